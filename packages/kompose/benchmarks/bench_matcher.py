@@ -0,0 +1,75 @@
+"""Benchmark the substring-rule matcher strategies.
+
+Compares, per compose file:
+
+  - `per rule`   — each substring rule testing its own literals with `in`
+                   (a literal shared by two rules is searched twice),
+  - `matcher`    — `PatternMatcher` as the engine uses it (one hit set per
+                   file; `in` per distinct literal below
+                   `AUTOMATON_MIN_PATTERNS`, the automaton above),
+  - `automaton`  — the Aho–Corasick automaton forced on.
+
+First with the literals of examples/rules.yaml against the test fixtures,
+then with synthetic pattern sets around the automaton threshold.
+
+    python benchmarks/bench_matcher.py
+"""
+
+from __future__ import annotations
+
+import random
+import timeit
+from pathlib import Path
+
+import yaml
+
+from kompose.matcher import AUTOMATON_MIN_PATTERNS, PatternMatcher
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def _best(fn, number: int) -> float:
+    """Best per-call time over 5 repeats, in microseconds."""
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number * 1e6
+
+
+def _example_rule_literals() -> list[list[str]]:
+    rules = yaml.safe_load((ROOT / "examples" / "rules.yaml").read_text())["rules"]
+    out = []
+    for rule in rules:
+        params = rule.get("params") or {}
+        literals = [*(params.get("required") or []), *(params.get("forbidden") or [])]
+        if literals:
+            out.append(literals)
+    return out
+
+
+def _row(label: str, per_rule: list[list[str]], text: str, number: int) -> None:
+    patterns = {p for literals in per_rule for p in literals}
+    matcher = PatternMatcher(patterns)
+    automaton = PatternMatcher(patterns, automaton_min=1)
+    times = [
+        _best(lambda: [[p in text for p in literals] for literals in per_rule], number),
+        _best(lambda: matcher.find(text), number),
+        _best(lambda: automaton.find(text), number),
+    ]
+    print(f"{label:<44} {len(patterns):>9} {len(text):>8} " + " ".join(f"{t:>11.1f}" for t in times))
+
+
+def main() -> None:
+    print(f"{'case':<44} {'patterns':>9} {'bytes':>8} {'per rule':>11} {'matcher':>11} {'automaton':>11}  (µs/file)")
+    per_rule = _example_rule_literals()
+    for fixture in sorted((ROOT / "tests" / "fixtures").glob("compose_*.yml")):
+        text = fixture.read_text()
+        _row(f"rules.yaml × {fixture.stem}", per_rule, text, 20000)
+        _row(f"rules.yaml × {fixture.stem} ×20", per_rule, text * 20, 2000)
+
+    rng = random.Random(1)
+    text = (ROOT / "tests" / "fixtures" / "compose_valid.yml").read_text() * 20
+    for count in (16, 64, AUTOMATON_MIN_PATTERNS // 2, AUTOMATON_MIN_PATTERNS, 1024, 4096):
+        patterns = {"".join(rng.choice("abcdefghijklmnop: ") for _ in range(rng.randint(5, 15))) for _ in range(count)}
+        _row(f"synthetic, {count} literals", [sorted(patterns)], text, 20)
+
+
+if __name__ == "__main__":
+    main()
@@ -96,6 +96,8 @@ def _build_parser() -> argparse.ArgumentParser:
         help=f"Host directory (default: {DEFAULT_HOST})",
     ).complete = _shared.COMPLETE_HOST
     parser.add_argument("--completion", choices=["zsh"], metavar="SHELL", help="Print a shell completion script to stdout and exit")
+    # Called by the zsh preamble when a completion source changed; not for humans.
+    parser.add_argument("--refresh-completion-index", action="store_true", help=argparse.SUPPRESS)
 
     subparsers = parser.add_subparsers(dest="command", metavar="<command>")
 
@@ -129,6 +131,11 @@ def main() -> int:
         sys.stdout.write(shtab.complete(parser, shell=args.completion, preamble={"zsh": _full_zsh_preamble()}))
         return 0
 
+    if args.refresh_completion_index:
+        from kompose import completion_index
+        completion_index.refresh(args.host)
+        return 0
+
     init_colors(args.no_color)
 
     if args.command is None:
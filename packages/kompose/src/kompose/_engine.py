@@ -3,13 +3,18 @@
 from __future__ import annotations
 
 import importlib
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
+from functools import cached_property
 from pathlib import Path
-from typing import Callable
+from typing import Callable, Iterable, Iterator, Sequence
 
 import yaml
 
+from .compose_index import ComposeDoc, compose_index
 from .config import get_host_dir
+from .matcher import PatternMatcher, matcher_for
+from .workspace import FixWorkspace
 
 SEVERITY_ERROR = "error"
 SEVERITY_WARNING = "warning"
@@ -26,13 +31,99 @@ class Issue:
     fix: str = ""
 
 
-@dataclass
 class LintContext:
-    service_name: str
-    compose_path: Path
-    content: str
-    parsed: dict
-    globals: dict
+    """What a rule sees for one service.
+
+    `parsed` is computed on first access and memoized: most rules only scan
+    `content`, so a ruleset that never touches it never pays for a YAML
+    parse. Pass `parsed=` to supply it up front, or `doc=` (a `ComposeDoc`)
+    to share the compose index's parse.
+
+    `contains(literal)` is the substring test for rules: when the engine
+    attaches the ruleset's `matcher`, the hit set for every literal is
+    computed once and each call is a set lookup.
+
+    `workspace` is where `fix()` hooks read other files and stage their
+    output (see `kompose.workspace`); one is created on demand when the
+    caller didn't supply one. Checks that read other files go through
+    `read_doc()`, so `kompose fix` can re-check against staged content.
+    """
+
+    __slots__ = (
+        "service_name", "compose_path", "content", "globals",
+        "_parsed", "_doc", "_matcher", "_hits", "_workspace",
+    )
+
+    def __init__(
+        self,
+        service_name: str,
+        compose_path: Path,
+        content: str,
+        parsed: dict | None = None,
+        globals: dict | None = None,
+        *,
+        doc: ComposeDoc | None = None,
+        matcher: PatternMatcher | None = None,
+        workspace: FixWorkspace | None = None,
+    ):
+        self.service_name = service_name
+        self.compose_path = compose_path
+        self.content = content
+        self.globals = globals if globals is not None else {}
+        self._parsed = parsed
+        self._doc = doc
+        self._matcher = matcher
+        self._hits: set[str] | None = None
+        self._workspace = workspace
+
+    @property
+    def parsed(self) -> dict:
+        if self._parsed is None:
+            if self._doc is not None:
+                self._parsed = self._doc.data
+            else:
+                self._parsed = ComposeDoc(self.compose_path, self.content).data
+        return self._parsed
+
+    @property
+    def workspace(self) -> FixWorkspace:
+        if self._workspace is None:
+            self._workspace = FixWorkspace()
+        return self._workspace
+
+    def read_doc(self, path: Path) -> ComposeDoc | None:
+        """Another file as a `ComposeDoc`: staged content when a workspace was
+        supplied (a fix run), else the shared compose index."""
+        if self._workspace is not None:
+            return self._workspace.doc(path)
+        return compose_index().doc(path)
+
+    def contains(self, literal: str) -> bool:
+        """`literal in self.content`, answered from the shared hit set when possible."""
+        matcher = self._matcher
+        if matcher is None or literal not in matcher.patterns:
+            return literal in self.content
+        if self._hits is None:
+            self._hits = matcher.find(self.content)
+        return literal in self._hits
+
+    @classmethod
+    def from_doc(
+        cls,
+        service_name: str,
+        doc: ComposeDoc,
+        globals_dict: dict,
+        *,
+        matcher: PatternMatcher | None = None,
+        workspace: FixWorkspace | None = None,
+    ) -> LintContext:
+        return cls(
+            service_name, doc.path, doc.content,
+            globals=dict(globals_dict), doc=doc, matcher=matcher, workspace=workspace,
+        )
+
+    def __repr__(self) -> str:
+        return f"LintContext(service_name={self.service_name!r}, compose_path={self.compose_path!r})"
 
 
 @dataclass
@@ -152,7 +243,7 @@ def load_kompose_config(host: str | None = None) -> dict:
     return merged
 
 
-def load_rules(host: str | None = None) -> tuple[dict, list[RuleSpec]]:
+def load_rules(host: str | None = None) -> tuple[dict, RulePlan]:
     """Load globals + rules from .kompose/ in the host directory.
 
     Supports two layouts (can coexist):
@@ -160,6 +251,8 @@ def load_rules(host: str | None = None) -> tuple[dict, list[RuleSpec]]:
       - multi-file: .kompose/globals.yaml + .kompose/rules/*.yaml
 
     Rules from both sources are merged by name; duplicates raise an error.
+    The returned `RulePlan` is a sequence of the specs; handlers are only
+    resolved by `plan.compile()` or on first use (doctor never does).
     """
     kompose_dir = get_kompose_dir(host)
     if not kompose_dir.exists():
@@ -206,11 +299,13 @@ def load_rules(host: str | None = None) -> tuple[dict, list[RuleSpec]]:
             f"(expected rules.yaml and/or rules/*.yaml)"
         )
 
-    return globals_dict, [spec for spec, _ in specs_by_name.values()]
+    return globals_dict, RulePlan(spec for spec, _ in specs_by_name.values())
 
 
 HandlerFn = Callable[[LintContext, dict, set], list[Issue]]
 NoticesFn = Callable[[Path, list, dict, set], list[Issue]]
+InputsFn = Callable[[Path, dict], list[Path]]
+PatternsFn = Callable[[dict], list[str]]
 FixFn = Callable[..., list["FixApplied"]]
 
 
@@ -253,22 +348,50 @@ def resolve_handler(spec: RuleSpec) -> HandlerFn:
     return fn
 
 
-def resolve_notices(spec: RuleSpec) -> NoticesFn | None:
-    """Return the rule's optional `notices()` callable, or None.
+def _optional_hook(spec: RuleSpec, hook: str) -> Callable | None:
+    """Return one of the rule's optional hooks (`notices`, `fix`, ...), or None.
 
-    For Python handlers, looks for a `notices` function in the handler module.
-    For built-in types, looks for `<type>_notices` in the built-in module.
+    For Python handlers, looks for a `<hook>` function in the handler module.
+    For built-in types, looks for `<type>_<hook>` in the built-in module.
     """
     module = _handler_module(spec)
     if spec.type:
-        return getattr(module, f"{spec.type}_notices", None)
-    return getattr(module, "notices", None)
+        return getattr(module, f"{spec.type}_{hook}", None)
+    return getattr(module, hook, None)
+
+
+def resolve_notices(spec: RuleSpec) -> NoticesFn | None:
+    """Return the rule's optional `notices()` callable, or None."""
+    return _optional_hook(spec, "notices")
+
+
+def resolve_inputs(spec: RuleSpec) -> InputsFn | None:
+    """Return the rule's optional `inputs()` callable, or None.
+
+    `inputs(service_dir, params)` lists the files a rule reads besides the
+    service's compose.yml, so the lint cache can invalidate on them. Same
+    naming convention as notices/fix (`<type>_inputs` for built-in types).
+    """
+    return _optional_hook(spec, "inputs")
+
+
+def resolve_patterns(spec: RuleSpec) -> PatternsFn | None:
+    """Return the rule's optional `patterns()` callable, or None.
+
+    `patterns(params)` lists the literal strings a rule tests with
+    `ctx.contains()`; they are folded into the ruleset's shared matcher.
+    Same naming convention as notices/fix (`<type>_patterns` for built-ins).
+    """
+    return _optional_hook(spec, "patterns")
+
+
+def ruleset_matcher(rules: Sequence[RuleSpec]) -> PatternMatcher | None:
+    """One matcher over every literal declared by `rules`, or None if there are none."""
+    return as_plan(rules).matcher
 
 
 def run_rule(spec: RuleSpec, ctx: LintContext) -> list[Issue]:
-    handler = resolve_handler(spec)
-    exclude = set(spec.exclude or [])
-    return handler(ctx, dict(spec.params), exclude) or []
+    return CompiledRule.compile(spec).run(ctx)
 
 
 def run_notices(
@@ -277,23 +400,12 @@ def run_notices(
     services: list[Path],
 ) -> list[Issue]:
     """Invoke a rule's `notices()` hook if defined, else return []."""
-    fn = resolve_notices(spec)
-    if fn is None:
-        return []
-    exclude = set(spec.exclude or [])
-    return fn(host_dir, services, dict(spec.params), exclude) or []
+    return CompiledRule.compile(spec).run_notices(host_dir, services)
 
 
 def resolve_fix(spec: RuleSpec) -> FixFn | None:
-    """Return the rule's optional `fix()` callable, or None.
-
-    Convention identical to notices: `fix` attr on handler modules, or
-    `<type>_fix` for built-in types.
-    """
-    module = _handler_module(spec)
-    if spec.type:
-        return getattr(module, f"{spec.type}_fix", None)
-    return getattr(module, "fix", None)
+    """Return the rule's optional `fix()` callable, or None."""
+    return _optional_hook(spec, "fix")
 
 
 def run_fix(
@@ -301,47 +413,234 @@ def run_fix(
     ctx: LintContext,
     *,
     force: bool = False,
-    dry_run: bool = False,
 ) -> list[FixApplied]:
     """Invoke a rule's `fix()` hook if defined, else return [].
 
-    The rule itself is responsible for honouring `dry_run` (not mutating
-    the filesystem) and `force` (skipping confirmation prompts).
+    Fixers never write to disk: they stage new content in `ctx.workspace`,
+    and the caller commits it (a dry run just doesn't). `force` skips
+    confirmation prompts.
     """
-    fn = resolve_fix(spec)
-    if fn is None:
-        return []
-    exclude = set(spec.exclude or [])
-    return fn(ctx, dict(spec.params), exclude, force=force, dry_run=dry_run) or []
+    return CompiledRule.compile(spec).run_fix(ctx, force=force)
+
+
+@dataclass(frozen=True)
+class CompiledRule:
+    """A `RuleSpec` with its hooks resolved and its params/exclude frozen.
+
+    Handlers receive the same `params` dict and `exclude` set on every call
+    and must treat them as read-only.
+    """
+    spec: RuleSpec
+    check: HandlerFn
+    notices: NoticesFn | None
+    fix: FixFn | None
+    inputs: InputsFn | None
+    patterns: frozenset[str]
+    params: dict
+    exclude: frozenset[str]
+
+    @classmethod
+    def compile(cls, spec: RuleSpec) -> CompiledRule:
+        params = dict(spec.params)
+        patterns_fn = resolve_patterns(spec)
+        patterns = frozenset(p for p in (patterns_fn(params) if patterns_fn else None) or [] if p)
+        return cls(
+            spec=spec,
+            check=resolve_handler(spec),
+            notices=resolve_notices(spec),
+            fix=resolve_fix(spec),
+            inputs=resolve_inputs(spec),
+            patterns=patterns,
+            params=params,
+            exclude=frozenset(spec.exclude or []),
+        )
+
+    def run(self, ctx: LintContext) -> list[Issue]:
+        return self.check(ctx, self.params, self.exclude) or []
+
+    def run_notices(self, host_dir: Path, services: list[Path]) -> list[Issue]:
+        if self.notices is None:
+            return []
+        return self.notices(host_dir, services, self.params, self.exclude) or []
+
+    def run_fix(self, ctx: LintContext, *, force: bool = False) -> list[FixApplied]:
+        if self.fix is None:
+            return []
+        return self.fix(ctx, self.params, self.exclude, force=force) or []
+
+    def inputs_for(self, service_dir: Path) -> list[Path]:
+        if self.inputs is None:
+            return []
+        return list(self.inputs(service_dir, self.params) or [])
+
+
+class RulePlan(Sequence[RuleSpec]):
+    """The loaded ruleset: a sequence of `RuleSpec`, plus its compiled form.
+
+    `compiled` resolves every rule's hooks once (raising `ValueError` for an
+    unknown type/handler, like `resolve_handler`); `matcher` is the shared
+    literal matcher over all declared `patterns()`. Both are built on first
+    access; callers that want errors up front call `compile()`. Pickles as
+    its specs only — pool workers recompile on arrival.
+    """
+
+    def __init__(self, specs: Iterable[RuleSpec] = ()):
+        self.specs: list[RuleSpec] = list(specs)
+
+    def __len__(self) -> int:
+        return len(self.specs)
+
+    def __getitem__(self, index):
+        return self.specs[index]
+
+    def __iter__(self) -> Iterator[RuleSpec]:
+        return iter(self.specs)
+
+    def __eq__(self, other):
+        if not isinstance(other, RulePlan):
+            return NotImplemented
+        return self.specs == other.specs
+
+    def __repr__(self) -> str:
+        return f"RulePlan({self.specs!r})"
+
+    def __reduce__(self):
+        return (RulePlan, (self.specs,))
+
+    @cached_property
+    def compiled(self) -> list[CompiledRule]:
+        return [CompiledRule.compile(spec) for spec in self.specs]
+
+    def compile(self) -> list[CompiledRule]:
+        """Resolve every rule's hooks now rather than on first use."""
+        return self.compiled
+
+    @cached_property
+    def matcher(self) -> PatternMatcher | None:
+        literals = frozenset().union(*(rule.patterns for rule in self.compiled))
+        return matcher_for(literals) if literals else None
+
+    @cached_property
+    def fixable(self) -> frozenset[str]:
+        """Names of the rules that define a `fix()` hook."""
+        return frozenset(rule.spec.name for rule in self.compiled if rule.fix is not None)
+
+
+def as_plan(rules: Sequence[RuleSpec]) -> RulePlan:
+    """`rules` itself if it's already a `RulePlan`, else a fresh plan over it."""
+    return rules if isinstance(rules, RulePlan) else RulePlan(rules)
 
 
 def lint_service(
     service_dir: Path,
-    rules: list[RuleSpec],
+    rules: Sequence[RuleSpec],
     globals_dict: dict,
 ) -> ServiceLintResult:
     """Run all rules against one service's compose.yml."""
     result = ServiceLintResult(service_name=service_dir.name)
     compose_path = service_dir / "compose.yml"
-    if not compose_path.exists():
+    doc = compose_index().doc(compose_path)
+    if doc is None:
         return result
 
-    content = compose_path.read_text()
-    try:
-        parsed = yaml.safe_load(content) or {}
-    except yaml.YAMLError:
-        parsed = {}
-
-    ctx = LintContext(
-        service_name=service_dir.name,
-        compose_path=compose_path,
-        content=content,
-        parsed=parsed,
-        globals=dict(globals_dict),
-    )
+    plan = as_plan(rules)
+    ctx = LintContext.from_doc(service_dir.name, doc, globals_dict, matcher=plan.matcher)
 
-    for spec in rules:
-        issues = run_rule(spec, ctx)
-        result.rule_results.append(RuleResult(rule=spec, issues=issues))
+    for rule in plan.compiled:
+        result.rule_results.append(RuleResult(rule=rule.spec, issues=rule.run(ctx)))
 
     return result
+
+
+# Per-worker state for `lint_services`, set once by the pool initializer: the
+# rules + globals are pickled once per worker (not once per service) and the
+# plan is compiled before the first service arrives.
+_worker_rules: RulePlan = RulePlan()
+_worker_globals: dict = {}
+
+# A worker costs a process start, a pickle of the rules and the handler
+# imports before its first service; below this many services per worker
+# that outweighs the parse it saves, so small batches (a cache hit on most
+# groups, a single-group lint) stay in-process.
+_MIN_SERVICES_PER_WORKER = 8
+
+
+def _init_lint_worker(rules: RulePlan, globals_dict: dict) -> None:
+    global _worker_rules, _worker_globals
+    _worker_rules = rules
+    _worker_globals = globals_dict
+    rules.compile()
+
+
+def _lint_in_worker(service_dir: Path) -> list[list[Issue]]:
+    """Lint one service inside a worker; only the issue lists travel back."""
+    result = lint_service(service_dir, _worker_rules, _worker_globals)
+    return [rr.issues for rr in result.rule_results]
+
+
+def _lint_issue_lists(
+    service_dirs: list[Path],
+    rules: RulePlan,
+    globals_dict: dict,
+    jobs: int,
+) -> list[list[list[Issue]]]:
+    """Per-service, per-rule issue lists — in-process or over a process pool.
+    The pool only gets as many workers as there are `_MIN_SERVICES_PER_WORKER`
+    batches of services; one or none lints in-process."""
+    workers = min(jobs, len(service_dirs) // _MIN_SERVICES_PER_WORKER)
+    if workers <= 1:
+        return [
+            [rr.issues for rr in lint_service(d, rules, globals_dict).rule_results]
+            for d in service_dirs
+        ]
+
+    rules.compile()
+
+    chunksize = max(1, len(service_dirs) // (workers * 4))
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_lint_worker,
+        initargs=(rules, globals_dict),
+    ) as pool:
+        return list(pool.map(_lint_in_worker, service_dirs, chunksize=chunksize))
+
+
+def lint_services(
+    service_dirs: list[Path],
+    rules: Sequence[RuleSpec],
+    globals_dict: dict,
+    *,
+    jobs: int = 1,
+    cache=None,
+) -> list[ServiceLintResult]:
+    """Run `lint_service` over several services; results keep the input order.
+
+    With `jobs > 1` and enough services to amortise the worker start-up, the
+    services are spread over a process pool — the cost is the pure-Python
+    YAML parse, so threads wouldn't help. Handlers are
+    resolved in the parent first, so a bad `handler:` fails exactly like the
+    sequential path instead of breaking the pool.
+
+    `cache` (a `kompose.lint_cache.LintCache`) short-circuits services whose
+    inputs are unchanged; only the misses are linted, then stored.
+    """
+    service_dirs = list(service_dirs)
+    rules = as_plan(rules)
+    issue_lists: list[list[list[Issue]] | None] = [None] * len(service_dirs)
+    if cache is not None:
+        for i, service_dir in enumerate(service_dirs):
+            issue_lists[i] = cache.lookup(service_dir)
+
+    todo = [i for i, issues in enumerate(issue_lists) if issues is None]
+    linted = _lint_issue_lists([service_dirs[i] for i in todo], rules, globals_dict, jobs)
+    for i, per_rule in zip(todo, linted):
+        issue_lists[i] = per_rule
+        if cache is not None:
+            cache.store(service_dirs[i], per_rule)
+
+    results = []
+    for service_dir, per_rule in zip(service_dirs, issue_lists):
+        result = ServiceLintResult(service_name=service_dir.name)
+        result.rule_results = [RuleResult(rule=spec, issues=issues) for spec, issues in zip(rules, per_rule)]
+        results.append(result)
+    return results
@@ -31,36 +31,66 @@ _kompose_host_dir() {
   print -r -- "$host"
 }
 
-_kompose_services() {
+# Loads the completion index (see kompose.completion_index) into `reply`,
+# one `<kind>\t<fields...>` record per element. Only when a source is newer
+# than the index does this start `kompose` to rebuild it; otherwise it's a
+# few stats and one builtin read.
+_kompose_index() {
+  reply=()
   local ws="$(_kompose_workspace)"
   local host="$(_kompose_host_dir)"
-  [[ -d $ws/$host ]] || return
+  ws=${ws%/}
+  [[ -d $ws ]] || return 1
+  local index="${XDG_CACHE_HOME:-$HOME/.cache}/kompose/completion/${ws//\//%}@${host}.tsv"
+  local src stale=0 kdir="$ws/$host/.kompose"
+  if [[ -f $index ]]; then
+    # Same list as completion_index.sources().
+    for src in $ws $ws/$host(N) $ws/$host/compose.yml(N) $ws/$host/*(N/) $ws/$host/*/compose.yml(N) \
+               $kdir(N) $kdir/commands.yaml(N) $kdir/commands(N) $kdir/commands/*.yaml(N); do
+      if [[ $src -nt $index ]]; then
+        stale=1
+        break
+      fi
+    done
+  else
+    stale=1
+  fi
+  (( stale )) && KOMPOSE_WORKSPACE=$ws kompose --host "$host" --refresh-completion-index &>/dev/null
+  [[ -r $index ]] || return 1
+  reply=("${(@f)$(<$index)}")
+}
+
+# Fields after `<kind>\t` of the index records of one kind (optionally also
+# matching the first field), e.g. `_kompose_index_field container paperless`.
+_kompose_index_field() {
+  local prefix="$1"$'\t'
+  [[ -n $2 ]] && prefix+="$2"$'\t'
+  reply=(${${(M)reply:#${prefix}*}#${prefix}})
+}
+
+_kompose_services() {
+  _kompose_index || return
+  _kompose_index_field group
   local -a names
-  names=(${ws}/${host}/*(/N:t))
+  names=($reply)
   _describe 'service' names
 }
 
 _kompose_hosts() {
-  local ws="$(_kompose_workspace)"
-  [[ -d $ws ]] || return
+  _kompose_index || return
+  _kompose_index_field host
   local -a names
-  names=(${ws}/*(/N:t))
+  names=($reply)
   _describe 'host' names
 }
 
 _kompose_containers() {
-  local ws="$(_kompose_workspace)"
-  local host="$(_kompose_host_dir)"
-  # Previous word is the group; its compose.yml holds the container names.
+  # Previous word is the group; the index holds its compose services.
   local service="${words[CURRENT-1]}"
-  local compose="$ws/$host/$service/compose.yml"
-  [[ -f $compose ]] || return
+  _kompose_index || return
+  _kompose_index_field container "$service"
   local -a names
-  names=(${(f)"$(awk '
-    /^services:[[:space:]]*$/ { in_svc=1; next }
-    in_svc && /^[^[:space:]]/  { in_svc=0 }
-    in_svc && /^  [a-zA-Z_-]/  { sub(/:.*$/, ""); sub(/^[[:space:]]+/, ""); print }
-  ' "$compose")"})
+  names=($reply)
   _describe 'container' names
 }
 """
@@ -73,6 +103,14 @@ COMPLETE_CONTAINER = {"zsh": "_kompose_containers"}
 COMPLETE_HOST = {"zsh": "_kompose_hosts"}
 
 
+def positive_int(value: str) -> int:
+    """argparse `type=` for counts that must be >= 1 (`--jobs`, `--parallel`)."""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be >= 1 (got {value})")
+    return number
+
+
 def add_subparser(subparsers, name: str, help: str, **kwargs) -> argparse.ArgumentParser:
     """Create a subparser with `help=` mirrored into `description=`.
 
@@ -14,6 +14,14 @@ def _add_check_args(parser: argparse.ArgumentParser) -> None:
         "service", nargs="?", metavar="<service>",
         help="Service to check (default: all)",
     ).complete = _shared.COMPLETE_SERVICE
+    parser.add_argument(
+        "-j", "--jobs", type=_shared.positive_int, default=None, metavar="N",
+        help="Lint N services in parallel worker processes (default: CPU count; 1 = sequential)",
+    )
+    parser.add_argument(
+        "--no-cache", action="store_true",
+        help="Re-lint every service, ignoring (and not updating) the lint cache",
+    )
 
 
 def register_top_level(subparsers) -> None:
@@ -15,7 +15,7 @@ from . import _shared
 
 
 def _add_lifecycle_args(parser: argparse.ArgumentParser) -> None:
-    """Args shared by up/down/restart: <service> + <containers...>."""
+    """Args shared by up/down/restart: <service> + <containers...> + --parallel."""
     parser.add_argument(
         "service", nargs="?", metavar="<service>",
         help="Service (group dir) or docker compose service name",
@@ -24,24 +24,59 @@ def _add_lifecycle_args(parser: argparse.ArgumentParser) -> None:
         "containers", nargs="*", metavar="<container>",
         help="Specific containers within the service",
     ).complete = _shared.COMPLETE_CONTAINER
+    parser.add_argument(
+        "-p", "--parallel", type=_shared.positive_int, default=None, metavar="N",
+        help="Legacy mode, all services: run N services at a time (output buffered per service); "
+             "with --rolling: recreate N services per batch. Otherwise unused in root mode (one compose call)",
+    )
+
+
+def _add_up_args(parser: argparse.ArgumentParser) -> None:
+    _add_lifecycle_args(parser)
+    parser.add_argument(
+        "--changed", action="store_true",
+        help="Root mode: only (re)create services whose config hash differs from their containers'",
+    )
+
+
+def _add_restart_args(parser: argparse.ArgumentParser) -> None:
+    _add_lifecycle_args(parser)
+    parser.add_argument(
+        "--rolling", action="store_true",
+        help="Root mode: recreate services one batch at a time, waiting for each to be healthy",
+    )
+    parser.add_argument(
+        "--timeout", type=_shared.positive_int, default=None, metavar="SECONDS",
+        help="With --rolling: readiness timeout per batch (default: 120)",
+    )
 
 
 def _add_logs_args(parser: argparse.ArgumentParser) -> None:
     parser.add_argument(
-        "service", metavar="<service>", help="Service to view logs",
+        "service", nargs="?", metavar="<service>", help="Service to view logs (optional with --grep: all)",
     ).complete = _shared.COMPLETE_SERVICE
     parser.add_argument(
         "containers", nargs="*", metavar="<container>",
-        help="Specific containers within the service",
+        help="Specific containers within the service, or more groups/services to merge into one stream",
     ).complete = _shared.COMPLETE_CONTAINER
     parser.add_argument("-f", "--follow", action="store_true", default=True, help="Follow log output (default)")
     parser.add_argument("--no-follow", action="store_false", dest="follow", help="Don't follow log output")
-    parser.add_argument("-n", "--tail", default="100", metavar="N", help="Number of lines to show (default: 100)")
+    parser.add_argument(
+        "-n", "--tail", default=None, metavar="N",
+        help="Number of lines to show (default: 100; all with --grep)",
+    )
+    parser.add_argument("--since", metavar="TIME", help="Only logs since TIME (e.g. 10m, 2h30m, 2024-05-01T12:00:00)")
+    parser.add_argument("--until", metavar="TIME", help="Only logs before TIME (same forms as --since)")
+    parser.add_argument(
+        "-g", "--grep", metavar="PATTERN",
+        help="Search the logs with a regex (use (?i) for case-insensitive); matches grouped by container",
+    )
+    parser.add_argument("-c", "--count", action="store_true", help="With --grep: per-container match counts only")
 
 
 def register_top_level(subparsers) -> None:
     p = _shared.add_subparser(subparsers, "up", "Start services (alias of: service up)")
-    _add_lifecycle_args(p)
+    _add_up_args(p)
     p.set_defaults(func=cmd_up)
 
     p = _shared.add_subparser(subparsers, "down", "Stop services (alias of: service down)")
@@ -49,7 +84,7 @@ def register_top_level(subparsers) -> None:
     p.set_defaults(func=cmd_down)
 
     p = _shared.add_subparser(subparsers, "restart", "Restart services (alias of: service restart)", aliases=["r"])
-    _add_lifecycle_args(p)
+    _add_restart_args(p)
     p.set_defaults(func=cmd_restart)
 
     p = _shared.add_subparser(subparsers, "logs", "View service logs (alias of: service logs)", aliases=["l"])
@@ -59,7 +94,7 @@ def register_top_level(subparsers) -> None:
 
 def register_canonical(service_subparsers) -> None:
     sp = _shared.add_subparser(service_subparsers, "up", "Start services")
-    _add_lifecycle_args(sp)
+    _add_up_args(sp)
     sp.set_defaults(func=cmd_up)
 
     sp = _shared.add_subparser(service_subparsers, "down", "Stop services")
@@ -67,7 +102,7 @@ def register_canonical(service_subparsers) -> None:
     sp.set_defaults(func=cmd_down)
 
     sp = _shared.add_subparser(service_subparsers, "restart", "Restart services", aliases=["r"])
-    _add_lifecycle_args(sp)
+    _add_restart_args(sp)
     sp.set_defaults(func=cmd_restart)
 
     sp = _shared.add_subparser(service_subparsers, "logs", "View service logs", aliases=["l"])
@@ -3,8 +3,8 @@
 This module owns:
 - the argparse subparser registration (`register_top_level`)
 - the `--` separator interception (`split_forwarded_args`)
-- the zsh completion preamble (`ZSH_PREAMBLE`) with helpers that scan
-  `<host>/.kompose/commands.yaml` and commands/*.yaml.
+- the zsh completion preamble (`ZSH_PREAMBLE`) with helpers that read the
+  actions from the completion index (`kompose.completion_index`).
 
 The execution logic lives in `kompose.commands`.
 """
@@ -44,6 +44,27 @@ def _add_run_args(parser: argparse.ArgumentParser) -> None:
         help="Action name when the first arg is a service",
     )
     second.complete = _COMPLETE_RUN_SECOND
+    fanout = parser.add_mutually_exclusive_group()
+    fanout.add_argument(
+        "--all", action="store_true",
+        help="Run the action on every service that defines it (concurrently)",
+    )
+    fanout.add_argument(
+        "--on", type=_service_list, metavar="SVC[,SVC...]",
+        help="Run the action on these services only (concurrently)",
+    )
+    parser.add_argument(
+        "-p", "--parallel", type=_shared.positive_int, default=None, metavar="N",
+        help="With --all / --on: run N actions at a time (default: 4)",
+    )
+
+
+def _service_list(value: str) -> list[str]:
+    """argparse `type=` for `--on a,b,c`."""
+    services = [s.strip() for s in value.split(",") if s.strip()]
+    if not services:
+        raise argparse.ArgumentTypeError("expected a comma-separated list of services")
+    return services
 
 
 def register_top_level(subparsers) -> None:
@@ -72,52 +93,25 @@ def split_forwarded_args(argv: list[str]) -> tuple[list[str], list[str]]:
     return argv[:sep_idx], argv[sep_idx + 1:]
 
 
-# Walks <host>/.kompose/commands.yaml and commands/*.yaml with awk to feed
-# zsh completion. Trade-off: no Python startup on Tab (snappy), but relies on
-# the schema's standard 2-space indentation (services > <svc> > actions >
-# <name>). Other indentations still execute fine (Python uses a real YAML
-# parser), only completion misses.
+# Actions come from the completion index (`_kompose_index` in the shared
+# preamble), which kompose builds with `load_commands` — so completion sees
+# exactly what `kompose run` will execute, whatever the YAML layout.
 ZSH_PREAMBLE = r"""
 # --- kompose run helpers ---
 
+# `<service>\t<action>` for every declared action, in `reply`.
 _kompose_run_pairs() {
-  local ws="$(_kompose_workspace)"
-  local host="$(_kompose_host_dir)"
-  local -a files
-  [[ -f $ws/$host/.kompose/commands.yaml ]] && files+=($ws/$host/.kompose/commands.yaml)
-  files+=($ws/$host/.kompose/commands/*.yaml(N))
-  [[ ${#files[@]} -eq 0 ]] && return
-  awk '
-    FNR==1 { svc=""; in_svc=0; in_actions=0; per_file_svc=FILENAME; sub(/.*\//, "", per_file_svc); sub(/\.yaml$/, "", per_file_svc) }
-    /^services:[[:space:]]*$/ { in_services=1; next }
-    in_services && /^[^[:space:]]/ { in_services=0 }
-    in_services && /^  [a-zA-Z0-9_-]+:[[:space:]]*$/ {
-      svc=$0; sub(/^  /, "", svc); sub(/:.*/, "", svc); in_actions=0; next
-    }
-    in_services && svc != "" && /^    actions:[[:space:]]*$/ { in_actions=1; next }
-    in_services && /^  [a-zA-Z0-9_-]+:/ && !/^    / { in_actions=0 }
-    in_actions && /^      [a-zA-Z0-9_-]+/ {
-      a=$0; sub(/^      /, "", a); sub(/:.*/, "", a)
-      print svc "\t" a
-    }
-    /^actions:[[:space:]]*$/ { in_actions_top=1; next }
-    in_actions_top && /^[^[:space:]]/ { in_actions_top=0 }
-    in_actions_top && /^  [a-zA-Z0-9_-]+/ {
-      a=$0; sub(/^  /, "", a); sub(/:.*/, "", a)
-      print per_file_svc "\t" a
-    }
-  ' "${files[@]}"
+  _kompose_index || return
+  _kompose_index_field action
 }
 
 # First positional of `kompose run`: a service OR a unique action.
 _kompose_run_first() {
-  local -a pairs services actions
-  pairs=("${(@f)$(_kompose_run_pairs)}")
-  for p in $pairs; do
-    services+=("${p%%	*}")
-    actions+=("${p##*	}")
-  done
-  typeset -aU services
+  _kompose_run_pairs || return
+  local -aU services
+  local -a actions
+  services=(${reply%%$'\t'*})
+  actions=(${reply#*$'\t'})
   _describe 'action' actions
   _describe 'service' services
 }
@@ -125,11 +119,10 @@ _kompose_run_first() {
 # Second positional of `kompose run <svc>`: actions of that service.
 _kompose_run_second() {
   local svc="${words[CURRENT-1]}"
-  local -a pairs filtered
-  pairs=("${(@f)$(_kompose_run_pairs)}")
-  for p in $pairs; do
-    [[ "${p%%	*}" == "$svc" ]] && filtered+=("${p##*	}")
-  done
-  _describe 'action' filtered
+  _kompose_index || return
+  _kompose_index_field action "$svc"
+  local -a actions
+  actions=($reply)
+  _describe 'action' actions
 }
 """
@@ -11,11 +11,28 @@ from . import _shared
 
 def _add_upgrade_args(parser: argparse.ArgumentParser) -> None:
     parser.add_argument(
-        "service", nargs="?", metavar="<service>",
-        help="Service group to upgrade (default: all containers)",
+        "service", nargs="*", metavar="<service>",
+        help="Service groups / services to upgrade (default: all containers)",
     ).complete = _shared.COMPLETE_SERVICE
     parser.add_argument("-f", "--force", action="store_true", help="Skip confirmation on the global form")
+    parser.add_argument(
+        "-p", "--parallel", type=_shared.positive_int, default=None, metavar="N",
+        help="Several targets: keep N trigger requests in flight (watchtower queues them; default: 1); "
+             "--engine native: pull N images at a time (default: 4)",
+    )
+    parser.add_argument(
+        "--engine", choices=["watchtower", "native"], default="watchtower",
+        help="watchtower: trigger its HTTP API (default); native: docker pull + recreate changed services from kompose",
+    )
+    parser.add_argument(
+        "--no-check", action="store_false", dest="check",
+        help="Skip the registry digest pre-check and let watchtower scan every image",
+    )
     parser.add_argument("--logs", action="store_true", help="Render the latest watchtower session (no trigger)")
+    parser.add_argument(
+        "--history", action="store_true",
+        help="Per-image update timeline from the local history (scoped to the <service>s if given)",
+    )
 
 
 def register_top_level(subparsers) -> None:
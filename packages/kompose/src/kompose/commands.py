@@ -21,6 +21,11 @@ Lookup rules — `kompose run <a>` resolves <a> against all loaded actions; if a
 single action across all services has that name it runs, otherwise we list the
 candidates and bail. `kompose run <s> <a>` is the explicit, unambiguous form.
 
+Fan-out — `kompose run <a> --all` runs every action named <a>, and
+`kompose run <a> --on s1,s2` the ones on those services, `--parallel N` at a
+time (no TTY, no stdin). Output lines are prefixed with the qualified name;
+a per-action exit / duration table closes the run.
+
 Pure logic only: schema, lookup, execution. CLI plumbing (subparser, zsh
 completion, `--` separator handling) lives in `kompose.cli.run`.
 """
@@ -30,13 +35,19 @@ from __future__ import annotations
 import shlex
 import subprocess
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 
 import yaml
 
 from ._engine import get_kompose_dir
-from .utils import Colors
+from .utils import Colors, Table
+
+FANOUT_JOBS = 4
+_PREFIX_COLORS = ("CYAN", "YELLOW", "GREEN", "BLUE", "GRAY")
 
 
 # ---------------------------------------------------------------------------
@@ -199,6 +210,23 @@ def resolve_action(
     )
 
 
+def resolve_fanout(actions: list[Action], name: str, services: list[str] | None) -> list[Action]:
+    """Every action called `name` — on `services` only, when given.
+    Raises LookupError when nothing matches or a listed service lacks it."""
+    matches = [a for a in actions if a.name == name]
+    if not matches:
+        raise LookupError(f"No action named '{name}' found in any service.")
+    if services is not None:
+        missing = [s for s in services if not any(a.service == s for a in matches)]
+        if missing:
+            raise LookupError(
+                f"No action '{name}' on: {', '.join(missing)}. "
+                f"Defined in: {', '.join(a.service for a in matches)}"
+            )
+        matches = [a for a in matches if a.service in services]
+    return sorted(matches, key=lambda a: a.qualified_name)
+
+
 def _list_actions_for(actions: list[Action], service: str) -> str:
     names = sorted(a.name for a in actions if a.service == service)
     return ", ".join(names)
@@ -209,8 +237,9 @@ def _list_actions_for(actions: list[Action], service: str) -> str:
 # ---------------------------------------------------------------------------
 
 
-def build_docker_exec(action: Action, forward_args: list[str]) -> list[str]:
-    """Build the docker exec argv. Args after `--` are appended to the shell string."""
+def build_docker_exec(action: Action, forward_args: list[str], interactive: bool = True) -> list[str]:
+    """Build the docker exec argv. Args after `--` are appended to the shell string.
+    `interactive=False` (fan-out) attaches neither stdin nor a TTY."""
     shell_cmd = action.exec
     if forward_args:
         # Quote each forwarded arg via printf-friendly single-quote escape so
@@ -218,7 +247,9 @@ def build_docker_exec(action: Action, forward_args: list[str]) -> list[str]:
         quoted = " ".join(_shell_quote(a) for a in forward_args)
         shell_cmd = f"{shell_cmd} {quoted}"
     flags = ["-i"]
-    if action.tty and sys.stdin.isatty():
+    if not interactive:
+        flags = []
+    elif action.tty and sys.stdin.isatty():
         flags = ["-it"]
     return ["docker", "exec", *flags, action.container, "sh", "-c", shell_cmd]
 
@@ -230,6 +261,75 @@ def _shell_quote(s: str) -> str:
     return "'" + s.replace("'", "'\\''") + "'"
 
 
+@dataclass
+class FanoutResult:
+    action: Action
+    returncode: int
+    duration: float
+
+
+def run_fanout(
+    actions: list[Action],
+    forward_args: list[str],
+    *,
+    parallel: int = FANOUT_JOBS,
+    verbose: bool = False,
+) -> list[FanoutResult]:
+    """Run `actions` concurrently, `parallel` at a time, streaming each one's
+    output with a `<service:action> |` prefix. Results keep `actions` order."""
+    width = max(len(a.qualified_name) for a in actions)
+    prefixes = {
+        a.qualified_name: f"{getattr(Colors, _PREFIX_COLORS[i % len(_PREFIX_COLORS)])}"
+                          f"{a.qualified_name.ljust(width)} |{Colors.RESET}"
+        for i, a in enumerate(actions)
+    }
+    print_lock = threading.Lock()
+
+    def emit(action: Action, line: str) -> None:
+        with print_lock:
+            print(f"{prefixes[action.qualified_name]} {line}", flush=True)
+
+    def run_one(action: Action) -> FanoutResult:
+        cmd = build_docker_exec(action, forward_args, interactive=False)
+        if verbose:
+            emit(action, f"{Colors.GRAY}+ {shlex.join(cmd)}{Colors.RESET}")
+        start = time.monotonic()
+        try:
+            proc = subprocess.Popen(
+                cmd, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                text=True, errors="replace", bufsize=1,
+            )
+        except OSError as e:
+            emit(action, f"{Colors.RED}{e}{Colors.RESET}")
+            return FanoutResult(action, 127, time.monotonic() - start)
+        for line in proc.stdout:
+            emit(action, line.rstrip("\n"))
+        returncode = proc.wait()
+        if returncode < 0:
+            returncode = 128 - returncode  # killed by a signal: shell convention
+        return FanoutResult(action, returncode, time.monotonic() - start)
+
+    with ThreadPoolExecutor(max_workers=max(1, min(parallel, len(actions)))) as pool:
+        return list(pool.map(run_one, actions))
+
+
+def _render_fanout(results: list[FanoutResult]) -> None:
+    table = Table(["Action", "Container", "Exit", "Took"])
+    for r in results:
+        color = Colors.GREEN if r.returncode == 0 else Colors.RED
+        table.add_row([
+            r.action.qualified_name,
+            f"{Colors.GRAY}{r.action.container}{Colors.RESET}",
+            f"{color}{r.returncode}{Colors.RESET}",
+            f"{r.duration:.1f}s",
+        ])
+    failed = sum(1 for r in results if r.returncode != 0)
+    print()
+    print(table.render())
+    summary = f"{len(results) - failed}/{len(results)} succeeded"
+    print(f"{Colors.GREEN if not failed else Colors.RED}{summary}{Colors.RESET}")
+
+
 # ---------------------------------------------------------------------------
 # CLI command
 # ---------------------------------------------------------------------------
@@ -263,6 +363,11 @@ def cmd_run(args) -> int:
         print(f"{Colors.GRAY}Hint: run `kompose doctor --commands` for a structured report.{Colors.RESET}")
         return 2
 
+    fan_all = getattr(args, "all", False)
+    on = getattr(args, "on", None)
+    if fan_all or on:
+        return _cmd_run_fanout(actions, first, second, on, forwarded, args)
+
     if first is None:
         return _print_list(actions, scope=None)
 
@@ -288,6 +393,35 @@ def cmd_run(args) -> int:
         return 130
 
 
+def _cmd_run_fanout(
+    actions: list[Action],
+    first: str | None,
+    second: str | None,
+    on: list[str] | None,
+    forwarded: list[str],
+    args,
+) -> int:
+    """`kompose run <action> --all | --on s1,s2`. Exit code is the highest of
+    the actions' (0 when all succeeded)."""
+    if first is None or second is not None:
+        print(f"{Colors.RED}--all / --on take a single action name: kompose run <action> --on s1,s2{Colors.RESET}")
+        return 2
+    try:
+        targets = resolve_fanout(actions, first, on or None)
+    except LookupError as e:
+        print(f"{Colors.RED}{e}{Colors.RESET}")
+        return 2
+
+    parallel = getattr(args, "parallel", None) or FANOUT_JOBS
+    try:
+        results = run_fanout(targets, forwarded, parallel=parallel, verbose=getattr(args, "verbose", False))
+    except KeyboardInterrupt:
+        print()
+        return 130
+    _render_fanout(results)
+    return max(r.returncode for r in results)
+
+
 def _print_list(actions: list[Action], scope: str | None) -> int:
     """Print actions, optionally filtered to a single service."""
     if not actions:
@@ -0,0 +1,148 @@
+"""Completion index — what zsh completion offers, precompiled by kompose.
+
+zsh completion runs on every Tab, so it can't afford a Python start-up, and
+scanning compose.yml / commands*.yaml from the shell only understands one
+indentation style. Instead, kompose writes one index per (workspace, host)
+under `$XDG_CACHE_HOME/kompose/completion/`, built with the same parsers the
+runtime uses (`compose_index`, `load_commands`). One record per line,
+tab-separated:
+
+    host       <host>
+    group      <group>
+    container  <group>  <compose service>
+    action     <service>  <action>
+
+The first line is a `#` header carrying the format and a signature of the
+sources' `(mtime_ns, size)`. The preamble checks `[[ src -nt index ]]` over
+the same source list (`sources()`) and calls
+`kompose --refresh-completion-index` only when something is newer; the
+refresh rebuilds only when the signature actually moved. Reading the index
+is a single `$(<file)`, no external process.
+
+Like the lint cache, it's disposable: deleting the directory is always safe.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+from pathlib import Path
+
+import yaml
+
+from ._engine import get_kompose_dir
+from .commands import load_commands
+from .compose_index import compose_index
+from .config import get_cache_dir, get_host_dir, get_services
+
+INDEX_DIR = "completion"
+_FORMAT = 1
+_HEADER = "#kompose-completion"
+
+
+def index_path(host: str | None = None) -> Path:
+    """`<cache>/completion/<workspace with / → %>@<host>.tsv` — the preamble
+    derives the same name from `$KOMPOSE_WORKSPACE` and the host."""
+    host_dir = get_host_dir(host)
+    workspace = str(host_dir.parent).replace("/", "%")
+    return get_cache_dir() / INDEX_DIR / f"{workspace}@{host_dir.name}.tsv"
+
+
+def _subdirs(path: Path) -> list[Path]:
+    try:
+        return sorted(p for p in path.iterdir() if p.is_dir() and not p.name.startswith("."))
+    except OSError:
+        return []
+
+
+def sources(host: str | None = None) -> list[Path]:
+    """Files and directories whose changes invalidate the index. Directories
+    are included so added / removed groups and command files count too."""
+    host_dir = get_host_dir(host)
+    kompose_dir = get_kompose_dir(host)
+    groups = _subdirs(host_dir)
+    return [
+        host_dir.parent,
+        host_dir,
+        host_dir / "compose.yml",
+        *groups,
+        *(group / "compose.yml" for group in groups),
+        kompose_dir,
+        kompose_dir / "commands.yaml",
+        kompose_dir / "commands",
+        *sorted((kompose_dir / "commands").glob("*.yaml")),
+    ]
+
+
+def signature(paths: list[Path]) -> str:
+    digest = hashlib.sha256()
+    for path in paths:
+        try:
+            st = path.stat()
+            stamp = f"{st.st_mtime_ns}:{st.st_size}"
+        except OSError:
+            stamp = "missing"
+        digest.update(f"\0{path}\0{stamp}".encode())
+    return digest.hexdigest()
+
+
+def build_records(host: str | None = None) -> list[tuple[str, ...]]:
+    """Every completion candidate for `host`, in index order."""
+    host_dir = get_host_dir(host)
+    records: list[tuple[str, ...]] = [("host", p.name) for p in _subdirs(host_dir.parent)]
+    index = compose_index()
+    for group_dir in get_services(host):
+        records.append(("group", group_dir.name))
+        records.extend(("container", group_dir.name, str(name)) for name in index.service_names(group_dir / "compose.yml"))
+    try:
+        actions = load_commands(host)
+    except (OSError, ValueError, yaml.YAMLError):
+        actions = []  # `kompose doctor --commands` reports these
+    records.extend(("action", str(action.service), str(action.name)) for action in actions)
+    return records
+
+
+def _stored_signature(path: Path) -> str | None:
+    try:
+        with path.open() as f:
+            fields = f.readline().rstrip("\n").split("\t")
+    except (OSError, UnicodeDecodeError):
+        return None
+    if len(fields) == 3 and fields[0] == _HEADER and fields[1] == str(_FORMAT):
+        return fields[2]
+    return None
+
+
+def refresh(host: str | None = None, path: Path | None = None) -> bool:
+    """Rebuild the index when its sources changed. Returns True if it was
+    rewritten. Write failures are ignored — completion just goes stale."""
+    path = path or index_path(host)
+    current = signature(sources(host))
+    if _stored_signature(path) == current:
+        # The preamble's `-nt` fired but nothing we index moved (e.g. a
+        # source written within the index's timestamp granularity): bump
+        # the index so the check settles instead of firing on every Tab.
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return False
+    lines = [f"{_HEADER}\t{_FORMAT}\t{current}"]
+    # A tab or newline inside a YAML key would break the line format; such
+    # names can't be typed at a prompt anyway.
+    lines.extend(
+        "\t".join(record) for record in build_records(host)
+        if not any("\t" in f or "\n" in f for f in record)
+    )
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp.write_text("\n".join(lines) + "\n")
+        os.replace(tmp, path)
+    except OSError:
+        tmp.unlink(missing_ok=True)
+        return False
+    return True
+
+
+__all__ = ["INDEX_DIR", "build_records", "index_path", "refresh", "signature", "sources"]
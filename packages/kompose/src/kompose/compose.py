@@ -7,22 +7,31 @@ Two execution modes, auto-selected per command invocation:
   Commands target this root file; service args are passed positionally to
   docker compose. Arg expansion: if an arg matches a service dir (group),
   it is expanded to all services declared in that group's compose.yml.
+  `up --changed` only passes the services whose config hash drifted from
+  their containers' (`drift.py`); `restart --rolling` recreates targets in
+  batches gated on readiness (`rolling.py`).
 
 - **Legacy mode** — when no root compose.yml exists. Per-service iteration
   with optional layering of `base/<service>/compose.yml` + `<host>/<service>/compose.yml`.
-  Preserved for hosts that have not adopted the include model.
+  Preserved for hosts that have not adopted the include model. All-services
+  up/restart walk the groups in dependency waves (`schedule.py`), down in
+  reverse; with `--parallel N`, each wave runs N services at a time.
 
 Status (`kompose status` + its formatters / stats sources / watch loop) lives
 in `status.py`, since it doesn't mutate state and has its own concerns.
 """
 
+import re
 import subprocess
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
 from pathlib import Path
 
-import yaml
-
+from . import drift, logmux, rolling, schedule
+from .compose_index import compose_index
 from .config import WORKSPACE_DIR, get_base_dir, get_host_dir, get_services
-from .utils import Colors
+from .utils import Colors, Table
 
 
 # ---------------------------------------------------------------------------
@@ -38,11 +47,7 @@ def get_root_compose(host: str | None = None) -> Path | None:
 
 def parse_compose_services(compose_path: Path) -> list[str]:
     """Return the service names declared in a compose.yml file."""
-    try:
-        parsed = yaml.safe_load(compose_path.read_text()) or {}
-    except (OSError, yaml.YAMLError):
-        return []
-    return list((parsed.get("services") or {}).keys())
+    return compose_index().service_names(compose_path)
 
 
 def build_service_to_group_map(host: str | None = None) -> dict[str, str]:
@@ -50,28 +55,7 @@ def build_service_to_group_map(host: str | None = None) -> dict[str, str]:
     root = get_root_compose(host)
     if not root:
         return {}
-
-    try:
-        parsed = yaml.safe_load(root.read_text()) or {}
-    except (OSError, yaml.YAMLError):
-        return {}
-
-    mapping: dict[str, str] = {}
-    host_dir = root.parent
-    for entry in parsed.get("include") or []:
-        include_path = entry if isinstance(entry, str) else (entry or {}).get("path", "")
-        if not include_path:
-            continue
-        path_obj = Path(include_path)
-        if len(path_obj.parts) < 2:
-            continue
-        group = path_obj.parts[-2]
-        full = host_dir / include_path
-        if not full.exists():
-            continue
-        for svc in parse_compose_services(full):
-            mapping[svc] = group
-    return mapping
+    return compose_index().service_to_group(root)
 
 
 def resolve_root_targets(
@@ -99,6 +83,31 @@ def resolve_root_targets(
     return [service_arg]
 
 
+def resolve_log_targets(host: str | None, args: list[str]) -> list[str]:
+    """Like `resolve_root_targets`, but every arg may be a group or a service.
+
+    `<group> <service>...` where each service belongs to the group keeps its
+    original meaning (those services only). Otherwise each arg is expanded on
+    its own — groups via `build_service_to_group_map` — so `traefik crowdsec
+    authelia` covers all three groups.
+    """
+    if not args:
+        return []
+    group_map = build_service_to_group_map(host)
+    groups: dict[str, list[str]] = {}
+    for svc, group in group_map.items():
+        groups.setdefault(group, []).append(svc)
+    first, rest = args[0], args[1:]
+    if not rest or (first in groups and all(group_map.get(a) == first for a in rest)):
+        return resolve_root_targets(host, first, rest)
+    services: list[str] = []
+    for arg in args:
+        for svc in groups.get(arg, [arg]):
+            if svc not in services:
+                services.append(svc)
+    return services
+
+
 def run_root_compose(
     host: str | None,
     action: str,
@@ -123,6 +132,75 @@ def run_root_compose(
         return 130
 
 
+def run_root_changed(host: str | None, services: list[str]) -> int:
+    """`up -d` only the services whose config hash differs from their containers'
+    (or that have no running container). Prints the plan first."""
+    root = get_root_compose(host)
+    if root is None:
+        print(f"{Colors.RED}Error: No root compose.yml at {get_host_dir(host)}{Colors.RESET}")
+        return 1
+
+    expected = drift.expected_hashes(root, services)
+    if expected is None:
+        print(f"{Colors.RED}Error: docker compose config failed for {root.relative_to(WORKSPACE_DIR)}{Colors.RESET}")
+        return 1
+    plan = drift.plan_drift(expected, drift.running_hashes(drift.project_name(root)))
+    drifted = [name for name, reason in plan.items() if reason != drift.UNCHANGED]
+    unchanged = len(plan) - len(drifted)
+
+    if not drifted:
+        print(f"{Colors.GREEN}Nothing changed{Colors.RESET} {Colors.GRAY}({unchanged} service(s) up to date){Colors.RESET}")
+        return 0
+    table = Table(["Service", "Change"])
+    colors = {drift.CHANGED: Colors.YELLOW, drift.MISSING: Colors.CYAN, drift.STOPPED: Colors.GRAY}
+    for name in drifted:
+        table.add_row([name, f"{colors[plan[name]]}{plan[name]}{Colors.RESET}"])
+    print(table.render())
+    if unchanged:
+        print(f"{Colors.GRAY}{unchanged} unchanged service(s) left alone{Colors.RESET}")
+    print()
+    return run_root_compose(host, "up", drifted, ["-d"])
+
+
+def run_root_rolling(host: str | None, services: list[str], batch: int, timeout: float) -> int:
+    """Recreate `services` `batch` at a time, waiting for each batch to be ready
+    (healthy, or running without a healthcheck, or exited 0 for one-shot
+    services) before the next. Aborts on the first failure."""
+    root = get_root_compose(host)
+    if root is None:
+        print(f"{Colors.RED}Error: No root compose.yml at {get_host_dir(host)}{Colors.RESET}")
+        return 1
+
+    order = rolling.rolling_order(root, services)
+    if not order:
+        print(f"{Colors.YELLOW}No services found{Colors.RESET}")
+        return 0
+    project = drift.project_name(root)
+    one_shot = rolling.one_shot_services(root, order)
+    steps = rolling.batches(order, batch)
+    for i, step in enumerate(steps, 1):
+        label = ", ".join(step)
+        print(f"\n{Colors.BOLD}[{i}/{len(steps)}] Recreating {label}...{Colors.RESET}")
+        result = run_root_compose(host, "up", step, ["-d", "--force-recreate", "--no-deps"])
+        if result != 0:
+            print(f"{Colors.RED}Rolling restart aborted: {label} failed to start{Colors.RESET}")
+            return result
+        try:
+            failure = rolling.wait_ready(project, step, timeout, one_shot=one_shot)
+        except KeyboardInterrupt:
+            print()
+            return 130
+        if failure:
+            print(f"{Colors.RED}Rolling restart aborted: {failure}{Colors.RESET}")
+            remaining = [name for later in steps[i:] for name in later]
+            if remaining:
+                print(f"{Colors.GRAY}Not restarted: {', '.join(remaining)}{Colors.RESET}")
+            return 1
+        print(f"{Colors.GREEN}✓ {label} ready{Colors.RESET}")
+    print(f"\n{Colors.GREEN}All services restarted{Colors.RESET}")
+    return 0
+
+
 # ---------------------------------------------------------------------------
 # Legacy-mode helpers (base + host layering, per-service iteration)
 # ---------------------------------------------------------------------------
@@ -192,32 +270,183 @@ def run_compose(
         return 130
 
 
+# ---------------------------------------------------------------------------
+# Legacy-mode parallel runner (`--parallel N`)
+# ---------------------------------------------------------------------------
+
+# One docker compose invocation: (action, extra_args).
+Step = tuple[str, list[str] | None]
+
+
+@dataclass
+class LegacyRun:
+    """Outcome of one service's steps, with its combined output buffered."""
+    service: str
+    returncode: int
+    duration: float
+    output: str = ""
+
+
+def run_compose_captured(service: str, steps: list[Step], host: str | None = None) -> LegacyRun:
+    """Run `steps` for one legacy service, capturing output; stops at the first failure."""
+    start = time.monotonic()
+    compose_files = get_compose_files(service, host)
+    if not compose_files:
+        message = f"{Colors.RED}Error: No compose.yml found for service '{service}'{Colors.RESET}"
+        return LegacyRun(service, 1, 0.0, message)
+
+    files_str = " + ".join(str(f.relative_to(WORKSPACE_DIR)) for f in compose_files)
+    chunks = [f"{Colors.GRAY}[{files_str}]{Colors.RESET}"]
+    returncode = 0
+    for action, extra_args in steps:
+        try:
+            proc = subprocess.run(
+                build_compose_command(compose_files, action, extra_args),
+                cwd=WORKSPACE_DIR,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                text=True,
+            )
+        except OSError as e:
+            chunks.append(f"{Colors.RED}Error: {e}{Colors.RESET}")
+            returncode = 1
+            break
+        if proc.stdout:
+            chunks.append(proc.stdout.rstrip("\n"))
+        returncode = proc.returncode
+        if returncode != 0:
+            break
+    return LegacyRun(service, returncode, time.monotonic() - start, "\n".join(chunks))
+
+
+def run_legacy_parallel(
+    services: list[str],
+    steps: list[Step],
+    host: str | None,
+    jobs: int,
+) -> list[LegacyRun] | None:
+    """Run `steps` for every service, `jobs` at a time.
+
+    Each service's output is printed as one block when it finishes (in
+    completion order). Returns the runs in input order, or None if
+    interrupted — queued services are then never started.
+    """
+    runs: dict[str, LegacyRun] = {}
+    pool = ThreadPoolExecutor(max_workers=max(1, min(jobs, len(services))))
+    pending = {pool.submit(run_compose_captured, name, steps, host) for name in services}
+    try:
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                run = future.result()
+                runs[run.service] = run
+                mark = f"{Colors.GREEN}✓" if run.returncode == 0 else f"{Colors.RED}✗"
+                print(f"\n{mark} {Colors.BOLD}{run.service}{Colors.RESET}")
+                if run.output:
+                    print(run.output)
+    except KeyboardInterrupt:
+        # Running `docker compose` children got the same SIGINT; drop the queue.
+        pool.shutdown(wait=True, cancel_futures=True)
+        print()
+        return None
+    pool.shutdown()
+    return [runs[name] for name in services]
+
+
+def _render_legacy_summary(runs: list[LegacyRun]) -> str:
+    table = Table(["Service", "Exit", "Duration"])
+    for run in runs:
+        color = Colors.GREEN if run.returncode == 0 else Colors.RED
+        table.add_row([run.service, f"{color}{run.returncode}{Colors.RESET}", f"{run.duration:.1f}s"])
+    return table.render()
+
+
+def legacy_waves(service_dirs: list[Path], host: str | None) -> list[list[str]]:
+    """Group names in dependency waves (see `kompose.schedule`)."""
+    return schedule.legacy_waves([d.name for d in service_dirs], lambda name: get_compose_files(name, host))
+
+
+def _legacy_all_parallel(
+    waves: list[list[str]],
+    steps: list[Step],
+    host: str | None,
+    jobs: int,
+    *,
+    failed_msg: str,
+    ok_msg: str,
+) -> int:
+    """Run `steps` wave by wave — a wave starts once the previous one is done,
+    services within a wave run `jobs` at a time."""
+    runs: list[LegacyRun] = []
+    for number, wave in enumerate(waves, 1):
+        if len(waves) > 1:
+            print(f"\n{Colors.GRAY}── wave {number}/{len(waves)}: {', '.join(wave)}{Colors.RESET}")
+        wave_runs = run_legacy_parallel(wave, steps, host, jobs)
+        if wave_runs is None:
+            return 130
+        runs.extend(wave_runs)
+    print()
+    print(_render_legacy_summary(runs))
+    failed = sum(1 for run in runs if run.returncode != 0)
+    if failed:
+        print(f"\n{Colors.RED}{failed} service(s) {failed_msg}{Colors.RESET}")
+        return 1
+    print(f"\n{Colors.GREEN}{ok_msg}{Colors.RESET}")
+    return 0
+
+
 # ---------------------------------------------------------------------------
 # Commands
 # ---------------------------------------------------------------------------
 
 
+def _note_parallel_unused(jobs: int) -> None:
+    """Say so when `-p` was given where it can't apply (root mode, outside
+    `--rolling`) rather than silently ignoring it."""
+    if jobs > 1:
+        print(
+            f"{Colors.GRAY}Note: -p/--parallel only applies to legacy mode and --rolling; root mode is "
+            f"a single docker compose call, which already parallelises the project.{Colors.RESET}"
+        )
+
+
 def cmd_up(args) -> int:
     """Start services."""
     host = getattr(args, "host", None)
     service = getattr(args, "service", None)
     containers = getattr(args, "containers", None) or None
+    jobs = getattr(args, "parallel", None) or 1
+    changed = getattr(args, "changed", False)
 
     if get_root_compose(host):
+        _note_parallel_unused(jobs)
         services = resolve_root_targets(host, service, containers)
+        if changed:
+            return run_root_changed(host, services)
         return run_root_compose(host, "up", services, ["-d"])
 
     # Legacy
+    if changed:
+        print(f"{Colors.RED}Error: --changed needs a root compose.yml (include model){Colors.RESET}")
+        return 1
     if service:
         return run_compose(service, "up", host, ["-d"], containers)
     services_dirs = get_services(host)
     if not services_dirs:
         print(f"{Colors.YELLOW}No services found{Colors.RESET}")
         return 0
+    # Dependencies first (see `kompose.schedule`).
+    waves = legacy_waves(services_dirs, host)
+    if jobs > 1:
+        return _legacy_all_parallel(
+            waves, [("up", ["-d"])], host, jobs,
+            failed_msg="failed to start", ok_msg="All services started",
+        )
     failed = 0
-    for service_dir in services_dirs:
-        print(f"\n{Colors.BOLD}{service_dir.name}{Colors.RESET}")
-        if run_compose(service_dir.name, "up", host, ["-d"]) != 0:
+    for name in (name for wave in waves for name in wave):
+        print(f"\n{Colors.BOLD}{name}{Colors.RESET}")
+        if run_compose(name, "up", host, ["-d"]) != 0:
             failed += 1
     if failed:
         print(f"\n{Colors.RED}{failed} service(s) failed to start{Colors.RESET}")
@@ -231,8 +460,10 @@ def cmd_down(args) -> int:
     host = getattr(args, "host", None)
     service = getattr(args, "service", None)
     containers = getattr(args, "containers", None) or None
+    jobs = getattr(args, "parallel", None) or 1
 
     if get_root_compose(host):
+        _note_parallel_unused(jobs)
         services = resolve_root_targets(host, service, containers)
         return run_root_compose(host, "down", services)
 
@@ -243,10 +474,17 @@ def cmd_down(args) -> int:
     if not services_dirs:
         print(f"{Colors.YELLOW}No services found{Colors.RESET}")
         return 0
+    # Dependents stop before what they depend on.
+    waves = legacy_waves(services_dirs, host)[::-1]
+    if jobs > 1:
+        return _legacy_all_parallel(
+            waves, [("down", None)], host, jobs,
+            failed_msg="failed to stop", ok_msg="All services stopped",
+        )
     failed = 0
-    for service_dir in services_dirs:
-        print(f"\n{Colors.BOLD}{service_dir.name}{Colors.RESET}")
-        if run_compose(service_dir.name, "down", host) != 0:
+    for name in (name for wave in waves for name in wave):
+        print(f"\n{Colors.BOLD}{name}{Colors.RESET}")
+        if run_compose(name, "down", host) != 0:
             failed += 1
     if failed:
         print(f"\n{Colors.RED}{failed} service(s) failed to stop{Colors.RESET}")
@@ -256,13 +494,19 @@ def cmd_down(args) -> int:
 
 
 def cmd_restart(args) -> int:
-    """Restart services (down + up)."""
+    """Restart services (down + up, or recreate in batches with --rolling)."""
     host = getattr(args, "host", None)
     service = getattr(args, "service", None)
     containers = getattr(args, "containers", None) or None
+    jobs = getattr(args, "parallel", None) or 1
+    roll = getattr(args, "rolling", False)
 
     if get_root_compose(host):
         services = resolve_root_targets(host, service, containers)
+        if roll:
+            timeout = getattr(args, "timeout", None) or rolling.DEFAULT_TIMEOUT
+            return run_root_rolling(host, services, jobs, timeout)
+        _note_parallel_unused(jobs)
         label = ", ".join(services) if services else "all"
         print(f"{Colors.BOLD}Stopping {label}...{Colors.RESET}")
         result = run_root_compose(host, "down", services)
@@ -272,6 +516,9 @@ def cmd_restart(args) -> int:
         return run_root_compose(host, "up", services, ["-d"])
 
     # Legacy
+    if roll:
+        print(f"{Colors.RED}Error: --rolling needs a root compose.yml (include model){Colors.RESET}")
+        return 1
     if service:
         print(f"{Colors.BOLD}Stopping {service}...{Colors.RESET}")
         result = run_compose(service, "down", host, containers=containers)
@@ -284,13 +531,20 @@ def cmd_restart(args) -> int:
     if not services_dirs:
         print(f"{Colors.YELLOW}No services found{Colors.RESET}")
         return 0
+    # Dependencies first (see `kompose.schedule`).
+    waves = legacy_waves(services_dirs, host)
+    if jobs > 1:
+        return _legacy_all_parallel(
+            waves, [("down", None), ("up", ["-d"])], host, jobs,
+            failed_msg="failed to restart", ok_msg="All services restarted",
+        )
     failed = 0
-    for service_dir in services_dirs:
-        print(f"\n{Colors.BOLD}Restarting {service_dir.name}...{Colors.RESET}")
-        if run_compose(service_dir.name, "down", host) != 0:
+    for name in (name for wave in waves for name in wave):
+        print(f"\n{Colors.BOLD}Restarting {name}...{Colors.RESET}")
+        if run_compose(name, "down", host) != 0:
             failed += 1
             continue
-        if run_compose(service_dir.name, "up", host, ["-d"]) != 0:
+        if run_compose(name, "up", host, ["-d"]) != 0:
             failed += 1
     if failed:
         print(f"\n{Colors.RED}{failed} service(s) failed to restart{Colors.RESET}")
@@ -300,24 +554,97 @@ def cmd_restart(args) -> int:
 
 
 def cmd_logs(args) -> int:
-    """View service logs."""
+    """View or search service logs.
+
+    Targets from a single group go to `docker compose logs`; targets spanning
+    several groups are merged by `logmux` (one reader per container).
+    `--grep` searches every targeted container (all of them without targets).
+    """
     host = getattr(args, "host", None)
     service = getattr(args, "service", None)
     containers = getattr(args, "containers", None) or None
     follow = getattr(args, "follow", True)
-    tail = getattr(args, "tail", "100")
-
-    if not service:
+    tail = getattr(args, "tail", None)
+    since = getattr(args, "since", None)
+    until = getattr(args, "until", None)
+    grep = getattr(args, "grep", None)
+    count = getattr(args, "count", False)
+
+    if count and grep is None:
+        print(f"{Colors.RED}Error: --count needs --grep PATTERN{Colors.RESET}")
+        return 1
+    if not service and grep is None:
         print(f"{Colors.RED}Error: Service name required for logs{Colors.RESET}")
         return 1
+    for flag, value in (("--since", since), ("--until", until)):
+        if value is None:
+            continue
+        try:
+            logmux.parse_time(value)
+        except ValueError:
+            print(f"{Colors.RED}Error: invalid {flag} value '{value}' (e.g. 10m, 2h30m, 2024-05-01T12:00:00){Colors.RESET}")
+            return 1
 
-    extra_args = ["--tail", str(tail)]
+    targets = [service, *(containers or [])] if service else []
+    root = get_root_compose(host)
+
+    if grep is not None:
+        try:
+            pattern = re.compile(grep)
+        except re.error as e:
+            print(f"{Colors.RED}Error: invalid --grep pattern: {e}{Colors.RESET}")
+            return 1
+        return logmux.grep_logs(
+            _log_selectors(host, root, targets), pattern,
+            tail=str(tail or "all"), since=since, until=until, count_only=count,
+        )
+
+    tail = str(tail or "100")
+    extra_args = ["--tail", tail]
     if follow:
         extra_args.append("-f")
-
-    if get_root_compose(host):
-        services = resolve_root_targets(host, service, containers)
+    if since:
+        extra_args.extend(["--since", since])
+    if until:
+        extra_args.extend(["--until", until])
+
+    if root:
+        services = resolve_log_targets(host, targets)
+        group_map = build_service_to_group_map(host)
+        if len({group_map.get(svc, svc) for svc in services}) > 1:
+            return logmux.stream_logs(
+                _log_selectors(host, root, targets), follow=follow, tail=tail, since=since, until=until,
+            )
         return run_root_compose(host, "logs", services, extra_args)
 
+    selectors = _log_selectors(host, None, targets)
+    if len({project for project, _ in selectors}) > 1:
+        return logmux.stream_logs(selectors, follow=follow, tail=tail, since=since, until=until)
     return run_compose(service, "logs", host, extra_args, containers)
 
+
+def _log_selectors(host: str | None, root: Path | None, targets: list[str]) -> list[logmux.Selector]:
+    """(project, service) selectors for `targets` — all containers when empty.
+
+    Root mode: one project, services via `resolve_log_targets`. Legacy: one
+    project per group, named after its directory; `<group> <containers...>`
+    narrows to those services, several group args select whole groups.
+    """
+    if root is not None:
+        project = drift.project_name(root)
+        services = resolve_log_targets(host, targets)
+        return [(project, svc) for svc in services] or [(project, None)]
+
+    normalize = drift.normalize_project_name
+    if not targets:
+        return [(normalize(d.name), None) for d in get_services(host)]
+    group, rest = targets[0], targets[1:]
+    if not rest:
+        return [(normalize(group), None)]
+    if set(rest) <= _legacy_services(group, host) or not all(get_compose_files(t, host) for t in targets):
+        return [(normalize(group), svc) for svc in rest]
+    return [(normalize(t), None) for t in targets]
+
+
+def _legacy_services(group: str, host: str | None) -> set[str]:
+    return {svc for f in get_compose_files(group, host) for svc in parse_compose_services(f)}
@@ -0,0 +1,170 @@
+"""Line-level concrete syntax tree for compose files.
+
+Just enough structure for the `property_order` rule: the `services:` block,
+each service header, and each property of a service with the exact line
+span it owns — comments and blank lines included, nothing normalised. The
+check reads property names/lines from it and the fix permutes the property
+spans and renders the lines back, so both agree on what a "property" is by
+construction.
+
+Parsing is a single pass over the lines. Conventions (same as the original
+text heuristics):
+
+  - `services:` is a top-level key (column 0); its block ends at the next
+    non-comment line in column 0.
+  - Service headers sit at the indent of the first `name:` child line.
+  - Properties sit at the indent of the first `key:` line of the service.
+  - Blank lines and comments at or above the property indent lead the
+    *next* property (they move with it); deeper ones stay with the current
+    property's value. Those after the last property are the service's
+    trailer and never move.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+
+
+@dataclass
+class PropertyNode:
+    name: str
+    line: int     # 1-based line number of the `key:` line
+    start: int    # 0-based index of the first line owned (leading comments included)
+    end: int      # exclusive
+
+
+@dataclass
+class ServiceNode:
+    name: str
+    line: int                 # 1-based line number of the header
+    body_start: int           # 0-based index of the first line after the header
+    body_end: int             # exclusive
+    properties: list[PropertyNode] = field(default_factory=list)
+
+    @property
+    def prop_start(self) -> int:
+        """First line owned by a property (lines before it are left alone)."""
+        return self.properties[0].start if self.properties else self.body_end
+
+    @property
+    def prop_end(self) -> int:
+        """End of the last property's span; the trailer runs from here to `body_end`."""
+        return self.properties[-1].end if self.properties else self.body_end
+
+
+@dataclass
+class ComposeCST:
+    lines: list[str]
+    services: list[ServiceNode] = field(default_factory=list)
+
+    def render(self, order: dict[int, list[PropertyNode]] | None = None) -> str:
+        """The file text, with each service in `order` (keyed by its index in
+        `services`) re-emitted in the given property order — a permutation of
+        that service's `properties`."""
+        if not order:
+            return "\n".join(self.lines)
+        out: list[str] = []
+        cursor = 0
+        for index, svc in enumerate(self.services):
+            props = order.get(index)
+            if props is None or not svc.properties:
+                continue
+            out.extend(self.lines[cursor:svc.prop_start])
+            for prop in props:
+                out.extend(self.lines[prop.start:prop.end])
+            cursor = svc.prop_end
+        out.extend(self.lines[cursor:])
+        return "\n".join(out)
+
+
+def _split(line: str) -> tuple[str, int]:
+    stripped = line.lstrip()
+    return stripped, len(line) - len(stripped)
+
+
+def _is_key(stripped: str) -> bool:
+    return ":" in stripped and not stripped.startswith("-") and not stripped.startswith("#")
+
+
+def parse_compose(content: str) -> ComposeCST:
+    """Build the CST for `content` in one pass over its lines."""
+    lines = content.split("\n")
+    cst = ComposeCST(lines)
+
+    in_services = False
+    service_indent: int | None = None
+    svc: ServiceNode | None = None
+    prop_indent: int | None = None
+    prop: PropertyNode | None = None
+    pending: int | None = None   # first index of blank/comment lines not yet owned
+
+    def close_service(end: int) -> None:
+        nonlocal svc, prop, pending
+        if svc is None:
+            return
+        if prop is not None:
+            prop.end = pending if pending is not None else end
+        svc.body_end = end
+        svc, prop, pending = None, None, None
+
+    for i, line in enumerate(lines):
+        stripped, indent = _split(line)
+        blank_or_comment = not stripped or stripped.startswith("#")
+
+        if not in_services:
+            if indent == 0 and stripped.startswith("services:"):
+                in_services = True
+            continue
+
+        if not blank_or_comment and indent == 0:
+            close_service(i)
+            in_services = False
+            if stripped.startswith("services:"):
+                in_services = True
+            continue
+
+        if blank_or_comment:
+            if svc is None:
+                continue
+            if stripped and prop is not None and prop_indent is not None and indent > prop_indent:
+                # Comment inside a value block: stays with the current property,
+                # along with any blank lines just before it.
+                pending = None
+                continue
+            if pending is None:
+                pending = i
+            continue
+
+        if service_indent is None and stripped.endswith(":") and _is_key(stripped):
+            service_indent = indent
+
+        if indent == service_indent and stripped.endswith(":") and _is_key(stripped):
+            close_service(i)
+            svc = ServiceNode(stripped.rstrip(":").strip(), i + 1, i + 1, len(lines))
+            cst.services.append(svc)
+            prop_indent = None
+            continue
+
+        if svc is None:
+            continue
+
+        if prop_indent is None and indent > service_indent and _is_key(stripped):
+            prop_indent = indent
+
+        if indent == prop_indent and _is_key(stripped):
+            if prop is not None:
+                prop.end = pending if pending is not None else i
+            start = pending if pending is not None else i
+            prop = PropertyNode(stripped.split(":")[0].strip(), i + 1, start, len(lines))
+            svc.properties.append(prop)
+            pending = None
+            continue
+
+        # Value line of the current property: interior blanks/comments stay put.
+        pending = None
+
+    close_service(len(lines))
+    return cst
+
+
+__all__ = ["ComposeCST", "PropertyNode", "ServiceNode", "parse_compose"]
@@ -0,0 +1,165 @@
+"""Per-process index of compose files — each compose.yml is read and parsed once.
+
+Many commands end up looking at the same files several times: `upgrade
+<service>` resolves a group, then walks the root `include:` map, then reads
+the group again for its image; `doctor` checks every action against its
+group's services; lint reads each compose.yml and the root compose per rule.
+`ComposeIndex` keeps one `ComposeDoc` per path, keyed on `(mtime_ns, size)`
+so an edit made during the run (a `kompose fix`, the user's editor) is picked
+up on the next access. Parsing is lazy: a doc only runs `yaml.safe_load` the
+first time something reads `.data`.
+
+Parsed structures are shared between callers — treat them as read-only.
+Code that rewrites a compose file calls `forget(path)` so a same-size edit
+within the filesystem's timestamp granularity can't be served stale.
+"""
+
+from __future__ import annotations
+
+import threading
+from pathlib import Path
+
+import yaml
+
+
+class ComposeDoc:
+    """One compose file: its raw text, plus the YAML parsed on first access."""
+
+    __slots__ = ("path", "content", "_data")
+
+    def __init__(self, path: Path, content: str):
+        self.path = path
+        self.content = content
+        self._data: dict | None = None
+
+    @property
+    def parsed(self) -> bool:
+        """Whether `.data` has been computed yet."""
+        return self._data is not None
+
+    @property
+    def data(self) -> dict:
+        """The parsed document; `{}` on YAML errors or a non-mapping top level."""
+        if self._data is None:
+            try:
+                parsed = yaml.safe_load(self.content) or {}
+            except yaml.YAMLError:
+                parsed = {}
+            self._data = parsed if isinstance(parsed, dict) else {}
+        return self._data
+
+    @property
+    def services(self) -> dict:
+        services = self.data.get("services")
+        return services if isinstance(services, dict) else {}
+
+    def includes(self) -> list[tuple[str, str]]:
+        """`[(group_dir, include_path), ...]` for each `include:` entry (root compose)."""
+        out: list[tuple[str, str]] = []
+        entries = self.data.get("include") or []
+        if not isinstance(entries, list):
+            return out
+        for entry in entries:
+            path_str = entry if isinstance(entry, str) else (entry or {}).get("path", "")
+            if not path_str or not isinstance(path_str, str):
+                continue
+            parts = Path(path_str).parts
+            if len(parts) >= 2:
+                out.append((parts[-2], path_str))
+        return out
+
+
+class ComposeIndex:
+    """Path → `ComposeDoc` cache, plus the derived lookups kompose needs."""
+
+    def __init__(self):
+        self._docs: dict[Path, tuple[tuple[int, int], ComposeDoc]] = {}
+        self._lock = threading.Lock()
+
+    def doc(self, path: Path) -> ComposeDoc | None:
+        """The document at `path`, or None if it doesn't exist / can't be read."""
+        try:
+            st = path.stat()
+        except OSError:
+            return None
+        stamp = (st.st_mtime_ns, st.st_size)
+        with self._lock:
+            cached = self._docs.get(path)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+        try:
+            content = path.read_text()
+        except (OSError, UnicodeDecodeError):
+            return None
+        doc = ComposeDoc(path, content)
+        with self._lock:
+            self._docs[path] = (stamp, doc)
+        return doc
+
+    def forget(self, path: Path) -> None:
+        """Drop `path` from the index (call after rewriting the file)."""
+        with self._lock:
+            self._docs.pop(path, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._docs.clear()
+
+    # -- derived lookups ---------------------------------------------------
+
+    def services(self, path: Path) -> dict:
+        """The `services:` mapping of `path`, or `{}`."""
+        doc = self.doc(path)
+        return doc.services if doc else {}
+
+    def service_names(self, path: Path) -> list[str]:
+        return list(self.services(path).keys())
+
+    def includes(self, root_path: Path) -> list[tuple[str, str]]:
+        doc = self.doc(root_path)
+        return doc.includes() if doc else []
+
+    def service_to_group(self, root_path: Path) -> dict[str, str]:
+        """Docker compose service name → group dir, via the root compose's includes."""
+        mapping: dict[str, str] = {}
+        host_dir = root_path.parent
+        for group, include_path in self.includes(root_path):
+            for svc in self.service_names(host_dir / include_path):
+                mapping[svc] = group
+        return mapping
+
+    def images(self, path: Path) -> dict[str, object]:
+        """Service name → raw `image:` value (None for build-only services)."""
+        return {
+            name: svc.get("image") if isinstance(svc, dict) else None
+            for name, svc in self.services(path).items()
+        }
+
+    def networks(self, path: Path, service: str) -> dict[str, dict]:
+        """A service's networks as `{name: settings}` (list form → empty settings)."""
+        svc = self.services(path).get(service)
+        networks = svc.get("networks") if isinstance(svc, dict) else None
+        if isinstance(networks, list):
+            return {str(name): {} for name in networks}
+        if isinstance(networks, dict):
+            return {name: conf if isinstance(conf, dict) else {} for name, conf in networks.items()}
+        return {}
+
+    def ipv4_addresses(self, path: Path, service: str) -> dict[str, str]:
+        """Network name → fixed `ipv4_address` for one service (networks without one omitted)."""
+        return {
+            name: conf["ipv4_address"]
+            for name, conf in self.networks(path, service).items()
+            if conf.get("ipv4_address")
+        }
+
+
+_index = ComposeIndex()
+
+
+def compose_index() -> ComposeIndex:
+    """The process-wide index."""
+    return _index
+
+
+__all__ = ["ComposeDoc", "ComposeIndex", "compose_index"]
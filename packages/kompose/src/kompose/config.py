@@ -37,6 +37,18 @@ def _xdg_config_home() -> Path:
     return Path(raw) if raw else Path.home() / ".config"
 
 
+def _xdg_cache_home() -> Path:
+    """Honour `$XDG_CACHE_HOME`; default to `~/.cache` per the XDG spec."""
+    raw = os.environ.get("XDG_CACHE_HOME")
+    return Path(raw) if raw else Path.home() / ".cache"
+
+
+def _xdg_state_home() -> Path:
+    """Honour `$XDG_STATE_HOME`; default to `~/.local/state` per the XDG spec."""
+    raw = os.environ.get("XDG_STATE_HOME")
+    return Path(raw) if raw else Path.home() / ".local" / "state"
+
+
 def _config_file_path() -> Path:
     return _xdg_config_home() / "kompose" / "config.yaml"
 
@@ -83,6 +95,16 @@ def get_base_dir() -> Path:
     return WORKSPACE_DIR / "base"
 
 
+def get_cache_dir() -> Path:
+    """Directory for disposable caches (`$XDG_CACHE_HOME/kompose`). Not created here."""
+    return _xdg_cache_home() / "kompose"
+
+
+def get_state_dir() -> Path:
+    """Directory for data worth keeping across runs (`$XDG_STATE_HOME/kompose`). Not created here."""
+    return _xdg_state_home() / "kompose"
+
+
 def get_services(host: str | None = None) -> list[Path]:
     """Get all service directories for a host."""
     host_dir = get_host_dir(host)
@@ -0,0 +1,403 @@
+"""Minimal Docker Engine API client over the local unix socket.
+
+Every read path used to spawn the `docker` CLI, paying 50–150 ms of Go binary
+startup before any real work. This module talks HTTP/1.1 to
+`/var/run/docker.sock` directly (stdlib only — `http.client` over an AF_UNIX
+socket) and keeps one keep-alive connection per thread, so a status frame that
+needs `ps` + `network inspect` + N `stats` costs a handful of socket round
+trips instead of N+2 process spawns.
+
+Scope is deliberately small — only the endpoints kompose reads:
+
+  - `list_containers`   GET  /containers/json
+  - `inspect_container` GET  /containers/{id}/json
+  - `inspect_network`   GET  /networks/{name}
+  - `inspect_image`     GET  /images/{name}/json
+  - `stats`             GET  /containers/{id}/stats?stream=false
+  - `logs`              GET  /containers/{id}/logs (demuxed line iterator)
+  - `events`            GET  /events (one JSON document per line)
+
+`get_client()` returns the shared client, or None when the socket isn't
+reachable (`DOCKER_HOST=tcp://…`, no daemon) or when a docker context other
+than `default` is selected — via `DOCKER_CONTEXT` or the CLI config's
+`currentContext` — since that context's endpoint is only known to the CLI.
+Callers keep their `docker` CLI path as the fallback for that case and for
+any `DockerError` raised mid-flight.
+"""
+
+from __future__ import annotations
+
+import codecs
+import http.client
+import json
+import os
+import socket
+import threading
+import urllib.parse
+from datetime import datetime
+from typing import Iterator
+
+DEFAULT_SOCKET = "/var/run/docker.sock"
+_DEFAULT_TIMEOUT = 10.0
+
+# Multiplexed stream header: [stream_type, 0, 0, 0, size (uint32 BE)].
+# stream_type is 0 (stdin), 1 (stdout) or 2 (stderr).
+_FRAME_HEADER_LEN = 8
+_FRAME_STREAM_TYPES = (0, 1, 2)
+
+
+class DockerError(Exception):
+    """Raised for any API failure — transport error or non-2xx response.
+
+    `status` is the HTTP status code, or 0 when the request never got a
+    response (socket missing, connection reset, malformed payload).
+    """
+
+    def __init__(self, message: str, status: int = 0):
+        super().__init__(message)
+        self.status = status
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    """`http.client.HTTPConnection` that dials an AF_UNIX socket."""
+
+    def __init__(self, socket_path: str, timeout: float | None = _DEFAULT_TIMEOUT):
+        # The Host header is ignored by dockerd, but HTTP/1.1 requires one.
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self) -> None:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        sock.connect(self.socket_path)
+        self.sock = sock
+
+
+def _encode_filters(filters: dict[str, list[str]] | None) -> str | None:
+    return json.dumps(filters) if filters else None
+
+
+def _to_timestamp(value: datetime | float | int | str | None) -> str | None:
+    """Render a `since` / `until` value the way the API expects (UNIX seconds)."""
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return f"{value.timestamp():.9f}"
+    if isinstance(value, (int, float)):
+        return f"{float(value):.9f}"
+    return str(value)
+
+
+class LogStream:
+    """Iterable of decoded log lines backed by a dedicated API connection.
+
+    Handles both wire formats: the 8-byte-framed multiplexed stream (non-TTY
+    containers — stdout and stderr interleaved) and the raw stream (TTY
+    containers). Lines are yielded without their trailing newline. `close()`
+    is safe to call from another thread to unblock a `follow=True` reader.
+    """
+
+    def __init__(self, conn: http.client.HTTPConnection, response: http.client.HTTPResponse):
+        self._conn = conn
+        self._response = response
+        self._closed = False
+
+    def __iter__(self) -> Iterator[str]:
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        pending = ""
+        try:
+            for chunk in self._chunks():
+                pending += decoder.decode(chunk)
+                *complete, pending = pending.split("\n")
+                for line in complete:
+                    yield line.rstrip("\r")
+            pending += decoder.decode(b"", final=True)
+            if pending:
+                yield pending.rstrip("\r")
+        except (OSError, http.client.HTTPException, ValueError):
+            # Closed from another thread, or the daemon went away — end of stream.
+            return
+
+    def _chunks(self) -> Iterator[bytes]:
+        head = self._read_exact(_FRAME_HEADER_LEN)
+        if not head:
+            return
+        if not _looks_multiplexed(head):
+            yield head
+            while True:
+                chunk = self._response.read1(65536)
+                if not chunk:
+                    return
+                yield chunk
+        while head:
+            size = int.from_bytes(head[4:8], "big")
+            payload = self._read_exact(size)
+            if payload:
+                yield payload
+            head = self._read_exact(_FRAME_HEADER_LEN)
+
+    def _read_exact(self, size: int) -> bytes:
+        buf = b""
+        while len(buf) < size:
+            chunk = self._response.read(size - len(buf))
+            if not chunk:
+                break
+            buf += chunk
+        return buf
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        # Shutting the socket down (not just closing the file object) is what
+        # unblocks a reader parked in recv() on another thread.
+        sock = self._conn.sock
+        if sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        self._conn.close()
+
+    def __enter__(self) -> "LogStream":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def _looks_multiplexed(head: bytes) -> bool:
+    return len(head) == _FRAME_HEADER_LEN and head[0] in _FRAME_STREAM_TYPES and head[1:4] == b"\x00\x00\x00"
+
+
+class DockerClient:
+    """Thin HTTP client for the Docker Engine API on a unix socket.
+
+    Regular requests reuse one keep-alive connection per thread (callers fan
+    out with `ThreadPoolExecutor`, and `http.client` connections aren't
+    thread-safe). Streaming endpoints (`logs`, exec output) get a dedicated
+    connection owned by the returned stream.
+    """
+
+    def __init__(self, socket_path: str = DEFAULT_SOCKET, timeout: float = _DEFAULT_TIMEOUT):
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self._local = threading.local()
+
+    # -- transport ---------------------------------------------------------
+
+    def _connection(self) -> http.client.HTTPConnection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = _UnixHTTPConnection(self.socket_path, timeout=self.timeout)
+            self._local.conn = conn
+        return conn
+
+    def _drop_connection(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+        self._local.conn = None
+
+    @staticmethod
+    def _url(path: str, params: dict | None) -> str:
+        query = {k: v for k, v in (params or {}).items() if v is not None}
+        return f"{path}?{urllib.parse.urlencode(query)}" if query else path
+
+    def _request(self, method: str, path: str, params: dict | None = None, body: dict | None = None) -> bytes:
+        url = self._url(path, params)
+        payload = json.dumps(body).encode() if body is not None else None
+        headers = {"Content-Type": "application/json"} if payload is not None else {}
+        # One retry: a keep-alive connection the daemon closed while idle only
+        # surfaces as an error on the next request.
+        for attempt in (0, 1):
+            conn = self._connection()
+            try:
+                conn.request(method, url, body=payload, headers=headers)
+                response = conn.getresponse()
+                data = response.read()
+            except (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError) as e:
+                self._drop_connection()
+                if attempt == 0:
+                    continue
+                raise DockerError(f"{method} {path}: {e}") from e
+            except (OSError, http.client.HTTPException) as e:
+                self._drop_connection()
+                raise DockerError(f"{method} {path}: {e}") from e
+            if response.will_close:
+                self._drop_connection()
+            if not 200 <= response.status < 300:
+                raise DockerError(_error_message(method, path, response.status, data), status=response.status)
+            return data
+        raise DockerError(f"{method} {path}: connection lost")
+
+    def _json(self, method: str, path: str, params: dict | None = None, body: dict | None = None):
+        data = self._request(method, path, params, body)
+        if not data:
+            return None
+        try:
+            return json.loads(data)
+        except json.JSONDecodeError as e:
+            raise DockerError(f"{method} {path}: invalid JSON response ({e})") from e
+
+    def _stream(self, method: str, path: str, params: dict | None = None, body: dict | None = None,
+                timeout: float | None = None) -> LogStream:
+        conn = _UnixHTTPConnection(self.socket_path, timeout=timeout)
+        payload = json.dumps(body).encode() if body is not None else None
+        headers = {"Content-Type": "application/json"} if payload is not None else {}
+        try:
+            conn.request(method, self._url(path, params), body=payload, headers=headers)
+            response = conn.getresponse()
+        except (OSError, http.client.HTTPException) as e:
+            conn.close()
+            raise DockerError(f"{method} {path}: {e}") from e
+        if not 200 <= response.status < 300:
+            data = response.read()
+            conn.close()
+            raise DockerError(_error_message(method, path, response.status, data), status=response.status)
+        return LogStream(conn, response)
+
+    def close(self) -> None:
+        self._drop_connection()
+
+    # -- endpoints ---------------------------------------------------------
+
+    def ping(self) -> bool:
+        try:
+            return self._request("GET", "/_ping") == b"OK"
+        except DockerError:
+            return False
+
+    def list_containers(self, *, all: bool = False, filters: dict[str, list[str]] | None = None) -> list[dict]:
+        params = {"all": "1" if all else None, "filters": _encode_filters(filters)}
+        return self._json("GET", "/containers/json", params) or []
+
+    def inspect_container(self, container: str) -> dict:
+        return self._json("GET", f"/containers/{urllib.parse.quote(container)}/json") or {}
+
+    def inspect_network(self, network: str) -> dict:
+        return self._json("GET", f"/networks/{urllib.parse.quote(network)}") or {}
+
+    def inspect_image(self, image: str) -> dict:
+        return self._json("GET", f"/images/{urllib.parse.quote(image)}/json") or {}
+
+    def stats(self, container: str) -> dict:
+        """One stats sample. The daemon takes two readings (~1s) so `precpu_stats` is populated."""
+        return self._json("GET", f"/containers/{urllib.parse.quote(container)}/stats", {"stream": "false"}) or {}
+
+    def logs(
+        self,
+        container: str,
+        *,
+        follow: bool = False,
+        since: datetime | float | int | str | None = None,
+        until: datetime | float | int | str | None = None,
+        tail: int | str | None = None,
+        timestamps: bool = False,
+    ) -> LogStream:
+        """Stream a container's stdout+stderr. `follow=True` blocks until `close()`."""
+        params = {
+            "stdout": "1",
+            "stderr": "1",
+            "follow": "1" if follow else None,
+            "since": _to_timestamp(since),
+            "until": _to_timestamp(until),
+            "tail": str(tail) if tail is not None else None,
+            "timestamps": "1" if timestamps else None,
+        }
+        # No socket timeout when following: the stream legitimately idles.
+        return self._stream(
+            "GET", f"/containers/{urllib.parse.quote(container)}/logs", params,
+            timeout=None if follow else self.timeout,
+        )
+
+    def events(
+        self,
+        *,
+        since: datetime | float | int | str | None = None,
+        filters: dict[str, list[str]] | None = None,
+    ) -> LogStream:
+        """Follow the daemon's event feed. Each line is one JSON event; blocks until `close()`."""
+        params = {"since": _to_timestamp(since), "filters": _encode_filters(filters)}
+        return self._stream("GET", "/events", params, timeout=None)
+
+
+def _error_message(method: str, path: str, status: int, data: bytes) -> str:
+    detail = data.decode("utf-8", errors="replace").strip()
+    try:
+        detail = json.loads(detail).get("message", detail)
+    except (json.JSONDecodeError, AttributeError):
+        pass
+    return f"{method} {path}: HTTP {status}" + (f" — {detail}" if detail else "")
+
+
+# ---------------------------------------------------------------------------
+# Shared client
+# ---------------------------------------------------------------------------
+
+
+_client: DockerClient | None = None
+_client_lock = threading.Lock()
+
+
+def _docker_context() -> str:
+    """The docker context the CLI would use: `DOCKER_CONTEXT`, else the
+    `currentContext` of `$DOCKER_CONFIG/config.json` ("" when unset)."""
+    context = os.environ.get("DOCKER_CONTEXT", "")
+    if context:
+        return context
+    config_dir = os.environ.get("DOCKER_CONFIG") or os.path.join(os.path.expanduser("~"), ".docker")
+    try:
+        with open(os.path.join(config_dir, "config.json")) as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return ""
+    context = data.get("currentContext") if isinstance(data, dict) else None
+    return context if isinstance(context, str) else ""
+
+
+def _socket_path() -> str | None:
+    """Resolve the daemon socket from `DOCKER_HOST` or the docker context.
+
+    None for non-unix hosts and for any context but `default`.
+    """
+    docker_host = os.environ.get("DOCKER_HOST", "")
+    if not docker_host:
+        if _docker_context() not in ("", "default"):
+            return None  # e.g. Docker Desktop / rootless / ssh — the CLI resolves those
+        return DEFAULT_SOCKET
+    if docker_host.startswith("unix://"):
+        return docker_host[len("unix://"):]
+    return None  # tcp:// / ssh:// — leave those to the CLI and its contexts
+
+
+def get_client() -> DockerClient | None:
+    """Return the process-wide client, or None if the socket isn't usable."""
+    global _client
+    with _client_lock:
+        if _client is not None:
+            return _client
+        path = _socket_path()
+        if not path or not os.path.exists(path) or not os.access(path, os.R_OK | os.W_OK):
+            return None
+        _client = DockerClient(path)
+        return _client
+
+
+def reset_client() -> None:
+    """Drop the shared client (tests, or after `DOCKER_HOST` / the context changes)."""
+    global _client
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+        _client = None
+
+
+__all__ = [
+    "DEFAULT_SOCKET",
+    "DockerClient",
+    "DockerError",
+    "LogStream",
+    "get_client",
+    "reset_client",
+]
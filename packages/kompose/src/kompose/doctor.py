@@ -15,8 +15,6 @@ import importlib
 from dataclasses import dataclass
 from pathlib import Path
 
-import yaml
-
 from . import config
 from ._engine import (
     SEVERITY_ERROR,
@@ -25,6 +23,7 @@ from ._engine import (
     load_rules,
 )
 from .commands import load_commands
+from .compose_index import compose_index
 from .config import get_host_dir
 from .utils import Colors
 
@@ -127,12 +126,7 @@ def check_rules_yaml(host: str | None = None) -> list[DoctorFinding]:
 
 def _compose_containers(compose_path: Path) -> set[str]:
     """Return the set of container/service names declared in a compose.yml."""
-    try:
-        parsed = yaml.safe_load(compose_path.read_text()) or {}
-    except (OSError, yaml.YAMLError):
-        return set()
-    services = parsed.get("services") or {}
-    return set(services.keys()) if isinstance(services, dict) else set()
+    return set(compose_index().service_names(compose_path))
 
 
 def check_commands_yaml(host: str | None = None) -> list[DoctorFinding]:
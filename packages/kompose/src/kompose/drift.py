@@ -0,0 +1,154 @@
+"""Config drift for `kompose up --changed` (root mode).
+
+docker compose stamps every container it creates with
+`com.docker.compose.config-hash`, a hash of the service's effective config
+(after includes, env interpolation and defaults). `docker compose config
+--hash` prints the same hash for the current files, so comparing the two
+tells which services a `git pull` actually changed — without reimplementing
+compose's normalisation here.
+
+`expected_hashes()` is one `docker compose config --hash` call for the whole
+project; `running_hashes()` is one bulk container list (Engine API, else
+`docker ps`). `plan_drift()` classifies each service; only the drifted ones
+are passed to `up -d`.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import subprocess
+from dataclasses import dataclass
+from pathlib import Path
+
+from .compose_index import compose_index
+from .docker import DockerError, get_client
+
+PROJECT_LABEL = "com.docker.compose.project"
+SERVICE_LABEL = "com.docker.compose.service"
+CONFIG_HASH_LABEL = "com.docker.compose.config-hash"
+ONEOFF_LABEL = "com.docker.compose.oneoff"
+
+# Plan reasons. Anything but UNCHANGED gets `up -d`.
+CHANGED = "config changed"
+MISSING = "not created"
+STOPPED = "stopped"
+UNCHANGED = "unchanged"
+
+_STOPPED_STATES = {"created", "exited", "dead"}
+
+
+@dataclass
+class ContainerHash:
+    service: str
+    config_hash: str
+    state: str
+
+
+def normalize_project_name(name: str) -> str:
+    """docker compose's project-name normalisation (lowercase, [a-z0-9_-] only)."""
+    return re.sub(r"[^a-z0-9_-]", "", name.lower())
+
+
+def project_name(root: Path) -> str:
+    """The compose project name for `root`, resolved the way docker compose does:
+    `COMPOSE_PROJECT_NAME`, else the top-level `name:`, else the directory name."""
+    name = os.environ.get("COMPOSE_PROJECT_NAME")
+    if not name:
+        doc = compose_index().doc(root)
+        declared = doc.data.get("name") if doc is not None else None
+        name = declared if isinstance(declared, str) and declared else root.parent.name
+    return normalize_project_name(name)
+
+
+def parse_hash_output(output: str) -> dict[str, str]:
+    """`docker compose config --hash` prints one `<service> <hash>` per line."""
+    hashes: dict[str, str] = {}
+    for line in output.splitlines():
+        parts = line.split()
+        if len(parts) == 2:
+            hashes[parts[0]] = parts[1]
+    return hashes
+
+
+def expected_hashes(root: Path, services: list[str] | None = None) -> dict[str, str] | None:
+    """Config hash of each service as currently defined (all services when `services`
+    is empty). None if docker compose can't render the project."""
+    selector = ",".join(services) if services else "*"
+    cmd = ["docker", "compose", "-f", str(root), "config", "--hash", selector]
+    try:
+        result = subprocess.run(cmd, cwd=root.parent, capture_output=True, text=True)
+    except OSError:
+        return None
+    if result.returncode != 0:
+        return None
+    return parse_hash_output(result.stdout)
+
+
+def running_hashes(project: str) -> list[ContainerHash]:
+    """Hash labels of the project's containers (one-off `run` containers excluded)."""
+    client = get_client()
+    if client is not None:
+        try:
+            raw = client.list_containers(all=True, filters={"label": [f"{PROJECT_LABEL}={project}"]})
+            return [
+                ContainerHash(labels.get(SERVICE_LABEL, ""), labels.get(CONFIG_HASH_LABEL, ""), c.get("State", ""))
+                for c in raw
+                for labels in [c.get("Labels") or {}]
+                if labels.get(ONEOFF_LABEL, "False") != "True"
+            ]
+        except DockerError:
+            pass
+
+    fmt = "\t".join(
+        f'{{{{.Label "{label}"}}}}' for label in (SERVICE_LABEL, CONFIG_HASH_LABEL, ONEOFF_LABEL)
+    ) + "\t{{.State}}"
+    cmd = ["docker", "ps", "-a", "--filter", f"label={PROJECT_LABEL}={project}", "--format", fmt]
+    try:
+        result = subprocess.run(cmd, capture_output=True, text=True)
+    except OSError:
+        return []
+    if result.returncode != 0:
+        return []
+    containers = []
+    for line in result.stdout.splitlines():
+        parts = line.split("\t")
+        if len(parts) != 4 or parts[2] == "True":
+            continue
+        containers.append(ContainerHash(parts[0], parts[1], parts[3]))
+    return containers
+
+
+def plan_drift(expected: dict[str, str], running: list[ContainerHash]) -> dict[str, str]:
+    """service → reason, for every service in `expected` (sorted by name)."""
+    by_service: dict[str, list[ContainerHash]] = {}
+    for container in running:
+        by_service.setdefault(container.service, []).append(container)
+
+    plan: dict[str, str] = {}
+    for service in sorted(expected):
+        containers = by_service.get(service)
+        if not containers:
+            plan[service] = MISSING
+        elif any(c.config_hash != expected[service] for c in containers):
+            plan[service] = CHANGED
+        elif any(c.state in _STOPPED_STATES for c in containers):
+            plan[service] = STOPPED
+        else:
+            plan[service] = UNCHANGED
+    return plan
+
+
+__all__ = [
+    "CHANGED",
+    "ContainerHash",
+    "MISSING",
+    "STOPPED",
+    "UNCHANGED",
+    "expected_hashes",
+    "normalize_project_name",
+    "parse_hash_output",
+    "plan_drift",
+    "project_name",
+    "running_hashes",
+]
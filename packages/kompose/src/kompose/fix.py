@@ -1,8 +1,14 @@
 """Fix command — orchestrates rule auto-fixes and delegates to env fix.
 
 For each service, every rule that defines a `fix()` hook is invoked once.
-The env-drift workflow (`cmd_env_fix`) is then chained at the end, since
-its interactivity model doesn't fit the per-service hook pattern.
+Fixers stage their output in a shared `FixWorkspace`, so each sees the
+fixes before it. After each fix the rule's check is re-run against the
+staged content: a fix that cleared none of its rule's issues (or introduced
+new ones) is rolled back, and whatever the rule still reports is listed.
+Every touched file is then written once, atomically (nothing is written
+under --dry-run). The env-drift workflow (`cmd_env_fix`) is then chained
+at the end, since its interactivity model doesn't fit the per-service hook
+pattern.
 
 Scope flags (mutually exclusive):
   --auto    Only run compose-level rule fixes; skip the interactive env sync.
@@ -17,20 +23,31 @@ Other flags:
 
 from __future__ import annotations
 
+from collections import Counter
+from dataclasses import dataclass
 from pathlib import Path
 
-import yaml
-
 from ._engine import (
+    CompiledRule,
     FixApplied,
+    Issue,
     LintContext,
     RuleSpec,
     load_rules,
-    run_fix,
 )
 from .config import get_host_dir, get_services
 from .env import cmd_env_fix
 from .utils import Colors
+from .workspace import FixWorkspace
+
+
+@dataclass
+class Unresolved:
+    """Issues a rule still reports for a service after its fix ran."""
+    spec: RuleSpec
+    service: str
+    issues: list[Issue]
+    reverted: list[FixApplied]   # the fix's changes, rolled back (empty when kept)
 
 
 def cmd_fix(args) -> int:
@@ -52,6 +69,7 @@ def cmd_fix(args) -> int:
 
     try:
         globals_dict, rules = load_rules(host)
+        rules.compile()
     except (FileNotFoundError, ValueError) as e:
         print(f"{Colors.RED}Error: {e}{Colors.RESET}")
         return 1
@@ -65,45 +83,86 @@ def cmd_fix(args) -> int:
     else:
         services = get_services(host)
 
+    workspace = FixWorkspace()
     fixes: list[tuple[RuleSpec, FixApplied]] = []
+    unresolved: list[Unresolved] = []
     for service_dir in services:
         compose_path = service_dir / "compose.yml"
-        if not compose_path.exists():
+        if not workspace.exists(compose_path):
             continue
-        ctx = _build_ctx(service_dir, compose_path, globals_dict)
-        for spec in rules:
-            for applied in run_fix(spec, ctx, force=force, dry_run=dry_run):
-                fixes.append((spec, applied))
+        for rule in rules.compiled:
+            if rule.fix is None:
+                continue
+            applied, left = _fix_and_recheck(rule, service_dir, compose_path, globals_dict, workspace, force=force)
+            fixes.extend((rule.spec, a) for a in applied)
+            if left is not None:
+                unresolved.append(left)
+
+    if not dry_run:
+        try:
+            workspace.commit()
+        except OSError as e:
+            print(f"{Colors.RED}Error: could not write fixes: {e}{Colors.RESET}")
+            return 1
 
     _render_fixes(fixes, dry_run=dry_run)
+    _render_unresolved(unresolved, dry_run=dry_run)
+    code = 1 if any(u.reverted for u in unresolved) else 0
 
     # --auto stops here; default flow continues into the env interactive workflow.
     if auto_only:
-        return 0
+        return code
 
     if dry_run:
         print(f"\n{Colors.GRAY}(dry-run: skipping interactive env fix){Colors.RESET}")
-        return 0
+        return code
 
-    if fixes:
+    if fixes or unresolved:
         print()  # spacer before the env section
     print(f"{Colors.BOLD}Running env fix…{Colors.RESET}")
-    return cmd_env_fix(args)
+    return cmd_env_fix(args) or code
+
+
+def _fix_and_recheck(
+    rule: CompiledRule,
+    service_dir: Path,
+    compose_path: Path,
+    globals_dict: dict,
+    workspace: FixWorkspace,
+    *,
+    force: bool,
+) -> tuple[list[FixApplied], Unresolved | None]:
+    """Run one rule's fix on one service, then its check on the staged result.
+
+    Issues are compared by message (locations move when a fix rewrites the
+    file). The fix is kept if it cleared at least one issue without adding
+    any; otherwise its staged writes are rolled back. Returns the kept
+    fixes and, if the rule still reports anything, what is left.
+    """
+    # Fresh context per step so each one sees the fixes staged before it.
+    before = rule.run(_build_ctx(service_dir, compose_path, globals_dict, workspace))
+    checkpoint = workspace.checkpoint()
+    applied = rule.run_fix(_build_ctx(service_dir, compose_path, globals_dict, workspace), force=force)
+    if not applied:
+        return [], None
+    after = rule.run(_build_ctx(service_dir, compose_path, globals_dict, workspace))
+
+    old, new = Counter(i.message for i in before), Counter(i.message for i in after)
+    if old - new and not new - old:
+        kept, reverted = applied, []
+    else:
+        workspace.rollback(checkpoint)
+        kept, reverted = [], applied
+    if not after and not reverted:
+        return kept, None
+    return kept, Unresolved(rule.spec, service_dir.name, after, reverted)
 
 
-def _build_ctx(service_dir: Path, compose_path: Path, globals_dict: dict) -> LintContext:
-    content = compose_path.read_text()
-    try:
-        parsed = yaml.safe_load(content) or {}
-    except yaml.YAMLError:
-        parsed = {}
-    return LintContext(
-        service_name=service_dir.name,
-        compose_path=compose_path,
-        content=content,
-        parsed=parsed,
-        globals=dict(globals_dict),
-    )
+def _build_ctx(service_dir: Path, compose_path: Path, globals_dict: dict, workspace: FixWorkspace) -> LintContext:
+    doc = workspace.doc(compose_path)
+    if doc is None:
+        raise FileNotFoundError(compose_path)
+    return LintContext.from_doc(service_dir.name, doc, globals_dict, workspace=workspace)
 
 
 def _render_fixes(fixes: list[tuple[RuleSpec, FixApplied]], *, dry_run: bool) -> None:
@@ -119,3 +178,19 @@ def _render_fixes(fixes: list[tuple[RuleSpec, FixApplied]], *, dry_run: bool) ->
     for spec, applied in fixes:
         location = f" {Colors.GRAY}{applied.target}{Colors.RESET}" if applied.target else ""
         print(f"  {color}{glyph}{Colors.RESET} {Colors.CYAN}{spec.name}{Colors.RESET}:{location} {applied.message}")
+
+
+def _render_unresolved(unresolved: list[Unresolved], *, dry_run: bool) -> None:
+    if not unresolved:
+        return
+    print(f"\n{Colors.BOLD}Still reported after fixing:{Colors.RESET}")
+    for item in unresolved:
+        name = f"{Colors.CYAN}{item.spec.name}{Colors.RESET}"
+        if item.reverted:
+            verb = "would not be applied" if dry_run else "not applied"
+            what = "; ".join(a.message for a in item.reverted)
+            print(f"  {Colors.RED}✗{Colors.RESET} {name}: {item.service}: fix {verb}, "
+                  f"it did not clear the rule's issues ({what})")
+        for issue in item.issues:
+            location = f" {Colors.GRAY}{issue.location}{Colors.RESET}" if issue.location else ""
+            print(f"  {Colors.YELLOW}!{Colors.RESET} {name}: {item.service}:{location} {issue.message}")
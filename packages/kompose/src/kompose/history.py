@@ -0,0 +1,234 @@
+"""Upgrade history — every watchtower session kompose has seen, kept locally.
+
+Watchtower's own logs only go back as far as the container's log retention,
+and `kompose upgrade --logs` can only reconstruct the latest session. Each
+completed session parsed from a live `kompose upgrade` tail or from `--logs`
+is appended to `$XDG_STATE_HOME/kompose/upgrade-history.jsonl`, one JSON
+record per session. `kompose upgrade --history [service]` answers from there
+without touching the container logs.
+
+A small side index (`upgrade-history.idx.json`) holds the session ids
+already stored (seeing the same session again is a no-op) and, per image,
+the byte offsets of the records that updated it, so a per-image timeline
+reads only those lines. The index is derived data: when it is missing or
+out of step with the JSONL (another process appended, the file was
+truncated), it is rebuilt from the JSONL.
+"""
+
+from __future__ import annotations
+
+import fcntl
+import json
+import os
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Iterable
+
+from .config import get_state_dir
+
+HISTORY_FILE = "upgrade-history.jsonl"
+INDEX_FILE = "upgrade-history.idx.json"
+_FORMAT = 1
+
+
+@dataclass
+class ImageUpdate:
+    image: str
+    container: str
+    time: str | None = None
+    duration: float | None = None   # first event naming the image → last naming its container
+
+
+@dataclass
+class Session:
+    id: str                         # end-marker timestamp, canonical UTC form
+    host: str
+    started: str | None
+    finished: str
+    duration: float | None
+    scanned: int
+    updated: int
+    failed: int
+    updates: list[ImageUpdate] = field(default_factory=list)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Session":
+        updates = [ImageUpdate(**u) for u in data.get("updates", [])]
+        return cls(**{**data, "updates": updates})
+
+
+def normalize_image(ref: str) -> str:
+    """`nginx` / `docker.io/library/nginx:latest` → `nginx:latest`."""
+    ref = ref.strip().strip('"')
+    for prefix in ("docker.io/", "index.docker.io/"):
+        if ref.startswith(prefix):
+            ref = ref[len(prefix):]
+    if ref.startswith("library/"):
+        ref = ref[len("library/"):]
+    if "@" not in ref and ":" not in ref.rsplit("/", 1)[-1]:
+        ref += ":latest"
+    return ref
+
+
+class UpgradeHistory:
+    """Append-only session log plus its id / per-image offset index."""
+
+    def __init__(self, directory: Path | None = None):
+        directory = directory or get_state_dir()
+        self.path = directory / HISTORY_FILE
+        self.index_path = directory / INDEX_FILE
+        self._index: dict | None = None
+
+    # -- index -------------------------------------------------------------
+
+    def _empty_index(self) -> dict:
+        return {"format": _FORMAT, "size": 0, "ids": [], "images": {}}
+
+    def _load_index(self) -> dict:
+        if self._index is not None:
+            return self._index
+        try:
+            index = json.loads(self.index_path.read_text())
+        except (OSError, ValueError):
+            index = None
+        if not isinstance(index, dict) or index.get("format") != _FORMAT:
+            index = self._empty_index()
+        try:
+            size = self.path.stat().st_size
+        except FileNotFoundError:
+            size = 0
+        if size < index.get("size", 0):
+            index = self._empty_index()  # truncated / replaced: start over
+        if size > index["size"]:
+            self._scan(index, index["size"])
+            self._save_index(index)
+        self._index = index
+        return index
+
+    def _scan(self, index: dict, offset: int) -> None:
+        """Index the records from `offset` to the end of the JSONL."""
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            for raw in iter(f.readline, b""):
+                if raw.endswith(b"\n"):
+                    self._index_record(index, offset, raw)
+                    offset += len(raw)
+                else:
+                    break  # partial last line (writer died mid-append): leave it out
+        index["size"] = offset
+
+    @staticmethod
+    def _index_record(index: dict, offset: int, raw: bytes) -> None:
+        try:
+            data = json.loads(raw)
+        except ValueError:
+            return
+        if not isinstance(data, dict) or "id" not in data:
+            return
+        index["ids"].append(f"{data.get('host')}|{data['id']}")
+        for update in data.get("updates", []):
+            offsets = index["images"].setdefault(update.get("image", ""), [])
+            if offset not in offsets:
+                offsets.append(offset)
+
+    def _save_index(self, index: dict) -> None:
+        tmp = self.index_path.with_name(f".{self.index_path.name}.{os.getpid()}.tmp")
+        try:
+            self.index_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp.write_text(json.dumps(index))
+            os.replace(tmp, self.index_path)
+        except OSError:
+            tmp.unlink(missing_ok=True)
+
+    # -- write -------------------------------------------------------------
+
+    def record(self, sessions: Iterable[Session]) -> int:
+        """Append the sessions not stored yet. Returns how many were new.
+
+        The JSONL is locked while appending, and the index caught up with
+        whatever other processes appended first, so two kompose runs
+        seeing the same session store it once."""
+        index = self._load_index()
+        pending = [s for s in sessions if f"{s.host}|{s.id}" not in set(index["ids"])]
+        if not pending:
+            return 0
+        added = 0
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "ab") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)  # released when the file closes
+            f.seek(0, os.SEEK_END)
+            if f.tell() != index["size"]:
+                self._scan(index, index["size"])  # someone else appended meanwhile
+                if f.tell() != index["size"]:
+                    # A writer died mid-line: terminate it so ours starts clean.
+                    f.write(b"\n")
+                    f.flush()
+                    self._scan(index, index["size"])
+            known = set(index["ids"])
+            for session in pending:
+                key = f"{session.host}|{session.id}"
+                if key in known:
+                    continue
+                raw = (json.dumps(asdict(session), separators=(",", ":")) + "\n").encode()
+                offset = f.tell()
+                f.write(raw)
+                self._index_record(index, offset, raw)
+                index["size"] = offset + len(raw)
+                known.add(key)
+                added += 1
+        if added:
+            self._save_index(index)
+        return added
+
+    # -- read --------------------------------------------------------------
+
+    def _read_at(self, offsets: Iterable[int]) -> list[Session]:
+        sessions: list[Session] = []
+        try:
+            with open(self.path, "rb") as f:
+                for offset in sorted(set(offsets)):
+                    f.seek(offset)
+                    try:
+                        sessions.append(Session.from_dict(json.loads(f.readline())))
+                    except (ValueError, TypeError):
+                        continue
+        except FileNotFoundError:
+            pass
+        return sessions
+
+    def sessions(self, host: str | None = None) -> list[Session]:
+        """Every stored session (oldest first), optionally for one host."""
+        sessions: list[Session] = []
+        try:
+            with open(self.path, "rb") as f:
+                for raw in f:
+                    try:
+                        sessions.append(Session.from_dict(json.loads(raw)))
+                    except (ValueError, TypeError):
+                        continue
+        except FileNotFoundError:
+            return []
+        return [s for s in sessions if host is None or s.host == host]
+
+    def timeline(self, images: Iterable[str], host: str | None = None) -> list[tuple[Session, ImageUpdate]]:
+        """(session, update) for each stored update of `images`, oldest first.
+        Only the records the index points at are read."""
+        wanted = {normalize_image(image) for image in images}
+        index = self._load_index()
+        offsets = [o for image in wanted for o in index["images"].get(image, [])]
+        rows = [
+            (session, update)
+            for session in self._read_at(offsets)
+            if host is None or session.host == host
+            for update in session.updates
+            if update.image in wanted
+        ]
+        return sorted(rows, key=lambda row: row[1].time or row[0].finished)
+
+
+__all__ = [
+    "ImageUpdate",
+    "Session",
+    "UpgradeHistory",
+    "normalize_image",
+]
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import os
 from pathlib import Path
 
 from ._engine import (
@@ -10,12 +11,11 @@ from ._engine import (
     Issue,
     RuleSpec,
     ServiceLintResult,
-    lint_service,
+    lint_services,
     load_rules,
-    resolve_fix,
-    run_notices,
 )
 from .config import get_host_dir, get_services
+from .lint_cache import LintCache
 from .utils import Colors, Table
 
 
@@ -90,6 +90,7 @@ def cmd_check(args) -> int:
 
     try:
         globals_dict, rules = load_rules(host)
+        rules.compile()
     except (FileNotFoundError, ValueError) as e:
         print(f"{Colors.RED}Error: {e}{Colors.RESET}")
         print(f"{Colors.GRAY}Hint: run `kompose doctor --rules` for a structured report.{Colors.RESET}")
@@ -104,10 +105,17 @@ def cmd_check(args) -> int:
     else:
         services = get_services(host)
 
-    results: list[ServiceLintResult] = []
-    for service_dir in services:
-        if (service_dir / "compose.yml").exists():
-            results.append(lint_service(service_dir, rules, globals_dict))
+    jobs = getattr(args, "jobs", None) or os.cpu_count() or 1
+    cache = None if getattr(args, "no_cache", False) else LintCache(rules, globals_dict)
+    results: list[ServiceLintResult] = lint_services(
+        [d for d in services if (d / "compose.yml").exists()],
+        rules,
+        globals_dict,
+        jobs=jobs,
+        cache=cache,
+    )
+    if cache is not None:
+        cache.save()
 
     categories = _categories(rules)
     table = Table(["Service", *[c.capitalize() for c in categories]])
@@ -136,8 +144,9 @@ def cmd_check(args) -> int:
     notices_by_rule: list[tuple[RuleSpec, list[Issue]]] = []
     notice_errors = 0
     notice_warnings = 0
-    for spec in rules:
-        issues = run_notices(spec, host_dir, notice_services)
+    for rule in rules.compiled:
+        spec = rule.spec
+        issues = rule.run_notices(host_dir, notice_services)
         if issues:
             notices_by_rule.append((spec, issues))
             if spec.severity == SEVERITY_ERROR:
@@ -154,7 +163,7 @@ def cmd_check(args) -> int:
     failed_services = sum(1 for r in results if r.has_errors)
 
     # Count issues whose rule advertises a fix() — surfaced as a footer hint.
-    fixable_rules = {spec.name for spec in rules if resolve_fix(spec) is not None}
+    fixable_rules = rules.fixable
     fixable_count = 0
     for r in results:
         for rr in r.rule_results:
@@ -164,9 +173,16 @@ def cmd_check(args) -> int:
         if spec.name in fixable_rules:
             fixable_count += len(issues)
 
+    cache_line = (
+        f"{Colors.GRAY}cache: {cache.hits} hit(s), {cache.misses} miss(es){Colors.RESET}"
+        if cache is not None else ""
+    )
+
     print()
     if total_errors == 0 and total_warnings == 0:
         print(f"{Colors.GREEN}All {len(results)} services passed{Colors.RESET}")
+        if cache_line:
+            print(cache_line)
         return 0
     if total_errors == 0:
         print(f"{Colors.YELLOW}{total_warnings} warning(s){Colors.RESET}")
@@ -183,5 +199,7 @@ def cmd_check(args) -> int:
 
     if fixable_count:
         print(f"{Colors.GRAY}→ {fixable_count} auto-fixable. Run `kompose fix` to apply.{Colors.RESET}")
+    if cache_line:
+        print(cache_line)
 
     return 0 if total_errors == 0 else 1
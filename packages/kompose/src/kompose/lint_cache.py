@@ -0,0 +1,142 @@
+"""Persistent lint cache — skip services whose inputs haven't changed.
+
+Most `kompose check` runs follow an edit to a single service, so re-linting
+every group is wasted work. Each service's per-rule issues are stored in
+`$XDG_CACHE_HOME/kompose/lint.json` under a key derived from:
+
+  - the kompose version (handler code changes between releases),
+  - the ruleset (every `RuleSpec` + `globals:`, serialised canonically),
+  - the content of the service's compose.yml,
+  - the content of every extra file a rule declares via its `inputs()` hook
+    (e.g. `env_check` → `.env` / `.env.example`, `compose_includes_sync` →
+    the root compose).
+
+Any mismatch is a miss and the service is linted normally. The cache is a
+plain JSON file: deleting it (or `--no-cache`) is always safe.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from dataclasses import asdict
+from pathlib import Path
+from typing import Sequence
+
+from . import __version__
+from ._engine import Issue, RuleSpec, as_plan
+from .config import get_cache_dir
+
+CACHE_FILE = "lint.json"
+_FORMAT = 1
+_MISSING = "missing"
+
+
+def _file_digest(path: Path) -> str:
+    try:
+        return hashlib.sha256(path.read_bytes()).hexdigest()
+    except FileNotFoundError:
+        return _MISSING
+    except OSError:
+        # Unreadable (permissions, a directory): hash the error class so the
+        # entry still invalidates once the file becomes readable.
+        return "unreadable"
+
+
+def ruleset_digest(rules: Sequence[RuleSpec], globals_dict: dict) -> str:
+    """Stable hash of the rule specs + globals (any edit to .kompose/ changes it)."""
+    payload = json.dumps(
+        {"rules": [asdict(spec) for spec in rules], "globals": globals_dict},
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class LintCache:
+    """Lookup / store of per-service issue lists, persisted by `save()`.
+
+    Counts `hits` and `misses` for the `kompose check` footer.
+    """
+
+    def __init__(self, rules: Sequence[RuleSpec], globals_dict: dict, path: Path | None = None):
+        self.path = path or get_cache_dir() / CACHE_FILE
+        self.rules = as_plan(rules)
+        self.hits = 0
+        self.misses = 0
+        self._ruleset = ruleset_digest(rules, globals_dict)
+        self._entries = self._load()
+        self._pending: dict[str, str] = {}
+        self._dirty = False
+
+    def _load(self) -> dict:
+        try:
+            data = json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(data, dict) or data.get("format") != _FORMAT:
+            return {}
+        entries = data.get("entries")
+        return entries if isinstance(entries, dict) else {}
+
+    def key(self, service_dir: Path) -> str:
+        digest = hashlib.sha256()
+        digest.update(__version__.encode())
+        digest.update(self._ruleset.encode())
+        paths = {service_dir / "compose.yml"}
+        for rule in self.rules.compiled:
+            paths.update(rule.inputs_for(service_dir))
+        for path in sorted(paths):
+            digest.update(f"\0{path}\0{_file_digest(path)}".encode())
+        return digest.hexdigest()
+
+    def lookup(self, service_dir: Path) -> list[list[Issue]] | None:
+        """Cached per-rule issues for `service_dir`, or None on a miss."""
+        slot = str(service_dir.resolve())
+        key = self.key(service_dir)
+        entry = self._entries.get(slot)
+        if (
+            isinstance(entry, dict)
+            and entry.get("key") == key
+            and isinstance(entry.get("issues"), list)
+            and len(entry["issues"]) == len(self.rules)
+        ):
+            try:
+                cached = [[Issue(**issue) for issue in per_rule] for per_rule in entry["issues"]]
+            except TypeError:
+                cached = None
+            if cached is not None:
+                self.hits += 1
+                return cached
+        self.misses += 1
+        # Store under the key computed *before* linting: if a file changes
+        # mid-run, the next run sees a different key and re-lints.
+        self._pending[slot] = key
+        return None
+
+    def store(self, service_dir: Path, issues: list[list[Issue]]) -> None:
+        slot = str(service_dir.resolve())
+        key = self._pending.pop(slot, None) or self.key(service_dir)
+        self._entries[slot] = {
+            "key": key,
+            "issues": [[asdict(issue) for issue in per_rule] for per_rule in issues],
+        }
+        self._dirty = True
+
+    def save(self) -> None:
+        """Write the cache atomically. Failures are ignored — it's only a cache."""
+        if not self._dirty:
+            return
+        tmp = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp.write_text(json.dumps({"format": _FORMAT, "entries": self._entries}))
+            os.replace(tmp, self.path)
+        except OSError:
+            tmp.unlink(missing_ok=True)
+            return
+        self._dirty = False
+
+
+__all__ = ["CACHE_FILE", "LintCache", "ruleset_digest"]
@@ -0,0 +1,480 @@
+"""Multiplexed log streamer and search for `kompose logs` across several groups.
+
+`docker compose logs` only covers one project invocation, so following
+`traefik` + `crowdsec` + `authelia` from different groups (or different
+legacy projects) used to mean one terminal each. Here every matching
+container gets its own reader thread (Engine API log stream, else
+`docker logs`), always with timestamps, and the main thread merges the
+readers' lines by timestamp into one stream with a colored
+`<container> |` prefix.
+
+Each reader feeds a bounded queue: a chatty container blocks on its own
+full queue instead of growing memory or crowding out the others, and the
+merge always emits the oldest buffered line across all readers.
+
+Merging is exact for bounded reads (no `--follow`): a line is emitted only
+once every reader has a line buffered or has finished. When following, a
+quiet container would stall that forever, so a buffered line is also
+released once it has waited `FOLLOW_WINDOW` seconds.
+
+`grep_logs()` (`--grep`) reads the same per-container streams concurrently
+on a thread pool, matching each line against one precompiled regex as it
+arrives, and keeps only the hits.
+"""
+
+from __future__ import annotations
+
+import queue
+import re
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from functools import partial
+from typing import Callable, Iterable, Iterator
+
+from .docker import DockerError, get_client
+from .drift import ONEOFF_LABEL, PROJECT_LABEL, SERVICE_LABEL
+from .utils import Colors, Table
+
+QUEUE_SIZE = 256
+FOLLOW_WINDOW = 0.25
+
+# (compose project, compose service or None for every service of the project)
+Selector = tuple[str, str | None]
+
+_DURATION_RE = re.compile(r"(\d+(?:\.\d+)?)(ms|s|m|h)")
+_DURATIONS_RE = re.compile(r"(?:\d+(?:\.\d+)?(?:ms|s|m|h))+")
+_DURATION_UNITS = {"ms": 0.001, "s": 1, "m": 60, "h": 3600}
+_EOF = object()
+
+
+def parse_time(value: str) -> datetime | float:
+    """`--since` / `--until` value → what the Engine API accepts.
+
+    Same forms as `docker logs`: a relative duration (`10m`, `1h30m`), a
+    UNIX timestamp, or an RFC 3339 date/time. Raises ValueError otherwise.
+    """
+    text = value.strip()
+    if _DURATIONS_RE.fullmatch(text):
+        seconds = sum(float(n) * _DURATION_UNITS[unit] for n, unit in _DURATION_RE.findall(text))
+        return datetime.now(timezone.utc) - timedelta(seconds=seconds)
+    try:
+        return float(text)
+    except ValueError:
+        pass
+    parsed = datetime.fromisoformat(text.replace("Z", "+00:00"))
+    return parsed if parsed.tzinfo else parsed.astimezone()
+
+
+def sort_key(timestamp: str) -> str:
+    """RFC3339Nano drops trailing zeros from the fraction; pad it so keys
+    compare lexicographically in time order."""
+    base, _, frac = timestamp.rstrip("Z").partition(".")
+    return f"{base}.{frac.ljust(9, '0')}"
+
+
+@dataclass
+class LogSource:
+    name: str
+    id: str
+
+
+def find_containers(selectors: Iterable[Selector]) -> list[LogSource]:
+    """Containers matching any selector, from one bulk list (sorted by name)."""
+    wanted = list(selectors)
+    rows: list[tuple[str, str, str, str, str]] = []  # (project, service, oneoff, name, id)
+    client = get_client()
+    listed = False
+    if client is not None:
+        try:
+            for c in client.list_containers(all=True, filters={"label": [PROJECT_LABEL]}):
+                labels = c.get("Labels") or {}
+                rows.append((
+                    labels.get(PROJECT_LABEL, ""), labels.get(SERVICE_LABEL, ""),
+                    labels.get(ONEOFF_LABEL, "False"),
+                    ((c.get("Names") or [""])[0]).lstrip("/"), c.get("Id", ""),
+                ))
+            listed = True
+        except DockerError:
+            rows = []
+    if not listed:
+        fmt = "\t".join(
+            [f'{{{{.Label "{label}"}}}}' for label in (PROJECT_LABEL, SERVICE_LABEL, ONEOFF_LABEL)]
+            + ["{{.Names}}", "{{.ID}}"]
+        )
+        try:
+            result = subprocess.run(
+                ["docker", "ps", "-a", "--filter", f"label={PROJECT_LABEL}", "--format", fmt],
+                capture_output=True, text=True,
+            )
+        except OSError:
+            return []
+        if result.returncode != 0:
+            return []
+        rows = [tuple(line.split("\t")) for line in result.stdout.splitlines() if line.count("\t") == 4]
+
+    sources = [
+        LogSource(name, cid)
+        for project, service, oneoff, name, cid in rows
+        if oneoff != "True" and any(p == project and s in (None, service) for p, s in wanted)
+    ]
+    return sorted(sources, key=lambda s: s.name)
+
+
+def open_log(
+    source: LogSource,
+    *,
+    follow: bool,
+    tail: str,
+    since: str | None = None,
+    until: str | None = None,
+) -> tuple[Iterable[str], Callable[[], None]]:
+    """`(lines, close)` for one container's timestamped logs — an Engine API
+    stream when the socket is reachable, else a `docker logs` process. Lines
+    are read lazily; `close()` is safe to call from another thread."""
+    client = get_client()
+    if client is not None:
+        try:
+            stream = client.logs(
+                source.id, follow=follow, tail=tail, timestamps=True,
+                since=parse_time(since) if since else None,
+                until=parse_time(until) if until else None,
+            )
+            return stream, stream.close
+        except DockerError:
+            pass
+    cmd = ["docker", "logs", "--timestamps", "--tail", str(tail)]
+    if follow:
+        cmd.append("-f")
+    if since:
+        cmd.extend(["--since", since])
+    if until:
+        cmd.extend(["--until", until])
+    cmd.append(source.id)
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, bufsize=1)
+
+    def close() -> None:
+        try:
+            proc.terminate()
+            proc.wait(timeout=2)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+        except Exception:
+            pass
+
+    return (line.rstrip("\n") for line in proc.stdout), close
+
+
+def split_timestamp(line: str) -> tuple[str | None, str]:
+    """`(timestamp, text)` of a `--timestamps` log line; timestamp is None if absent."""
+    timestamp, sep, text = line.partition(" ")
+    if sep and timestamp[:4].isdigit() and "T" in timestamp:
+        return timestamp, text
+    return None, line
+
+
+class LogReader:
+    """One container's log lines, pushed as `(sort_key, line)` into a bounded queue."""
+
+    def __init__(
+        self,
+        source: LogSource,
+        *,
+        follow: bool,
+        tail: str,
+        since: str | None,
+        until: str | None,
+        maxsize: int = QUEUE_SIZE,
+    ):
+        self.source = source
+        self.follow = follow
+        self.tail = tail
+        self.since = since
+        self.until = until
+        self.queue: queue.Queue = queue.Queue(maxsize=maxsize)
+        self._stop = threading.Event()
+        self._close: Callable[[], None] | None = None
+        self._thread: threading.Thread | None = None
+
+    def start(self, wake: threading.Event | None = None) -> None:
+        self._thread = threading.Thread(target=self._run, args=(wake,), daemon=True)
+        self._thread.start()
+
+    def _lines(self) -> Iterable[str]:
+        lines, self._close = open_log(
+            self.source, follow=self.follow, tail=self.tail, since=self.since, until=self.until,
+        )
+        return lines
+
+    def _put(self, item, wake: threading.Event | None) -> bool:
+        while not self._stop.is_set():
+            try:
+                self.queue.put(item, timeout=0.1)
+            except queue.Full:
+                continue
+            if wake is not None:
+                wake.set()
+            return True
+        return False
+
+    def _run(self, wake: threading.Event | None) -> None:
+        last = ""
+        try:
+            for line in self._lines():
+                timestamp, text = split_timestamp(line)
+                if timestamp is not None:
+                    last = sort_key(timestamp)  # else: keep the previous line's key
+                if not self._put((last, text), wake):
+                    return
+        except Exception:
+            pass
+        finally:
+            self._put(_EOF, wake)
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._close is not None:
+            self._close()
+            self._close = None
+
+
+def merge(
+    readers: list,
+    *,
+    window: float | None = None,
+    wake: threading.Event | None = None,
+    clock=time.monotonic,
+) -> Iterator[tuple[object, str]]:
+    """Yield `(reader, line)` in timestamp order across `readers`' queues.
+
+    `window=None` waits for every live reader before emitting (exact order);
+    a number releases a buffered line after it has waited that long.
+    """
+    wake = wake or threading.Event()
+    live = set(range(len(readers)))
+    heads: dict[int, tuple[str, str, float]] = {}  # reader index → (key, line, arrived)
+    while live or heads:
+        wake.clear()
+        now = clock()
+        for i in sorted(live - heads.keys()):
+            try:
+                item = readers[i].queue.get_nowait()
+            except queue.Empty:
+                continue
+            if item is _EOF:
+                live.discard(i)
+            else:
+                heads[i] = (item[0], item[1], now)
+
+        if heads:
+            i = min(heads, key=lambda k: (heads[k][0], k))
+            _, line, arrived = heads[i]
+            starving = bool(live - heads.keys())
+            if not starving or (window is not None and clock() - arrived >= window):
+                del heads[i]
+                yield readers[i], line
+                continue
+        elif not live:
+            break
+        wake.wait(timeout=window if window is not None else 0.1)
+
+
+_PREFIX_COLORS = ("CYAN", "YELLOW", "GREEN", "BLUE", "GRAY")
+
+
+def stream_logs(
+    selectors: list[Selector],
+    *,
+    follow: bool,
+    tail: str,
+    since: str | None = None,
+    until: str | None = None,
+) -> int:
+    """Follow/print every matching container's logs as one merged stream."""
+    sources = find_containers(selectors)
+    if not sources:
+        print(f"{Colors.YELLOW}No containers found{Colors.RESET}")
+        return 1
+
+    width = max(len(s.name) for s in sources)
+    readers = [LogReader(s, follow=follow, tail=tail, since=since, until=until) for s in sources]
+    prefixes = {
+        id(r): f"{getattr(Colors, _PREFIX_COLORS[i % len(_PREFIX_COLORS)])}{r.source.name.ljust(width)} |{Colors.RESET}"
+        for i, r in enumerate(readers)
+    }
+    wake = threading.Event()
+    for reader in readers:
+        reader.start(wake)
+    try:
+        for reader, line in merge(readers, window=FOLLOW_WINDOW if follow else None, wake=wake):
+            print(f"{prefixes[id(reader)]} {line}", flush=True)
+    except KeyboardInterrupt:
+        print()
+        return 130
+    finally:
+        for reader in readers:
+            reader.stop()
+    return 0
+
+
+# ---------------------------------------------------------------------------
+# Search (`kompose logs --grep`)
+# ---------------------------------------------------------------------------
+
+GREP_JOBS = 8
+
+
+@dataclass
+class GrepResult:
+    source: LogSource
+    count: int = 0
+    matches: list[tuple[str | None, str]] = field(default_factory=list)  # (timestamp, text)
+    error: str | None = None
+
+
+class _OpenLogs:
+    """`close()` callbacks of the logs a search is reading, so an interrupt
+    can close them all from the main thread. Once closed, new ones are
+    refused."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._closers: list[Callable[[], None]] = []
+        self.closed = False
+
+    def add(self, close: Callable[[], None]) -> bool:
+        with self._lock:
+            if not self.closed:
+                self._closers.append(close)
+            return not self.closed
+
+    def discard(self, close: Callable[[], None]) -> None:
+        with self._lock:
+            if close in self._closers:
+                self._closers.remove(close)
+
+    def close_all(self) -> None:
+        with self._lock:
+            self.closed = True
+            closers, self._closers = self._closers, []
+        for close in closers:
+            close()
+
+
+def grep_source(
+    source: LogSource,
+    pattern: re.Pattern,
+    *,
+    tail: str = "all",
+    since: str | None = None,
+    until: str | None = None,
+    keep_lines: bool = True,
+    open_logs: _OpenLogs | None = None,
+) -> GrepResult:
+    """Stream one container's logs through `pattern`. Only matching lines are
+    kept (none with `keep_lines=False`), so memory is bounded by the hits.
+    The stream is registered in `open_logs` while it's being read."""
+    result = GrepResult(source)
+    try:
+        lines, close = open_log(source, follow=False, tail=tail, since=since, until=until)
+    except OSError as e:
+        result.error = str(e)
+        return result
+    if open_logs is not None and not open_logs.add(close):
+        close()  # the search was interrupted while this one was opening
+        return result
+    try:
+        for line in lines:
+            timestamp, text = split_timestamp(line)
+            if pattern.search(text):
+                result.count += 1
+                if keep_lines:
+                    result.matches.append((timestamp, text))
+    finally:
+        if open_logs is not None:
+            open_logs.discard(close)
+        close()
+    return result
+
+
+def grep_logs(
+    selectors: list[Selector],
+    pattern: re.Pattern,
+    *,
+    tail: str = "all",
+    since: str | None = None,
+    until: str | None = None,
+    count_only: bool = False,
+    jobs: int = GREP_JOBS,
+) -> int:
+    """Search every matching container's logs concurrently. Prints the hits
+    grouped by container (or just the counts). Returns 0 if anything matched."""
+    sources = find_containers(selectors)
+    if not sources:
+        print(f"{Colors.YELLOW}No containers found{Colors.RESET}")
+        return 1
+
+    open_logs = _OpenLogs()
+    search = partial(
+        grep_source, pattern=pattern, tail=tail, since=since, until=until,
+        keep_lines=not count_only, open_logs=open_logs,
+    )
+    table = Table(["Container", "Matches"])
+    total = hit_containers = 0
+    pool = ThreadPoolExecutor(max_workers=min(jobs, len(sources)))
+    interrupted = False
+    try:
+        # `map` yields in container order as soon as each one (and those before it) finishes.
+        for result in pool.map(search, sources):
+            total += result.count
+            hit_containers += bool(result.count)
+            if result.error:
+                print(f"{Colors.RED}{result.source.name}: {result.error}{Colors.RESET}")
+            if count_only:
+                color = Colors.GREEN if result.count else Colors.GRAY
+                table.add_row([result.source.name, f"{color}{result.count}{Colors.RESET}"])
+                continue
+            if not result.count:
+                continue
+            print(f"{Colors.BOLD}{result.source.name}{Colors.RESET} {Colors.GRAY}({result.count}){Colors.RESET}")
+            for timestamp, text in result.matches:
+                highlighted = pattern.sub(lambda m: f"{Colors.RED}{m.group(0)}{Colors.RESET}", text)
+                stamp = f"{Colors.GRAY}{timestamp}{Colors.RESET} " if timestamp else ""
+                print(f"  {stamp}{highlighted}")
+            print()
+    except KeyboardInterrupt:
+        # Don't wait for the workers: close their streams so they stop
+        # reading, and drop the containers not started yet.
+        interrupted = True
+        pool.shutdown(wait=False, cancel_futures=True)
+        open_logs.close_all()
+        print()
+        return 130
+    finally:
+        if not interrupted:
+            pool.shutdown()
+
+    if count_only:
+        print(table.render())
+    print(f"{Colors.GRAY}{total} match(es) in {hit_containers}/{len(sources)} container(s){Colors.RESET}")
+    return 0 if total else 1
+
+
+__all__ = [
+    "GrepResult",
+    "LogReader",
+    "LogSource",
+    "Selector",
+    "find_containers",
+    "grep_logs",
+    "grep_source",
+    "merge",
+    "open_log",
+    "parse_time",
+    "sort_key",
+    "split_timestamp",
+    "stream_logs",
+]
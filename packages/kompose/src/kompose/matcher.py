@@ -0,0 +1,120 @@
+"""Multi-pattern literal matcher.
+
+`substring_required` / `substring_forbidden` rules each test a handful of
+literals against a service's compose.yml. The engine gathers every literal
+of the ruleset into one `PatternMatcher`, computes the hit set once per file
+and lets rules look their literals up in it (`LintContext.contains`), so a
+literal shared by several rules is only searched for once.
+
+How the hit set is computed depends on the pattern count. `str.__contains__`
+runs in C and is hard to beat for the few dozen literals a real ruleset
+declares; an Aho–Corasick automaton scans the text once whatever the pattern
+count, but walks it a character at a time in Python, so it only pays off for
+hundreds of patterns (`AUTOMATON_MIN_PATTERNS`, measured with
+`benchmarks/bench_matcher.py`).
+
+Matchers are immutable once built, so they are safe to share between threads
+and cheap to rebuild in pool workers.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from functools import lru_cache
+from typing import Iterable
+
+# Below this many patterns, one `in` test per literal beats the automaton
+# (see benchmarks/bench_matcher.py for the crossover).
+AUTOMATON_MIN_PATTERNS = 256
+
+
+class PatternMatcher:
+    """Finds which of a fixed set of literal strings occur in a text."""
+
+    __slots__ = ("patterns", "_automaton")
+
+    def __init__(self, patterns: Iterable[str], automaton_min: int = AUTOMATON_MIN_PATTERNS):
+        self.patterns: frozenset[str] = frozenset(p for p in patterns if p)
+        self._automaton = _Automaton(self.patterns) if len(self.patterns) >= automaton_min else None
+
+    def __len__(self) -> int:
+        return len(self.patterns)
+
+    @property
+    def uses_automaton(self) -> bool:
+        return self._automaton is not None
+
+    def find(self, text: str) -> set[str]:
+        """The patterns that occur at least once in `text`."""
+        if self._automaton is not None:
+            return self._automaton.find(text)
+        return {pattern for pattern in self.patterns if pattern in text}
+
+
+class _Automaton:
+    """Aho–Corasick automaton over `patterns`: one pass over the text."""
+
+    __slots__ = ("patterns", "_goto", "_fail", "_out")
+
+    def __init__(self, patterns: frozenset[str]):
+        self.patterns = patterns
+        # Node 0 is the root. `_goto[n]` maps a character to the next node,
+        # `_out[n]` holds the patterns that end at `n` (including via fail links).
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._out: list[frozenset[str]] = [frozenset()]
+
+        ends: list[set[str]] = [set()]
+        for pattern in sorted(self.patterns):
+            node = 0
+            for char in pattern:
+                nxt = self._goto[node].get(char)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[node][char] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    ends.append(set())
+                node = nxt
+            ends[node].add(pattern)
+
+        # Breadth-first: a node's fail link is the longest proper suffix of its
+        # path that is also a path in the trie; its outputs include the fail
+        # target's outputs (already final since that node is shallower).
+        out: list[frozenset[str]] = [frozenset()] * len(self._goto)
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            out[node] = frozenset(ends[node] | out[self._fail[node]])
+            for char, child in self._goto[node].items():
+                fail = self._fail[node]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(char, 0)
+                queue.append(child)
+        self._out = out
+
+    def find(self, text: str) -> set[str]:
+        found: set[str] = set()
+        if not self.patterns:
+            return found
+        goto, fail, out = self._goto, self._fail, self._out
+        node = 0
+        for char in text:
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            if out[node]:
+                found |= out[node]
+                if len(found) == len(self.patterns):
+                    break
+        return found
+
+
+@lru_cache(maxsize=16)
+def matcher_for(patterns: frozenset[str]) -> PatternMatcher:
+    """Shared matcher for a pattern set (built once per process)."""
+    return PatternMatcher(patterns)
+
+
+__all__ = ["AUTOMATON_MIN_PATTERNS", "PatternMatcher", "matcher_for"]
@@ -0,0 +1,307 @@
+"""Native upgrade engine — `kompose upgrade --engine native`.
+
+The watchtower engine is one opaque blocking HTTP call whose progress can
+only be recovered by scraping watchtower's logs. This engine does the same
+job from kompose itself:
+
+1. note the image ID every target container runs (one bulk container list),
+2. pull the target images, `PULL_JOBS` at a time (`docker pull`, so registry
+   credentials and credential helpers work as for a manual pull),
+3. compare each container's image ID with the freshly pulled one, and
+4. `docker compose up -d --no-deps` only the services whose image changed —
+   one compose call for the root project, one per group in legacy mode,
+   retried service by service when a call fails so the failure is
+   attributed to the right services.
+
+Progress is reported through `emit(level, message, fields)` with the same
+messages and fields watchtower logs ("Pulling new image", "Found new …
+image", "Started new container", "Update session completed"), so
+`upgrade.py` renders it and records it in the history exactly like a
+watchtower session. `NativeRun.body()` has the shape of watchtower's
+`/v1/update` response.
+"""
+
+from __future__ import annotations
+
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable
+
+from . import drift
+from .compose import build_compose_command, get_compose_files, get_root_compose
+from .config import WORKSPACE_DIR
+from .docker import DockerError, get_client
+
+PULL_JOBS = 4
+
+# Service outcomes. NOT_RUNNING services are left alone, like watchtower
+# leaves stopped containers alone.
+UPDATED = "updated"
+UNCHANGED = "unchanged"
+NOT_RUNNING = "not running"
+FAILED = "failed"
+
+Emit = Callable[[str, str, dict], None]
+
+
+@dataclass
+class NativeTarget:
+    target: str     # the CLI argument it came from (group name for the global form)
+    group: str      # group dir holding its compose.yml
+    service: str    # docker compose service name
+    image: str
+
+
+@dataclass
+class Container:
+    name: str
+    image_id: str
+
+
+@dataclass
+class ServiceOutcome:
+    target: NativeTarget
+    status: str
+    containers: list[str] = field(default_factory=list)
+    error: str = ""
+
+
+@dataclass
+class NativeRun:
+    outcomes: list[ServiceOutcome]
+
+    def body(self, target: str | None = None) -> dict:
+        """watchtower-style `{"metric": {...}}` for all targets or one of them."""
+        outcomes = [
+            o for o in self.outcomes
+            if o.status != NOT_RUNNING and (target is None or o.target.target == target)
+        ]
+        return {"metric": {
+            "scanned": len(outcomes),
+            "updated": sum(1 for o in outcomes if o.status == UPDATED),
+            "failed": sum(1 for o in outcomes if o.status == FAILED),
+        }}
+
+
+# ---------------------------------------------------------------------------
+# Docker reads
+# ---------------------------------------------------------------------------
+
+
+def running_containers(projects: set[str]) -> dict[tuple[str, str], list[Container]]:
+    """(project, service) → running containers, for the compose `projects`."""
+    found: dict[tuple[str, str], list[Container]] = {}
+
+    def add(labels: dict, name: str, image_id: str) -> None:
+        project = labels.get(drift.PROJECT_LABEL, "")
+        if project in projects and labels.get(drift.ONEOFF_LABEL, "False") != "True":
+            found.setdefault((project, labels.get(drift.SERVICE_LABEL, "")), []).append(Container(name, image_id))
+
+    client = get_client()
+    if client is not None:
+        try:
+            for c in client.list_containers(filters={"label": [drift.PROJECT_LABEL]}):
+                add(c.get("Labels") or {}, ((c.get("Names") or ["?"])[0]).lstrip("/"), c.get("ImageID", ""))
+            return found
+        except DockerError:
+            found.clear()
+
+    try:
+        ids = subprocess.run(
+            ["docker", "ps", "-q", "--no-trunc", "--filter", f"label={drift.PROJECT_LABEL}"],
+            capture_output=True, text=True,
+        ).stdout.split()
+        if not ids:
+            return found
+        fmt = "\t".join(
+            f'{{{{index .Config.Labels "{label}"}}}}'
+            for label in (drift.PROJECT_LABEL, drift.SERVICE_LABEL, drift.ONEOFF_LABEL)
+        ) + "\t{{.Name}}\t{{.Image}}"
+        result = subprocess.run(["docker", "inspect", "--format", fmt, *ids], capture_output=True, text=True)
+    except OSError:
+        return found
+    for line in result.stdout.splitlines():
+        parts = line.split("\t")
+        if len(parts) == 5:
+            labels = {drift.PROJECT_LABEL: parts[0], drift.SERVICE_LABEL: parts[1], drift.ONEOFF_LABEL: parts[2]}
+            add(labels, parts[3].lstrip("/"), parts[4])
+    return found
+
+
+def image_id(image: str) -> str | None:
+    """Local image ID of `image`, or None if it isn't present."""
+    client = get_client()
+    if client is not None:
+        try:
+            return client.inspect_image(image).get("Id") or None
+        except DockerError as e:
+            if e.status == 404:
+                return None
+    try:
+        result = subprocess.run(
+            ["docker", "image", "inspect", "--format", "{{.Id}}", image], capture_output=True, text=True,
+        )
+    except OSError:
+        return None
+    if result.returncode != 0:
+        return None
+    return result.stdout.strip() or None
+
+
+def pull_image(image: str) -> tuple[str | None, str]:
+    """`docker pull` then the local image ID. Returns (image_id, error)."""
+    try:
+        result = subprocess.run(["docker", "pull", "--quiet", image], capture_output=True, text=True)
+    except OSError as e:
+        return None, str(e)
+    if result.returncode != 0:
+        lines = [line for line in result.stderr.splitlines() if line.strip()]
+        return None, lines[-1] if lines else f"docker pull exited {result.returncode}"
+    new_id = image_id(image)
+    return new_id, "" if new_id else "pulled image not found locally"
+
+
+# ---------------------------------------------------------------------------
+# Recreate
+# ---------------------------------------------------------------------------
+
+
+def _compose_up(host: str | None, root, pairs: list[tuple[str, str]]) -> str:
+    """One `up -d --no-deps` call for `pairs` (all of one group in legacy
+    mode). Returns the error, "" on success."""
+    services = [s for _, s in pairs]
+    if root is not None:
+        cmd, cwd = ["docker", "compose", "-f", str(root), "up", "-d", "--no-deps", *services], root.parent
+    else:
+        cmd, cwd = build_compose_command(get_compose_files(pairs[0][0], host), "up", ["-d", "--no-deps"], services), WORKSPACE_DIR
+    try:
+        result = subprocess.run(cmd, cwd=cwd, capture_output=True, text=True)
+    except OSError as e:
+        return str(e)
+    if result.returncode == 0:
+        return ""
+    lines = [line for line in result.stderr.splitlines() if line.strip()]
+    return lines[-1] if lines else f"docker compose exited {result.returncode}"
+
+
+def recreate(host: str | None, services_by_group: dict[str, list[str]]) -> dict[tuple[str, str], str]:
+    """`up -d --no-deps` the given services. Returns (group, service) → error
+    for the ones that couldn't be recreated (empty when all went through).
+
+    One compose call for the root project, one per group in legacy mode.
+    When a call covering several services fails, they are retried one at a
+    time, so only the services that actually fail are reported — compose
+    doesn't say which one broke the batch, and re-running `up` on the ones
+    it already recreated is a no-op.
+    """
+    root = get_root_compose(host)
+    pairs = [(group, s) for group in sorted(services_by_group) for s in services_by_group[group]]
+    if root is not None:
+        batches = [pairs]
+    else:
+        batches = [[pair for pair in pairs if pair[0] == group] for group in sorted(services_by_group)]
+
+    errors: dict[tuple[str, str], str] = {}
+    for batch in batches:
+        error = _compose_up(host, root, batch)
+        if not error:
+            continue
+        if len(batch) == 1:
+            errors[batch[0]] = error
+            continue
+        for pair in batch:
+            error = _compose_up(host, root, [pair])
+            if error:
+                errors[pair] = error
+    return errors
+
+
+# ---------------------------------------------------------------------------
+# Engine
+# ---------------------------------------------------------------------------
+
+
+def _short(image_id: str) -> str:
+    return image_id.split(":", 1)[-1][:12]
+
+
+def run_native(host: str | None, targets: list[NativeTarget], *, jobs: int = PULL_JOBS, emit: Emit) -> NativeRun:
+    """Pull, compare and recreate `targets`. Ends with an "Update session
+    completed" event carrying the counts."""
+    root = get_root_compose(host)
+    root_project = drift.project_name(root) if root is not None else None
+
+    def project(target: NativeTarget) -> str:
+        return root_project or drift.normalize_project_name(target.group)
+
+    # Keyed by (group, service): legacy groups are separate projects and may
+    # reuse service names.
+    running = running_containers({project(t) for t in targets})
+    containers = {(t.group, t.service): running.get((project(t), t.service), []) for t in targets}
+    outcomes = {(t.group, t.service): ServiceOutcome(t, NOT_RUNNING) for t in targets}
+
+    images = sorted({t.image for t in targets if containers[(t.group, t.service)]})
+
+    def pull(image: str) -> tuple[str | None, str]:
+        emit("INFO", "Pulling new image", {"image": image})
+        return pull_image(image)
+
+    with ThreadPoolExecutor(max_workers=max(1, min(jobs, len(images)))) as pool:
+        pulled = dict(zip(images, pool.map(pull, images)))
+
+    changed: dict[str, list[str]] = {}
+    for target in targets:
+        running_here = containers[(target.group, target.service)]
+        if not running_here:
+            continue
+        outcome = outcomes[(target.group, target.service)]
+        outcome.containers = [c.name for c in running_here]
+        new_id, error = pulled[target.image]
+        if new_id is None:
+            outcome.status, outcome.error = FAILED, error
+            emit("WARN", "Could not pull image", {"image": target.image, "error": error})
+            continue
+        if all(c.image_id == new_id for c in running_here):
+            outcome.status = UNCHANGED
+            continue
+        for c in running_here:
+            emit("INFO", f"Found new {target.image} image ({_short(new_id)})", {"container": c.name, "image": target.image})
+        changed.setdefault(target.group, []).append(target.service)
+
+    if changed:
+        errors = recreate(host, changed)
+        for group, services in changed.items():
+            for service in services:
+                outcome = outcomes[(group, service)]
+                error = errors.get((group, service))
+                if error:
+                    outcome.status, outcome.error = FAILED, error
+                    emit("ERRO", "Could not recreate service", {"service": service, "error": error})
+                    continue
+                outcome.status = UPDATED
+                for name in outcome.containers:
+                    emit("INFO", "Creating new container", {"container": name})
+                    emit("INFO", "Started new container", {"container": name, "image": outcome.target.image})
+
+    run = NativeRun(list(outcomes.values()))
+    metric = run.body()["metric"]
+    emit("INFO", "Update session completed", {key: str(value) for key, value in metric.items()})
+    return run
+
+
+__all__ = [
+    "FAILED",
+    "NOT_RUNNING",
+    "NativeRun",
+    "NativeTarget",
+    "PULL_JOBS",
+    "ServiceOutcome",
+    "UNCHANGED",
+    "UPDATED",
+    "image_id",
+    "pull_image",
+    "recreate",
+    "run_native",
+    "running_containers",
+]
@@ -0,0 +1,416 @@
+"""Registry digest pre-check for `kompose upgrade`.
+
+A watchtower session checks every image it is given, one by one, and the
+HTTP trigger blocks until it is done — mostly to learn that nothing changed.
+Before triggering, kompose asks each image's registry for the current
+manifest digest (`HEAD /v2/<repo>/manifests/<tag>`, which Docker Hub doesn't
+count against the pull rate limit) and compares it with the digests the local
+image was pulled from (`RepoDigests`). Only images whose digest moved are
+passed to watchtower's `?image=` filter.
+
+The checks run on a small thread pool sharing keep-alive connections per
+registry, so N images on the same registry cost N round trips on a couple
+of connections rather than N TLS handshakes. Anonymous bearer tokens are
+fetched on the first 401 and reused for the repository; `auths` entries
+from the docker CLI config are sent when present (credential helpers are
+not consulted).
+
+A fresh local image isn't enough: after a `docker compose pull` without
+`up`, the tag already points at the new image while the containers still run
+the old one — watchtower would recreate them. So the running containers'
+image IDs are compared with the local image's ID too, and any container
+behind it makes the image stale without asking the registry.
+
+The check is conservative: anything it can't decide (registry unreachable,
+private image without credentials, image built locally) counts as stale and
+is left to watchtower.
+"""
+
+from __future__ import annotations
+
+import http.client
+import json
+import os
+import re
+import subprocess
+import threading
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable
+
+from .docker import DockerError, get_client
+from .history import normalize_image
+
+DOCKER_HUB = "registry-1.docker.io"
+CHECK_JOBS = 8
+_TIMEOUT = 10.0
+
+# Ask for the index first so multi-arch images answer with the digest that
+# ends up in RepoDigests.
+MANIFEST_ACCEPT = ", ".join([
+    "application/vnd.oci.image.index.v1+json",
+    "application/vnd.docker.distribution.manifest.list.v2+json",
+    "application/vnd.docker.distribution.manifest.v2+json",
+    "application/vnd.oci.image.manifest.v1+json",
+])
+
+# Check outcomes. STALE and UNKNOWN are sent to watchtower.
+FRESH = "up to date"
+STALE = "new digest"
+NOT_PULLED = "not pulled"
+UNKNOWN = "check failed"
+
+_CHALLENGE_RE = re.compile(r'(\w+)="([^"]*)"')
+_IMAGE_ID_RE = re.compile(r"^(sha256:)?[0-9a-f]{12,64}$")
+_LOCAL_HOSTS = ("localhost", "127.", "[::1]")
+
+
+class RegistryError(Exception):
+    """Raised when a registry can't answer a manifest query."""
+
+
+@dataclass
+class ImageRef:
+    registry: str      # API host[:port] (docker.io → registry-1.docker.io)
+    repository: str    # `library/nginx`, `foo/bar`, …
+    tag: str
+
+    @property
+    def scheme(self) -> str:
+        # Like the docker daemon, plain HTTP is only assumed for loopback registries.
+        return "http" if self.registry.startswith(_LOCAL_HOSTS) else "https"
+
+
+@dataclass
+class LocalImage:
+    id: str
+    digests: set[str]    # registry digests it was pulled as (RepoDigests)
+
+
+@dataclass
+class DigestCheck:
+    image: str
+    status: str
+    detail: str = ""
+
+    @property
+    def needs_update(self) -> bool:
+        return self.status in (STALE, UNKNOWN)
+
+
+def parse_reference(image: str) -> ImageRef:
+    """Split an `image:` value into registry / repository / tag."""
+    name, tag = image, "latest"
+    if ":" in image.rsplit("/", 1)[-1]:
+        name, tag = image.rsplit(":", 1)
+    first, sep, rest = name.partition("/")
+    if sep and ("." in first or ":" in first or first == "localhost"):
+        registry, repository = first, rest
+    else:
+        registry, repository = DOCKER_HUB, name
+    if registry in ("docker.io", "index.docker.io"):
+        registry = DOCKER_HUB
+    if registry == DOCKER_HUB and "/" not in repository:
+        repository = f"library/{repository}"
+    return ImageRef(registry, repository, tag)
+
+
+# ---------------------------------------------------------------------------
+# Local digests
+# ---------------------------------------------------------------------------
+
+
+def local_images(images: list[str]) -> dict[str, LocalImage | None] | None:
+    """image → its local ID and digests (None when the image isn't present).
+    None overall when docker can't be queried at all."""
+    client = get_client()
+    if client is not None:
+        try:
+            found: dict[str, LocalImage | None] = {}
+            for image in images:
+                try:
+                    info = client.inspect_image(image)
+                except DockerError as e:
+                    if e.status != 404:
+                        raise
+                    found[image] = None
+                    continue
+                found[image] = LocalImage(info.get("Id", ""), _digests(info.get("RepoDigests")))
+            return found
+        except DockerError:
+            pass
+
+    # One `docker image inspect` for all of them; missing images are simply
+    # absent from the output, so map results back through their tags.
+    fmt = "{{json .RepoTags}}\t{{json .RepoDigests}}\t{{.Id}}"
+    try:
+        result = subprocess.run(["docker", "image", "inspect", "--format", fmt, *images], capture_output=True, text=True)
+    except OSError:
+        return None
+    if result.returncode != 0 and not result.stdout.strip():
+        return None if "No such image" not in result.stderr else {image: None for image in images}
+    by_tag: dict[str, LocalImage] = {}
+    for line in result.stdout.splitlines():
+        parts = line.split("\t")
+        if len(parts) != 3:
+            continue
+        try:
+            tags, digests = json.loads(parts[0]) or [], json.loads(parts[1]) or []
+        except json.JSONDecodeError:
+            continue
+        for tag in tags:
+            by_tag[normalize_image(tag)] = LocalImage(parts[2], _digests(digests))
+    return {image: by_tag.get(normalize_image(image)) for image in images}
+
+
+def running_images() -> dict[str, set[str]] | None:
+    """Normalized image reference → IDs of the images its running containers
+    run. None when docker can't be queried.
+
+    Keyed on `Config.Image`, the reference the container was created from:
+    the container list shows a bare image ID instead once that tag has moved
+    to a newer pull — exactly the containers we're after.
+    """
+    found: dict[str, set[str]] = {}
+
+    def add(ref: str, image_id: str) -> None:
+        if ref and image_id and not _IMAGE_ID_RE.match(ref):
+            found.setdefault(normalize_image(ref), set()).add(image_id)
+
+    client = get_client()
+    if client is not None:
+        try:
+            for c in client.list_containers():
+                ref = c.get("Image", "")
+                if _IMAGE_ID_RE.match(ref):
+                    ref = (client.inspect_container(c["Id"]).get("Config") or {}).get("Image", "")
+                add(ref, c.get("ImageID", ""))
+            return found
+        except DockerError:
+            found.clear()
+
+    try:
+        ids = subprocess.run(["docker", "ps", "-q", "--no-trunc"], capture_output=True, text=True)
+        if ids.returncode != 0:
+            return None
+        if not ids.stdout.split():
+            return found
+        result = subprocess.run(
+            ["docker", "inspect", "--format", "{{.Config.Image}}\t{{.Image}}", *ids.stdout.split()],
+            capture_output=True, text=True,
+        )
+    except OSError:
+        return None
+    for line in result.stdout.splitlines():
+        ref, _, image_id = line.partition("\t")
+        add(ref, image_id)
+    return found
+
+
+def _digests(repo_digests: Iterable[str] | None) -> set[str]:
+    return {entry.rsplit("@", 1)[1] for entry in repo_digests or () if "@" in entry}
+
+
+# ---------------------------------------------------------------------------
+# Registry client
+# ---------------------------------------------------------------------------
+
+
+def _docker_auths() -> dict[str, str]:
+    """registry host → base64 `user:password` from the docker CLI config."""
+    config_dir = os.environ.get("DOCKER_CONFIG") or str(Path.home() / ".docker")
+    try:
+        data = json.loads((Path(config_dir) / "config.json").read_text())
+    except (OSError, ValueError):
+        return {}
+    auths: dict[str, str] = {}
+    for key, entry in (data.get("auths") or {}).items():
+        if not isinstance(entry, dict) or not entry.get("auth"):
+            continue
+        host = urllib.parse.urlsplit(key).netloc if "://" in key else key.split("/", 1)[0]
+        if host in ("index.docker.io", "docker.io"):
+            host = DOCKER_HUB
+        auths[host] = entry["auth"]
+    return auths
+
+
+class _ConnectionPool:
+    """Idle keep-alive connections per (scheme, host), shared by the workers."""
+
+    def __init__(self, timeout: float):
+        self.timeout = timeout
+        self._idle: dict[tuple[str, str], list[http.client.HTTPConnection]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, scheme: str, host: str) -> http.client.HTTPConnection:
+        with self._lock:
+            idle = self._idle.get((scheme, host))
+            if idle:
+                return idle.pop()
+        cls = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+        return cls(host, timeout=self.timeout)
+
+    def put(self, scheme: str, host: str, conn: http.client.HTTPConnection) -> None:
+        with self._lock:
+            self._idle.setdefault((scheme, host), []).append(conn)
+
+    def close(self) -> None:
+        with self._lock:
+            for conns in self._idle.values():
+                for conn in conns:
+                    conn.close()
+            self._idle.clear()
+
+
+class RegistryClient:
+    """Manifest digest lookups against Docker Registry v2 APIs."""
+
+    def __init__(self, timeout: float = _TIMEOUT, auths: dict[str, str] | None = None):
+        self._pool = _ConnectionPool(timeout)
+        self._auths = _docker_auths() if auths is None else auths
+        self._tokens: dict[tuple[str, str], str] = {}
+        self._lock = threading.Lock()
+
+    def close(self) -> None:
+        self._pool.close()
+
+    def _request(self, method: str, url: str, headers: dict[str, str]) -> tuple[int, http.client.HTTPMessage, bytes]:
+        parts = urllib.parse.urlsplit(url)
+        path = parts.path + (f"?{parts.query}" if parts.query else "")
+        # One retry: an idle keep-alive connection may have been closed by the server.
+        for attempt in (0, 1):
+            conn = self._pool.get(parts.scheme, parts.netloc)
+            try:
+                conn.request(method, path, headers=headers)
+                response = conn.getresponse()
+                body = response.read()
+            except (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError) as e:
+                conn.close()
+                if attempt == 0:
+                    continue
+                raise RegistryError(f"{parts.netloc}: {e}") from e
+            except (OSError, http.client.HTTPException) as e:
+                conn.close()
+                raise RegistryError(f"{parts.netloc}: {e}") from e
+            if response.will_close:
+                conn.close()
+            else:
+                self._pool.put(parts.scheme, parts.netloc, conn)
+            return response.status, response.headers, body
+        raise RegistryError(f"{parts.netloc}: connection lost")
+
+    def _token(self, ref: ImageRef, challenge: str) -> str | None:
+        """Bearer token for pulling `ref`, from the realm in a 401 challenge."""
+        params = dict(_CHALLENGE_RE.findall(challenge))
+        realm = params.pop("realm", None)
+        if not realm:
+            return None
+        params.setdefault("scope", f"repository:{ref.repository}:pull")
+        url = f"{realm}?{urllib.parse.urlencode(params)}"
+        headers = {"Accept": "application/json"}
+        if ref.registry in self._auths:
+            headers["Authorization"] = f"Basic {self._auths[ref.registry]}"
+        status, _, body = self._request("GET", url, headers)
+        if status != 200:
+            return None
+        try:
+            data = json.loads(body)
+        except json.JSONDecodeError:
+            return None
+        return data.get("token") or data.get("access_token")
+
+    def remote_digest(self, ref: ImageRef) -> str:
+        """Digest the registry currently serves for `ref`'s tag."""
+        url = f"{ref.scheme}://{ref.registry}/v2/{ref.repository}/manifests/{ref.tag}"
+        key = (ref.registry, ref.repository)
+        headers = {"Accept": MANIFEST_ACCEPT}
+        with self._lock:
+            token = self._tokens.get(key)
+        if token:
+            headers["Authorization"] = f"Bearer {token}"
+
+        status, response_headers, _ = self._request("HEAD", url, headers)
+        if status == 401:
+            challenge = response_headers.get("WWW-Authenticate", "")
+            scheme = challenge.split(" ", 1)[0].lower()
+            if scheme == "bearer":
+                token = self._token(ref, challenge)
+                if token:
+                    with self._lock:
+                        self._tokens[key] = token
+                    headers["Authorization"] = f"Bearer {token}"
+            elif scheme == "basic" and ref.registry in self._auths:
+                headers["Authorization"] = f"Basic {self._auths[ref.registry]}"
+            if "Authorization" in headers:
+                status, response_headers, _ = self._request("HEAD", url, headers)
+        if status != 200:
+            raise RegistryError(f"{ref.registry}: HTTP {status}")
+        digest = response_headers.get("Docker-Content-Digest")
+        if not digest:
+            raise RegistryError(f"{ref.registry}: no Docker-Content-Digest header")
+        return digest
+
+
+# ---------------------------------------------------------------------------
+# Pre-check
+# ---------------------------------------------------------------------------
+
+
+def check_images(
+    images: list[str],
+    *,
+    jobs: int = CHECK_JOBS,
+    client: RegistryClient | None = None,
+    running: dict[str, set[str]] | None = None,
+) -> list[DigestCheck] | None:
+    """Compare each image's running containers with the local image, then its
+    local digests with its registry's. Same order as `images`; None when the
+    local images can't be inspected (no docker). `running` is
+    `running_images()`, looked up here when not given."""
+    local = local_images(images)
+    if local is None:
+        return None
+    if running is None:
+        running = running_images() or {}
+    registry = client or RegistryClient()
+
+    def check(image: str) -> DigestCheck:
+        local_image = local.get(image)
+        if local_image is None:
+            return DigestCheck(image, NOT_PULLED)
+        behind = running.get(normalize_image(image), set()) - {local_image.id}
+        if behind:
+            return DigestCheck(image, STALE, f"{len(behind)} older image(s) still running")
+        if not local_image.digests:
+            return DigestCheck(image, UNKNOWN, "no registry digest (built locally?)")
+        try:
+            remote = registry.remote_digest(parse_reference(image))
+        except RegistryError as e:
+            return DigestCheck(image, UNKNOWN, str(e))
+        return DigestCheck(image, FRESH if remote in local_image.digests else STALE, remote)
+
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, min(jobs, len(images)))) as pool:
+            return list(pool.map(check, images))
+    finally:
+        if client is None:
+            registry.close()
+
+
+__all__ = [
+    "DigestCheck",
+    "FRESH",
+    "ImageRef",
+    "LocalImage",
+    "NOT_PULLED",
+    "RegistryClient",
+    "RegistryError",
+    "STALE",
+    "UNKNOWN",
+    "check_images",
+    "local_images",
+    "parse_reference",
+    "running_images",
+]
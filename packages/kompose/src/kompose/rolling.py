@@ -0,0 +1,252 @@
+"""Rolling restart for root mode (`kompose restart --rolling`).
+
+A plain restart is `down` then `up -d` over every target, so a group goes
+offline as a whole. A rolling restart instead recreates the targets in
+batches (`up -d --force-recreate --no-deps <batch>`) and waits for each batch
+to become ready before touching the next one:
+
+  - a container with a Docker healthcheck is ready once it reports
+    `healthy`; `unhealthy` fails the roll immediately,
+  - a container without one is ready once it has stayed running, with an
+    unchanged `RestartCount`, for a short settle window (`SETTLE_WINDOW`) —
+    so a service that crash-loops right after start isn't waved through,
+  - a one-shot service (its restart policy doesn't restart a clean exit:
+    `restart: "no"`, the default, or `on-failure`) is also ready once it
+    exited with code 0,
+  - any other exit (or never getting there within the timeout) fails the
+    roll; so does a targeted service that still has no container when the
+    timeout runs out.
+
+Readiness is polled with one bulk container list per tick (Engine API, else
+`docker ps`); the health verdict is read from the `Status` column. Only the
+containers that are settling are inspected, for their restart count.
+Services are rolled dependencies first (`depends_on:` inside the project).
+"""
+
+from __future__ import annotations
+
+import re
+import subprocess
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from . import schedule
+from .compose_index import compose_index
+from .docker import DockerError, get_client
+from .drift import ONEOFF_LABEL, PROJECT_LABEL, SERVICE_LABEL
+
+DEFAULT_TIMEOUT = 120.0
+POLL_INTERVAL = 1.0
+SETTLE_WINDOW = 5.0
+
+# Readiness verdicts.
+READY = "ready"
+WAITING = "waiting"
+FAILED = "failed"
+
+_EXIT_CODE_RE = re.compile(r"^Exited \((-?\d+)\)")
+
+
+@dataclass
+class ContainerState:
+    service: str
+    name: str
+    state: str      # running / exited / restarting / ...
+    status: str     # `docker ps` Status column, e.g. "Up 5 seconds (healthy)"
+
+
+def readiness(container: ContainerState, *, one_shot: bool = False) -> str:
+    """READY / WAITING / FAILED for one container. `one_shot` containers
+    are expected to exit: exit code 0 counts as ready."""
+    if container.state in ("exited", "dead"):
+        code = _EXIT_CODE_RE.match(container.status)
+        if one_shot and container.state == "exited" and code and int(code.group(1)) == 0:
+            return READY
+        return FAILED
+    if container.state != "running":
+        return WAITING  # created / restarting / removing
+    if "(unhealthy)" in container.status:
+        return FAILED
+    if "(health: starting)" in container.status:
+        return WAITING
+    return READY
+
+
+def project_containers(project: str) -> list[ContainerState]:
+    """Every (non one-off) container of `project`, in one list call."""
+    client = get_client()
+    if client is not None:
+        try:
+            raw = client.list_containers(all=True, filters={"label": [f"{PROJECT_LABEL}={project}"]})
+            return [
+                ContainerState(
+                    labels.get(SERVICE_LABEL, ""),
+                    ((c.get("Names") or [""])[0]).lstrip("/"),
+                    c.get("State", ""),
+                    c.get("Status", ""),
+                )
+                for c in raw
+                for labels in [c.get("Labels") or {}]
+                if labels.get(ONEOFF_LABEL, "False") != "True"
+            ]
+        except DockerError:
+            pass
+
+    fmt = "\t".join([
+        f'{{{{.Label "{SERVICE_LABEL}"}}}}', f'{{{{.Label "{ONEOFF_LABEL}"}}}}',
+        "{{.Names}}", "{{.State}}", "{{.Status}}",
+    ])
+    cmd = ["docker", "ps", "-a", "--filter", f"label={PROJECT_LABEL}={project}", "--format", fmt]
+    try:
+        result = subprocess.run(cmd, capture_output=True, text=True)
+    except OSError:
+        return []
+    if result.returncode != 0:
+        return []
+    containers = []
+    for line in result.stdout.splitlines():
+        parts = line.split("\t")
+        if len(parts) != 5 or parts[1] == "True":
+            continue
+        containers.append(ContainerState(parts[0], parts[2], parts[3], parts[4]))
+    return containers
+
+
+def restart_count(name: str) -> int | None:
+    """The container's `RestartCount` (Engine API, else `docker inspect`);
+    None when it can't be read."""
+    client = get_client()
+    if client is not None:
+        try:
+            count = client.inspect_container(name).get("RestartCount")
+            return count if isinstance(count, int) else None
+        except DockerError:
+            pass
+    try:
+        result = subprocess.run(
+            ["docker", "inspect", "--format", "{{.RestartCount}}", name],
+            capture_output=True, text=True,
+        )
+    except OSError:
+        return None
+    if result.returncode != 0:
+        return None
+    try:
+        return int(result.stdout.strip())
+    except ValueError:
+        return None
+
+
+def _needs_settling(container: ContainerState) -> bool:
+    """Running without a healthcheck: `running` alone proves little."""
+    return container.state == "running" and "(healthy)" not in container.status
+
+
+def wait_ready(
+    project: str,
+    services: list[str],
+    timeout: float = DEFAULT_TIMEOUT,
+    *,
+    interval: float = POLL_INTERVAL,
+    clock=time.monotonic,
+    sleep=time.sleep,
+    one_shot: frozenset[str] | set[str] = frozenset(),
+    settle: float = SETTLE_WINDOW,
+) -> str | None:
+    """Block until every container of `services` is ready. `one_shot` names
+    the services allowed to exit cleanly (see `one_shot_services`).
+
+    A service without any container yet counts as waiting; a running
+    container without a healthcheck must keep running, with the same
+    `RestartCount`, for `settle` seconds before it counts as ready.
+
+    Returns None on success, else a one-line reason (first failure, or what
+    was still pending when `timeout` ran out).
+    """
+    wanted = set(services)
+    deadline = clock() + timeout
+    settling: dict[str, tuple[float, int | None]] = {}  # name -> (running since, restart count)
+    while True:
+        pending: list[str] = []
+        seen: set[str] = set()
+        now = clock()
+        for container in project_containers(project):
+            if container.service not in wanted:
+                continue
+            seen.add(container.service)
+            verdict = readiness(container, one_shot=container.service in one_shot)
+            if verdict == FAILED:
+                return f"{container.name}: {container.status or container.state}"
+            if verdict == READY and _needs_settling(container):
+                count = restart_count(container.name)
+                since, known = settling.get(container.name, (now, count))
+                if known != count:
+                    since = now  # restarted between two polls
+                settling[container.name] = (since, count)
+                if now - since < settle:
+                    verdict = WAITING
+            else:
+                settling.pop(container.name, None)
+            if verdict == WAITING:
+                pending.append(container.name)
+        pending.extend(f"{name} (no container)" for name in wanted - seen)
+        if not pending:
+            return None
+        if clock() >= deadline:
+            return f"not ready after {timeout:g}s: {', '.join(sorted(pending))}"
+        sleep(interval)
+
+
+def _definitions(root: Path) -> dict[str, object]:
+    """Every service definition of the root project, includes resolved."""
+    index = compose_index()
+    definitions: dict[str, object] = dict(index.services(root))
+    for _, include_path in index.includes(root):
+        definitions.update(index.services(root.parent / include_path))
+    return definitions
+
+
+def one_shot_services(root: Path, services: list[str]) -> set[str]:
+    """The `services` whose restart policy leaves a clean exit alone —
+    `restart: "no"` (compose's default) or `on-failure[:N]`."""
+    definitions = _definitions(root)
+    one_shot = set()
+    for name in services:
+        svc = definitions.get(name)
+        policy = svc.get("restart", "no") if isinstance(svc, dict) else "no"
+        if policy is False:
+            policy = "no"  # unquoted `restart: no` is a YAML 1.1 boolean
+        if str(policy) == "no" or str(policy).startswith("on-failure"):
+            one_shot.add(name)
+    return one_shot
+
+
+def rolling_order(root: Path, services: list[str]) -> list[str]:
+    """`services` (all of the project's when empty), dependencies first."""
+    definitions = _definitions(root)
+    targets = set(services) if services else {str(name) for name in definitions}
+    graph: dict[str, set[str]] = {}
+    for name in targets:
+        svc = definitions.get(name)
+        depends_on = svc.get("depends_on") if isinstance(svc, dict) else None
+        needs = {str(dep) for dep in depends_on} if isinstance(depends_on, (list, dict)) else set()
+        graph[name] = needs & targets
+    return [name for wave in schedule.plan_waves(graph) for name in wave]
+
+
+def batches(services: list[str], size: int) -> list[list[str]]:
+    return [services[i:i + size] for i in range(0, len(services), max(size, 1))]
+
+
+__all__ = [
+    "ContainerState",
+    "DEFAULT_TIMEOUT",
+    "batches",
+    "one_shot_services",
+    "project_containers",
+    "readiness",
+    "restart_count",
+    "rolling_order",
+    "wait_ready",
+]
@@ -17,48 +17,23 @@ params:
 
 from __future__ import annotations
 
-from functools import lru_cache
 from pathlib import Path
 
-import yaml
-
 from .._engine import FixApplied, Issue, LintContext
+from ..compose_index import compose_index
 
 
 def _root_path(host_dir: Path, params: dict) -> Path:
     return host_dir / params.get("root", "compose.yml")
 
 
-@lru_cache(maxsize=8)
-def _read_includes(root_path: Path, mtime: float) -> list[tuple[str, str]]:
+def _read_includes(root_path: Path) -> list[tuple[str, str]]:
     """Return [(group_dir, include_path), ...] for each entry in `include:`.
 
-    Cached on (path, mtime) so each lint run only reads the file once.
+    Served from the shared compose index, so each lint run only parses the
+    root compose once.
     """
-    if not root_path.exists():
-        return []
-    try:
-        data = yaml.safe_load(root_path.read_text()) or {}
-    except (OSError, yaml.YAMLError):
-        return []
-
-    out: list[tuple[str, str]] = []
-    for entry in data.get("include") or []:
-        path_str = entry if isinstance(entry, str) else (entry or {}).get("path", "")
-        if not path_str:
-            continue
-        parts = Path(path_str).parts
-        group = parts[-2] if len(parts) >= 2 else ""
-        if group:
-            out.append((group, path_str))
-    return out
-
-
-def _included_groups(root_path: Path) -> set[str]:
-    if not root_path.exists():
-        return set()
-    mtime = root_path.stat().st_mtime
-    return {g for g, _ in _read_includes(root_path, mtime)}
+    return compose_index().includes(root_path)
 
 
 def check(ctx: LintContext, params: dict, exclude: set[str]) -> list[Issue]:
@@ -67,22 +42,28 @@ def check(ctx: LintContext, params: dict, exclude: set[str]) -> list[Issue]:
         return []
     host_dir = ctx.compose_path.parent.parent
     root_path = _root_path(host_dir, params)
-    if not root_path.exists():
+    # Through the context, so `kompose fix` re-checks against the staged root.
+    root = ctx.read_doc(root_path)
+    if root is None:
         return []
-    if ctx.service_name in _included_groups(root_path):
+    if ctx.service_name in {g for g, _ in root.includes()}:
         return []
     return [Issue(message=f"not in root compose include ({root_path.name})")]
 
 
+def inputs(service_dir: Path, params: dict) -> list[Path]:
+    """`check()` reads the root compose — a change there must invalidate the lint cache."""
+    return [_root_path(service_dir.parent, params)]
+
+
 def notices(host_dir: Path, services: list[Path], params: dict, exclude: set[str]) -> list[Issue]:
     """Direction B: every include path must point to an existing file."""
     root_path = _root_path(host_dir, params)
     if not root_path.exists():
         return []
 
-    mtime = root_path.stat().st_mtime
     issues: list[Issue] = []
-    for group, include_path in _read_includes(root_path, mtime):
+    for group, include_path in _read_includes(root_path):
         if group in exclude:
             continue
         full = host_dir / include_path
@@ -94,7 +75,7 @@ def notices(host_dir: Path, services: list[Path], params: dict, exclude: set[str
     return issues
 
 
-def fix(ctx: LintContext, params: dict, exclude: set[str], *, force: bool = False, dry_run: bool = False) -> list[FixApplied]:
+def fix(ctx: LintContext, params: dict, exclude: set[str], *, force: bool = False) -> list[FixApplied]:
     """Auto-fix direction A: add the current service to the root compose's `include:`.
 
     Only fixes when the service is missing from the include list (= the same
@@ -107,22 +88,22 @@ def fix(ctx: LintContext, params: dict, exclude: set[str], *, force: bool = Fals
 
     host_dir = ctx.compose_path.parent.parent
     root_path = _root_path(host_dir, params)
-    if not root_path.exists():
+    root = ctx.workspace.doc(root_path)
+    if root is None:
         return []
 
-    if ctx.service_name in _included_groups(root_path):
+    # Read through the workspace: entries staged for earlier services in this
+    # run are already there, and the root is written once at commit.
+    if ctx.service_name in {g for g, _ in root.includes()}:
         return []  # nothing to fix
 
     # Determine the include path to add — by convention `<service>/compose.yml`
     relative_path = f"{ctx.service_name}/compose.yml"
-    new_content = _add_include_entry(root_path.read_text(), relative_path)
+    new_content = _add_include_entry(root.content, relative_path)
     if new_content is None:
         return []  # couldn't locate the include block; refuse rather than corrupt
 
-    if not dry_run:
-        root_path.write_text(new_content)
-        # Invalidate cache so subsequent calls in the same lint run see the update
-        _read_includes.cache_clear()
+    ctx.workspace.write(root_path, new_content)
 
     return [FixApplied(
         target=root_path.name,
@@ -16,6 +16,8 @@ exclude: service names to skip entirely.
 
 from __future__ import annotations
 
+from pathlib import Path
+
 from .._engine import Issue, LintContext
 from ..env import (
     ENV_STATUS_DRIFT,
@@ -25,6 +27,11 @@ from ..env import (
 )
 
 
+def inputs(service_dir: Path, params: dict) -> list[Path]:
+    """Files compared besides compose.yml (invalidate the lint cache when they change)."""
+    return [service_dir / ".env", service_dir / ".env.example"]
+
+
 def check(ctx: LintContext, params: dict, exclude: set[str]) -> list[Issue]:
     if ctx.service_name in exclude:
         return []
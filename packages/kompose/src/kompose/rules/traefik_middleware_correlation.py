@@ -15,8 +15,8 @@ import re
 
 from .._engine import Issue, LintContext
 
-_RULE_PATTERN = r"traefik\.http\.routers\.([a-z0-9-]+)\.rule[^:]*:[^`]*`([^`]+)`"
-_MIDDLEWARE_PATTERN = r"traefik\.http\.routers\.([a-z0-9-]+)\.middlewares[^:]*:[^\n]*"
+_RULE_PATTERN = re.compile(r"traefik\.http\.routers\.([a-z0-9-]+)\.rule[^:]*:[^`]*`([^`]+)`")
+_MIDDLEWARE_PATTERN = re.compile(r"traefik\.http\.routers\.([a-z0-9-]+)\.middlewares[^:]*:[^\n]*")
 _ALWAYS_IGNORE = {"wildcard-certs"}
 
 
@@ -26,10 +26,10 @@ def check(ctx: LintContext, params: dict, exclude: set[str]) -> list[Issue]:
     public_mw = ctx.globals.get("public_middleware", "wan@file")
     private_mw = ctx.globals.get("private_middleware", "lan@file")
 
-    rules = dict(re.findall(_RULE_PATTERN, ctx.content))
+    rules = dict(_RULE_PATTERN.findall(ctx.content))
     issues: list[Issue] = []
 
-    for match in re.finditer(_MIDDLEWARE_PATTERN, ctx.content):
+    for match in _MIDDLEWARE_PATTERN.finditer(ctx.content):
         router = match.group(1)
         middleware_line = match.group(0)
 
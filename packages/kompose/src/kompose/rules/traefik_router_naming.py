@@ -16,7 +16,7 @@ import re
 
 from .._engine import Issue, LintContext
 
-_ROUTER_PATTERN = r"traefik\.http\.routers\.([a-z0-9-]+)\."
+_ROUTER_PATTERN = re.compile(r"traefik\.http\.routers\.([a-z0-9-]+)\.")
 _ALWAYS_IGNORE = {"wildcard-certs"}
 
 
@@ -26,7 +26,7 @@ def check(ctx: LintContext, params: dict, exclude: set[str]) -> list[Issue]:
     private_suffixes = tuple(s for s in suffixes if s != "-public")
 
     has_public = public_domain in ctx.content
-    routers = sorted(set(re.findall(_ROUTER_PATTERN, ctx.content)))
+    routers = sorted(set(_ROUTER_PATTERN.findall(ctx.content)))
 
     issues: list[Issue] = []
     for router in routers:
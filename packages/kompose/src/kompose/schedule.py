@@ -0,0 +1,145 @@
+"""Dependency waves for legacy-mode lifecycle commands.
+
+In legacy mode each group (service dir) is its own compose project, so
+docker compose can't order them: a group whose containers join the
+`reverse-proxy` network, or `depends_on` a database declared in another
+group, would otherwise start in alphabetical order and crash-loop until its
+dependency is up.
+
+`group_dependencies()` derives a group → {groups it needs} graph from the
+compose files (base + host layering, via the compose index):
+
+  - `depends_on:` naming a service declared in another group,
+  - `network_mode: service:<name>` / `container:<name>` pointing into another group,
+  - an `external` network that another group declares (owns). An owned
+    network without `name:` is created as `<project>_<key>`, so it only
+    matches an external reference to that prefixed name.
+
+`plan_waves()` turns it into topological waves: every group in a wave only
+needs groups from earlier waves, so a wave can run in parallel. `up` walks
+the waves forward, `down` in reverse. Groups caught in a cycle are put in
+one final wave (sorted) rather than refusing to run.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from . import drift
+from .compose_index import compose_index
+
+
+@dataclass
+class GroupInfo:
+    """What one group declares and references, merged across its compose files."""
+    services: set[str] = field(default_factory=set)
+    containers: set[str] = field(default_factory=set)
+    service_refs: set[str] = field(default_factory=set)     # depends_on / network_mode targets
+    owned_networks: set[str] = field(default_factory=set)
+    external_networks: set[str] = field(default_factory=set)
+
+
+def _network_name(key: str, conf, project: str) -> str:
+    """The name compose creates an owned network under: its `name:`, else
+    `<project>_<key>`."""
+    if isinstance(conf, dict) and isinstance(conf.get("name"), str):
+        return conf["name"]
+    return f"{project}_{key}"
+
+
+def _is_external(conf) -> bool:
+    if not isinstance(conf, dict):
+        return False
+    external = conf.get("external")
+    if isinstance(external, dict):
+        return True  # legacy `external: {name: ...}` form
+    return bool(external)
+
+
+def _external_name(key: str, conf: dict) -> str:
+    external = conf.get("external")
+    if isinstance(external, dict) and isinstance(external.get("name"), str):
+        return external["name"]
+    if isinstance(conf.get("name"), str):
+        return conf["name"]
+    return key  # external networks are looked up verbatim
+
+
+def group_info(compose_files: list[Path]) -> GroupInfo:
+    """Collect a group's declarations/references from its layered compose files."""
+    info = GroupInfo()
+    index = compose_index()
+    project = drift.project_name(compose_files[0]) if compose_files else ""
+    for path in compose_files:
+        doc = index.doc(path)
+        if doc is None:
+            continue
+        for name, svc in doc.services.items():
+            info.services.add(str(name))
+            if not isinstance(svc, dict):
+                continue
+            if isinstance(svc.get("container_name"), str):
+                info.containers.add(svc["container_name"])
+            depends_on = svc.get("depends_on")
+            if isinstance(depends_on, (list, dict)):
+                info.service_refs.update(str(dep) for dep in depends_on)
+            network_mode = svc.get("network_mode")
+            if isinstance(network_mode, str):
+                kind, _, target = network_mode.partition(":")
+                if kind in ("service", "container") and target:
+                    info.service_refs.add(target)
+        networks = doc.data.get("networks")
+        if isinstance(networks, dict):
+            for key, conf in networks.items():
+                if _is_external(conf):
+                    info.external_networks.add(_external_name(str(key), conf))
+                else:
+                    info.owned_networks.add(_network_name(str(key), conf, project))
+    return info
+
+
+def group_dependencies(infos: dict[str, GroupInfo]) -> dict[str, set[str]]:
+    """group → the other groups it must start after."""
+    providers: dict[str, str] = {}
+    for group, info in infos.items():
+        for name in info.services | info.containers:
+            providers.setdefault(name, group)
+    network_owners: dict[str, str] = {}
+    for group, info in infos.items():
+        for network in info.owned_networks:
+            network_owners.setdefault(network, group)
+
+    graph: dict[str, set[str]] = {}
+    for group, info in infos.items():
+        needs = {providers[ref] for ref in info.service_refs - info.services if ref in providers}
+        needs |= {network_owners[n] for n in info.external_networks if n in network_owners}
+        needs.discard(group)
+        graph[group] = needs
+    return graph
+
+
+def plan_waves(graph: dict[str, set[str]]) -> list[list[str]]:
+    """Topological waves (Kahn's algorithm, by level). Each wave is sorted."""
+    remaining = {group: set(needs) & graph.keys() for group, needs in graph.items()}
+    waves: list[list[str]] = []
+    while remaining:
+        ready = sorted(group for group, needs in remaining.items() if not needs)
+        if not ready:
+            waves.append(sorted(remaining))  # cycle: run the rest together
+            break
+        waves.append(ready)
+        for group in ready:
+            del remaining[group]
+        for needs in remaining.values():
+            needs.difference_update(ready)
+    return waves
+
+
+def legacy_waves(groups: list[str], files_for) -> list[list[str]]:
+    """Waves for `groups`, reading each group's compose files via `files_for(group)`."""
+    infos = {group: group_info(files_for(group)) for group in groups}
+    return plan_waves(group_dependencies(infos))
+
+
+__all__ = ["GroupInfo", "group_dependencies", "group_info", "legacy_waves", "plan_waves"]
@@ -1,13 +1,18 @@
 """Status command — read-only view of compose-managed containers.
 
-Layered as four sections, top-down by abstraction level:
+Layered as five sections, top-down by abstraction level:
 
-  1. **Data fetchers**: raw `docker network inspect` / `docker ps` / `/proc/meminfo` calls.
+  1. **Data fetchers**: raw Docker Engine API reads (`kompose.docker`, with
+     the `docker network inspect` / `docker ps` CLI as fallback) and
+     `/proc/meminfo`.
   2. **Formatters**: pure functions that turn raw strings into display cells
      (ports, CPU%, memory %, IP-sortable tuples).
-  3. **Stats sources**: `StatsSource` interface with snapshot (one-shot) and
-     streaming (background `docker stats`) implementations.
-  4. **Table + commands**: gather → build → render, plus the live `-f` watch loop
+  3. **Stats sources**: `StatsSource` interface with cgroup v2 (direct file
+     reads), snapshot (one-shot) and streaming (background `docker stats`)
+     implementations.
+  4. **Live model**: `ContainerModel`, the in-memory container state behind
+     the `-f` watch loop — seeded once, then kept current from docker events.
+  5. **Table + commands**: gather → build → render, plus the live `-f` watch loop
      that uses the terminal's alternate screen buffer (htop/vim style).
 
 The status code is intentionally separate from `compose.py` because it doesn't
@@ -26,6 +31,7 @@ import threading
 import time
 from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from pathlib import Path
 
 from .compose import (
     build_service_to_group_map,
@@ -35,10 +41,15 @@ from .compose import (
     run_root_compose,
 )
 from .config import get_services
+from .docker import DockerClient, DockerError, LogStream, get_client
 from .utils import Colors, Table
 
 REVERSE_PROXY_NETWORK = "reverse-proxy"
+CGROUP_ROOT = Path("/sys/fs/cgroup")
 _UNSORTABLE_IP = (999, 999, 999, 999)
+# Gap between the two cgroup reads of a snapshot, and the shortest window a
+# live-mode CPU% is computed over (event-driven frames can be ms apart).
+_CGROUP_SAMPLE_INTERVAL = 0.5
 
 
 # ---------------------------------------------------------------------------
@@ -46,28 +57,64 @@ _UNSORTABLE_IP = (999, 999, 999, 999)
 # ---------------------------------------------------------------------------
 
 
+def _network_ips(containers_data: dict) -> dict[str, dict]:
+    """Map container name → {ipv4, ipv6} from a network's `Containers` block."""
+    containers = {}
+    for info in (containers_data or {}).values():
+        name = info.get("Name", "")
+        containers[name] = {
+            "ipv4": info.get("IPv4Address", "").split("/")[0],
+            "ipv6": info.get("IPv6Address", "").split("/")[0],
+        }
+    return containers
+
+
 def get_network_containers(network: str = REVERSE_PROXY_NETWORK) -> dict[str, dict]:
     """Get containers and their IPs from a docker network."""
+    client = get_client()
+    if client is not None:
+        try:
+            return _network_ips(client.inspect_network(network).get("Containers") or {})
+        except DockerError as e:
+            if e.status == 404:
+                return {}
+            # Anything else (socket hiccup, permission) → try the CLI.
+
     cmd = ["docker", "network", "inspect", network, "--format", "{{ json .Containers }}"]
     try:
         result = subprocess.run(cmd, capture_output=True, text=True)
         if result.returncode != 0:
             return {}
-        containers_data = json.loads(result.stdout.strip())
-        containers = {}
-        for info in containers_data.values():
-            name = info.get("Name", "")
-            containers[name] = {
-                "ipv4": info.get("IPv4Address", "").split("/")[0],
-                "ipv6": info.get("IPv6Address", "").split("/")[0],
-            }
-        return containers
+        return _network_ips(json.loads(result.stdout.strip()))
     except Exception:
         return {}
 
 
+def _container_from_api(data: dict) -> dict:
+    """Normalise a `GET /containers/json` entry to the shape the table expects."""
+    labels = data.get("Labels") or {}
+    names = data.get("Names") or [""]
+    return {
+        "ID": data.get("Id", ""),
+        "Name": names[0].lstrip("/"),
+        "State": data.get("State", ""),
+        "Status": data.get("Status", ""),
+        "ExposedPorts": _api_ports(data.get("Ports") or []),
+        "_project": labels.get("com.docker.compose.project", ""),
+        "_service": labels.get("com.docker.compose.service", ""),
+    }
+
+
 def _get_all_compose_containers() -> list[dict]:
-    """Get all compose-managed containers with a single docker ps call."""
+    """Get all compose-managed containers with a single list call (API, else `docker ps`)."""
+    client = get_client()
+    if client is not None:
+        try:
+            raw = client.list_containers(all=True, filters={"label": ["com.docker.compose.project"]})
+            return [_container_from_api(c) for c in raw]
+        except DockerError:
+            pass
+
     cmd = ["docker", "ps", "-a", "--filter", "label=com.docker.compose.project", "--format", "json"]
     try:
         result = subprocess.run(cmd, capture_output=True, text=True)
@@ -83,6 +130,7 @@ def _get_all_compose_containers() -> list[dict]:
                 continue
             labels = dict(p.split("=", 1) for p in data.get("Labels", "").split(",") if "=" in p)
             containers.append({
+                "ID": data.get("ID", ""),
                 "Name": data.get("Names", ""),
                 "State": data.get("State", ""),
                 "Status": data.get("Status", ""),
@@ -151,6 +199,37 @@ def _parse_exposed_ports(ports_str: str) -> list[str]:
     return out
 
 
+def _api_ports(ports: list[dict]) -> list[str]:
+    """Same output as `_parse_exposed_ports`, from the API's structured `Ports` list.
+
+    The API lists every port individually (and once per published address), so
+    consecutive ports of the same protocol are folded back into `a-b/<proto>`
+    ranges the way `docker ps` displays them.
+
+    Input example:
+      `[{PrivatePort: 80, Type: tcp, PublicPort: 8080}, {PrivatePort: 80, Type: tcp}]` → ['80/tcp']
+    """
+    by_proto: dict[str, set[int]] = {}
+    for entry in ports:
+        private = entry.get("PrivatePort")
+        if not isinstance(private, int):
+            continue
+        by_proto.setdefault(entry.get("Type") or "tcp", set()).add(private)
+
+    out: list[str] = []
+    for proto, numbers in by_proto.items():
+        ordered = sorted(numbers)
+        start = prev = ordered[0]
+        for port in ordered[1:] + [None]:
+            if port is not None and port == prev + 1:
+                prev = port
+                continue
+            out.append(f"{start}/{proto}" if start == prev else f"{start}-{prev}/{proto}")
+            if port is not None:
+                start = prev = port
+    return out
+
+
 def _format_ports(ports: list[str], limit: int = 4) -> str:
     """Format a list of exposed ports for the status table (top `limit` + `+N`)."""
     if not ports:
@@ -241,7 +320,7 @@ def _format_cpu(cpu_perc_str: str) -> str:
 
 
 # ---------------------------------------------------------------------------
-# Stats sources — snapshot (one-shot) vs streaming (live `-f` mode)
+# Stats sources — cgroup files, snapshot (one-shot) vs streaming (live `-f` mode)
 # ---------------------------------------------------------------------------
 
 
@@ -257,6 +336,66 @@ def _parse_stats_line(line: str) -> tuple[str, dict] | None:
     return (name, data) if name else None
 
 
+def _docker_bytes(value: float) -> str:
+    """Render bytes like `docker stats` does (go-units `BytesSize`: 4 significant digits, binary units)."""
+    for unit in ("B", "KiB", "MiB", "GiB", "TiB"):
+        if value < 1024 or unit == "TiB":
+            return f"{value:.4g}{unit}"
+        value /= 1024
+    return f"{value:.4g}TiB"
+
+
+def _stats_from_api(data: dict) -> dict:
+    """Convert a `GET /containers/{id}/stats` sample to the `docker stats` JSON fields we render.
+
+    CPU% follows the CLI formula (delta container time / delta system time ×
+    online CPUs), so 100% = one core saturated. Memory subtracts the page
+    cache (`inactive_file`) from usage, as the CLI does.
+    """
+    cpu = data.get("cpu_stats") or {}
+    pre = data.get("precpu_stats") or {}
+    cpu_delta = (cpu.get("cpu_usage") or {}).get("total_usage", 0) - (pre.get("cpu_usage") or {}).get("total_usage", 0)
+    system_delta = (cpu.get("system_cpu_usage") or 0) - (pre.get("system_cpu_usage") or 0)
+    online = cpu.get("online_cpus") or len((cpu.get("cpu_usage") or {}).get("percpu_usage") or []) or 1
+    cpu_pct = (cpu_delta / system_delta) * online * 100 if cpu_delta > 0 and system_delta > 0 else 0.0
+
+    mem = data.get("memory_stats") or {}
+    usage = mem.get("usage") or 0
+    mem_detail = mem.get("stats") or {}
+    cache = mem_detail.get("inactive_file", mem_detail.get("total_inactive_file", 0)) or 0
+    if cache < usage:
+        usage -= cache
+    limit = mem.get("limit") or 0
+
+    out = {"Name": (data.get("name") or "").lstrip("/"), "CPUPerc": f"{cpu_pct:.2f}%"}
+    if limit:
+        out["MemUsage"] = f"{_docker_bytes(usage)} / {_docker_bytes(limit)}"
+    return out
+
+
+def _api_stats_snapshot(client: DockerClient) -> dict[str, dict]:
+    """One stats sample per running container, fetched concurrently.
+
+    Each `stream=false` call blocks ~1s on the daemon (two readings for the
+    CPU delta); fanning out keeps the whole snapshot at ~1s regardless of the
+    container count.
+    """
+    running = client.list_containers()
+    if not running:
+        return {}
+
+    def sample(container: dict) -> tuple[str, dict] | None:
+        try:
+            stats = _stats_from_api(client.stats(container["Id"]))
+        except DockerError:
+            return None  # container stopped between list and stats — skip it
+        name = (container.get("Names") or [""])[0].lstrip("/")
+        return name, stats
+
+    with ThreadPoolExecutor(max_workers=min(8, len(running))) as pool:
+        return {name: stats for name, stats in filter(None, pool.map(sample, running))}
+
+
 class StatsSource:
     """Interface — returns the latest stats dict for a container, or {} if absent."""
 
@@ -268,12 +407,20 @@ class StatsSource:
 
 
 class SnapshotStats(StatsSource):
-    """One-shot `docker stats --no-stream` fetch."""
+    """One-shot stats fetch — Engine API per container, else `docker stats --no-stream`."""
 
     def __init__(self):
         self._data: dict[str, dict] = {}
 
     def load(self) -> None:
+        client = get_client()
+        if client is not None:
+            try:
+                self._data = _api_stats_snapshot(client)
+                return
+            except DockerError:
+                pass
+
         cmd = ["docker", "stats", "--no-stream", "--format", "{{json .}}"]
         try:
             result = subprocess.run(cmd, capture_output=True, text=True)
@@ -340,35 +487,427 @@ class StreamingStats(StatsSource):
             self._proc = None
 
 
+def _find_cgroup_dir(root: Path, container_id: str) -> Path | None:
+    """Locate a container's cgroup v2 dir (systemd or cgroupfs driver layout).
+
+    Truncated ids (`docker ps` CLI output) are resolved with a prefix glob.
+    """
+    layouts = ("system.slice/docker-{}.scope", "docker/{}")
+    for layout in layouts:
+        path = root / layout.format(container_id)
+        if path.is_dir():
+            return path
+    if len(container_id) < 64:
+        for layout in layouts:
+            matches = [p for p in root.glob(layout.format(f"{container_id}*")) if p.is_dir()]
+            if len(matches) == 1:
+                return matches[0]
+    return None
+
+
+def _read_cgroup_cpu_usec(path: Path) -> int | None:
+    """Cumulative CPU time (µs) from `cpu.stat`, or None if unreadable."""
+    try:
+        with open(path / "cpu.stat") as f:
+            for line in f:
+                key, _, value = line.partition(" ")
+                if key == "usage_usec":
+                    return int(value)
+    except (OSError, ValueError):
+        return None
+    return None
+
+
+def _read_cgroup_memory(path: Path) -> tuple[int, int] | None:
+    """`(usage, limit)` in bytes; usage excludes page cache, limit 0 means unlimited."""
+    try:
+        current = int((path / "memory.current").read_text())
+        raw_max = (path / "memory.max").read_text().strip()
+    except (OSError, ValueError):
+        return None
+    try:
+        with open(path / "memory.stat") as f:
+            for line in f:
+                if line.startswith("inactive_file "):
+                    inactive = int(line.split()[1])
+                    if inactive < current:
+                        current -= inactive
+                    break
+    except (OSError, ValueError):
+        pass
+    return current, 0 if raw_max == "max" else int(raw_max)
+
+
+class CgroupStats(StatsSource):
+    """CPU/Mem read straight from each container's cgroup v2 files.
+
+    CPU% is the `cpu.stat` `usage_usec` delta over the wall time between two
+    `sample()` calls — 100% = one core, the `docker stats` scale. Memory is
+    `memory.current` minus `inactive_file` against `memory.max` (`max` →
+    system memory, as the CLI reports it). Values are rendered to the same
+    `CPUPerc` / `MemUsage` strings, so `_stats_cells` / `_format_memory` read
+    this source exactly like the docker ones. No daemon round trip, no
+    two-second sampling wait.
+    """
+
+    def __init__(self, root: Path = CGROUP_ROOT, system_mem: float | None = None):
+        self.root = root
+        self.system_mem = _get_system_memory() if system_mem is None else system_mem
+        self._names: dict[str, str] = {}                 # container name → id
+        self._dirs: dict[str, Path | None] = {}          # container id → cgroup dir
+        self._prev: dict[str, tuple[int, float]] = {}    # container id → (usage_usec, monotonic)
+        self._data: dict[str, dict] = {}
+
+    def available(self) -> bool:
+        """True on a cgroup v2 (unified) host."""
+        return (self.root / "cgroup.controllers").is_file()
+
+    def track(self, containers: dict[str, str]) -> bool:
+        """Set the containers to sample (name → id). False if any has no cgroup dir."""
+        self._names = dict(containers)
+        for container_id in self._names.values():
+            if self._dirs.get(container_id) is None:
+                self._dirs[container_id] = _find_cgroup_dir(self.root, container_id)
+        return all(self._dirs[cid] is not None for cid in self._names.values())
+
+    def sample(self) -> None:
+        now = time.monotonic()
+        data: dict[str, dict] = {}
+        for name, container_id in self._names.items():
+            path = self._dirs.get(container_id)
+            if path is None:
+                continue
+            stats = dict(self._data.get(name, {}))
+            usage = _read_cgroup_cpu_usec(path)
+            prev = self._prev.get(container_id)
+            if usage is not None and (prev is None or now - prev[1] >= _CGROUP_SAMPLE_INTERVAL):
+                # A lower counter means the cgroup was recreated (restart) — just re-baseline.
+                if prev is not None and usage >= prev[0]:
+                    stats["CPUPerc"] = f"{(usage - prev[0]) / ((now - prev[1]) * 1e6) * 100:.2f}%"
+                self._prev[container_id] = (usage, now)
+            memory = _read_cgroup_memory(path)
+            if memory is not None:
+                used, limit = memory
+                limit = limit or self.system_mem
+                if limit:
+                    stats["MemUsage"] = f"{_docker_bytes(used)} / {_docker_bytes(limit)}"
+            if stats:
+                data[name] = stats
+        self._data = data
+
+    def get(self, name: str) -> dict:
+        return self._data.get(name, {})
+
+
+def _running_ids(containers: list[dict]) -> dict[str, str]:
+    """name → id for the running containers among `containers`."""
+    return {c["Name"]: c["ID"] for c in containers if c.get("State") == "running" and c.get("ID")}
+
+
+def _load_snapshot_stats(containers: list[dict]) -> StatsSource:
+    """One-shot stats for `containers`: two cgroup reads, else the docker snapshot."""
+    cgroup = CgroupStats()
+    running = _running_ids(containers)
+    if cgroup.available() and cgroup.track(running):
+        cgroup.sample()
+        if running:
+            time.sleep(_CGROUP_SAMPLE_INTERVAL)
+            cgroup.sample()
+        return cgroup
+    snap = SnapshotStats()
+    snap.load()
+    return snap
+
+
 # ---------------------------------------------------------------------------
-# Table + render — gather containers, build the table, drill into a service
+# Live model — event-driven container state for the `-f` watch loop
 # ---------------------------------------------------------------------------
 
 
-def _gather_status_groups(host: str | None, service_arg: str | None) -> tuple[list[tuple[str, list[dict]]], list]:
-    """Collect & group containers for the status view. Pure (no stats fetch)."""
-    services = get_services(host)
-    if not services:
-        return [], []
+# Events that can change a row. Healthcheck runs also emit exec_* events every
+# few seconds per container; those are filtered out daemon-side.
+_CONTAINER_EVENTS = (
+    "create", "start", "restart", "die", "stop", "kill", "oom",
+    "pause", "unpause", "rename", "destroy", "health_status",
+)
+_NETWORK_EVENTS = ("connect", "disconnect")
 
-    service_to_group = build_service_to_group_map(host)
-    service_dir_names = {s.name for s in services}
+_DOCKER_TIME_RE = re.compile(r"(\d{4}-\d\d-\d\dT\d\d:\d\d:\d\d)(?:\.(\d+))?(Z|[+-]\d\d:\d\d)?$")
 
-    with ThreadPoolExecutor(max_workers=2) as pool:
-        future_containers = pool.submit(_get_all_compose_containers)
-        future_network = pool.submit(get_network_containers, REVERSE_PROXY_NETWORK)
-        all_containers = future_containers.result()
-        network_containers = future_network.result()
 
+def _parse_docker_time(value: str | None) -> float | None:
+    """RFC 3339 (nanosecond) timestamp from inspect → epoch seconds; None for Go's zero time."""
+    if not value or value.startswith("0001-"):
+        return None
+    match = _DOCKER_TIME_RE.match(value)
+    if not match:
+        return None
+    base, frac, tz = match.groups()
+    stamp = datetime.fromisoformat(base + ("+00:00" if tz in (None, "Z") else tz)).timestamp()
+    return stamp + (float(f"0.{frac}") if frac else 0.0)
+
+
+def _human_duration(seconds: float) -> str:
+    """Docker's relative duration wording (go-units `HumanDuration`), e.g. `About an hour`."""
+    secs = int(seconds)
+    if secs < 1:
+        return "Less than a second"
+    if secs == 1:
+        return "1 second"
+    if secs < 60:
+        return f"{secs} seconds"
+    minutes = secs // 60
+    if minutes == 1:
+        return "About a minute"
+    if minutes < 60:
+        return f"{minutes} minutes"
+    hours = int(seconds / 3600 + 0.5)
+    if hours == 1:
+        return "About an hour"
+    if hours < 48:
+        return f"{hours} hours"
+    if hours < 24 * 7 * 2:
+        return f"{hours // 24} days"
+    if hours < 24 * 30 * 2:
+        return f"{hours // 24 // 7} weeks"
+    if hours < 24 * 365 * 2:
+        return f"{hours // 24 // 30} months"
+    return f"{int(seconds / 3600) // 24 // 365} years"
+
+
+def _status_text(state: dict, now: float) -> str:
+    """Rebuild the `docker ps` Status column from an inspect `State` block.
+
+    Computed at render time so "Up 5 minutes" keeps ticking without asking
+    the daemon again.
+    """
+    started = _parse_docker_time(state.get("StartedAt"))
+    finished = _parse_docker_time(state.get("FinishedAt"))
+    exit_code = state.get("ExitCode", 0)
+    if state.get("Running"):
+        up = _human_duration(now - started) if started else "Less than a second"
+        if state.get("Paused"):
+            return f"Up {up} (Paused)"
+        if state.get("Restarting"):
+            ago = _human_duration(now - finished) if finished else "Less than a second"
+            return f"Restarting ({exit_code}) {ago} ago"
+        health = (state.get("Health") or {}).get("Status")
+        if health:
+            return f"Up {up} ({'health: starting' if health == 'starting' else health})"
+        return f"Up {up}"
+    if state.get("Status") == "removing":
+        return "Removal In Progress"
+    if state.get("Dead"):
+        return "Dead"
+    if started is None:
+        return "Created"
+    if finished is None:
+        return ""
+    return f"Exited ({exit_code}) {_human_duration(now - finished)} ago"
+
+
+def _container_from_inspect(data: dict, network: str = REVERSE_PROXY_NETWORK) -> dict:
+    """Build a model row from `GET /containers/{id}/json` (or `docker inspect`).
+
+    Same keys as `_get_all_compose_containers` plus `_ip` (read from the
+    container's own network settings, so no separate network inspect is
+    needed) and `_state`, the raw State block `_status_text` renders from.
+    """
+    state = data.get("State") or {}
+    labels = (data.get("Config") or {}).get("Labels") or {}
+    settings = data.get("NetworkSettings") or {}
+    ports = []
+    for key in settings.get("Ports") or {}:
+        number, _, proto = key.partition("/")
+        if number.isdigit():
+            ports.append({"PrivatePort": int(number), "Type": proto or "tcp"})
+    return {
+        "ID": data.get("Id", ""),
+        "Name": (data.get("Name") or "").lstrip("/"),
+        "State": state.get("Status", ""),
+        "ExposedPorts": _api_ports(ports),
+        "_project": labels.get("com.docker.compose.project", ""),
+        "_service": labels.get("com.docker.compose.service", ""),
+        "_ip": ((settings.get("Networks") or {}).get(network) or {}).get("IPAddress", ""),
+        "_state": state,
+    }
+
+
+def _inspect_containers(ids: list[str], network: str = REVERSE_PROXY_NETWORK) -> list[dict]:
+    """Inspect `ids` (API in parallel, else one `docker inspect`); vanished ids are skipped."""
+    if not ids:
+        return []
+    client = get_client()
+    if client is not None:
+        def inspect(container_id: str) -> dict | None:
+            try:
+                return client.inspect_container(container_id)
+            except DockerError:
+                return None
+
+        with ThreadPoolExecutor(max_workers=min(8, len(ids))) as pool:
+            return [_container_from_inspect(d, network) for d in pool.map(inspect, ids) if d]
+
+    try:
+        result = subprocess.run(["docker", "inspect", *ids], capture_output=True, text=True)
+        # Non-zero when some id vanished; stdout still holds the ones that exist.
+        return [_container_from_inspect(d, network) for d in json.loads(result.stdout or "[]")]
+    except Exception:
+        return []
+
+
+class ContainerModel:
+    """In-memory compose container state, kept current by docker events.
+
+    Seeded once (list + inspect). A background thread then follows the event
+    feed (Engine API, else `docker events`) and re-inspects only the
+    container an event names. The watch loop reads `rows()` from memory and
+    waits on `changed`, so a start/stop shows up on the next frame instead of
+    after a full refresh interval. If the feed drops (daemon restart), the
+    model re-seeds and re-subscribes.
+    """
+
+    def __init__(self, network: str = REVERSE_PROXY_NETWORK):
+        self.network = network
+        self.changed = threading.Event()
+        self._rows: dict[str, dict] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._stream: LogStream | None = None
+        self._proc: subprocess.Popen | None = None
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        # Subscribe from *before* the seed so nothing between the two is lost;
+        # replayed events just re-inspect a container, which is idempotent.
+        since = time.time()
+        self.seed()
+        self._thread = threading.Thread(target=self._follow, args=(since,), daemon=True)
+        self._thread.start()
+
+    def seed(self) -> None:
+        ids = [c["ID"] for c in _get_all_compose_containers() if c.get("ID")]
+        rows = {row["ID"]: row for row in _inspect_containers(ids, self.network)}
+        with self._lock:
+            self._rows = rows
+        self.changed.set()
+
+    def rows(self) -> list[dict]:
+        """Copies of every row with a freshly computed `Status`."""
+        now = time.time()
+        with self._lock:
+            rows = [dict(row) for row in self._rows.values()]
+        for row in rows:
+            row["Status"] = _status_text(row["_state"], now)
+        return rows
+
+    def apply(self, event: dict) -> None:
+        """Fold one docker event into the model."""
+        actor = event.get("Actor") or {}
+        attrs = actor.get("Attributes") or {}
+        action = (event.get("Action") or "").split(":", 1)[0]  # "health_status: healthy"
+        kind = event.get("Type")
+        if kind == "container":
+            if action not in _CONTAINER_EVENTS or "com.docker.compose.project" not in attrs:
+                return
+            container_id = actor.get("ID", "")
+        elif kind == "network":
+            if action not in _NETWORK_EVENTS or attrs.get("name") != self.network:
+                return
+            container_id = attrs.get("container", "")
+        else:
+            return
+        if not container_id:
+            return
+
+        found = [] if action == "destroy" else _inspect_containers([container_id], self.network)
+        with self._lock:
+            if found and found[0].get("_project"):
+                self._rows[container_id] = found[0]
+            elif self._rows.pop(container_id, None) is None:
+                return  # not ours and never was — nothing changed
+        self.changed.set()
+
+    def _follow(self, since: float) -> None:
+        while not self._stop.is_set():
+            for event in self._events(since):
+                if self._stop.is_set():
+                    return
+                self.apply(event)
+            if self._stop.wait(1.0):
+                return
+            since = time.time()
+            self.seed()
+
+    def _events(self, since: float):
+        """Yield decoded events from the API feed, or from `docker events` as a fallback."""
+        client = get_client()
+        lines = None
+        if client is not None:
+            try:
+                self._stream = client.events(since=since, filters={
+                    "type": ["container", "network"],
+                    "event": [*_CONTAINER_EVENTS, *_NETWORK_EVENTS],
+                })
+                lines = iter(self._stream)
+            except DockerError:
+                self._stream = None
+        if lines is None:
+            cmd = ["docker", "events", "--since", f"{since:.3f}", "--format", "{{json .}}",
+                   "--filter", "type=container", "--filter", "type=network"]
+            for action in (*_CONTAINER_EVENTS, *_NETWORK_EVENTS):
+                cmd += ["--filter", f"event={action}"]
+            try:
+                self._proc = subprocess.Popen(
+                    cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True, bufsize=1,
+                )
+            except OSError:
+                return
+            lines = self._proc.stdout
+        try:
+            for line in lines:
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+        except Exception:
+            return
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._stream is not None:
+            self._stream.close()
+            self._stream = None
+        if self._proc is not None:
+            try:
+                self._proc.terminate()
+                self._proc.wait(timeout=2)
+            except subprocess.TimeoutExpired:
+                self._proc.kill()
+            except Exception:
+                pass
+            self._proc = None
+
+
+# ---------------------------------------------------------------------------
+# Table + render — gather containers, build the table, drill into a service
+# ---------------------------------------------------------------------------
+
+
+def _group_status_containers(
+    containers: list[dict],
+    service_to_group: dict[str, str],
+    service_dir_names: set[str],
+    service_arg: str | None,
+) -> list[tuple[str, list[dict]]]:
+    """Group containers (with `_ip` already set) by service dir, filter, sort by IP. Pure."""
     service_groups: dict[str, list[dict]] = {}
-    for container in all_containers:
+    for container in containers:
         project = container.get("_project", "")
         svc_label = container.get("_service", "")
         group = service_to_group.get(svc_label) if service_to_group else project
         if not group or group not in service_dir_names:
             continue
-        name = container.get("Name", "")
-        container["_ip"] = network_containers.get(name, {}).get("ipv4", "")
         container["_service_dir"] = group
         service_groups.setdefault(group, []).append(container)
 
@@ -389,10 +928,31 @@ def _gather_status_groups(host: str | None, service_arg: str | None) -> tuple[li
                 return c["_ip"]
         return ""
 
-    sorted_services = sorted(
+    return sorted(
         service_groups.items(),
         key=lambda x: parse_ip_for_sort(get_main_ip(x[1]))
     )
+
+
+def _gather_status_groups(host: str | None, service_arg: str | None) -> tuple[list[tuple[str, list[dict]]], list]:
+    """Collect & group containers for the status view. Pure (no stats fetch)."""
+    services = get_services(host)
+    if not services:
+        return [], []
+
+    service_to_group = build_service_to_group_map(host)
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        future_containers = pool.submit(_get_all_compose_containers)
+        future_network = pool.submit(get_network_containers, REVERSE_PROXY_NETWORK)
+        all_containers = future_containers.result()
+        network_containers = future_network.result()
+
+    for container in all_containers:
+        container["_ip"] = network_containers.get(container.get("Name", ""), {}).get("ipv4", "")
+    sorted_services = _group_status_containers(
+        all_containers, service_to_group, {s.name for s in services}, service_arg,
+    )
     return sorted_services, services
 
 
@@ -507,26 +1067,22 @@ def _render_drilldown_logs(host: str | None, service_arg: str, tail: str, follow
         run_compose(service_arg, "logs", host, extra)
 
 
-def _render_status_once(
-    args,
-    host: str | None,
+def _print_status_table(
+    sorted_services: list[tuple[str, list[dict]]],
+    services: list,
     service_arg: str | None,
     show_stats: bool,
     stats_source: StatsSource | None,
-    *,
-    follow_logs: bool,
-) -> int:
-    """Render a single snapshot of the status table. Used by snapshot AND watch modes."""
-    sorted_services, services = _gather_status_groups(host, service_arg)
-
+) -> None:
+    """Print the grouped table + running count (or the matching empty-state message)."""
     if not services:
         print(f"{Colors.YELLOW}No services found{Colors.RESET}")
-        return 0
+        return
 
     if not sorted_services:
         msg = f"No containers found for '{service_arg}'" if service_arg else "No containers found"
         print(f"{Colors.YELLOW}{msg}{Colors.RESET}")
-        return 0
+        return
 
     system_mem = _get_system_memory() if show_stats else 0
     system_mem_str = _compact_mem(system_mem) if system_mem > 0 else "?"
@@ -543,7 +1099,23 @@ def _render_status_once(
     print(table_text)
     print(f"\n{Colors.GREEN}{running}{Colors.RESET}/{total} container(s) running")
 
-    if service_arg and not getattr(args, "no_logs", False):
+
+def _render_status_once(
+    args,
+    host: str | None,
+    service_arg: str | None,
+    show_stats: bool,
+    *,
+    follow_logs: bool,
+) -> int:
+    """Render a single snapshot of the status table (fresh docker reads)."""
+    sorted_services, services = _gather_status_groups(host, service_arg)
+    stats_source: StatsSource | None = None
+    if show_stats and sorted_services:
+        stats_source = _load_snapshot_stats([c for _, conts in sorted_services for c in conts])
+    _print_status_table(sorted_services, services, service_arg, show_stats, stats_source)
+
+    if sorted_services and service_arg and not getattr(args, "no_logs", False):
         _render_drilldown_logs(host, service_arg, str(getattr(args, "tail", "30")), follow_logs)
 
     return 0
@@ -573,32 +1145,56 @@ def cmd_status(args) -> int:
 
     # Snapshot mode.
     show_stats = getattr(args, "stats", False) or bool(service_arg)
-    stats_source: StatsSource | None = None
-    if show_stats:
-        snap = SnapshotStats()
-        snap.load()
-        stats_source = snap
+    return _render_status_once(args, host, service_arg, show_stats, follow_logs=follow)
 
-    return _render_status_once(args, host, service_arg, show_stats, stats_source, follow_logs=follow)
+
+def _compose_layout(host: str | None) -> tuple[list[Path], dict[str, str], set[str]]:
+    """(group dirs, compose service → group, group dir names) for one frame.
+
+    Re-read every frame so groups and includes added or edited while
+    `status -f` runs show up. Cheap: the compose index only re-parses files
+    whose mtime / size moved, so an unchanged tree costs a few `stat` calls.
+    """
+    services = get_services(host)
+    service_to_group = build_service_to_group_map(host) if services else {}
+    return services, service_to_group, {s.name for s in services}
 
 
 def _watch_status(args) -> int:
-    """Live refreshing status table (kompose status -f). Stats stream in background.
+    """Live refreshing status table (kompose status -f). Stats from cgroups or a `docker stats` stream.
 
     Renders inside the terminal's *alternate screen buffer* (`\\033[?1049h`),
     the same technique `htop`/`vim`/`less` use. On exit, the original terminal
     content is restored — nothing from the live session pollutes the scrollback.
     Each frame is built in memory then written atomically to avoid mid-render
     flicker.
+
+    Frames read container state from a `ContainerModel` (seeded once, updated
+    from docker events) — no docker reads per frame. The compose grouping is
+    re-derived each frame through the compose index (see `_compose_layout`).
+    A frame is drawn every `-i` seconds for fresh stats, or immediately when
+    an event changes the model.
     """
     host = getattr(args, "host", None)
     interval = max(1, int(getattr(args, "interval", 2) or 2))
     show_stats = True  # live mode implies stats (otherwise why refresh?)
 
-    streamer = StreamingStats()
-    streamer.start()
-    # Give the streamer ~1s to receive the first batch of samples before the first render.
-    time.sleep(1.0)
+    model = ContainerModel()
+    model.start()
+    # cgroup files when every running container has one; else stream `docker stats`.
+    cgroup = CgroupStats()
+    stats_source: StatsSource
+    if cgroup.available() and cgroup.track(_running_ids(model.rows())):
+        cgroup.sample()
+        stats_source = cgroup
+        time.sleep(_CGROUP_SAMPLE_INTERVAL)
+    else:
+        cgroup = None
+        streamer = StreamingStats()
+        streamer.start()
+        stats_source = streamer
+        # Give the streamer ~1s to receive the first batch of samples before the first render.
+        time.sleep(1.0)
 
     # Enter alternate screen buffer + hide cursor.
     sys.stdout.write("\033[?1049h\033[?25l")
@@ -606,28 +1202,38 @@ def _watch_status(args) -> int:
 
     try:
         while True:
+            # Cleared before reading so an event landing mid-render triggers the next frame.
+            model.changed.clear()
             now = datetime.now().strftime("%H:%M:%S")
             header = (
                 f"{Colors.BOLD}kompose status --stats -f{Colors.RESET}  "
                 f"{Colors.GRAY}refresh {interval}s · {now} · Ctrl+C to exit{Colors.RESET}"
             )
 
+            services, service_to_group, service_dir_names = _compose_layout(host)
+            rows = model.rows()
+            if cgroup is not None:
+                cgroup.track(_running_ids(rows))
+                cgroup.sample()
+            sorted_services = _group_status_containers(rows, service_to_group, service_dir_names, None)
+
             # Capture the table render to a buffer so we can write the whole
             # frame atomically — no flicker from partial paints.
             buf = io.StringIO()
             with contextlib.redirect_stdout(buf):
-                _render_status_once(args, host, None, show_stats, streamer, follow_logs=False)
+                _print_status_table(sorted_services, services, None, show_stats, stats_source)
 
             # Compose frame: cursor home → header → captured table → clear-to-end.
             frame = "\033[H" + header + "\n" + buf.getvalue() + "\033[J"
             sys.stdout.write(frame)
             sys.stdout.flush()
 
-            time.sleep(interval)
+            model.changed.wait(interval)
     except KeyboardInterrupt:
         pass
     finally:
-        streamer.close()
+        model.stop()
+        stats_source.close()
         # Show cursor + leave alternate screen buffer (restores prior content).
         sys.stdout.write("\033[?25h\033[?1049l")
         sys.stdout.flush()
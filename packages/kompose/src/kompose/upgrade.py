@@ -4,15 +4,45 @@ Exposes two flows:
 
 - **Trigger** (`kompose upgrade [service]`): synchronously POSTs to
   `<watchtower>/v1/update`. While waiting, a background thread tails
-  `docker logs -f watchtower --since <t0>`, filters for the high-signal
+  watchtower's logs from `<t0>` (Engine API over the docker socket, or
+  `docker logs -f` when the socket isn't reachable), filters for the high-signal
   events (Pulling / Stopping / Creating / Started / Removed image), and
   renders them compactly. The HTTP response's JSON report is used as the
-  authoritative final summary.
-
-- **Read-only logs** (`kompose upgrade --logs`): parses
-  `docker logs watchtower` and slices the most recent session — between the
-  last "Received HTTP API update request" / "Running update on schedule"
-  trigger and the matching "Update session completed". No HTTP call.
+  authoritative final summary. Unless `--no-check` is given, the images are
+  first compared with their registry's current digest and with what their
+  containers run (`registry.py`), and only the stale ones are sent, so
+  watchtower doesn't spend the session re-checking images that haven't
+  moved. The untargeted form is only narrowed this way when every running
+  container uses an image of the root compose's groups; otherwise it stays
+  a full watchtower scan.
+
+- **Several targets** (`kompose upgrade a b c [--parallel N]`): each target
+  is resolved on its own and gets its own `/v1/update` request, up to N in
+  flight. Watchtower runs one session at a time and queues the targeted
+  requests behind its lock, so kompose just keeps the queue full. Each
+  request's timeout grows with the number of requests ahead of it, and one
+  that still times out while an earlier one is in flight is reported as
+  "timed out while queued" rather than as a failed session; the shared
+  log tail attributes each event to its group (by image, then container) and
+  every group gets its own row in the final summary.
+
+- **Read-only logs** (`kompose upgrade --logs`): reads watchtower's logs
+  newest first — the json-file log backwards in growing chunks when it is
+  readable, else growing `--tail` windows (same API-then-CLI source) — and
+  stops at the most recent session: between the last "Received HTTP API
+  update request" / "Running update on schedule" trigger and the matching
+  "Update session completed". No HTTP call.
+
+- **History** (`kompose upgrade --history [service]`): every completed
+  session seen by the two flows above is stored in a local index
+  (`history.py`); this renders the per-image update timeline from it
+  without reading any container logs.
+
+- **Native engine** (`kompose upgrade --engine native [service…]`): no
+  watchtower involved — `native.py` pulls the images itself, compares image
+  IDs and recreates only the services whose image changed, reporting
+  watchtower-shaped events that are rendered (and recorded in the history)
+  like a watchtower session.
 
 Resolution & config:
   - Token  → `<host>/watchtower/.env::WATCHTOWER_HTTP_API_TOKEN`
@@ -31,24 +61,28 @@ Exit codes:
 from __future__ import annotations
 
 import json
+import os
 import re
 import subprocess
 import threading
-import time
 import urllib.error
 import urllib.parse
 import urllib.request
 from dataclasses import dataclass
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-
-import yaml
+from typing import Callable, Iterable, Iterator
 
 from ._engine import load_kompose_config
 from .compose import build_service_to_group_map
-from .config import get_host_dir
+from .compose_index import compose_index
+from .config import get_host_dir, get_services
+from .docker import DockerError, LogStream, get_client
 from .env import parse_env_file
-from .utils import Colors, confirm
+from .history import ImageUpdate, Session, UpgradeHistory, normalize_image
+from .native import NativeTarget, run_native
+from .registry import FRESH, NOT_PULLED, STALE, UNKNOWN, check_images, running_images
+from .utils import Colors, Table, confirm
 
 WATCHTOWER_SERVICE = "watchtower"
 WATCHTOWER_DEFAULT_PORT = 8080
@@ -109,23 +143,10 @@ def _watchtower_ip_from_compose(compose_path: Path) -> str | None:
     Prefers `reverse-proxy`; falls back to the first attached network that
     declares an `ipv4_address`. Returns None if no fixed IP is set.
     """
-    if not compose_path.exists():
-        return None
-    try:
-        parsed = yaml.safe_load(compose_path.read_text()) or {}
-    except (OSError, yaml.YAMLError):
-        return None
-    svc = (parsed.get("services") or {}).get(WATCHTOWER_SERVICE) or {}
-    networks = svc.get("networks") or {}
-    if not isinstance(networks, dict):
-        return None
-    preferred = networks.get(WATCHTOWER_DEFAULT_NETWORK)
-    if isinstance(preferred, dict) and preferred.get("ipv4_address"):
-        return preferred["ipv4_address"]
-    for entry in networks.values():
-        if isinstance(entry, dict) and entry.get("ipv4_address"):
-            return entry["ipv4_address"]
-    return None
+    addresses = compose_index().ipv4_addresses(compose_path, WATCHTOWER_SERVICE)
+    if WATCHTOWER_DEFAULT_NETWORK in addresses:
+        return addresses[WATCHTOWER_DEFAULT_NETWORK]
+    return next(iter(addresses.values()), None)
 
 
 # ---------------------------------------------------------------------------
@@ -147,12 +168,7 @@ def _is_updatable(image: object) -> bool:
 
 def _load_services_section(compose_path: Path) -> dict:
     """Return the `services:` mapping from a compose.yml, or `{}` on any failure."""
-    try:
-        parsed = yaml.safe_load(compose_path.read_text()) or {}
-    except (OSError, yaml.YAMLError):
-        return {}
-    services = parsed.get("services")
-    return services if isinstance(services, dict) else {}
+    return compose_index().services(compose_path)
 
 
 def extract_images_from_compose(compose_path: Path) -> list[str]:
@@ -221,6 +237,82 @@ def resolve_target(host: str | None, service: str | None) -> ImageResolution:
     )
 
 
+def resolve_native_targets(host: str | None, services: list[str]) -> list[NativeTarget]:
+    """Expand CLI targets to the (group, service, image) triples the native
+    engine works on. No targets means every group of the host."""
+    host_dir = get_host_dir(host)
+    service_to_group = build_service_to_group_map(host)
+    if services:
+        wanted = services
+    elif service_to_group:
+        wanted = sorted(set(service_to_group.values()))
+    else:
+        wanted = [d.name for d in get_services(host)]
+
+    targets: list[NativeTarget] = []
+    for target in wanted:
+        group_compose = host_dir / target / "compose.yml"
+        if group_compose.exists():
+            for name, svc_def in _load_services_section(group_compose).items():
+                image = svc_def.get("image") if isinstance(svc_def, dict) else None
+                if _is_updatable(image):
+                    targets.append(NativeTarget(target, target, name, image))
+            continue
+        group = service_to_group.get(target)
+        if not group:
+            raise FileNotFoundError(
+                f"Service '{target}' not found at {group_compose} "
+                f"and not declared in any group's compose.yml"
+            )
+        image = extract_image_for_service(host_dir / group / "compose.yml", target)
+        if image:
+            targets.append(NativeTarget(target, group, target, image))
+    return targets
+
+
+def host_images(host: str | None) -> list[str]:
+    """Every updatable image of the groups included by the root compose."""
+    host_dir = get_host_dir(host)
+    groups = set(build_service_to_group_map(host).values())
+    return sorted({
+        image
+        for group in groups
+        for image in extract_images_from_compose(host_dir / group / "compose.yml")
+    })
+
+
+# ---------------------------------------------------------------------------
+# Registry pre-check
+# ---------------------------------------------------------------------------
+
+
+def images_outside(running: dict[str, set[str]], images: list[str]) -> list[str]:
+    """Running image references (from `running_images()`) not among `images`."""
+    known = {normalize_image(image) for image in images}
+    return sorted(ref for ref in running if ref not in known)
+
+
+def precheck_images(images: list[str], running: dict[str, set[str]] | None = None) -> list[str] | None:
+    """The subset of `images` whose registry digest differs from the local one,
+    or whose containers run an older image (undecidable ones included). None
+    when the check couldn't run at all."""
+    print(f"{Colors.GRAY}Checking {len(images)} image(s) against their registries…{Colors.RESET}")
+    checks = check_images(images, running=running)
+    if checks is None:
+        print(f"  {Colors.GRAY}docker unavailable — skipping the pre-check{Colors.RESET}")
+        return None
+
+    counts = {status: sum(1 for c in checks if c.status == status) for status in (FRESH, STALE, UNKNOWN, NOT_PULLED)}
+    print("  " + " · ".join(f"{n} {status}" for status, n in counts.items() if n))
+    for check in checks:
+        if check.status == STALE:
+            behind = "" if check.detail.startswith("sha256:") else f" {Colors.GRAY}({check.detail}){Colors.RESET}"
+            print(f"  {Colors.CYAN}↑{Colors.RESET} {check.image}{behind}")
+        elif check.status == UNKNOWN:
+            print(f"  {Colors.YELLOW}?{Colors.RESET} {check.image} {Colors.GRAY}({check.detail}){Colors.RESET}")
+    return [check.image for check in checks if check.needs_update]
+
+
 # ---------------------------------------------------------------------------
 # Watchtower log parsing (Pretty format from logrus)
 # ---------------------------------------------------------------------------
@@ -229,6 +321,8 @@ def resolve_target(host: str | None, service: str | None) -> ImageResolution:
 _ANSI_RE = re.compile(r"\x1B\[[0-9;]*m")
 _LOG_LINE_RE = re.compile(r"^(?P<level>[A-Z]{4})\[(?P<elapsed>\d+)\]\s+(?P<rest>.*)$")
 _KV_RE = re.compile(r'([A-Za-z_][A-Za-z0-9_.-]*)=("(?:[^"\\]|\\.)*"|\S+)')
+# `docker logs --timestamps` prefix (RFC 3339, nanoseconds).
+_DOCKER_TS_RE = re.compile(r"^(?P<time>\d{4}-\d{2}-\d{2}T\S+Z)\s")
 
 _SESSION_START_MARKERS = (
     "Received HTTP API update request",
@@ -244,11 +338,21 @@ class LogEvent:
     level: str        # INFO / DEBU / WARN / ERRO
     message: str      # e.g. "Pulling new image"
     fields: dict      # parsed key=value tail
+    time: str | None = None   # docker timestamp, when the line was read with one
 
 
 def parse_watchtower_line(raw: str) -> LogEvent | None:
-    """Parse one watchtower log line. Returns None for unparseable lines."""
+    """Parse one watchtower log line. Returns None for unparseable lines.
+
+    A leading docker timestamp (`docker logs --timestamps`) is split off into
+    `LogEvent.time`.
+    """
     stripped = _ANSI_RE.sub("", raw).rstrip()
+    timestamp = None
+    ts_match = _DOCKER_TS_RE.match(stripped)
+    if ts_match:
+        timestamp = ts_match.group("time")
+        stripped = stripped[ts_match.end():].lstrip()
     if not stripped:
         return None
     match = _LOG_LINE_RE.match(stripped)
@@ -264,7 +368,7 @@ def parse_watchtower_line(raw: str) -> LogEvent | None:
         message = rest.strip()
         kv_text = ""
     fields = {k: v.strip('"') for k, v in _KV_RE.findall(kv_text)}
-    return LogEvent(level=match.group("level"), message=message, fields=fields)
+    return LogEvent(level=match.group("level"), message=message, fields=fields, time=timestamp)
 
 
 def slice_latest_session(lines: list[str]) -> list[LogEvent]:
@@ -274,26 +378,154 @@ def slice_latest_session(lines: list[str]) -> list[LogEvent]:
     session is in progress), then back to the matching start marker. Returns
     parsed events in chronological order.
     """
-    events = [ev for ev in (parse_watchtower_line(line) for line in lines) if ev]
-    if not events:
-        return []
+    return latest_session(reversed(lines))
 
-    # Find the most recent end (or fall through to "still running").
-    end_idx = -1
-    for i in range(len(events) - 1, -1, -1):
-        if _SESSION_END_MARKER in events[i].message:
-            end_idx = i
-            break
 
-    # Find the matching start, walking backward from end_idx (or last event).
-    search_upper = end_idx if end_idx >= 0 else len(events) - 1
-    start_idx = 0
-    for i in range(search_upper, -1, -1):
-        if any(marker in events[i].message for marker in _SESSION_START_MARKERS):
-            start_idx = i
-            break
+def latest_session(lines_newest_first: Iterable[str]) -> list[LogEvent]:
+    """`slice_latest_session` over lines given newest first, parsed lazily.
 
-    return events[start_idx : (end_idx + 1 if end_idx >= 0 else len(events))]
+    Stops pulling lines as soon as the most recent end marker and its start
+    marker are both found, so a reverse reader only has to go back as far as
+    that session. Without any end marker (session in progress) the whole log
+    has to be seen, since an older completed session would still win.
+    """
+    newest: list[LogEvent] = []          # events after the most recent end marker, newest first
+    session: list[LogEvent] | None = None
+    for line in lines_newest_first:
+        event = parse_watchtower_line(line)
+        if event is None:
+            continue
+        if session is None:
+            if _SESSION_END_MARKER in event.message:
+                session = [event]
+            else:
+                newest.append(event)
+            continue
+        session.append(event)
+        if any(marker in event.message for marker in _SESSION_START_MARKERS):
+            return session[::-1]
+
+    if session is not None:
+        return session[::-1]  # no start marker before it: from the first event
+    for i, event in enumerate(newest):
+        if any(marker in event.message for marker in _SESSION_START_MARKERS):
+            return newest[i::-1]
+    return newest[::-1]
+
+
+# ---------------------------------------------------------------------------
+# Sessions → upgrade history records (`kompose.history`)
+# ---------------------------------------------------------------------------
+
+_FOUND_NEW_RE = re.compile(r"^Found new (?P<image>\S+) image")
+
+
+def _parse_time(value: str | None) -> datetime | None:
+    if not value:
+        return None
+    # Python < 3.11 can't parse 'Z', nor fractions other than 3 or 6 digits.
+    text = value.replace("Z", "+00:00")
+    text = re.sub(r"\.(\d+)", lambda m: "." + m.group(1)[:6].ljust(6, "0"), text)
+    try:
+        return datetime.fromisoformat(text)
+    except ValueError:
+        return None
+
+
+def _session_id(value: str) -> str:
+    """`value` in one canonical form, so the same instant gets the same id
+    whatever the fraction's precision (RFC3339Nano trims trailing zeros,
+    docker prints 9 digits): UTC, trailing zeros trimmed, e.g.
+    `2024-05-01T03:00:10.5Z`. Unparseable values are kept as they are."""
+    parsed = _parse_time(value)
+    if parsed is None:
+        return value
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc)
+    fraction = f"{parsed.microsecond:06d}".rstrip("0")
+    return parsed.strftime("%Y-%m-%dT%H:%M:%S") + (f".{fraction}" if fraction else "") + ("Z" if parsed.tzinfo else "")
+
+
+def _seconds_between(start: str | None, end: str | None) -> float | None:
+    a, b = _parse_time(start), _parse_time(end)
+    if a is None or b is None:
+        return None
+    return round((b - a).total_seconds(), 3)
+
+
+def _int(value) -> int:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return 0
+
+
+def _image_updates(events: list[LogEvent]) -> list[ImageUpdate]:
+    updates: list[ImageUpdate] = []
+    for i, event in enumerate(events):
+        match = _FOUND_NEW_RE.match(event.message)
+        if not match:
+            continue
+        image = normalize_image(event.fields.get("image") or match.group("image"))
+        container = (event.fields.get("container") or "").lstrip("/")
+        first = next(
+            (e for e in events[:i] if e.fields.get("image") and normalize_image(e.fields["image"]) == image),
+            event,
+        )
+        last = event
+        for later in events[i + 1:]:
+            if container and (later.fields.get("container") or "").lstrip("/") == container:
+                last = later
+        updates.append(ImageUpdate(
+            image=image, container=container, time=first.time or event.time,
+            duration=_seconds_between(first.time, last.time) if last is not event else None,
+        ))
+    return updates
+
+
+def sessions_from_events(events: Iterable[LogEvent], host: str) -> list[Session]:
+    """Completed sessions in `events` (watchtower `LogEvent`s, chronological).
+
+    A session runs from a start marker (or the first event) to the end
+    marker. Sessions without an end marker, or whose end has no timestamp
+    to identify it by, are skipped.
+    """
+    sessions: list[Session] = []
+    current: list[LogEvent] = []
+    for event in events:
+        if any(marker in event.message for marker in _SESSION_START_MARKERS):
+            current = [event]
+            continue
+        current.append(event)
+        if _SESSION_END_MARKER not in event.message:
+            continue
+        if event.time:
+            started = current[0].time
+            sessions.append(Session(
+                id=_session_id(event.time),
+                host=host,
+                started=started,
+                finished=event.time,
+                duration=_seconds_between(started, event.time),
+                scanned=_int(event.fields.get("scanned")),
+                updated=_int(event.fields.get("updated")),
+                failed=_int(event.fields.get("failed")),
+                updates=_image_updates(current),
+            ))
+        current = []
+    return sessions
+
+
+def _record_history(events: Iterable[LogEvent], host: str | None) -> None:
+    """Store the completed sessions among `events`. Best effort: the history
+    must never fail an upgrade."""
+    sessions = sessions_from_events(events, get_host_dir(host).name)
+    if not sessions:
+        return
+    try:
+        UpgradeHistory().record(sessions)
+    except OSError:
+        pass
 
 
 # ---------------------------------------------------------------------------
@@ -368,15 +600,20 @@ def _render_kv(fields: dict) -> str:
 # ---------------------------------------------------------------------------
 
 
+# How long one /v1/update session may take before the request gives up.
+TRIGGER_TIMEOUT = 1800.0
+
+
 @dataclass
 class TriggerResult:
     """Outcome of the synchronous /v1/update call."""
     http_status: int
     body: dict | None         # parsed JSON, or None if not JSON
     error: str | None = None  # network / protocol error message
+    timed_out: bool = False   # no response within the request's timeout
 
 
-def trigger_update(url: str, token: str, images: list[str], timeout: float = 1800.0) -> TriggerResult:
+def trigger_update(url: str, token: str, images: list[str], timeout: float = TRIGGER_TIMEOUT) -> TriggerResult:
     """POST /v1/update [?image=…] with a Bearer token. Synchronous (blocks until end)."""
     qs = ""
     if images:
@@ -405,9 +642,124 @@ def trigger_update(url: str, token: str, images: list[str], timeout: float = 180
             body = None
         return TriggerResult(http_status=e.code, body=body, error=str(e))
     except urllib.error.URLError as e:
-        return TriggerResult(http_status=0, body=None, error=str(e.reason))
-    except (OSError, TimeoutError) as e:
-        return TriggerResult(http_status=0, body=None, error=str(e))
+        return TriggerResult(http_status=0, body=None, error=str(e.reason),
+                             timed_out=isinstance(e.reason, TimeoutError))
+    except OSError as e:  # TimeoutError included
+        return TriggerResult(http_status=0, body=None, error=str(e), timed_out=isinstance(e, TimeoutError))
+
+
+# ---------------------------------------------------------------------------
+# Several targets — concurrent triggers, per-group attribution
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class GroupRun:
+    """One target of a multi-target upgrade."""
+    target: str
+    images: list[str]                   # sent in its `?image=` filter
+    result: TriggerResult | None = None  # None: nothing was sent (no stale image)
+    queued: bool = False                 # timed out while an earlier request still held watchtower
+
+
+class EventAttribution:
+    """Map watchtower events back to the target whose images they concern.
+
+    Per-container lines ("Stopping", "Started new container", …) carry only
+    `container=`; the container is tied to a group by the first line that
+    names both it and one of the group's images.
+    """
+
+    def __init__(self, image_groups: dict[str, str]):
+        self.image_groups = {normalize_image(image): group for image, group in image_groups.items()}
+        self.containers: dict[str, str] = {}
+
+    def __call__(self, event: LogEvent) -> str | None:
+        container = (event.fields.get("container") or "").lstrip("/")
+        image = event.fields.get("image")
+        if not image:
+            match = _FOUND_NEW_RE.match(event.message)
+            image = match.group("image") if match else None
+        group = self.image_groups.get(normalize_image(image)) if image else None
+        if group and container:
+            self.containers[container] = group
+        elif container:
+            group = self.containers.get(container)
+        return group
+
+
+def attribute_events(events: Iterable[LogEvent], image_groups: dict[str, str]) -> dict[str, list[LogEvent]]:
+    """group → its events (chronological); unattributable events are dropped."""
+    attribution = EventAttribution(image_groups)
+    by_group: dict[str, list[LogEvent]] = {}
+    for event in events:
+        group = attribution(event)
+        if group:
+            by_group.setdefault(group, []).append(event)
+    return by_group
+
+
+def trigger_many(url: str, token: str, runs: list[GroupRun], parallel: int) -> None:
+    """Send one `/v1/update` per run with images, at most `parallel` in flight.
+    Fills `run.result`. Workers are daemon threads and the foreground joins
+    with a timeout, so Ctrl+C isn't held up by a 30-minute request.
+
+    Watchtower serialises sessions, so a request sent behind N others may
+    wait for all of them before its own starts: it gets N+1 session
+    timeouts. One that times out while an earlier request is still in
+    flight never got its session and is flagged `queued`."""
+    pending = [run for run in runs if run.images]
+    in_flight: list[GroupRun] = []  # send order
+    lock = threading.Lock()
+
+    def worker() -> None:
+        while True:
+            with lock:
+                if not pending:
+                    return
+                run = pending.pop(0)
+                ahead = len(in_flight)
+                in_flight.append(run)
+            result = trigger_update(url, token, run.images, timeout=TRIGGER_TIMEOUT * (ahead + 1))
+            with lock:
+                run.queued = result.timed_out and in_flight.index(run) > 0
+                in_flight.remove(run)
+            run.result = result
+
+    threads = [threading.Thread(target=worker, daemon=True) for _ in range(max(1, min(parallel, len(pending))))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        while thread.is_alive():
+            thread.join(0.2)
+
+
+def _render_group_summary(runs: list[GroupRun], by_group: dict[str, list[LogEvent]]) -> None:
+    table = Table(["Group", "Images", "Updated", "Failed", "Skipped", "Containers"])
+    for run in runs:
+        if run.result is None:
+            table.add_row([run.target, "0", "-", "-", "-", f"{Colors.GRAY}up to date{Colors.RESET}"])
+            continue
+        if run.queued:
+            note = f"{Colors.YELLOW}timed out while queued — watchtower may still run it{Colors.RESET}"
+            table.add_row([run.target, str(len(run.images)), "-", "-", "-", note])
+            continue
+        if not (200 <= run.result.http_status < 300):
+            error = run.result.error or f"HTTP {run.result.http_status}"
+            table.add_row([run.target, str(len(run.images)), "-", "-", "-", f"{Colors.RED}{error}{Colors.RESET}"])
+            continue
+        updated, failed, skipped = _extract_summary(run.result.body)
+        containers = sorted({u.container for u in _image_updates(by_group.get(run.target, [])) if u.container})
+        table.add_row([
+            run.target,
+            str(len(run.images)),
+            f"{Colors.GREEN}{updated}{Colors.RESET}",
+            f"{Colors.RED}{failed}{Colors.RESET}" if failed else "0",
+            f"{Colors.GRAY}{skipped}{Colors.RESET}",
+            ", ".join(containers) or f"{Colors.GRAY}-{Colors.RESET}",
+        ])
+    print()
+    print(table.render())
 
 
 # ---------------------------------------------------------------------------
@@ -415,50 +767,105 @@ def trigger_update(url: str, token: str, images: list[str], timeout: float = 180
 # ---------------------------------------------------------------------------
 
 
-class WatchtowerLogTail:
-    """Background `docker logs -f watchtower --since <ts>` reader.
+# The follower asks for logs from a bit before t0 (the CLI's `--since` only
+# has second precision) and drops the lines older than t0 itself, so nothing
+# logged between the trigger and the follower attaching is lost.
+_SINCE_SLACK = 2.0
+# How long to wait after the HTTP response for "Update session completed".
+_SESSION_END_TIMEOUT = 5.0
+
 
-    Renders relevant events as they arrive. Started before the HTTP call,
-    stopped after it returns. Honors Ctrl+C by setting an internal flag —
-    the foreground exits cleanly while the daemon continues on watchtower.
+class WatchtowerLogTail:
+    """Background follower of watchtower's logs since `since`.
+
+    Reads the Engine API log stream when the docker socket is reachable,
+    else spawns `docker logs -f --since`. Renders relevant events as they
+    arrive. Because the follow replays from just before `since`, the trigger
+    can be sent right after `start()`; `wait_finished()` then blocks until the
+    session-end line shows up (or the stream ends) instead of sleeping.
+    Honors Ctrl+C by setting an internal flag — the foreground exits cleanly
+    while the daemon continues on watchtower.
     """
 
-    def __init__(self, since: datetime):
+    def __init__(self, since: datetime, label: Callable[[LogEvent], str | None] | None = None):
         self.since = since
+        self.label = label  # prefixes rendered lines (group attribution), if set
         self._proc: subprocess.Popen | None = None
+        self._stream: LogStream | None = None
         self._thread: threading.Thread | None = None
         self._stop = threading.Event()
+        self._done = threading.Condition()
+        self._ended = 0       # session-end lines seen
+        self._closed = False  # stream gone
+        self.events: list[LogEvent] = []  # every parsed event, for the upgrade history
 
     def start(self) -> None:
-        since_str = self.since.astimezone(timezone.utc).isoformat(timespec="seconds")
-        self._proc = subprocess.Popen(
-            ["docker", "logs", "-f", "--since", since_str, WATCHTOWER_CONTAINER_NAME],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.STDOUT,
-            text=True,
-            bufsize=1,
-        )
-        self._thread = threading.Thread(target=self._read, daemon=True)
+        replay_from = self.since - timedelta(seconds=_SINCE_SLACK)
+        client = get_client()
+        if client is not None:
+            try:
+                self._stream = client.logs(
+                    WATCHTOWER_CONTAINER_NAME, follow=True, since=replay_from, timestamps=True,
+                )
+            except DockerError:
+                self._stream = None
+
+        if self._stream is not None:
+            lines = iter(self._stream)
+        else:
+            since_str = replay_from.astimezone(timezone.utc).isoformat(timespec="seconds")
+            self._proc = subprocess.Popen(
+                ["docker", "logs", "-f", "--timestamps", "--since", since_str, WATCHTOWER_CONTAINER_NAME],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                text=True,
+                bufsize=1,
+            )
+            lines = self._proc.stdout
+        self._thread = threading.Thread(target=self._read, args=(lines,), daemon=True)
         self._thread.start()
 
-    def _read(self) -> None:
-        if self._proc is None or self._proc.stdout is None:
-            return
+    def _read(self, lines) -> None:
         try:
-            for line in self._proc.stdout:
+            for line in lines or ():
                 if self._stop.is_set():
                     return
                 event = parse_watchtower_line(line)
-                if event is None:
+                if event is None or self._before_start(event):
                     continue
+                self.events.append(event)
+                group = self.label(event) if self.label else None
                 rendered = render_event(event)
                 if rendered:
+                    if group:
+                        rendered = f"{Colors.GRAY}[{group}]{Colors.RESET} {rendered}"
                     print(rendered, flush=True)
+                if _SESSION_END_MARKER in event.message:
+                    with self._done:
+                        self._ended += 1
+                        self._done.notify_all()
         except Exception:
             return
+        finally:
+            with self._done:
+                self._closed = True  # stream gone: nothing more to wait for
+                self._done.notify_all()
+
+    def _before_start(self, event: LogEvent) -> bool:
+        """A replayed line from the slack window (logged before `since`)."""
+        when = _parse_time(event.time)
+        return when is not None and when < self.since
+
+    def wait_finished(self, timeout: float = _SESSION_END_TIMEOUT, sessions: int = 1) -> bool:
+        """Block until `sessions` session-end lines were rendered (or the stream ended)."""
+        with self._done:
+            return self._done.wait_for(lambda: self._closed or self._ended >= sessions, timeout)
 
     def stop(self) -> None:
         self._stop.set()
+        if self._stream is not None:
+            self._stream.close()
+            self._stream = None
         if self._proc is not None:
             try:
                 self._proc.terminate()
@@ -505,14 +912,52 @@ def render_summary(summary: tuple[int, int, int]) -> None:
 # ---------------------------------------------------------------------------
 
 
+def _targets(value: str | list[str] | None) -> list[str]:
+    """The positional `service` argument(s), deduped in order."""
+    if not value:
+        return []
+    values = [value] if isinstance(value, str) else value
+    return list(dict.fromkeys(values))
+
+
+def _watchtower_endpoint(host: str | None) -> tuple[str, str] | None:
+    """(url, token) for the host's watchtower, or None after printing why not."""
+    url = discover_watchtower_url(host)
+    token = read_watchtower_token(host)
+    if not url:
+        print(
+            f"{Colors.RED}Error: cannot resolve watchtower URL.{Colors.RESET}\n"
+            f"Either add `kompose.watchtower.url` in `<host>/.kompose/rules.yaml`,\n"
+            f"or ensure `<host>/watchtower/compose.yml` defines an `ipv4_address`."
+        )
+        return None
+    if not token:
+        print(
+            f"{Colors.RED}Error: WATCHTOWER_HTTP_API_TOKEN not found in "
+            f"`<host>/watchtower/.env`.{Colors.RESET}"
+        )
+        return None
+    return url, token
+
+
 def cmd_upgrade(args) -> int:
     """Trigger an update via watchtower, or render the latest session with --logs."""
     host = getattr(args, "host", None)
+    services = _targets(getattr(args, "service", None))
 
     if getattr(args, "logs", False):
         return _cmd_upgrade_logs(host)
+    if getattr(args, "history", False):
+        return _cmd_upgrade_history(host, services)
+
+    if getattr(args, "engine", "watchtower") == "native":
+        return _cmd_upgrade_native(host, services, getattr(args, "force", False), getattr(args, "parallel", None))
 
-    service = getattr(args, "service", None)
+    check = getattr(args, "check", True)
+    if len(services) > 1:
+        return _cmd_upgrade_many(host, services, getattr(args, "parallel", None) or 1, check)
+
+    service = services[0] if services else None
     force = getattr(args, "force", False)
 
     try:
@@ -530,32 +975,48 @@ def cmd_upgrade(args) -> int:
         )
         return EXIT_OK
 
-    url = discover_watchtower_url(host)
-    token = read_watchtower_token(host)
-    if not url:
-        print(
-            f"{Colors.RED}Error: cannot resolve watchtower URL.{Colors.RESET}\n"
-            f"Either add `kompose.watchtower.url` in `<host>/.kompose/rules.yaml`,\n"
-            f"or ensure `<host>/watchtower/compose.yml` defines an `ipv4_address`."
-        )
-        return EXIT_TRIGGER_FAILED
-    if not token:
-        print(
-            f"{Colors.RED}Error: WATCHTOWER_HTTP_API_TOKEN not found in "
-            f"`<host>/watchtower/.env`.{Colors.RESET}"
-        )
+    endpoint = _watchtower_endpoint(host)
+    if endpoint is None:
         return EXIT_TRIGGER_FAILED
+    url, token = endpoint
+
+    # Only send what actually moved. The global form is narrowed to the
+    # images of the included groups — unless containers outside them are
+    # running (or docker can't tell), which only a full scan would update.
+    images = resolution.images
+    candidates = images
+    running = None
+    if check and not images:
+        running = running_images()
+        candidates = host_images(host)
+        outside = images_outside(running, candidates) if running is not None else []
+        if running is None:
+            print(f"{Colors.GRAY}docker unavailable — skipping the pre-check{Colors.RESET}")
+            candidates = []
+        elif outside:
+            shown = ", ".join(outside[:3]) + (f", … (+{len(outside) - 3})" if len(outside) > 3 else "")
+            print(
+                f"{Colors.YELLOW}{len(outside)} running image(s) outside the root compose's include: "
+                f"({shown}) — keeping the full watchtower scan.{Colors.RESET}"
+            )
+            candidates = []
+    if check and candidates:
+        stale = precheck_images(candidates, running)
+        if stale is not None:
+            if not stale:
+                print(f"{Colors.GREEN}✓ Nothing to upgrade — every image matches its registry digest.{Colors.RESET}")
+                return EXIT_OK
+            images = stale
 
     # Confirm only on the global (untargeted) form.
     if not resolution.target and not force:
-        n = len(resolution.images) or "all"
+        n = len(images) or "all"
         if not confirm(f"Trigger watchtower update on {n} containers?"):
             print(f"{Colors.GRAY}Aborted.{Colors.RESET}")
             return EXIT_OK
 
-    label = resolution.target or "all containers"
-    img_count = f" ({len(resolution.images)} image{'s' if len(resolution.images) != 1 else ''})" \
-        if resolution.images else ""
+    label = resolution.target or ("stale images" if images else "all containers")
+    img_count = f" ({len(images)} image{'s' if len(images) != 1 else ''})" if images else ""
     print(f"{Colors.BOLD}↻ Upgrading {label}{img_count}{Colors.RESET}")
     print(f"  {Colors.GRAY}{url}/v1/update{Colors.RESET}")
 
@@ -563,21 +1024,21 @@ def cmd_upgrade(args) -> int:
     t0 = datetime.now(timezone.utc)
     tail = WatchtowerLogTail(since=t0)
     tail.start()
-    # Give the docker logs subprocess a moment to attach before the HTTP call,
-    # otherwise the early "Received HTTP API update request" line is missed.
-    time.sleep(0.5)
 
     try:
-        result = trigger_update(url, token, resolution.images)
-        # "Update session completed" arrives slightly after the HTTP response
-        # on some builds — give the tail a brief window to flush it before we
-        # tear it down. Skipped on the Ctrl+C path (the user wants out now).
-        time.sleep(0.8)
+        result = trigger_update(url, token, images)
+        # "Update session completed" can land slightly after the HTTP
+        # response — wait for it rather than tearing the tail down early.
+        # Skipped on the Ctrl+C path (the user wants out now) and when the
+        # trigger failed (there's no session to wait for).
+        if 200 <= result.http_status < 300:
+            tail.wait_finished()
     except KeyboardInterrupt:
         print(f"\n{Colors.YELLOW}Interrupted locally — watchtower may still finish.{Colors.RESET}")
         return EXIT_INTERRUPTED
     finally:
         tail.stop()
+        _record_history(tail.events, host)
 
     if not (200 <= result.http_status < 300):
         detail = result.error or (result.body and json.dumps(result.body)) or ""
@@ -592,32 +1053,274 @@ def cmd_upgrade(args) -> int:
     return EXIT_PARTIAL if summary[1] > 0 else EXIT_OK
 
 
-def _cmd_upgrade_logs(host: str | None) -> int:
-    """Render the latest watchtower session from `docker logs`. No trigger."""
-    # The trailing newlines in docker logs are kept so the parser sees them
-    # as line boundaries; --tail is generous (DEBUG mode is chatty).
+def _cmd_upgrade_many(host: str | None, services: list[str], parallel: int, check: bool) -> int:
+    """`kompose upgrade a b c`: one trigger per target, per-group summary."""
+    runs: list[GroupRun] = []
+    for service in services:
+        try:
+            resolution = resolve_target(host, service)
+        except FileNotFoundError as e:
+            print(f"{Colors.RED}Error: {e}{Colors.RESET}")
+            return EXIT_TRIGGER_FAILED
+        if not resolution.images:
+            print(f"{Colors.YELLOW}No updatable images in '{service}' — skipped.{Colors.RESET}")
+            continue
+        runs.append(GroupRun(service, resolution.images))
+    if not runs:
+        return EXIT_OK
+
+    endpoint = _watchtower_endpoint(host)
+    if endpoint is None:
+        return EXIT_TRIGGER_FAILED
+    url, token = endpoint
+
+    if check:
+        stale = precheck_images(sorted({image for run in runs for image in run.images}))
+        if stale is not None:
+            for run in runs:
+                run.images = [image for image in run.images if image in stale]
+
+    image_groups = {image: run.target for run in runs for image in run.images}
+    sending = [run for run in runs if run.images]
+    if sending:
+        print(
+            f"{Colors.BOLD}↻ Upgrading {', '.join(run.target for run in sending)} "
+            f"({len(image_groups)} image{'s' if len(image_groups) != 1 else ''}, "
+            f"{min(parallel, len(sending))} at a time){Colors.RESET}"
+        )
+        print(f"  {Colors.GRAY}{url}/v1/update{Colors.RESET}")
+
+        tail = WatchtowerLogTail(since=datetime.now(timezone.utc), label=EventAttribution(image_groups))
+        tail.start()
+        try:
+            trigger_many(url, token, runs, parallel)
+            succeeded = sum(1 for run in sending if run.result and 200 <= run.result.http_status < 300)
+            if succeeded:
+                tail.wait_finished(sessions=succeeded)
+        except KeyboardInterrupt:
+            print(f"\n{Colors.YELLOW}Interrupted locally — watchtower may still finish.{Colors.RESET}")
+            return EXIT_INTERRUPTED
+        finally:
+            tail.stop()
+            _record_history(tail.events, host)
+        by_group = attribute_events(tail.events, image_groups)
+    else:
+        by_group = {}
+
+    _render_group_summary(runs, by_group)
+    if any(run.result and not 200 <= run.result.http_status < 300 for run in runs):
+        return EXIT_TRIGGER_FAILED
+    if any(run.result and _extract_summary(run.result.body)[1] > 0 for run in runs):
+        return EXIT_PARTIAL
+    return EXIT_OK
+
+
+def _native_timestamp() -> str:
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+
+
+def _cmd_upgrade_native(host: str | None, services: list[str], force: bool, parallel: int | None) -> int:
+    """`--engine native`: pull + recreate from kompose, watchtower-style output."""
+    try:
+        targets = resolve_native_targets(host, services)
+    except FileNotFoundError as e:
+        print(f"{Colors.RED}Error: {e}{Colors.RESET}")
+        return EXIT_TRIGGER_FAILED
+    if not targets:
+        print(
+            f"{Colors.YELLOW}No updatable images in '{', '.join(services) or 'any group'}' "
+            f"(only build-only or digest-pinned services).{Colors.RESET}"
+        )
+        return EXIT_OK
+
+    images = sorted({t.image for t in targets})
+    if not services and not force:
+        if not confirm(f"Pull {len(images)} images and recreate the services that changed?"):
+            print(f"{Colors.GRAY}Aborted.{Colors.RESET}")
+            return EXIT_OK
+
+    label = ", ".join(services) or "all containers"
+    print(f"{Colors.BOLD}↻ Upgrading {label} ({len(images)} image{'s' if len(images) != 1 else ''}){Colors.RESET}")
+    print(f"  {Colors.GRAY}native engine — docker pull + compose up{Colors.RESET}")
+
+    events: list[LogEvent] = []
+    events_lock = threading.Lock()
+    label_of = EventAttribution({t.image: t.target for t in targets}) if len(services) > 1 else None
+
+    def emit(level: str, message: str, fields: dict) -> None:
+        event = LogEvent(level=level, message=message, fields=dict(fields), time=_native_timestamp())
+        with events_lock:
+            events.append(event)
+            group = label_of(event) if label_of else None
+            rendered = render_event(event)
+            if rendered:
+                if group:
+                    rendered = f"{Colors.GRAY}[{group}]{Colors.RESET} {rendered}"
+                print(rendered, flush=True)
+
+    try:
+        kwargs = {"jobs": parallel} if parallel else {}
+        run = run_native(host, targets, emit=emit, **kwargs)
+    except KeyboardInterrupt:
+        print(f"\n{Colors.YELLOW}Interrupted — some services may already be recreated.{Colors.RESET}")
+        return EXIT_INTERRUPTED
+    finally:
+        _record_history(events, host)
+
+    if len(services) > 1:
+        runs = [
+            GroupRun(service, sorted({t.image for t in targets if t.target == service}),
+                     TriggerResult(200, run.body(service)))
+            for service in services
+        ]
+        _render_group_summary(runs, attribute_events(events, {t.image: t.target for t in targets}))
+    summary = _extract_summary(run.body())
+    render_summary(summary)
+    return EXIT_PARTIAL if summary[1] > 0 else EXIT_OK
+
+
+def _read_watchtower_log_tail(tail: int | str, until: datetime | None = None) -> list[str] | None:
+    """Last `tail` watchtower log lines (API, else `docker logs`); None on failure.
+
+    Failures are reported to stdout here so the caller only has to map None
+    to an exit code.
+    """
+    client = get_client()
+    if client is not None:
+        try:
+            with client.logs(WATCHTOWER_CONTAINER_NAME, tail=tail, until=until, timestamps=True) as stream:
+                return list(stream)
+        except DockerError as e:
+            if e.status == 404:
+                print(f"{Colors.RED}Error: container '{WATCHTOWER_CONTAINER_NAME}' not found{Colors.RESET}")
+                return None
+
+    cmd = ["docker", "logs", "--timestamps", "--tail", str(tail)]
+    if until is not None:
+        cmd.extend(["--until", until.astimezone(timezone.utc).isoformat(timespec="seconds")])
     try:
         proc = subprocess.run(
-            ["docker", "logs", "--tail", "5000", WATCHTOWER_CONTAINER_NAME],
+            cmd + [WATCHTOWER_CONTAINER_NAME],
             capture_output=True,
             text=True,
             timeout=30,
         )
     except (subprocess.TimeoutExpired, FileNotFoundError) as e:
         print(f"{Colors.RED}Error: failed to read watchtower logs: {e}{Colors.RESET}")
-        return EXIT_TRIGGER_FAILED
+        return None
 
     if proc.returncode != 0:
         print(f"{Colors.RED}Error: docker logs returned {proc.returncode}{Colors.RESET}")
         if proc.stderr:
             print(proc.stderr.strip())
+        return None
+    return (proc.stdout + proc.stderr).splitlines()
+
+
+# ---------------------------------------------------------------------------
+# Reverse log readers (newest line first) for `--logs`
+# ---------------------------------------------------------------------------
+
+_TAIL_START = 1000
+_TAIL_GROWTH = 4
+_CHUNK_START = 64 * 1024
+
+
+def _reverse_file_lines(path: Path, chunk: int = _CHUNK_START) -> Iterator[str]:
+    """Lines of `path`, last first, reading backwards in doubling chunks."""
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        pos = f.tell()
+        carry = b""  # partial first line of the previous block
+        while pos > 0:
+            size = min(chunk, pos)
+            pos -= size
+            f.seek(pos)
+            parts = (f.read(size) + carry).split(b"\n")
+            carry = parts[0]
+            for raw in reversed(parts[1:]):
+                if raw:
+                    yield raw.decode("utf-8", errors="replace")
+            chunk *= 2
+        if carry:
+            yield carry.decode("utf-8", errors="replace")
+
+
+def _json_file_messages(records: Iterable[str]) -> Iterator[str]:
+    """Each json-file driver record as a `docker logs --timestamps` line."""
+    for record in records:
+        try:
+            data = json.loads(record)
+            message = data["log"].rstrip("\n")
+        except (ValueError, KeyError, TypeError, AttributeError):
+            continue
+        timestamp = data.get("time")
+        yield f"{timestamp} {message}" if isinstance(timestamp, str) else message
+
+
+def _reverse_tail_lines(first: list[str], fetch, requested: int) -> Iterator[str]:
+    """Lines newest first from growing `--tail` windows.
+
+    `first` is the result of `fetch(requested)`. The logs can't be read
+    backwards over the API, so each round asks for `_TAIL_GROWTH`× more and
+    yields only the older lines it hadn't seen. `fetch` pins `until` so the
+    windows line up even if watchtower logs meanwhile.
+    """
+    lines, seen = first, 0
+    while True:
+        yield from reversed(lines[: len(lines) - seen])
+        if len(lines) < requested:
+            return  # reached the start of the log
+        seen, requested = len(lines), requested * _TAIL_GROWTH
+        lines = fetch(requested)
+        if lines is None:
+            return
+
+
+def _watchtower_json_log() -> Path | None:
+    """Watchtower's json-file log, if the driver is json-file and it's readable here."""
+    client = get_client()
+    if client is None:
+        return None
+    try:
+        info = client.inspect_container(WATCHTOWER_CONTAINER_NAME)
+    except DockerError:
+        return None
+    log_type = ((info.get("HostConfig") or {}).get("LogConfig") or {}).get("Type")
+    log_path = info.get("LogPath")
+    if log_type != "json-file" or not log_path or not os.access(log_path, os.R_OK):
+        return None
+    return Path(log_path)
+
+
+def read_watchtower_lines_reversed() -> Iterable[str] | None:
+    """Watchtower's log lines, newest first and read lazily; None on failure.
+
+    Reads the json-file log backwards when it is accessible, else grows the
+    `--tail` window (API, else `docker logs`) until the consumer stops.
+    """
+    log_path = _watchtower_json_log()
+    if log_path is not None:
+        return _json_file_messages(_reverse_file_lines(log_path))
+
+    until = datetime.now(timezone.utc)
+    first = _read_watchtower_log_tail(_TAIL_START, until)
+    if first is None:
+        return None
+    return _reverse_tail_lines(first, lambda n: _read_watchtower_log_tail(n, until), _TAIL_START)
+
+
+def _cmd_upgrade_logs(host: str | None) -> int:
+    """Render the latest watchtower session from its logs. No trigger."""
+    lines = read_watchtower_lines_reversed()
+    if lines is None:
         return EXIT_TRIGGER_FAILED
 
-    lines = (proc.stdout + proc.stderr).splitlines()
-    events = slice_latest_session(lines)
+    events = latest_session(lines)
     if not events:
         print(f"{Colors.GRAY}No watchtower session found in recent logs.{Colors.RESET}")
         return EXIT_OK
+    _record_history(events, host)
 
     print(f"{Colors.BOLD}Latest watchtower session{Colors.RESET}")
     for event in events:
@@ -627,6 +1330,67 @@ def _cmd_upgrade_logs(host: str | None) -> int:
     return EXIT_OK
 
 
+def _format_when(value: str | None) -> str:
+    when = _parse_time(value)
+    return when.astimezone().strftime("%Y-%m-%d %H:%M") if when else "?"
+
+
+def _format_took(seconds: float | None) -> str:
+    if seconds is None:
+        return "-"
+    if seconds < 60:
+        return f"{seconds:.1f}s"
+    minutes, rest = divmod(int(round(seconds)), 60)
+    return f"{minutes}m{rest:02d}s"
+
+
+def _cmd_upgrade_history(host: str | None, services: list[str]) -> int:
+    """Per-image update timeline from the local history (no docker calls)."""
+    history = UpgradeHistory()
+    host_name = get_host_dir(host).name
+    service = ", ".join(services)
+    if services:
+        images: list[str] = []
+        for target in services:
+            try:
+                images += resolve_target(host, target).images
+            except FileNotFoundError as e:
+                print(f"{Colors.RED}Error: {e}{Colors.RESET}")
+                return EXIT_TRIGGER_FAILED
+        if not images:
+            print(f"{Colors.YELLOW}No updatable images in '{service}'.{Colors.RESET}")
+            return EXIT_OK
+        rows = history.timeline(images, host_name)
+        sessions = None
+    else:
+        sessions = history.sessions(host_name)
+        rows = [(session, update) for session in sessions for update in session.updates]
+
+    if rows:
+        table = Table(["When", "Image", "Container", "Took"])
+        for session, update in reversed(rows):
+            table.add_row([
+                _format_when(update.time or session.finished),
+                update.image,
+                f"{Colors.GRAY}{update.container or '-'}{Colors.RESET}",
+                _format_took(update.duration),
+            ])
+        print(table.render())
+    else:
+        print(f"{Colors.GRAY}No recorded image updates{' for ' + service if service else ''}.{Colors.RESET}")
+
+    if sessions:
+        last = sessions[-1]
+        print(
+            f"\n{Colors.GRAY}{len(sessions)} session(s) recorded · last {_format_when(last.finished)} "
+            f"({last.updated} updated, {last.failed} failed, {last.scanned} scanned"
+            f"{', took ' + _format_took(last.duration) if last.duration is not None else ''}){Colors.RESET}"
+        )
+    elif sessions is not None:
+        print(f"{Colors.GRAY}History is collected by `kompose upgrade` and `kompose upgrade --logs`.{Colors.RESET}")
+    return EXIT_OK
+
+
 __all__ = [
     "cmd_upgrade",
     "discover_watchtower_url",
@@ -634,13 +1398,25 @@ __all__ = [
     "extract_images_from_compose",
     "extract_image_for_service",
     "resolve_target",
+    "host_images",
+    "images_outside",
+    "resolve_native_targets",
+    "precheck_images",
     "parse_watchtower_line",
+    "latest_session",
+    "read_watchtower_lines_reversed",
+    "sessions_from_events",
     "slice_latest_session",
     "render_event",
     "trigger_update",
+    "trigger_many",
+    "attribute_events",
+    "EventAttribution",
+    "GroupRun",
     "ImageResolution",
     "LogEvent",
     "TriggerResult",
+    "TRIGGER_TIMEOUT",
     "EXIT_OK",
     "EXIT_PARTIAL",
     "EXIT_TRIGGER_FAILED",
@@ -0,0 +1,109 @@
+"""In-memory file buffer for `kompose fix`.
+
+Rule fixers are content → content transforms: they read files through the
+workspace and stage their output back into it instead of writing to disk.
+Later fixers therefore see earlier fixes, a file touched by several fixes
+(e.g. the root compose gaining one `include:` entry per missing service) is
+written once, `--dry-run` is simply "don't commit", and a fix that fails its
+re-check is undone with `rollback()` before anything reaches the disk.
+
+`commit()` writes each changed file atomically (temp file in the same
+directory + `os.replace`, keeping the original's permissions) and drops it
+from the compose index so the rest of the run reads the new content.
+"""
+
+from __future__ import annotations
+
+import os
+import shutil
+from pathlib import Path
+
+from .compose_index import ComposeDoc, compose_index
+
+
+class FixWorkspace:
+    """Buffered view of the files a fix run reads and writes."""
+
+    def __init__(self):
+        self._original: dict[Path, str | None] = {}
+        self._current: dict[Path, str] = {}
+        self._docs: dict[Path, ComposeDoc] = {}
+
+    def _load(self, path: Path) -> str | None:
+        if path not in self._original:
+            try:
+                self._original[path] = path.read_text()
+            except FileNotFoundError:
+                self._original[path] = None
+        return self._original[path]
+
+    def exists(self, path: Path) -> bool:
+        return path in self._current or self._load(path) is not None
+
+    def read(self, path: Path) -> str:
+        """Current content of `path` — staged if any fixer wrote it, else from disk."""
+        if path in self._current:
+            return self._current[path]
+        content = self._load(path)
+        if content is None:
+            raise FileNotFoundError(path)
+        return content
+
+    def doc(self, path: Path) -> ComposeDoc | None:
+        """The current content as a `ComposeDoc` (parsed lazily, cached until the next write)."""
+        doc = self._docs.get(path)
+        if doc is None:
+            if not self.exists(path):
+                return None
+            doc = self._docs[path] = ComposeDoc(path, self.read(path))
+        return doc
+
+    def write(self, path: Path, content: str) -> None:
+        """Stage `content` for `path`. Nothing touches the disk until `commit()`."""
+        self._load(path)
+        self._current[path] = content
+        self._docs.pop(path, None)
+
+    def checkpoint(self) -> dict[Path, str]:
+        """The staged state so far, for `rollback()`."""
+        return dict(self._current)
+
+    def rollback(self, checkpoint: dict[Path, str]) -> list[Path]:
+        """Drop everything staged since `checkpoint`. Returns the paths reverted."""
+        reverted = [p for p, content in self._current.items() if checkpoint.get(p) != content]
+        for path in reverted:
+            if path in checkpoint:
+                self._current[path] = checkpoint[path]
+            else:
+                del self._current[path]
+            self._docs.pop(path, None)
+        return reverted
+
+    def changed(self) -> list[Path]:
+        """Paths whose staged content differs from what was on disk."""
+        return [p for p, content in self._current.items() if content != self._original.get(p)]
+
+    def commit(self) -> list[Path]:
+        """Write every changed file once, atomically. Returns the paths written."""
+        written: list[Path] = []
+        for path in self.changed():
+            _atomic_write(path, self._current[path])
+            compose_index().forget(path)
+            self._original[path] = self._current[path]
+            written.append(path)
+        return written
+
+
+def _atomic_write(path: Path, content: str) -> None:
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        tmp.write_text(content)
+        if path.exists():
+            shutil.copymode(path, tmp)
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
+__all__ = ["FixWorkspace"]
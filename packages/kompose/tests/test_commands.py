@@ -1,20 +1,30 @@
 """Tests for the `run` command: schema parsing, action lookup, exec building."""
 
+import io
+import re
 import tempfile
+import threading
+import time
 import unittest
+from contextlib import redirect_stdout
 from pathlib import Path
 from unittest import mock
 
 from kompose import commands
 from kompose.commands import (
     Action,
+    FanoutResult,
     _parse_action,
     _shell_quote,
     build_docker_exec,
     load_commands,
     resolve_action,
+    resolve_fanout,
+    run_fanout,
 )
 
+_ANSI = re.compile(r"\x1B\[[0-9;]*m")
+
 
 # ---------------------------------------------------------------------------
 # Schema parsing
@@ -238,6 +248,86 @@ class TestBuildDockerExec(unittest.TestCase):
         self.assertIn("-i", cmd)
         self.assertNotIn("-it", cmd)
 
+    @mock.patch("sys.stdin.isatty", return_value=True)
+    def test_non_interactive_attaches_nothing(self, _):
+        a = Action(name="shell", service="crowdsec", container="crowdsec", exec="bash", tty=True)
+        self.assertEqual(build_docker_exec(a, [], interactive=False)[:3], ["docker", "exec", "crowdsec"])
+
+
+# ---------------------------------------------------------------------------
+# Fan-out
+# ---------------------------------------------------------------------------
+
+
+class TestResolveFanout(unittest.TestCase):
+    ACTIONS = [_act("pg-b", "vacuum"), _act("pg-a", "vacuum"), _act("crowdsec", "hub-upgrade")]
+
+    def test_all_matches_sorted(self):
+        self.assertEqual(
+            [a.qualified_name for a in resolve_fanout(self.ACTIONS, "vacuum", None)],
+            ["pg-a:vacuum", "pg-b:vacuum"],
+        )
+
+    def test_on_filters_and_rejects_services_without_the_action(self):
+        self.assertEqual([a.service for a in resolve_fanout(self.ACTIONS, "vacuum", ["pg-b"])], ["pg-b"])
+        with self.assertRaises(LookupError) as ctx:
+            resolve_fanout(self.ACTIONS, "vacuum", ["pg-a", "crowdsec"])
+        self.assertIn("crowdsec", str(ctx.exception))
+
+    def test_unknown_action_raises(self):
+        with self.assertRaises(LookupError):
+            resolve_fanout(self.ACTIONS, "nope", None)
+
+
+class _FakeProc:
+    def __init__(self, lines, returncode, delay=0.0):
+        self.stdout = iter(lines)
+        self._returncode = returncode
+        self._delay = delay
+
+    def wait(self):
+        time.sleep(self._delay)
+        return self._returncode
+
+
+class TestRunFanout(unittest.TestCase):
+    def test_prefixed_output_and_results_in_order(self):
+        procs = {
+            "a": _FakeProc(["one\n", "two\n"], 0),
+            "bb": _FakeProc(["boom\n"], 3),
+        }
+        out = io.StringIO()
+        with mock.patch.object(commands.subprocess, "Popen", side_effect=lambda cmd, **kw: procs[cmd[2]]), \
+                redirect_stdout(out):
+            results = run_fanout([_act("a", "x"), _act("bb", "x")], [])
+        self.assertEqual([(r.action.service, r.returncode) for r in results], [("a", 0), ("bb", 3)])
+        lines = _ANSI.sub("", out.getvalue()).splitlines()
+        self.assertIn("a:x  | one", lines)
+        self.assertIn("bb:x | boom", lines)
+
+    def test_parallel_cap(self):
+        lock = threading.Lock()
+        live, peak = [0], [0]
+
+        def popen(cmd, **kw):
+            with lock:
+                live[0] += 1
+                peak[0] = max(peak[0], live[0])
+            proc = _FakeProc([], 0, delay=0.05)
+            wait = proc.wait
+
+            def done():
+                rc = wait()
+                with lock:
+                    live[0] -= 1
+                return rc
+            proc.wait = done
+            return proc
+
+        with mock.patch.object(commands.subprocess, "Popen", side_effect=popen), redirect_stdout(io.StringIO()):
+            run_fanout([_act(f"s{i}", "x") for i in range(5)], [], parallel=2)
+        self.assertEqual(peak[0], 2)
+
 
 # ---------------------------------------------------------------------------
 # cmd_run dispatch
@@ -252,6 +342,9 @@ class TestCmdRun(unittest.TestCase):
         ns.second = kw.get("second")
         ns.verbose = kw.get("verbose", False)
         ns.forwarded = kw.get("forwarded", [])
+        ns.all = kw.get("all", False)
+        ns.on = kw.get("on")
+        ns.parallel = kw.get("parallel")
         return ns
 
     @mock.patch("kompose.commands.subprocess.run")
@@ -279,6 +372,28 @@ class TestCmdRun(unittest.TestCase):
         rc = commands.cmd_run(self._args(first="reload"))
         self.assertEqual(rc, 2)
 
+    @mock.patch("kompose.commands.run_fanout")
+    @mock.patch("kompose.commands.load_commands")
+    def test_fanout_returns_the_worst_exit_code(self, mock_load, mock_fanout):
+        actions = [_act("pg-a", "vacuum"), _act("pg-b", "vacuum"), _act("pg-c", "vacuum")]
+        mock_load.return_value = actions
+        mock_fanout.return_value = [FanoutResult(actions[0], 0, 1.0), FanoutResult(actions[1], 2, 1.5)]
+        with redirect_stdout(io.StringIO()):
+            rc = commands.cmd_run(self._args(first="vacuum", on=["pg-a", "pg-b"], parallel=2))
+        self.assertEqual(rc, 2)
+        targets = mock_fanout.call_args[0][0]
+        self.assertEqual([a.service for a in targets], ["pg-a", "pg-b"])
+        self.assertEqual(mock_fanout.call_args.kwargs["parallel"], 2)
+
+    @mock.patch("kompose.commands.run_fanout")
+    @mock.patch("kompose.commands.load_commands")
+    def test_fanout_rejects_the_explicit_service_form(self, mock_load, mock_fanout):
+        mock_load.return_value = [_act("pg-a", "vacuum")]
+        with redirect_stdout(io.StringIO()):
+            rc = commands.cmd_run(self._args(first="pg-a", second="vacuum", all=True))
+        self.assertEqual(rc, 2)
+        mock_fanout.assert_not_called()
+
     @mock.patch("kompose.commands.subprocess.run")
     @mock.patch("kompose.commands.load_commands")
     def test_single_service_arg_lists_its_actions(self, mock_load, mock_run):
@@ -0,0 +1,108 @@
+"""Tests for the zsh completion index — records, path, mtime-driven rebuilds."""
+
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from kompose import config
+from kompose.completion_index import build_records, index_path, refresh
+
+
+class _IndexFixture(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        root = Path(self._tmp.name)
+        self.workspace = root / "homelab"
+        self.host_dir = self.workspace / "nas"
+        for name in ("nas", "vps", "base"):
+            (self.workspace / name).mkdir(parents=True)
+        # Neither file uses the conventional 2-space layout.
+        self._write("paperless/compose.yml", "services:\n    paperless:\n        image: x\n    paperless-db: {image: y}\n")
+        self._write("plex/compose.yml", "services: {plex: {image: z}}\n")
+        (self.host_dir / "notes").mkdir()  # no compose.yml: not a group
+        self._write(".kompose/commands.yaml", "services:\n   crowdsec:\n     actions: {hub-upgrade: cscli hub upgrade}\n")
+        self._write(".kompose/commands/plex.yaml", "actions:\n    scan: plex-scan\n")
+
+        patches = [
+            mock.patch.object(config, "WORKSPACE_DIR", self.workspace),
+            mock.patch.object(config, "DEFAULT_HOST", "nas"),
+            mock.patch.dict("os.environ", {"XDG_CACHE_HOME": str(root / "cache")}),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+        self.index = index_path()
+
+    def _write(self, rel: str, content: str) -> Path:
+        path = self.host_dir / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+        return path
+
+    def _records(self) -> list[list[str]]:
+        return [line.split("\t") for line in self.index.read_text().splitlines() if not line.startswith("#")]
+
+
+class TestBuildRecords(_IndexFixture):
+    def test_records_come_from_the_yaml_parsers(self):
+        self.assertEqual(build_records(), [
+            ("host", "base"), ("host", "nas"), ("host", "vps"),
+            ("group", "paperless"),
+            ("container", "paperless", "paperless"), ("container", "paperless", "paperless-db"),
+            ("group", "plex"),
+            ("container", "plex", "plex"),
+            ("action", "crowdsec", "hub-upgrade"), ("action", "plex", "scan"),
+        ])
+
+    def test_broken_commands_file_keeps_the_rest(self):
+        self._write(".kompose/commands.yaml", "services: [nope\n")
+        records = build_records()
+        self.assertIn(("group", "plex"), records)
+        self.assertFalse([r for r in records if r[0] == "action"])
+
+
+class TestRefresh(_IndexFixture):
+    def test_path_matches_the_preamble_naming(self):
+        encoded = str(self.workspace).replace("/", "%")
+        self.assertEqual(self.index.name, f"{encoded}@nas.tsv")
+        self.assertEqual(self.index.parent, config.get_cache_dir() / "completion")
+
+    def test_first_refresh_writes_the_index(self):
+        self.assertTrue(refresh())
+        self.assertIn(["container", "plex", "plex"], self._records())
+        self.assertTrue(self.index.read_text().startswith("#kompose-completion\t1\t"))
+
+    def test_unchanged_sources_are_not_rebuilt(self):
+        refresh()
+        self.assertFalse(refresh())
+
+    def test_edited_compose_rebuilds(self):
+        refresh()
+        compose = self._write("plex/compose.yml", "services: {plex: {image: z}, tautulli: {image: t}}\n")
+        os.utime(compose, ns=(0, self.index.stat().st_mtime_ns + 10**9))
+        self.assertTrue(refresh())
+        self.assertIn(["container", "plex", "tautulli"], self._records())
+
+    def test_new_command_file_rebuilds(self):
+        refresh()
+        self._write(".kompose/commands/paperless.yaml", "actions: {reindex: document_index reindex}\n")
+        self.assertTrue(refresh())
+        self.assertIn(["action", "paperless", "reindex"], self._records())
+
+    def test_removed_group_rebuilds(self):
+        refresh()
+        (self.host_dir / "plex" / "compose.yml").unlink()
+        self.assertTrue(refresh())
+        self.assertNotIn(["group", "plex"], self._records())
+
+    def test_unwritable_cache_is_ignored(self):
+        with mock.patch("pathlib.Path.write_text", side_effect=OSError("read-only")):
+            self.assertFalse(refresh())
+        self.assertFalse(self.index.exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
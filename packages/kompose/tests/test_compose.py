@@ -1,18 +1,26 @@
 """Tests for compose module (lifecycle helpers: root mode + legacy mode)."""
 
+import argparse
+import io
+import subprocess
 import tempfile
+import threading
 import unittest
+from contextlib import redirect_stdout
 from pathlib import Path
 from unittest import mock
 
-from kompose import compose, config
+from kompose import compose, config, drift
 from kompose.compose import (
     build_compose_command,
     build_service_to_group_map,
     get_compose_files,
     get_root_compose,
     parse_compose_services,
+    resolve_log_targets,
     resolve_root_targets,
+    run_compose_captured,
+    run_legacy_parallel,
 )
 
 
@@ -187,5 +195,269 @@ class TestGetComposeFiles(_WorkspaceFixture):
         self.assertEqual(get_compose_files("does-not-exist", "nas"), [])
 
 
+class TestLegacyParallel(_WorkspaceFixture):
+    def setUp(self):
+        super().setUp()
+        self.names = ["alpha", "beta", "gamma"]
+        for name in self.names:
+            (self.host_dir / name).mkdir()
+            (self.host_dir / name / "compose.yml").write_text("services: {}\n")
+        self.calls: list[tuple[str, str]] = []
+
+    def _fake_run(self, fail: set[str] = frozenset(), barrier: threading.Barrier | None = None):
+        def run(cmd, **kwargs):
+            service = Path(cmd[3]).parent.name
+            action = cmd[4]
+            self.calls.append((service, action))
+            if barrier is not None:
+                barrier.wait(timeout=5)
+            code = 1 if (service, action) in fail else 0
+            return subprocess.CompletedProcess(cmd, code, stdout=f"{action} {service}\n")
+        return mock.patch.object(compose.subprocess, "run", side_effect=run)
+
+    def test_services_run_concurrently_and_return_in_input_order(self):
+        with self._fake_run(barrier=threading.Barrier(3)), redirect_stdout(io.StringIO()):
+            runs = run_legacy_parallel(self.names, [("up", ["-d"])], "nas", jobs=3)
+        self.assertEqual([r.service for r in runs], self.names)
+        self.assertTrue(all(r.returncode == 0 for r in runs))
+        self.assertIn("up beta", runs[1].output)
+
+    def test_failed_step_stops_that_service_only(self):
+        with self._fake_run(fail={("beta", "down")}):
+            beta = run_compose_captured("beta", [("down", None), ("up", ["-d"])], "nas")
+            gamma = run_compose_captured("gamma", [("down", None), ("up", ["-d"])], "nas")
+        self.assertEqual(beta.returncode, 1)
+        self.assertEqual(gamma.returncode, 0)
+        self.assertEqual(self.calls, [("beta", "down"), ("gamma", "down"), ("gamma", "up")])
+
+    def test_missing_compose_is_a_failed_run(self):
+        run = run_compose_captured("ghost", [("up", ["-d"])], "nas")
+        self.assertEqual(run.returncode, 1)
+        self.assertIn("No compose.yml found", run.output)
+
+    def test_up_waits_for_dependency_wave(self):
+        (self.host_dir / "alpha" / "compose.yml").write_text(
+            "services:\n  a:\n    depends_on: [g]\n"
+        )
+        (self.host_dir / "gamma" / "compose.yml").write_text("services:\n  g: {}\n")
+        for parallel in (1, 3):
+            self.calls.clear()
+            args = argparse.Namespace(host="nas", service=None, containers=[], parallel=parallel)
+            with self._fake_run(), redirect_stdout(io.StringIO()):
+                self.assertEqual(compose.cmd_up(args), 0)
+            order = [service for service, _ in self.calls]
+            self.assertLess(order.index("gamma"), order.index("alpha"))
+
+    def test_down_runs_waves_in_reverse(self):
+        (self.host_dir / "alpha" / "compose.yml").write_text(
+            "services:\n  a:\n    network_mode: service:g\n"
+        )
+        (self.host_dir / "gamma" / "compose.yml").write_text("services:\n  g: {}\n")
+        args = argparse.Namespace(host="nas", service=None, containers=[], parallel=None)
+        with self._fake_run(), redirect_stdout(io.StringIO()):
+            self.assertEqual(compose.cmd_down(args), 0)
+        order = [service for service, _ in self.calls]
+        self.assertLess(order.index("alpha"), order.index("gamma"))
+
+    def test_cmd_restart_parallel_reports_summary(self):
+        args = argparse.Namespace(host="nas", service=None, containers=[], parallel=2)
+        out = io.StringIO()
+        with self._fake_run(fail={("gamma", "up")}), redirect_stdout(out):
+            code = compose.cmd_restart(args)
+        self.assertEqual(code, 1)
+        text = out.getvalue()
+        self.assertIn("Duration", text)
+        self.assertIn("1 service(s) failed to restart", text)
+        self.assertEqual(sorted(self.calls), sorted(
+            [(n, "down") for n in self.names] + [(n, "up") for n in self.names]
+        ))
+
+
+class TestRootParallelNote(_WorkspaceFixture):
+    def setUp(self):
+        super().setUp()
+        (self.host_dir / "compose.yml").write_text("services:\n  a: {}\n")
+
+    def _output(self, cmd, parallel):
+        args = argparse.Namespace(host="nas", service=None, containers=[], parallel=parallel, changed=False, rolling=False)
+        out = io.StringIO()
+        with mock.patch.object(compose.subprocess, "run", return_value=subprocess.CompletedProcess([], 0)) as run, \
+                redirect_stdout(out):
+            self.assertEqual(cmd(args), 0)
+        return out.getvalue(), run
+
+    def test_parallel_is_reported_as_unused(self):
+        for cmd in (compose.cmd_up, compose.cmd_down, compose.cmd_restart):
+            with self.subTest(cmd=cmd.__name__):
+                text, run = self._output(cmd, 4)
+                self.assertIn("-p/--parallel only applies to legacy mode", text)
+                self.assertTrue(run.called)
+
+    def test_no_note_without_parallel(self):
+        text, _ = self._output(compose.cmd_up, None)
+        self.assertNotIn("--parallel", text)
+
+
+class TestUpChanged(_WorkspaceFixture):
+    def setUp(self):
+        super().setUp()
+        (self.host_dir / "compose.yml").write_text("services: {}\n")
+        self.calls: list[list[str]] = []
+
+    def _run(self, cmd, **kwargs):
+        self.calls.append(cmd)
+        if "config" in cmd:
+            return subprocess.CompletedProcess(cmd, 0, stdout="a h1\nb h2\nc h3\n")
+        return subprocess.CompletedProcess(cmd, 0)
+
+    def _up(self, running):
+        args = argparse.Namespace(host="nas", service=None, containers=[], parallel=None, changed=True)
+        out = io.StringIO()
+        with mock.patch.object(compose.subprocess, "run", side_effect=self._run), \
+                mock.patch.object(compose.drift, "running_hashes", return_value=running), \
+                redirect_stdout(out):
+            code = compose.cmd_up(args)
+        return code, out.getvalue()
+
+    def test_only_drifted_services_are_brought_up(self):
+        code, text = self._up([
+            drift.ContainerHash("a", "h1", "running"),
+            drift.ContainerHash("b", "stale", "running"),
+        ])
+        self.assertEqual(code, 0)
+        self.assertEqual(self.calls[-1][-4:], ["up", "-d", "b", "c"])
+        self.assertIn("config changed", text)
+        self.assertIn("not created", text)
+
+    def test_nothing_changed_skips_up(self):
+        code, text = self._up([drift.ContainerHash(n, h, "running") for n, h in
+                               [("a", "h1"), ("b", "h2"), ("c", "h3")]])
+        self.assertEqual(code, 0)
+        self.assertIn("Nothing changed", text)
+        self.assertFalse(any("up" in cmd for cmd in self.calls))
+
+
+class TestRestartRolling(_WorkspaceFixture):
+    def setUp(self):
+        super().setUp()
+        (self.host_dir / "compose.yml").write_text(
+            "services:\n  a: {restart: unless-stopped}\n  b: {restart: unless-stopped}\n  c: {}\n"
+        )
+        self.calls: list[list[str]] = []
+
+    def _restart(self, failure_on: str | None = None, parallel=None):
+        def wait(project, services, timeout, one_shot=frozenset()):
+            self.one_shot = one_shot
+            return f"{services[0]}: unhealthy" if failure_on in services else None
+
+        def run(cmd, **kwargs):
+            self.calls.append(cmd)
+            return subprocess.CompletedProcess(cmd, 0)
+
+        args = argparse.Namespace(
+            host="nas", service=None, containers=[], parallel=parallel, rolling=True, timeout=None,
+        )
+        out = io.StringIO()
+        with mock.patch.object(compose.subprocess, "run", side_effect=run), \
+                mock.patch.object(compose.rolling, "wait_ready", side_effect=wait), \
+                redirect_stdout(out):
+            code = compose.cmd_restart(args)
+        return code, out.getvalue()
+
+    def test_recreates_in_batches_without_down(self):
+        code, _ = self._restart(parallel=2)
+        self.assertEqual(code, 0)
+        self.assertEqual([cmd[cmd.index("--no-deps") + 1:] for cmd in self.calls], [["a", "b"], ["c"]])
+        self.assertFalse(any("down" in cmd for cmd in self.calls))
+        self.assertEqual(self.one_shot, {"c"})  # no restart policy: may exit 0
+
+    def test_aborts_on_first_unready_batch(self):
+        code, text = self._restart(failure_on="b")
+        self.assertEqual(code, 1)
+        self.assertEqual(len(self.calls), 2)
+        self.assertIn("Rolling restart aborted: b: unhealthy", text)
+        self.assertIn("Not restarted: c", text)
+
+
+class TestLogsAcrossGroups(_WorkspaceFixture):
+    def setUp(self):
+        super().setUp()
+        for group, services in {"traefik": ["traefik"], "security": ["crowdsec", "authelia"]}.items():
+            (self.host_dir / group).mkdir()
+            body = "".join(f"  {svc}:\n    image: x\n" for svc in services)
+            (self.host_dir / group / "compose.yml").write_text(f"services:\n{body}")
+        (self.host_dir / "compose.yml").write_text(
+            "name: homelab\ninclude:\n  - traefik/compose.yml\n  - security/compose.yml\n"
+        )
+
+    def test_group_and_its_services_keep_original_meaning(self):
+        self.assertEqual(resolve_log_targets("nas", ["security", "crowdsec"]), ["crowdsec"])
+
+    def test_mixed_args_expand_independently(self):
+        self.assertEqual(
+            resolve_log_targets("nas", ["traefik", "security", "crowdsec"]),
+            ["traefik", "crowdsec", "authelia"],
+        )
+
+    def _logs(self, *targets, since=None):
+        args = argparse.Namespace(
+            host="nas", service=targets[0], containers=list(targets[1:]),
+            follow=False, tail="50", since=since, until=None,
+        )
+        with mock.patch.object(compose.logmux, "stream_logs", return_value=0) as stream, \
+                mock.patch.object(compose.subprocess, "run",
+                                  return_value=subprocess.CompletedProcess([], 0)) as run, \
+                redirect_stdout(io.StringIO()):
+            code = compose.cmd_logs(args)
+        return code, stream, run
+
+    def test_single_group_uses_docker_compose_logs(self):
+        code, stream, run = self._logs("security", since="10m")
+        self.assertEqual(code, 0)
+        stream.assert_not_called()
+        self.assertIn("--since", run.call_args[0][0])
+
+    def test_several_groups_are_multiplexed(self):
+        code, stream, run = self._logs("traefik", "security")
+        self.assertEqual(code, 0)
+        run.assert_not_called()
+        selectors = stream.call_args[0][0]
+        self.assertEqual(selectors, [("homelab", "traefik"), ("homelab", "crowdsec"), ("homelab", "authelia")])
+        self.assertEqual(stream.call_args[1]["tail"], "50")
+
+    def test_invalid_since_is_rejected(self):
+        code, stream, run = self._logs("traefik", since="last tuesday")
+        self.assertEqual(code, 1)
+        run.assert_not_called()
+
+    def _grep(self, *targets, pattern="req=\\w+", count=False):
+        args = argparse.Namespace(
+            host="nas", service=targets[0] if targets else None, containers=list(targets[1:]),
+            follow=True, tail=None, since=None, until=None, grep=pattern, count=count,
+        )
+        with mock.patch.object(compose.logmux, "grep_logs", return_value=0) as grep, \
+                redirect_stdout(io.StringIO()):
+            code = compose.cmd_logs(args)
+        return code, grep
+
+    def test_grep_without_targets_searches_the_whole_project(self):
+        code, grep = self._grep(count=True)
+        self.assertEqual(code, 0)
+        selectors, pattern = grep.call_args[0]
+        self.assertEqual(selectors, [("homelab", None)])
+        self.assertEqual(pattern.pattern, "req=\\w+")
+        self.assertEqual(grep.call_args[1]["tail"], "all")
+        self.assertTrue(grep.call_args[1]["count_only"])
+
+    def test_grep_expands_groups(self):
+        _, grep = self._grep("security")
+        self.assertEqual(grep.call_args[0][0], [("homelab", "crowdsec"), ("homelab", "authelia")])
+
+    def test_grep_rejects_invalid_regex(self):
+        code, grep = self._grep(pattern="(unclosed")
+        self.assertEqual(code, 1)
+        grep.assert_not_called()
+
+
 if __name__ == "__main__":
     unittest.main()
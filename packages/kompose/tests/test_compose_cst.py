@@ -0,0 +1,93 @@
+"""Tests for the line-level compose CST used by property_order."""
+
+import unittest
+
+from kompose.compose_cst import parse_compose
+
+SAMPLE = """\
+name: demo
+services:
+  # first service
+  web:
+    image: nginx
+    # env for web
+    environment:
+      - A=1
+      # inside the list
+      - B=2
+
+    container_name: web
+    # trailing note
+  db:
+    container_name: db
+    image: postgres
+networks:
+  default: {}
+"""
+
+
+class TestParse(unittest.TestCase):
+    def setUp(self):
+        self.cst = parse_compose(SAMPLE)
+
+    def test_services_and_header_lines(self):
+        self.assertEqual([(s.name, s.line) for s in self.cst.services], [("web", 4), ("db", 14)])
+
+    def test_property_names_and_lines(self):
+        web, db = self.cst.services
+        self.assertEqual([(p.name, p.line) for p in web.properties],
+                         [("image", 5), ("environment", 7), ("container_name", 12)])
+        self.assertEqual([(p.name, p.line) for p in db.properties],
+                         [("container_name", 15), ("image", 16)])
+
+    def test_comment_ownership(self):
+        lines = SAMPLE.split("\n")
+        web = self.cst.services[0]
+        image, env, name = web.properties
+        # Leading comment belongs to the next property; the in-value comment
+        # and the values stay with `environment`; the blank line leads `container_name`.
+        self.assertEqual(lines[env.start:env.end], [
+            "    # env for web", "    environment:", "      - A=1", "      # inside the list", "      - B=2",
+        ])
+        self.assertEqual(lines[name.start:name.end], ["", "    container_name: web"])
+        # The trailer (comment after the last property) doesn't belong to any property.
+        self.assertEqual(lines[web.prop_end:web.body_end], ["    # trailing note"])
+
+    def test_block_ends_at_next_top_level_key(self):
+        self.assertEqual(self.cst.services[-1].body_end, SAMPLE.split("\n").index("networks:"))
+
+    def test_no_services(self):
+        self.assertEqual(parse_compose("name: x\nnetworks: {}\n").services, [])
+
+    def test_nested_services_key_is_not_the_block(self):
+        cst = parse_compose("x-meta:\n  services:\n    fake:\n      a: 1\n")
+        self.assertEqual(cst.services, [])
+
+
+class TestRender(unittest.TestCase):
+    def test_identity(self):
+        self.assertEqual(parse_compose(SAMPLE).render(), SAMPLE)
+        cst = parse_compose(SAMPLE)
+        self.assertEqual(cst.render({i: s.properties for i, s in enumerate(cst.services)}), SAMPLE)
+
+    def test_permutation_moves_whole_spans(self):
+        cst = parse_compose(SAMPLE)
+        image, env, name = cst.services[0].properties
+        out = cst.render({0: [name, image, env]}).split("\n")
+        self.assertEqual(out[3:14], [
+            "  web:",
+            "",
+            "    container_name: web",
+            "    image: nginx",
+            "    # env for web",
+            "    environment:",
+            "      - A=1",
+            "      # inside the list",
+            "      - B=2",
+            "    # trailing note",
+            "  db:",
+        ])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,113 @@
+"""Tests for the per-process compose index — caching, invalidation, lookups."""
+
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from kompose import compose_index as compose_index_module
+from kompose.compose_index import ComposeIndex
+
+
+class _IndexFixture(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.host_dir = Path(self._tmp.name)
+        self.index = ComposeIndex()
+
+    def _write(self, rel: str, content: str) -> Path:
+        path = self.host_dir / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+        return path
+
+
+class TestDocCaching(_IndexFixture):
+    def test_parses_once_across_lookups(self):
+        path = self._write("servarr/compose.yml", "services:\n  sonarr: {}\n  radarr: {}\n")
+        with mock.patch.object(compose_index_module.yaml, "safe_load",
+                               wraps=compose_index_module.yaml.safe_load) as spy:
+            self.index.service_names(path)
+            self.index.services(path)
+            self.index.images(path)
+        self.assertEqual(spy.call_count, 1)
+
+    def test_parse_is_lazy(self):
+        path = self._write("a/compose.yml", "services: {}\n")
+        doc = self.index.doc(path)
+        self.assertFalse(doc.parsed)
+        self.assertEqual(doc.content, "services: {}\n")
+        doc.data
+        self.assertTrue(doc.parsed)
+
+    def test_modified_file_is_reloaded(self):
+        path = self._write("a/compose.yml", "services:\n  one: {}\n")
+        self.assertEqual(self.index.service_names(path), ["one"])
+        path.write_text("services:\n  one: {}\n  two: {}\n")
+        st = path.stat()
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+        self.assertEqual(self.index.service_names(path), ["one", "two"])
+
+    def test_forget_drops_same_size_rewrite(self):
+        path = self._write("a/compose.yml", "services:\n  aaa: {}\n")
+        stamp = path.stat().st_mtime_ns
+        self.index.service_names(path)
+        path.write_text("services:\n  bbb: {}\n")
+        os.utime(path, ns=(stamp, stamp))  # same size + same mtime → indistinguishable
+        self.index.forget(path)
+        self.assertEqual(self.index.service_names(path), ["bbb"])
+
+    def test_missing_file(self):
+        self.assertIsNone(self.index.doc(self.host_dir / "nope.yml"))
+        self.assertEqual(self.index.services(self.host_dir / "nope.yml"), {})
+
+    def test_malformed_yaml_is_empty(self):
+        path = self._write("a/compose.yml", "services: [unclosed\n")
+        self.assertEqual(self.index.services(path), {})
+
+    def test_non_mapping_top_level_is_empty(self):
+        path = self._write("a/compose.yml", "- just\n- a list\n")
+        self.assertEqual(self.index.service_names(path), [])
+
+
+class TestDerivedLookups(_IndexFixture):
+    def test_service_to_group_follows_includes(self):
+        self._write("servarr/compose.yml", "services:\n  sonarr: {}\n  radarr: {}\n")
+        self._write("immich/compose.yml", "services:\n  immich-server: {}\n")
+        root = self._write("compose.yml", (
+            "include:\n"
+            "  - path: servarr/compose.yml\n"
+            "  - immich/compose.yml\n"
+            "  - path: ghost/compose.yml\n"
+            "  - path: flat.yml\n"
+        ))
+        self.assertEqual(self.index.service_to_group(root), {
+            "sonarr": "servarr", "radarr": "servarr", "immich-server": "immich",
+        })
+        self.assertEqual([g for g, _ in self.index.includes(root)], ["servarr", "immich", "ghost"])
+
+    def test_images(self):
+        path = self._write("a/compose.yml", "services:\n  app:\n    image: nginx:1\n  job:\n    build: .\n")
+        self.assertEqual(self.index.images(path), {"app": "nginx:1", "job": None})
+
+    def test_ipv4_addresses_dict_form(self):
+        path = self._write("a/compose.yml", (
+            "services:\n"
+            "  app:\n"
+            "    networks:\n"
+            "      reverse-proxy:\n"
+            "        ipv4_address: 10.10.10.5\n"
+            "      internal: {}\n"
+        ))
+        self.assertEqual(self.index.ipv4_addresses(path, "app"), {"reverse-proxy": "10.10.10.5"})
+
+    def test_networks_list_form(self):
+        path = self._write("a/compose.yml", "services:\n  app:\n    networks: [a, b]\n")
+        self.assertEqual(self.index.networks(path, "app"), {"a": {}, "b": {}})
+        self.assertEqual(self.index.ipv4_addresses(path, "app"), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -13,6 +13,8 @@ from kompose.config import (
     _HARDCODED_WORKSPACE,
     _resolve,
     get_base_dir,
+    get_cache_dir,
+    get_state_dir,
     get_host_dir,
 )
 
@@ -27,6 +29,22 @@ class TestPaths(unittest.TestCase):
     def test_base_dir(self):
         self.assertEqual(get_base_dir(), WORKSPACE_DIR / "base")
 
+    def test_cache_dir_honours_xdg(self):
+        with mock.patch.dict("os.environ", {"XDG_CACHE_HOME": "/tmp/xdg-cache"}):
+            self.assertEqual(get_cache_dir(), Path("/tmp/xdg-cache/kompose"))
+
+    def test_cache_dir_default(self):
+        with mock.patch.dict("os.environ", {"XDG_CACHE_HOME": ""}):
+            self.assertEqual(get_cache_dir(), Path.home() / ".cache" / "kompose")
+
+    def test_state_dir_honours_xdg(self):
+        with mock.patch.dict("os.environ", {"XDG_STATE_HOME": "/tmp/xdg-state"}):
+            self.assertEqual(get_state_dir(), Path("/tmp/xdg-state/kompose"))
+
+    def test_state_dir_default(self):
+        with mock.patch.dict("os.environ", {"XDG_STATE_HOME": ""}):
+            self.assertEqual(get_state_dir(), Path.home() / ".local" / "state" / "kompose")
+
 
 class TestResolutionChain(unittest.TestCase):
     """Verify the precedence: env var > file config > hardcoded fallback."""
@@ -0,0 +1,232 @@
+"""Tests for the Docker Engine API client.
+
+Runs against a stand-in daemon: a threaded HTTP/1.1 server bound to a
+temporary unix socket that serves canned responses per route. No docker
+daemon is needed.
+"""
+
+import json
+import os
+import socketserver
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler
+from unittest import mock
+
+from kompose import docker
+from kompose.docker import DockerClient, DockerError, _looks_multiplexed, _socket_path
+
+
+def _frame(stream: int, payload: bytes) -> bytes:
+    return bytes([stream, 0, 0, 0]) + len(payload).to_bytes(4, "big") + payload
+
+
+class _FakeDaemon(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Unix-socket HTTP server. `routes` maps (method, path) → (status, body, content_type)."""
+
+    daemon_threads = True
+
+    def __init__(self, path: str, routes: dict):
+        self.routes = routes
+        self.requests: list[tuple[str, str]] = []
+        self.connections = 0
+        super().__init__(path, _Handler)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+
+    def address_string(self):
+        return "unix"
+
+    def log_message(self, *args):
+        pass
+
+    def _serve(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            self.rfile.read(length)
+        self.server.requests.append((self.command, self.path))
+        path = self.path.split("?", 1)[0]
+        status, body, content_type = self.server.routes.get(
+            (self.command, path), (404, b'{"message": "no such route"}', "application/json"),
+        )
+        if isinstance(body, (dict, list)):
+            body = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = _serve
+    do_POST = _serve
+
+
+class _DaemonTestCase(unittest.TestCase):
+    routes: dict = {}
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.socket_path = os.path.join(self._tmp.name, "docker.sock")
+        self.daemon = _FakeDaemon(self.socket_path, dict(self.routes))
+        self._thread = threading.Thread(target=self.daemon.serve_forever, daemon=True)
+        self._thread.start()
+        self.client = DockerClient(self.socket_path, timeout=5)
+
+    def tearDown(self):
+        self.client.close()
+        self.daemon.shutdown()
+        self.daemon.server_close()
+        self._tmp.cleanup()
+
+
+class TestRequests(_DaemonTestCase):
+    routes = {
+        ("GET", "/_ping"): (200, b"OK", "text/plain"),
+        ("GET", "/containers/json"): (200, [{"Id": "abc", "Names": ["/web"]}], "application/json"),
+        ("GET", "/networks/reverse-proxy"): (200, {"Containers": {"abc": {"Name": "web"}}}, "application/json"),
+        ("GET", "/images/foo/bar%3A1.2/json"): (200, {"RepoDigests": ["foo/bar@sha256:abc"]}, "application/json"),
+        ("GET", "/containers/gone/json"): (404, {"message": "No such container: gone"}, "application/json"),
+        ("GET", "/events"): (200, b'{"Type":"container","Action":"start"}\n{"Type":"network","Action":"connect"}\n',
+                             "application/json"),
+    }
+
+    def test_ping(self):
+        self.assertTrue(self.client.ping())
+
+    def test_list_containers_sends_filters(self):
+        result = self.client.list_containers(all=True, filters={"label": ["com.docker.compose.project"]})
+        self.assertEqual(result[0]["Id"], "abc")
+        method, path = self.daemon.requests[-1]
+        self.assertEqual(method, "GET")
+        self.assertIn("all=1", path)
+        self.assertIn("filters=", path)
+
+    def test_inspect_network(self):
+        self.assertEqual(self.client.inspect_network("reverse-proxy")["Containers"]["abc"]["Name"], "web")
+
+    def test_inspect_image_quotes_the_reference(self):
+        self.assertEqual(self.client.inspect_image("foo/bar:1.2")["RepoDigests"], ["foo/bar@sha256:abc"])
+
+    def test_events_yield_one_json_document_per_line(self):
+        with self.client.events(since=1700000000, filters={"type": ["container"]}) as stream:
+            actions = [json.loads(line)["Action"] for line in stream]
+        self.assertEqual(actions, ["start", "connect"])
+        self.assertIn("filters=", self.daemon.requests[-1][1])
+
+    def test_keep_alive_reuses_connection(self):
+        for _ in range(5):
+            self.client.list_containers()
+        self.client.inspect_network("reverse-proxy")
+        self.assertEqual(self.daemon.connections, 1)
+
+    def test_http_error_carries_status_and_message(self):
+        with self.assertRaises(DockerError) as ctx:
+            self.client.inspect_container("gone")
+        self.assertEqual(ctx.exception.status, 404)
+        self.assertIn("No such container: gone", str(ctx.exception))
+
+    def test_missing_socket_raises_docker_error(self):
+        client = DockerClient(os.path.join(self._tmp.name, "nope.sock"))
+        with self.assertRaises(DockerError) as ctx:
+            client.list_containers()
+        self.assertEqual(ctx.exception.status, 0)
+
+
+class TestLogs(_DaemonTestCase):
+    routes = {
+        ("GET", "/containers/mux/logs"): (
+            200,
+            _frame(1, b"first line\nsecond ") + _frame(2, b"line\n") + _frame(1, b"caf\xc3") + _frame(1, b"\xa9\n"),
+            "application/vnd.docker.multiplexed-stream",
+        ),
+        ("GET", "/containers/tty/logs"): (200, b"raw one\r\nraw two", "application/vnd.docker.raw-stream"),
+    }
+
+    def test_demuxes_frames_across_boundaries(self):
+        with self.client.logs("mux", tail=10) as stream:
+            self.assertEqual(list(stream), ["first line", "second line", "café"])
+        self.assertIn("tail=10", self.daemon.requests[-1][1])
+
+    def test_raw_stream_for_tty_containers(self):
+        with self.client.logs("tty") as stream:
+            self.assertEqual(list(stream), ["raw one", "raw two"])
+
+    def test_since_is_sent_as_unix_seconds(self):
+        with self.client.logs("mux", since=1700000000):
+            pass
+        self.assertIn("since=1700000000.000000000", self.daemon.requests[-1][1])
+
+    def test_missing_container_raises(self):
+        with self.assertRaises(DockerError) as ctx:
+            self.client.logs("nope")
+        self.assertEqual(ctx.exception.status, 404)
+
+
+class TestLooksMultiplexed(unittest.TestCase):
+    def test_frame_header(self):
+        self.assertTrue(_looks_multiplexed(_frame(1, b"x")[:8]))
+
+    def test_plain_text(self):
+        self.assertFalse(_looks_multiplexed(b"2024-01-"))
+
+
+class TestSocketPath(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.config_dir = self._tmp.name
+
+    def _env(self, **env) -> dict:
+        return {"DOCKER_CONFIG": self.config_dir, **env}
+
+    def _current_context(self, name: str) -> None:
+        with open(os.path.join(self.config_dir, "config.json"), "w") as f:
+            json.dump({"currentContext": name}, f)
+
+    def test_default_socket(self):
+        with mock.patch.dict(os.environ, self._env(), clear=True):
+            self.assertEqual(_socket_path(), docker.DEFAULT_SOCKET)
+
+    def test_default_context_uses_the_default_socket(self):
+        self._current_context("default")
+        with mock.patch.dict(os.environ, self._env(), clear=True):
+            self.assertEqual(_socket_path(), docker.DEFAULT_SOCKET)
+
+    def test_current_context_defers_to_cli(self):
+        self._current_context("desktop-linux")
+        with mock.patch.dict(os.environ, self._env(), clear=True):
+            self.assertIsNone(_socket_path())
+
+    def test_docker_context_env_wins_over_config(self):
+        self._current_context("desktop-linux")
+        with mock.patch.dict(os.environ, self._env(DOCKER_CONTEXT="default"), clear=True):
+            self.assertEqual(_socket_path(), docker.DEFAULT_SOCKET)
+        with mock.patch.dict(os.environ, self._env(DOCKER_CONTEXT="remote"), clear=True):
+            self.assertIsNone(_socket_path())
+
+    def test_unix_docker_host(self):
+        with mock.patch.dict(os.environ, {"DOCKER_HOST": "unix:///run/user/1000/docker.sock"}):
+            self.assertEqual(_socket_path(), "/run/user/1000/docker.sock")
+
+    def test_tcp_docker_host_defers_to_cli(self):
+        with mock.patch.dict(os.environ, {"DOCKER_HOST": "tcp://10.0.0.2:2375"}):
+            self.assertIsNone(_socket_path())
+
+    def test_get_client_none_without_socket(self):
+        docker.reset_client()
+        try:
+            with mock.patch.dict(os.environ, {"DOCKER_HOST": "unix:///nonexistent/docker.sock"}):
+                self.assertIsNone(docker.get_client())
+        finally:
+            docker.reset_client()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+"""Tests for config drift detection (`kompose up --changed`)."""
+
+import os
+import subprocess
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from kompose import drift
+from kompose.compose_index import compose_index
+from kompose.drift import (
+    CHANGED,
+    MISSING,
+    STOPPED,
+    UNCHANGED,
+    ContainerHash,
+    parse_hash_output,
+    plan_drift,
+    project_name,
+    running_hashes,
+)
+
+
+class TestParseHashOutput(unittest.TestCase):
+    def test_one_service_per_line(self):
+        out = "traefik 3f2a\nsonarr 9bc1\n\nwarning: something odd here\n"
+        self.assertEqual(parse_hash_output(out), {"traefik": "3f2a", "sonarr": "9bc1"})
+
+
+class TestPlanDrift(unittest.TestCase):
+    def test_classifies_each_service(self):
+        expected = {"a": "h1", "b": "h2", "c": "h3", "d": "h4"}
+        running = [
+            ContainerHash("a", "h1", "running"),
+            ContainerHash("b", "old", "running"),
+            ContainerHash("d", "h4", "exited"),
+            ContainerHash("zombie", "x", "running"),
+        ]
+        self.assertEqual(plan_drift(expected, running), {
+            "a": UNCHANGED, "b": CHANGED, "c": MISSING, "d": STOPPED,
+        })
+
+    def test_any_stale_replica_marks_the_service_changed(self):
+        running = [ContainerHash("w", "h", "running"), ContainerHash("w", "old", "running")]
+        self.assertEqual(plan_drift({"w": "h"}, running), {"w": CHANGED})
+
+
+class TestProjectName(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name) / "My.Host" / "compose.yml"
+        self.root.parent.mkdir()
+        compose_index().clear()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+        compose_index().clear()
+
+    def test_defaults_to_normalised_dir_name(self):
+        self.root.write_text("services: {}\n")
+        with mock.patch.dict(os.environ, {}, clear=True):
+            self.assertEqual(project_name(self.root), "myhost")
+
+    def test_top_level_name_wins_over_dir(self):
+        self.root.write_text("name: homelab\nservices: {}\n")
+        with mock.patch.dict(os.environ, {}, clear=True):
+            self.assertEqual(project_name(self.root), "homelab")
+
+    def test_env_wins_over_everything(self):
+        self.root.write_text("name: homelab\nservices: {}\n")
+        with mock.patch.dict(os.environ, {"COMPOSE_PROJECT_NAME": "override"}):
+            self.assertEqual(project_name(self.root), "override")
+
+
+class TestRunningHashes(unittest.TestCase):
+    def test_api_path_skips_oneoff_containers(self):
+        client = mock.Mock()
+        client.list_containers.return_value = [
+            {"State": "running", "Labels": {drift.SERVICE_LABEL: "a", drift.CONFIG_HASH_LABEL: "h1"}},
+            {"State": "exited", "Labels": {
+                drift.SERVICE_LABEL: "a", drift.CONFIG_HASH_LABEL: "h1", drift.ONEOFF_LABEL: "True",
+            }},
+        ]
+        with mock.patch.object(drift, "get_client", return_value=client):
+            self.assertEqual(running_hashes("homelab"), [ContainerHash("a", "h1", "running")])
+        client.list_containers.assert_called_once_with(
+            all=True, filters={"label": [f"{drift.PROJECT_LABEL}=homelab"]},
+        )
+
+    def test_cli_fallback_parses_label_columns(self):
+        out = "a\th1\tFalse\trunning\nb\th2\tTrue\texited\n"
+        result = subprocess.CompletedProcess([], 0, stdout=out)
+        with mock.patch.object(drift, "get_client", return_value=None), \
+                mock.patch.object(drift.subprocess, "run", return_value=result) as run:
+            self.assertEqual(running_hashes("homelab"), [ContainerHash("a", "h1", "running")])
+        self.assertEqual(run.call_count, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,26 +1,35 @@
 """Tests for the lint engine: YAML loading, dispatch, RuleSpec validation."""
 
+import pickle
 import tempfile
 import unittest
 from pathlib import Path
 from unittest import mock
 
 from kompose import _engine
+from kompose import compose_index as compose_index_module
 from kompose._engine import (
     FixApplied,
+    CompiledRule,
     LintContext,
+    RulePlan,
     RuleSpec,
     SEVERITY_ERROR,
     SEVERITY_WARNING,
     lint_service,
+    lint_services,
     load_rules,
     resolve_fix,
     resolve_handler,
     resolve_notices,
     run_fix,
     run_notices,
+    ruleset_matcher,
     run_rule,
 )
+from kompose.compose_index import compose_index
+
+EXAMPLE_RULES = Path(__file__).resolve().parents[1] / "examples" / "rules.yaml"
 
 
 class TestRuleSpecValidation(unittest.TestCase):
@@ -217,6 +226,207 @@ class TestLintService(unittest.TestCase):
         result = lint_service(self.service_dir, rules, {})
         self.assertEqual(result.rule_results, [])
 
+    def test_example_ruleset_never_parses_compose(self):
+        # Every rule in the shipped example scans text only — no YAML parse.
+        compose = self.service_dir / "compose.yml"
+        compose.write_text("services:\n  app:\n    image: x\n")
+        kompose_dir = Path(self.tmp.name) / ".kompose"
+        kompose_dir.mkdir()
+        (kompose_dir / "rules.yaml").write_text(EXAMPLE_RULES.read_text())
+        with mock.patch.object(_engine, "get_kompose_dir", return_value=kompose_dir):
+            globals_dict, rules = load_rules()
+        result = lint_service(self.service_dir, rules, globals_dict)
+        self.assertEqual(len(result.rule_results), len(rules))
+        self.assertFalse(compose_index().doc(compose).parsed)
+
+
+class TestRulePlan(unittest.TestCase):
+    def _plan(self):
+        return RulePlan([
+            RuleSpec(name="req", category="c", type="substring_required",
+                     params={"required": ["TZ="]}, exclude=["skipme"]),
+            RuleSpec(name="order", category="c", type="property_order", params={"order": ["image"]}),
+            RuleSpec(name="sync", category="c", handler="compose_includes_sync"),
+        ])
+
+    def test_behaves_like_a_spec_list(self):
+        plan = self._plan()
+        self.assertEqual(len(plan), 3)
+        self.assertEqual(plan[0].name, "req")
+        self.assertEqual([s.name for s in plan], ["req", "order", "sync"])
+        self.assertEqual(plan.specs, list(plan))
+        self.assertNotEqual(plan, list(plan))
+
+    def test_compiled_rule_freezes_params_and_exclude(self):
+        rule = self._plan().compiled[0]
+        self.assertIsInstance(rule, CompiledRule)
+        self.assertEqual(rule.exclude, frozenset({"skipme"}))
+        self.assertEqual(rule.patterns, frozenset({"TZ="}))
+        self.assertIsNone(rule.notices)
+
+    def test_fixable(self):
+        self.assertEqual(self._plan().fixable, {"order", "sync"})
+
+    def test_unknown_handler_raises_on_compile_only(self):
+        plan = RulePlan([RuleSpec(name="r", category="c", handler="does_not_exist")])
+        self.assertEqual(len(plan), 1)
+        with self.assertRaises(ValueError):
+            plan.compile()
+
+    def test_hooks_resolved_once_across_services(self):
+        plan = self._plan()
+        with tempfile.TemporaryDirectory() as tmp:
+            dirs = []
+            for name in ("a", "b", "c"):
+                d = Path(tmp) / name
+                d.mkdir()
+                (d / "compose.yml").write_text("services:\n  app:\n    image: x\n")
+                dirs.append(d)
+            lint_service(dirs[0], plan, {})
+            with mock.patch.object(_engine.importlib, "import_module",
+                                   wraps=_engine.importlib.import_module) as spy:
+                for d in dirs:
+                    lint_service(d, plan, {})
+        self.assertEqual(spy.call_count, 0)
+
+    def test_pickles_as_specs_only(self):
+        plan = self._plan()
+        plan.compile()
+        clone = pickle.loads(pickle.dumps(plan))
+        self.assertEqual(clone, plan)
+        self.assertNotIn("compiled", vars(clone))
+
+    def test_load_rules_returns_plan(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            kompose_dir = Path(tmp)
+            (kompose_dir / "rules.yaml").write_text(EXAMPLE_RULES.read_text())
+            with mock.patch.object(_engine, "get_kompose_dir", return_value=kompose_dir):
+                _, plan = load_rules()
+        self.assertIsInstance(plan, RulePlan)
+        self.assertEqual(len(plan.compile()), len(plan))
+
+
+class TestRulesetMatcher(unittest.TestCase):
+    def _rules(self):
+        return [
+            RuleSpec(name="req", category="c", type="substring_required",
+                     params={"required": ["TZ=", "restart: unless-stopped"]}),
+            RuleSpec(name="forb", category="c", type="substring_forbidden",
+                     params={"forbidden": "privileged: true"}),
+            RuleSpec(name="net", category="c", handler="reverse_proxy_network"),
+        ]
+
+    def test_collects_literals_from_substring_rules(self):
+        matcher = ruleset_matcher(self._rules())
+        self.assertEqual(matcher.patterns, {"TZ=", "restart: unless-stopped", "privileged: true"})
+
+    def test_none_without_literals(self):
+        self.assertIsNone(ruleset_matcher([RuleSpec(name="net", category="c", handler="reverse_proxy_network")]))
+
+    def test_content_scanned_once_for_all_rules(self):
+        rules = self._rules()
+        matcher = ruleset_matcher(rules)
+        ctx = LintContext("svc", Path("/tmp/compose.yml"), "environment:\n  - TZ=UTC\nprivileged: true\n",
+                          matcher=matcher)
+        with mock.patch.object(type(matcher), "find", wraps=matcher.find) as spy:
+            issues = [run_rule(spec, ctx) for spec in rules[:2]]
+        self.assertEqual(spy.call_count, 1)
+        self.assertEqual([i.message for i in issues[0]], ["missing 'restart: unless-stopped'"])
+        self.assertEqual([i.message for i in issues[1]], ["forbidden 'privileged: true'"])
+
+    def test_contains_falls_back_for_unknown_literals(self):
+        ctx = LintContext("svc", Path("/tmp/compose.yml"), "abc", matcher=ruleset_matcher(self._rules()))
+        self.assertTrue(ctx.contains("b"))
+        self.assertFalse(ctx.contains("TZ="))
+
+
+class TestLintContext(unittest.TestCase):
+    def test_parsed_is_lazy_and_memoized(self):
+        ctx = LintContext("svc", Path("/tmp/compose.yml"), "services:\n  app: {}\n")
+        with mock.patch.object(compose_index_module.yaml, "safe_load",
+                               wraps=compose_index_module.yaml.safe_load) as spy:
+            self.assertEqual(spy.call_count, 0)
+            self.assertEqual(ctx.parsed, {"services": {"app": {}}})
+            ctx.parsed
+        self.assertEqual(spy.call_count, 1)
+
+    def test_supplied_parsed_is_used(self):
+        ctx = LintContext("svc", Path("/tmp/compose.yml"), "services: {}\n", parsed={"x": 1})
+        self.assertEqual(ctx.parsed, {"x": 1})
+
+    def test_invalid_yaml_parses_to_empty(self):
+        ctx = LintContext("svc", Path("/tmp/compose.yml"), "services: [unclosed\n")
+        self.assertEqual(ctx.parsed, {})
+
+    def test_from_doc_shares_the_index_parse(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "compose.yml"
+            path.write_text("services:\n  app: {}\n")
+            doc = compose_index().doc(path)
+            ctx = LintContext.from_doc("svc", doc, {"k": "v"})
+            self.assertFalse(doc.parsed)
+            self.assertIs(ctx.parsed, doc.data)
+            self.assertEqual(ctx.globals, {"k": "v"})
+
+
+class TestLintServices(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        self.dirs = []
+        for i, name in enumerate(["gamma", "alpha", "beta", "delta"]):
+            service_dir = self.root / name
+            service_dir.mkdir()
+            body = "services:\n  app:\n    image: x\n" + ("    # foo\n" if i % 2 else "")
+            (service_dir / "compose.yml").write_text(body)
+            self.dirs.append(service_dir)
+        self.rules = [
+            RuleSpec(name="must-have-foo", category="cat", type="substring_required",
+                     params={"required": ["foo"]}),
+            RuleSpec(name="net", category="cat", handler="reverse_proxy_network"),
+        ]
+        # Four services are below the pool threshold; lower it so jobs=2 really spawns.
+        patcher = mock.patch.object(_engine, "_MIN_SERVICES_PER_WORKER", 1)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _summary(self, results):
+        return [(r.service_name, [len(rr.issues) for rr in r.rule_results]) for r in results]
+
+    def test_parallel_matches_sequential_in_input_order(self):
+        sequential = lint_services(self.dirs, self.rules, {}, jobs=1)
+        parallel = lint_services(self.dirs, self.rules, {}, jobs=2)
+        self.assertEqual(self._summary(parallel), self._summary(sequential))
+        self.assertEqual([r.service_name for r in parallel], ["gamma", "alpha", "beta", "delta"])
+
+    def test_parallel_results_reference_parent_specs(self):
+        results = lint_services(self.dirs, self.rules, {}, jobs=2)
+        self.assertIs(results[0].rule_results[0].rule, self.rules[0])
+
+    def test_unknown_handler_raises_before_spawning(self):
+        rules = [RuleSpec(name="r", category="c", handler="does_not_exist")]
+        with self.assertRaises(ValueError):
+            lint_services(self.dirs, rules, {}, jobs=2)
+
+    def test_empty_input(self):
+        self.assertEqual(lint_services([], self.rules, {}, jobs=4), [])
+
+    def test_small_batches_stay_in_process(self):
+        with mock.patch.object(_engine, "_MIN_SERVICES_PER_WORKER", 3), \
+                mock.patch.object(_engine, "ProcessPoolExecutor") as pool:
+            results = lint_services(self.dirs, self.rules, {}, jobs=8)
+        pool.assert_not_called()  # 4 services: one worker's worth
+        self.assertEqual(len(results), 4)
+
+        with mock.patch.object(_engine, "_MIN_SERVICES_PER_WORKER", 2), \
+                mock.patch.object(_engine, "ProcessPoolExecutor") as pool:
+            pool.return_value.__enter__.return_value.map.return_value = [[[], []]] * 4
+            lint_services(self.dirs, self.rules, {}, jobs=8)
+        self.assertEqual(pool.call_args.kwargs["max_workers"], 2)
+
 
 class TestNoticesHook(unittest.TestCase):
     """Tests for the optional `notices()` hook on handlers."""
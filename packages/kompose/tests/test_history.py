@@ -0,0 +1,111 @@
+"""Tests for the upgrade history store (JSONL + offset index)."""
+
+import json
+import tempfile
+import unittest
+from dataclasses import asdict
+from pathlib import Path
+from unittest import mock
+
+from kompose.history import (
+    HISTORY_FILE,
+    INDEX_FILE,
+    ImageUpdate,
+    Session,
+    UpgradeHistory,
+    normalize_image,
+)
+
+
+def _session(finished: str, *images: str, host: str = "nas") -> Session:
+    return Session(
+        id=finished, host=host, started=None, finished=finished, duration=None,
+        scanned=10, updated=len(images), failed=0,
+        updates=[ImageUpdate(image=image, container=image.split(":")[0], time=finished) for image in images],
+    )
+
+
+class TestNormalizeImage(unittest.TestCase):
+    def test_forms(self):
+        self.assertEqual(normalize_image("nginx"), "nginx:latest")
+        self.assertEqual(normalize_image("docker.io/library/nginx:1.25"), "nginx:1.25")
+        self.assertEqual(normalize_image("ghcr.io/foo/bar"), "ghcr.io/foo/bar:latest")
+        self.assertEqual(normalize_image("registry:5000/foo"), "registry:5000/foo:latest")
+        self.assertEqual(normalize_image("foo@sha256:abc"), "foo@sha256:abc")
+
+
+class TestUpgradeHistory(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp.name) / "state"
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_record_is_idempotent_per_session(self):
+        history = UpgradeHistory(self.dir)
+        self.assertEqual(history.record([_session("2024-05-01T00:00:00Z", "a:latest")]), 1)
+        self.assertEqual(history.record([_session("2024-05-01T00:00:00Z", "a:latest")]), 0)
+        self.assertEqual(UpgradeHistory(self.dir).record([_session("2024-05-01T00:00:00Z", "a:latest")]), 0)
+        self.assertEqual(len((self.dir / HISTORY_FILE).read_text().splitlines()), 1)
+
+    def test_same_id_on_another_host_is_a_different_session(self):
+        history = UpgradeHistory(self.dir)
+        history.record([_session("2024-05-01T00:00:00Z", "a:latest")])
+        self.assertEqual(history.record([_session("2024-05-01T00:00:00Z", "a:latest", host="pi")]), 1)
+        self.assertEqual(len(history.sessions("nas")), 1)
+
+    def test_timeline_reads_only_indexed_records(self):
+        history = UpgradeHistory(self.dir)
+        history.record([
+            _session("2024-05-01T00:00:00Z", "a:latest", "b:latest"),
+            _session("2024-05-02T00:00:00Z", "c:latest"),
+            _session("2024-05-03T00:00:00Z", "a:latest"),
+        ])
+        fresh = UpgradeHistory(self.dir)
+        with mock.patch.object(fresh, "sessions", side_effect=AssertionError("full scan")):
+            rows = fresh.timeline(["a"])
+        self.assertEqual([s.finished for s, _ in rows], ["2024-05-01T00:00:00Z", "2024-05-03T00:00:00Z"])
+        self.assertTrue(all(u.image == "a:latest" for _, u in rows))
+
+    def test_index_catches_up_with_records_appended_elsewhere(self):
+        UpgradeHistory(self.dir).record([_session("2024-05-01T00:00:00Z", "a:latest")])
+        other = _session("2024-05-02T00:00:00Z", "a:latest")
+        with open(self.dir / HISTORY_FILE, "a") as f:
+            f.write(json.dumps(asdict(other)) + "\n")
+        history = UpgradeHistory(self.dir)
+        self.assertEqual(len(history.timeline(["a:latest"])), 2)
+        self.assertEqual(history.record([other]), 0)
+
+    def test_session_stored_by_another_process_after_loading_is_not_repeated(self):
+        session = _session("2024-05-01T00:00:00Z", "a:latest")
+        history = UpgradeHistory(self.dir)
+        history.timeline(["a"])  # index loaded before the other process appends
+        self.assertEqual(UpgradeHistory(self.dir).record([session]), 1)
+        self.assertEqual(history.record([session, _session("2024-05-02T00:00:00Z", "a:latest")]), 1)
+        self.assertEqual(len((self.dir / HISTORY_FILE).read_text().splitlines()), 2)
+
+    def test_missing_or_corrupt_index_is_rebuilt(self):
+        UpgradeHistory(self.dir).record([_session("2024-05-01T00:00:00Z", "a:latest")])
+        (self.dir / INDEX_FILE).write_text("{not json")
+        history = UpgradeHistory(self.dir)
+        self.assertEqual(len(history.timeline(["a:latest"])), 1)
+        self.assertEqual(history.record([_session("2024-05-01T00:00:00Z", "a:latest")]), 0)
+
+    def test_partial_last_line_is_ignored(self):
+        UpgradeHistory(self.dir).record([_session("2024-05-01T00:00:00Z", "a:latest")])
+        with open(self.dir / HISTORY_FILE, "a") as f:
+            f.write('{"id": "half')
+        history = UpgradeHistory(self.dir)
+        self.assertEqual(len(history.timeline(["a:latest"])), 1)
+        self.assertEqual(history.record([_session("2024-05-02T00:00:00Z", "a:latest")]), 1)
+        self.assertEqual(len(UpgradeHistory(self.dir).timeline(["a:latest"])), 2)
+
+    def test_empty_store(self):
+        history = UpgradeHistory(self.dir)
+        self.assertEqual(history.sessions(), [])
+        self.assertEqual(history.timeline(["a"]), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -93,6 +93,16 @@ class TestPropertyOrder(unittest.TestCase):
         fixes = " ".join(i.fix for i in issues)
         self.assertIn("container_name", fixes)
 
+    def test_each_prop_points_at_first_earlier_prop_that_belongs_after_it(self):
+        order = [f"k{i:03d}" for i in range(300)]
+        body = "".join(f"    {k}: v\n" for k in [order[5], order[2], order[9], order[1], *reversed(order[10:])])
+        ctx = make_ctx("services:\n  app:\n" + body)
+        issues = property_order(ctx, {"order": order}, set())
+        moves = [i.fix for i in issues]
+        self.assertEqual(moves[:2], ["move `k002` before `k005`", "move `k001` before `k005`"])
+        # Descending tail: every prop after the first must move before `k299`.
+        self.assertEqual(moves[2:], [f"move `{k}` before `k299`" for k in reversed(order[10:299])])
+
     def test_no_order_param(self):
         ctx = make_ctx("services:\n  app:\n    image: x\n")
         self.assertEqual(property_order(ctx, {}, set()), [])
@@ -439,6 +449,12 @@ class TestPropertyOrderFix(unittest.TestCase):
     def tearDown(self):
         self.tmp.cleanup()
 
+    def _fix(self, ctx: LintContext, params: dict, exclude: set):
+        # Same sequence as `kompose fix`: run the fixer, then commit the workspace.
+        fixes = property_order_fix(ctx, params, exclude)
+        ctx.workspace.commit()
+        return fixes
+
     def _ctx(self, content: str) -> LintContext:
         self.compose.write_text(content)
         return LintContext(
@@ -457,7 +473,7 @@ class TestPropertyOrderFix(unittest.TestCase):
             "    image: x\n"
         )
         ctx = self._ctx(content)
-        fixes = property_order_fix(ctx, {"order": ["container_name", "image"]}, set())
+        fixes = self._fix(ctx, {"order": ["container_name", "image"]}, set())
         self.assertEqual(fixes, [])
         self.assertEqual(self.compose.read_text(), content)
 
@@ -469,14 +485,14 @@ class TestPropertyOrderFix(unittest.TestCase):
             "    container_name: app\n"
         )
         ctx = self._ctx(content)
-        fixes = property_order_fix(ctx, {"order": ["container_name", "image"]}, set())
+        fixes = self._fix(ctx, {"order": ["container_name", "image"]}, set())
         self.assertEqual(len(fixes), 1)
         self.assertIn("app", fixes[0].message)
         new = self.compose.read_text()
         # container_name should appear before image now
         self.assertLess(new.index("container_name"), new.index("image"))
 
-    def test_dry_run_does_not_write(self):
+    def test_hook_stages_without_writing(self):
         content = (
             "services:\n"
             "  app:\n"
@@ -484,9 +500,11 @@ class TestPropertyOrderFix(unittest.TestCase):
             "    container_name: app\n"
         )
         ctx = self._ctx(content)
-        fixes = property_order_fix(ctx, {"order": ["container_name", "image"]}, set(), dry_run=True)
+        fixes = property_order_fix(ctx, {"order": ["container_name", "image"]}, set())
         self.assertEqual(len(fixes), 1)
-        self.assertEqual(self.compose.read_text(), content)  # unchanged
+        self.assertEqual(self.compose.read_text(), content)  # the hook only stages
+        staged = ctx.workspace.read(self.compose)
+        self.assertLess(staged.index("container_name"), staged.index("image"))
 
     def test_preserves_value_blocks_with_lists(self):
         content = (
@@ -499,7 +517,7 @@ class TestPropertyOrderFix(unittest.TestCase):
             "    container_name: app\n"
         )
         ctx = self._ctx(content)
-        property_order_fix(ctx, {"order": ["container_name", "environment", "image"]}, set())
+        self._fix(ctx, {"order": ["container_name", "environment", "image"]}, set())
         new = self.compose.read_text()
         # Environment list items must stay attached to environment:
         env_idx = new.index("environment:")
@@ -517,7 +535,7 @@ class TestPropertyOrderFix(unittest.TestCase):
             "    container_name: app\n"
         )
         ctx = self._ctx(content)
-        property_order_fix(ctx, {"order": ["container_name", "image"]}, set())
+        self._fix(ctx, {"order": ["container_name", "image"]}, set())
         new = self.compose.read_text()
         # The comment should now precede container_name AND container_name should be first
         lines = new.split("\n")
@@ -533,7 +551,7 @@ class TestPropertyOrderFix(unittest.TestCase):
             "    container_name: app\n"
         )
         ctx = self._ctx(content)
-        fixes = property_order_fix(ctx, {"order": ["container_name", "image"]}, {"app"})
+        fixes = self._fix(ctx, {"order": ["container_name", "image"]}, {"app"})
         self.assertEqual(fixes, [])
 
     def test_unknown_props_in_middle_are_not_touched(self):
@@ -549,7 +567,7 @@ class TestPropertyOrderFix(unittest.TestCase):
         )
         ctx = self._ctx(content)
         # `build` is NOT in expected_order; container_name and image ARE and are in correct order.
-        fixes = property_order_fix(ctx, {"order": ["container_name", "image"]}, set())
+        fixes = self._fix(ctx, {"order": ["container_name", "image"]}, set())
         self.assertEqual(fixes, [])
         self.assertEqual(self.compose.read_text(), content)  # untouched
 
@@ -564,7 +582,7 @@ class TestPropertyOrderFix(unittest.TestCase):
             "    container_name: app\n"
         )
         ctx = self._ctx(content)
-        fixes = property_order_fix(ctx, {"order": ["container_name", "image"]}, set())
+        fixes = self._fix(ctx, {"order": ["container_name", "image"]}, set())
         self.assertEqual(len(fixes), 1)
         new = self.compose.read_text()
         # build: must remain between the two known props (position-wise)
@@ -587,7 +605,7 @@ class TestPropertyOrderFix(unittest.TestCase):
             "    image: b\n"
         )
         ctx = self._ctx(content)
-        fixes = property_order_fix(ctx, {"order": ["container_name", "image"]}, set())
+        fixes = self._fix(ctx, {"order": ["container_name", "image"]}, set())
         # only app1 needed reordering
         self.assertEqual(len(fixes), 1)
         self.assertIn("app1", fixes[0].message)
@@ -608,6 +626,11 @@ class TestComposeIncludesSyncFix(unittest.TestCase):
     def tearDown(self):
         self.tmp.cleanup()
 
+    def _fix(self, ctx: LintContext, params: dict, exclude: set):
+        fixes = compose_includes_sync.fix(ctx, params, exclude)
+        ctx.workspace.commit()
+        return fixes
+
     def _ctx(self, service_name: str) -> LintContext:
         return LintContext(
             service_name=service_name,
@@ -619,26 +642,26 @@ class TestComposeIncludesSyncFix(unittest.TestCase):
 
     def test_no_root_compose_returns_empty(self):
         # no root compose.yml at all
-        fixes = compose_includes_sync.fix(self._ctx("minecraft"), {}, set())
+        fixes = self._fix(self._ctx("minecraft"), {}, set())
         self.assertEqual(fixes, [])
 
     def test_already_included_no_op(self):
         (self.host_dir / "compose.yml").write_text(
             "include:\n  - path: paperless/compose.yml\n"
         )
-        fixes = compose_includes_sync.fix(self._ctx("paperless"), {}, set())
+        fixes = self._fix(self._ctx("paperless"), {}, set())
         self.assertEqual(fixes, [])
 
     def test_excluded_not_added(self):
         (self.host_dir / "compose.yml").write_text("include:\n  - path: paperless/compose.yml\n")
-        fixes = compose_includes_sync.fix(self._ctx("minecraft"), {}, {"minecraft"})
+        fixes = self._fix(self._ctx("minecraft"), {}, {"minecraft"})
         self.assertEqual(fixes, [])
 
     def test_adds_missing_include_dict_form(self):
         (self.host_dir / "compose.yml").write_text(
             "include:\n  - path: paperless/compose.yml\n"
         )
-        fixes = compose_includes_sync.fix(self._ctx("minecraft"), {}, set())
+        fixes = self._fix(self._ctx("minecraft"), {}, set())
         self.assertEqual(len(fixes), 1)
         new_root = (self.host_dir / "compose.yml").read_text()
         self.assertIn("minecraft/compose.yml", new_root)
@@ -649,19 +672,21 @@ class TestComposeIncludesSyncFix(unittest.TestCase):
         (self.host_dir / "compose.yml").write_text(
             "include:\n  - paperless/compose.yml\n"
         )
-        fixes = compose_includes_sync.fix(self._ctx("minecraft"), {}, set())
+        fixes = self._fix(self._ctx("minecraft"), {}, set())
         self.assertEqual(len(fixes), 1)
         new_root = (self.host_dir / "compose.yml").read_text()
         # Should match the short-form style
         self.assertIn("- minecraft/compose.yml", new_root)
         self.assertNotIn("path: minecraft", new_root)
 
-    def test_dry_run_does_not_write(self):
+    def test_hook_stages_without_writing(self):
         original = "include:\n  - path: paperless/compose.yml\n"
         (self.host_dir / "compose.yml").write_text(original)
-        fixes = compose_includes_sync.fix(self._ctx("minecraft"), {}, set(), dry_run=True)
+        ctx = self._ctx("minecraft")
+        fixes = compose_includes_sync.fix(ctx, {}, set())
         self.assertEqual(len(fixes), 1)
         self.assertEqual((self.host_dir / "compose.yml").read_text(), original)
+        self.assertIn("- path: minecraft/compose.yml", ctx.workspace.read(self.host_dir / "compose.yml"))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,109 @@
+"""Tests for the persistent lint cache — keys, invalidation, persistence."""
+
+import tempfile
+import unittest
+from pathlib import Path
+
+from kompose._engine import Issue, RuleSpec, lint_services
+from kompose.lint_cache import LintCache
+
+
+class _CacheFixture(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        root = Path(self._tmp.name)
+        self.cache_path = root / "cache" / "lint.json"
+        self.host_dir = root / "nas"
+        self.service_dir = self.host_dir / "paperless"
+        self.service_dir.mkdir(parents=True)
+        (self.service_dir / "compose.yml").write_text("services:\n  app:\n    image: x\n")
+        (self.host_dir / "compose.yml").write_text("include:\n  - path: paperless/compose.yml\n")
+        self.rules = [
+            RuleSpec(name="must-have-foo", category="cat", type="substring_required",
+                     params={"required": ["foo"]}),
+            RuleSpec(name="env", category="env", handler="env_check"),
+            RuleSpec(name="includes", category="compose", handler="compose_includes_sync"),
+        ]
+
+    def _run(self, rules=None, globals_dict=None):
+        """One `kompose check`-style pass: fresh cache object, lint, save."""
+        rules = rules or self.rules
+        cache = LintCache(rules, globals_dict or {}, path=self.cache_path)
+        results = lint_services([self.service_dir], rules, globals_dict or {}, cache=cache)
+        cache.save()
+        return cache, results
+
+
+class TestLintCache(_CacheFixture):
+    def test_second_run_hits(self):
+        first, _ = self._run()
+        self.assertEqual((first.hits, first.misses), (0, 1))
+        second, results = self._run()
+        self.assertEqual((second.hits, second.misses), (1, 0))
+        self.assertEqual(len(results[0].rule_results[0].issues), 1)  # "foo" still missing
+
+    def test_cached_results_match_fresh_lint(self):
+        _, fresh = self._run()
+        _, cached = self._run()
+        self.assertEqual(
+            [(rr.rule.name, rr.issues) for rr in cached[0].rule_results],
+            [(rr.rule.name, rr.issues) for rr in fresh[0].rule_results],
+        )
+
+    def test_compose_edit_invalidates(self):
+        self._run()
+        (self.service_dir / "compose.yml").write_text("services:\n  app:\n    image: foo\n")
+        cache, results = self._run()
+        self.assertEqual(cache.misses, 1)
+        self.assertEqual(results[0].rule_results[0].issues, [])
+
+    def test_env_files_declared_by_env_check_invalidate(self):
+        self._run()
+        (self.service_dir / ".env.example").write_text("FOO=\n")
+        cache, results = self._run()
+        self.assertEqual(cache.misses, 1)
+        self.assertEqual(len(results[0].rule_results[1].issues), 1)  # FOO missing, no .env
+
+        (self.service_dir / ".env").write_text("FOO=bar\n")
+        cache, results = self._run()
+        self.assertEqual(cache.misses, 1)
+        self.assertEqual(results[0].rule_results[1].issues, [])
+
+    def test_root_compose_declared_by_includes_rule_invalidates(self):
+        _, results = self._run()
+        self.assertEqual(results[0].rule_results[2].issues, [])
+        (self.host_dir / "compose.yml").write_text("include: []\n")
+        cache, results = self._run()
+        self.assertEqual(cache.misses, 1)
+        self.assertEqual(len(results[0].rule_results[2].issues), 1)
+
+    def test_ruleset_change_invalidates(self):
+        self._run()
+        rules = [RuleSpec(name="must-have-foo", category="cat", type="substring_required",
+                          params={"required": ["bar"]})]
+        cache, _ = self._run(rules=rules)
+        self.assertEqual(cache.misses, 1)
+
+    def test_globals_change_invalidates(self):
+        self._run(globals_dict={"domain": "a.example"})
+        cache, _ = self._run(globals_dict={"domain": "b.example"})
+        self.assertEqual(cache.misses, 1)
+
+    def test_corrupt_cache_file_is_a_miss(self):
+        self.cache_path.parent.mkdir(parents=True)
+        self.cache_path.write_text("{not json")
+        cache, _ = self._run()
+        self.assertEqual(cache.misses, 1)
+        reloaded = LintCache(self.rules, {}, path=self.cache_path).lookup(self.service_dir)
+        self.assertIsInstance(reloaded[0][0], Issue)
+
+    def test_nothing_written_on_all_hits(self):
+        self._run()
+        mtime = self.cache_path.stat().st_mtime_ns
+        self._run()
+        self.assertEqual(self.cache_path.stat().st_mtime_ns, mtime)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,201 @@
+"""Tests for the multiplexed log streamer."""
+
+import io
+import queue
+import re
+import subprocess
+import threading
+import unittest
+from contextlib import redirect_stdout
+from datetime import datetime, timezone
+from unittest import mock
+
+from kompose import logmux
+from kompose.logmux import (
+    LogReader,
+    LogSource,
+    find_containers,
+    grep_logs,
+    grep_source,
+    merge,
+    parse_time,
+    sort_key,
+)
+
+_ANSI = re.compile(r"\x1B\[[0-9;]*m")
+
+
+class TestParseTime(unittest.TestCase):
+    def test_relative_durations(self):
+        before = datetime.now(timezone.utc)
+        value = parse_time("1h30m")
+        self.assertAlmostEqual((before - value).total_seconds(), 5400, delta=5)
+
+    def test_unix_timestamp(self):
+        self.assertEqual(parse_time("1700000000.5"), 1700000000.5)
+
+    def test_rfc3339(self):
+        self.assertEqual(
+            parse_time("2024-05-01T12:00:00Z"),
+            datetime(2024, 5, 1, 12, tzinfo=timezone.utc),
+        )
+
+    def test_garbage_raises(self):
+        with self.assertRaises(ValueError):
+            parse_time("yesterday")
+
+
+class TestSortKey(unittest.TestCase):
+    def test_trimmed_fractions_compare_in_time_order(self):
+        self.assertLess(sort_key("2024-05-01T12:00:00.12Z"), sort_key("2024-05-01T12:00:00.123Z"))
+        self.assertLess(sort_key("2024-05-01T12:00:00Z"), sort_key("2024-05-01T12:00:00.000000001Z"))
+
+
+class _FakeReader:
+    def __init__(self, lines, eof=True):
+        self.queue: queue.Queue = queue.Queue()
+        for key, line in lines:
+            self.queue.put((key, line))
+        if eof:
+            self.queue.put(logmux._EOF)
+
+
+class TestMerge(unittest.TestCase):
+    def test_exact_merge_orders_by_timestamp(self):
+        a = _FakeReader([("1", "a1"), ("4", "a4")])
+        b = _FakeReader([("2", "b2"), ("3", "b3"), ("5", "b5")])
+        lines = [line for _, line in merge([a, b])]
+        self.assertEqual(lines, ["a1", "b2", "b3", "a4", "b5"])
+
+    def test_follow_window_releases_lines_past_a_silent_reader(self):
+        chatty = _FakeReader([("1", "x"), ("2", "y")])
+        silent = _FakeReader([], eof=False)
+        now = [0.0]
+
+        def clock():
+            now[0] += 1.0
+            return now[0]
+
+        out = merge([chatty, silent], window=0.5, clock=clock)
+        self.assertEqual([next(out)[1], next(out)[1]], ["x", "y"])
+
+
+class TestLogReader(unittest.TestCase):
+    def test_queue_is_bounded_and_lines_keep_timestamp_order(self):
+        lines = [f"2024-05-01T12:00:0{i}.5Z line {i}" for i in range(5)] + ["no timestamp here"]
+        reader = LogReader(LogSource("web-1", "abc"), follow=False, tail="10", since=None, until=None, maxsize=2)
+        with mock.patch.object(reader, "_lines", return_value=iter(lines)):
+            reader.start()
+            got = []
+            while True:
+                item = reader.queue.get(timeout=5)
+                self.assertLessEqual(reader.queue.qsize(), 2)
+                if item is logmux._EOF:
+                    break
+                got.append(item)
+        self.assertEqual([text for _, text in got][:2], ["line 0", "line 1"])
+        self.assertEqual(got[-1], (got[-2][0], "no timestamp here"))
+
+    def test_stop_unblocks_a_full_queue(self):
+        lines = iter(f"2024-05-01T12:00:00Z l{i}" for i in range(100))
+        reader = LogReader(LogSource("web-1", "abc"), follow=True, tail="10", since=None, until=None, maxsize=1)
+        with mock.patch.object(reader, "_lines", return_value=lines):
+            reader.start()
+            reader.queue.get(timeout=5)
+            reader.stop()
+            reader._thread.join(timeout=5)
+        self.assertFalse(reader._thread.is_alive())
+
+
+class TestFindContainers(unittest.TestCase):
+    def test_selectors_filter_one_bulk_listing(self):
+        out = "\n".join([
+            "homelab\ttraefik\tFalse\ttraefik\tid1",
+            "homelab\tcrowdsec\tFalse\tcrowdsec\tid2",
+            "homelab\tcrowdsec\tTrue\thomelab-crowdsec-run-1\tid3",
+            "homelab\tsonarr\tFalse\tsonarr\tid4",
+            "paperless\tbroker\tFalse\tpaperless-broker-1\tid5",
+        ]) + "\n"
+        result = subprocess.CompletedProcess([], 0, stdout=out)
+        with mock.patch.object(logmux, "get_client", return_value=None), \
+                mock.patch.object(logmux.subprocess, "run", return_value=result) as run:
+            sources = find_containers([("homelab", "traefik"), ("homelab", "crowdsec"), ("paperless", None)])
+        self.assertEqual([s.name for s in sources], ["crowdsec", "paperless-broker-1", "traefik"])
+        self.assertEqual(run.call_count, 1)
+
+
+class TestGrep(unittest.TestCase):
+    LOGS = {
+        "web": ["2024-05-01T12:00:00Z GET /a req=abc123", "2024-05-01T12:00:01Z GET /b req=zzz"],
+        "api": ["2024-05-01T12:00:02Z handled req=abc123 in 3ms"],
+        "db": ["2024-05-01T12:00:03Z checkpoint"],
+    }
+
+    def _open(self, source, **kwargs):
+        self.opened.append((source.name, kwargs))
+        return iter(self.LOGS[source.name]), lambda: None
+
+    def _grep(self, pattern, **kwargs):
+        self.opened = []
+        sources = [LogSource(name, name) for name in sorted(self.LOGS)]
+        out = io.StringIO()
+        with mock.patch.object(logmux, "find_containers", return_value=sources), \
+                mock.patch.object(logmux, "open_log", side_effect=self._open), \
+                redirect_stdout(out):
+            code = grep_logs([("p", None)], re.compile(pattern), **kwargs)
+        return code, _ANSI.sub("", out.getvalue())
+
+    def test_matches_grouped_by_container(self):
+        code, text = self._grep(r"req=abc\d+", since="1h")
+        self.assertEqual(code, 0)
+        self.assertIn("api (1)", text)
+        self.assertIn("web (1)", text)
+        self.assertNotIn("db (", text)
+        self.assertNotIn("req=zzz", text)
+        self.assertIn("2 match(es) in 2/3 container(s)", text)
+        self.assertTrue(all(kw["since"] == "1h" and kw["follow"] is False for _, kw in self.opened))
+
+    def test_count_only(self):
+        code, text = self._grep("GET", count_only=True)
+        self.assertEqual(code, 0)
+        self.assertIn("Matches", text)
+        self.assertNotIn("GET /a", text)
+        self.assertIn("2 match(es) in 1/3 container(s)", text)
+
+    def test_no_match_returns_1(self):
+        code, _ = self._grep("nope")
+        self.assertEqual(code, 1)
+
+    def test_interrupt_closes_open_streams_and_drops_pending_containers(self):
+        closed = {name: threading.Event() for name in ("b", "c")}
+        opened = []
+
+        def blocked(name):
+            closed[name].wait(5)
+            yield from ()
+
+        def open_log(source, **kwargs):
+            opened.append(source.name)
+            if source.name in closed:
+                return blocked(source.name), closed[source.name].set
+            return iter(["2024-05-01T12:00:00Z hit"]), lambda: None
+
+        sources = [LogSource(name, name) for name in ("a", "b", "c", "d")]
+        with mock.patch.object(logmux, "find_containers", return_value=sources), \
+                mock.patch.object(logmux, "open_log", side_effect=open_log), \
+                mock.patch.object(logmux.Table, "add_row", side_effect=KeyboardInterrupt), \
+                redirect_stdout(io.StringIO()):
+            code = grep_logs([("p", None)], re.compile("hit"), count_only=True, jobs=2)
+        self.assertEqual(code, 130)
+        for name in closed.keys() & set(opened):
+            self.assertTrue(closed[name].wait(2))
+        self.assertNotIn("d", opened)
+
+    def test_count_mode_keeps_no_lines(self):
+        with mock.patch.object(logmux, "open_log", return_value=(iter(self.LOGS["web"]), lambda: None)):
+            result = grep_source(LogSource("web", "web"), re.compile("GET"), keep_lines=False)
+        self.assertEqual((result.count, result.matches), (2, []))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -48,5 +48,15 @@ class TestCompletion(unittest.TestCase):
         self.assertIn("upgrade", self.out)
 
 
+class TestRefreshCompletionIndex(unittest.TestCase):
+    """The hidden flag the zsh preamble calls when a completion source changed."""
+
+    def test_refreshes_for_the_host_and_prints_nothing(self):
+        with mock.patch("kompose.completion_index.refresh") as refresh:
+            rc, out = _run("--host", "vps", "--refresh-completion-index")
+        self.assertEqual((rc, out), (0, ""))
+        refresh.assert_called_once_with("vps")
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,58 @@
+"""Tests for the literal matcher — both strategies (`in` per literal, Aho–Corasick)."""
+
+import random
+import unittest
+
+from kompose.matcher import AUTOMATON_MIN_PATTERNS, PatternMatcher, matcher_for
+
+
+class TestPatternMatcher(unittest.TestCase):
+    def _matchers(self, patterns):
+        """One matcher per strategy: per-literal `in`, and the automaton forced on."""
+        return [PatternMatcher(patterns), PatternMatcher(patterns, automaton_min=1)]
+
+    def assertFinds(self, patterns, text, expected):
+        for m in self._matchers(patterns):
+            with self.subTest(automaton=m.uses_automaton):
+                self.assertEqual(m.find(text), expected)
+
+    def test_classic_overlapping_patterns(self):
+        self.assertFinds(["he", "she", "his", "hers"], "ushers", {"she", "he", "hers"})
+
+    def test_pattern_inside_another(self):
+        patterns = ["restart: unless-stopped", "unless", "stopped"]
+        self.assertFinds(patterns, "    restart: unless-stopped\n", {"restart: unless-stopped", "unless", "stopped"})
+        self.assertFinds(patterns, "restart: always # stopped", {"stopped"})
+
+    def test_failure_links_across_partial_matches(self):
+        self.assertFinds(["abcd", "bcx"], "abcx", {"bcx"})
+
+    def test_no_match(self):
+        self.assertFinds(["TZ=", "PUID"], "services: {}\n", set())
+
+    def test_empty_patterns_ignored(self):
+        self.assertEqual(PatternMatcher(["", "x"]).patterns, frozenset({"x"}))
+        self.assertFinds([], "anything", set())
+
+    def test_unicode(self):
+        self.assertFinds(["café", "é"], "un café", {"café", "é"})
+
+    def test_strategy_follows_pattern_count(self):
+        self.assertFalse(PatternMatcher(["a", "b"]).uses_automaton)
+        many = [f"literal-{i}" for i in range(AUTOMATON_MIN_PATTERNS)]
+        self.assertTrue(PatternMatcher(many).uses_automaton)
+
+    def test_automaton_agrees_with_substring_test(self):
+        rng = random.Random(7)
+        for _ in range(200):
+            patterns = {"".join(rng.choice("ab") for _ in range(rng.randint(1, 4))) for _ in range(6)}
+            text = "".join(rng.choice("abc") for _ in range(rng.randint(0, 30)))
+            expected = {p for p in patterns if p in text}
+            self.assertEqual(PatternMatcher(patterns, automaton_min=1).find(text), expected, (patterns, text))
+
+    def test_matcher_for_is_shared(self):
+        self.assertIs(matcher_for(frozenset({"a", "b"})), matcher_for(frozenset({"b", "a"})))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,156 @@
+"""Tests for the native upgrade engine (pull + recreate changed services)."""
+
+import subprocess
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from kompose import native
+from kompose.native import (
+    FAILED,
+    NOT_RUNNING,
+    UNCHANGED,
+    UPDATED,
+    Container,
+    NativeTarget,
+    recreate,
+    run_native,
+    running_containers,
+)
+
+
+def _targets(*specs):
+    return [NativeTarget(group, group, service, image) for group, service, image in specs]
+
+
+class TestRunNative(unittest.TestCase):
+    def _run(self, targets, running, pulled, errors=None, jobs=4):
+        self.emitted = []
+        with mock.patch.object(native, "get_root_compose", return_value=Path("/srv/nas/compose.yml")), \
+                mock.patch.object(native.drift, "project_name", return_value="nas"), \
+                mock.patch.object(native, "running_containers", return_value=running), \
+                mock.patch.object(native, "pull_image", side_effect=lambda image: pulled[image]), \
+                mock.patch.object(native, "recreate", return_value=errors or {}) as recreate_mock:
+            run = run_native(None, targets, jobs=jobs, emit=lambda *event: self.emitted.append(event))
+        return run, recreate_mock
+
+    def test_only_services_whose_image_changed_are_recreated(self):
+        targets = _targets(
+            ("apps", "web", "foo/web"),
+            ("apps", "worker", "foo/web"),
+            ("data", "db", "foo/db:16"),
+            ("data", "cache", "foo/cache"),
+            ("data", "broken", "foo/broken"),
+        )
+        running = {
+            ("nas", "web"): [Container("web", "sha256:old")],
+            ("nas", "worker"): [Container("worker-1", "sha256:new"), Container("worker-2", "sha256:old")],
+            ("nas", "db"): [Container("db", "sha256:db")],
+            ("nas", "broken"): [Container("broken", "sha256:x")],
+        }
+        pulled = {"foo/web": ("sha256:new", ""), "foo/db:16": ("sha256:db", ""), "foo/broken": (None, "denied")}
+        run, recreate_mock = self._run(targets, running, pulled)
+
+        statuses = {o.target.service: o.status for o in run.outcomes}
+        self.assertEqual(statuses, {
+            "web": UPDATED, "worker": UPDATED, "db": UNCHANGED, "cache": NOT_RUNNING, "broken": FAILED,
+        })
+        recreate_mock.assert_called_once_with(None, {"apps": ["web", "worker"]})
+        self.assertEqual(run.body(), {"metric": {"scanned": 4, "updated": 2, "failed": 1}})
+        self.assertEqual(run.body("data"), {"metric": {"scanned": 2, "updated": 0, "failed": 1}})
+
+        messages = [message for _, message, _ in self.emitted]
+        self.assertEqual(messages.count("Pulling new image"), 3)  # cache isn't running: not pulled
+        self.assertEqual(messages.count("Started new container"), 3)
+        self.assertTrue(any(m.startswith("Found new foo/web image (new)") for m in messages))
+        self.assertEqual(self.emitted[-1], ("INFO", "Update session completed",
+                                            {"scanned": "4", "updated": "2", "failed": "1"}))
+
+    def test_failed_recreate_is_reported(self):
+        targets = _targets(("apps", "web", "foo/web"))
+        run, _ = self._run(
+            targets, {("nas", "web"): [Container("web", "sha256:old")]}, {"foo/web": ("sha256:new", "")},
+            errors={("apps", "web"): "port is already allocated"},
+        )
+        self.assertEqual(run.outcomes[0].status, FAILED)
+        self.assertIn(("ERRO", "Could not recreate service", {"service": "web", "error": "port is already allocated"}),
+                      self.emitted)
+        self.assertNotIn("Creating new container", [message for _, message, _ in self.emitted])
+
+    def test_pulls_respect_the_concurrency_cap(self):
+        targets = _targets(*[("g", f"s{i}", f"img{i}") for i in range(6)])
+        running = {("nas", f"s{i}"): [Container(f"s{i}", "sha256:a")] for i in range(6)}
+        lock = threading.Lock()
+        live, peak = [0], [0]
+
+        def slow_pull(image):
+            with lock:
+                live[0] += 1
+                peak[0] = max(peak[0], live[0])
+            time.sleep(0.05)
+            with lock:
+                live[0] -= 1
+            return "sha256:a", ""
+
+        with mock.patch.object(native, "get_root_compose", return_value=Path("/srv/nas/compose.yml")), \
+                mock.patch.object(native.drift, "project_name", return_value="nas"), \
+                mock.patch.object(native, "running_containers", return_value=running), \
+                mock.patch.object(native, "pull_image", side_effect=slow_pull), \
+                mock.patch.object(native, "recreate") as recreate_mock:
+            run_native(None, targets, jobs=2, emit=lambda *event: None)
+        self.assertEqual(peak[0], 2)
+        recreate_mock.assert_not_called()
+
+
+class TestRunningContainers(unittest.TestCase):
+    def test_api_listing_grouped_by_project_and_service(self):
+        client = mock.MagicMock()
+        client.list_containers.return_value = [
+            {"Names": ["/web"], "ImageID": "sha256:a", "Labels": {
+                "com.docker.compose.project": "nas", "com.docker.compose.service": "web"}},
+            {"Names": ["/nas-web-run-1"], "ImageID": "sha256:a", "Labels": {
+                "com.docker.compose.project": "nas", "com.docker.compose.service": "web",
+                "com.docker.compose.oneoff": "True"}},
+            {"Names": ["/other"], "ImageID": "sha256:b", "Labels": {
+                "com.docker.compose.project": "other", "com.docker.compose.service": "x"}},
+        ]
+        with mock.patch.object(native, "get_client", return_value=client):
+            found = running_containers({"nas"})
+        self.assertEqual(found, {("nas", "web"): [Container("web", "sha256:a")]})
+
+
+class TestRecreate(unittest.TestCase):
+    def test_legacy_mode_runs_one_compose_call_per_group(self):
+        failures = {"data": subprocess.CompletedProcess([], 1, stdout="", stderr="boom\n")}
+
+        def fake_run(cmd, **kwargs):
+            group = Path(cmd[cmd.index("-f") + 1]).parent.name
+            return failures.get(group, subprocess.CompletedProcess([], 0, stdout="", stderr=""))
+
+        with mock.patch.object(native, "get_root_compose", return_value=None), \
+                mock.patch.object(native, "get_compose_files", side_effect=lambda g, h: [Path(f"/srv/{g}/compose.yml")]), \
+                mock.patch.object(native.subprocess, "run", side_effect=fake_run) as run:
+            errors = recreate(None, {"apps": ["web"], "data": ["db", "cache"]})
+        self.assertEqual(run.call_count, 4)  # apps, data, then data's services one by one
+        self.assertEqual(run.call_args_list[0][0][0][-4:], ["up", "-d", "--no-deps", "web"])
+        self.assertEqual(errors, {("data", "db"): "boom", ("data", "cache"): "boom"})
+
+    def test_failed_root_call_is_narrowed_to_the_failing_service(self):
+        def fake_run(cmd, **kwargs):
+            if "cache" in cmd:
+                return subprocess.CompletedProcess([], 1, stdout="", stderr="cache: port is already allocated\n")
+            return subprocess.CompletedProcess([], 0, stdout="", stderr="")
+
+        with mock.patch.object(native, "get_root_compose", return_value=Path("/srv/nas/compose.yml")), \
+                mock.patch.object(native.subprocess, "run", side_effect=fake_run) as run:
+            errors = recreate(None, {"apps": ["web"], "data": ["db", "cache"]})
+        self.assertEqual([call[0][0][call[0][0].index("--no-deps") + 1:] for call in run.call_args_list], [
+            ["web", "db", "cache"], ["web"], ["db"], ["cache"],
+        ])
+        self.assertEqual(errors, {("data", "cache"): "cache: port is already allocated"})
+
+
+if __name__ == "__main__":
+    unittest.main()
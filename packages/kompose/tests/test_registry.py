@@ -0,0 +1,232 @@
+"""Tests for the registry digest pre-check.
+
+Runs against a stand-in registry: a threaded HTTP/1.1 server on loopback that
+serves manifest digests (behind an anonymous bearer token for some repos).
+No network access or docker daemon is needed.
+"""
+
+import json
+import subprocess
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+from kompose import registry
+from kompose.registry import (
+    DOCKER_HUB,
+    FRESH,
+    NOT_PULLED,
+    STALE,
+    UNKNOWN,
+    ImageRef,
+    LocalImage,
+    RegistryClient,
+    RegistryError,
+    check_images,
+    local_images,
+    parse_reference,
+    running_images,
+)
+
+
+class _FakeRegistry(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, manifests: dict, protected: set):
+        self.manifests = manifests    # "repo:tag" → digest
+        self.protected = protected    # repos that need a bearer token
+        self.requests: list[tuple[str, str]] = []
+        self.connections = 0
+        self.lock = threading.Lock()
+        super().__init__(("127.0.0.1", 0), _Handler)
+
+    @property
+    def host(self) -> str:
+        return f"127.0.0.1:{self.server_address[1]}"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def log_message(self, *args):
+        pass
+
+    def _reply(self, status: int, headers: dict | None = None, body: bytes = b"") -> None:
+        self.send_response(status)
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    def do_GET(self):
+        self.server.requests.append((self.command, self.path))
+        if self.path.startswith("/token?"):
+            self._reply(200, {"Content-Type": "application/json"}, json.dumps({"token": "t0k"}).encode())
+        else:
+            self._reply(404)
+
+    def do_HEAD(self):
+        self.server.requests.append((self.command, self.path))
+        repo, _, tag = self.path.removeprefix("/v2/").partition("/manifests/")
+        if repo in self.server.protected and self.headers.get("Authorization") != "Bearer t0k":
+            realm = f"http://{self.server.host}/token"
+            self._reply(401, {"WWW-Authenticate": f'Bearer realm="{realm}",service="test"'})
+            return
+        digest = self.server.manifests.get(f"{repo}:{tag}")
+        if digest is None:
+            self._reply(404)
+            return
+        self._reply(200, {"Docker-Content-Digest": digest})
+
+
+class _RegistryTestCase(unittest.TestCase):
+    manifests = {
+        "foo/app:latest": "sha256:new",
+        "foo/db:16": "sha256:same",
+        "private/app:1": "sha256:secret",
+    }
+
+    def setUp(self):
+        self.server = _FakeRegistry(dict(self.manifests), {"private/app"})
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.client = RegistryClient(timeout=5, auths={})
+
+    def tearDown(self):
+        self.client.close()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def image(self, name: str) -> str:
+        return f"{self.server.host}/{name}"
+
+
+class TestParseReference(unittest.TestCase):
+    def test_forms(self):
+        self.assertEqual(parse_reference("nginx"), ImageRef(DOCKER_HUB, "library/nginx", "latest"))
+        self.assertEqual(parse_reference("docker.io/foo/bar:1.2"), ImageRef(DOCKER_HUB, "foo/bar", "1.2"))
+        self.assertEqual(parse_reference("ghcr.io/a/b/c:v1"), ImageRef("ghcr.io", "a/b/c", "v1"))
+        self.assertEqual(parse_reference("localhost:5000/app"), ImageRef("localhost:5000", "app", "latest"))
+
+    def test_only_loopback_registries_use_http(self):
+        self.assertEqual(parse_reference("localhost:5000/app").scheme, "http")
+        self.assertEqual(parse_reference("ghcr.io/a/b").scheme, "https")
+
+
+class TestRemoteDigest(_RegistryTestCase):
+    def test_anonymous_manifest_head(self):
+        digest = self.client.remote_digest(parse_reference(self.image("foo/db:16")))
+        self.assertEqual(digest, "sha256:same")
+        self.assertEqual(self.server.requests, [("HEAD", "/v2/foo/db/manifests/16")])
+
+    def test_bearer_challenge_fetches_and_reuses_a_token(self):
+        ref = parse_reference(self.image("private/app:1"))
+        self.assertEqual(self.client.remote_digest(ref), "sha256:secret")
+        self.assertEqual(self.client.remote_digest(ref), "sha256:secret")
+        tokens = [path for method, path in self.server.requests if method == "GET"]
+        self.assertEqual(len(tokens), 1)
+        self.assertIn("scope=repository%3Aprivate%2Fapp%3Apull", tokens[0])
+
+    def test_missing_manifest_raises(self):
+        with self.assertRaises(RegistryError):
+            self.client.remote_digest(parse_reference(self.image("foo/gone:1")))
+
+    def test_keep_alive_connections_are_pooled(self):
+        for _ in range(10):
+            self.client.remote_digest(parse_reference(self.image("foo/app")))
+        self.assertEqual(self.server.connections, 1)
+
+
+class TestCheckImages(_RegistryTestCase):
+    def test_only_moved_or_undecidable_images_need_an_update(self):
+        images = [self.image(n) for n in ("foo/app", "foo/db:16", "foo/gone:1", "foo/local:1", "foo/absent:1")]
+        local = {
+            images[0]: LocalImage("sha256:1", {"sha256:old"}),
+            images[1]: LocalImage("sha256:2", {"sha256:same"}),
+            images[2]: LocalImage("sha256:3", {"sha256:x"}),
+            images[3]: LocalImage("sha256:4", set()),
+            images[4]: None,
+        }
+        with mock.patch.object(registry, "local_images", return_value=local):
+            checks = check_images(images, client=self.client, jobs=4, running={})
+        self.assertEqual([c.status for c in checks], [STALE, FRESH, UNKNOWN, UNKNOWN, NOT_PULLED])
+        self.assertEqual([c.image for c in checks if c.needs_update], [images[0], images[2], images[3]])
+
+    def test_container_behind_the_local_image_is_stale_without_asking(self):
+        # `compose pull` without `up`: the registry and the local tag agree,
+        # but the container still runs the previous image.
+        image = self.image("foo/db:16")
+        local = {image: LocalImage("sha256:new", {"sha256:same"})}
+        running = {image: {"sha256:new", "sha256:old"}}
+        with mock.patch.object(registry, "local_images", return_value=local):
+            [check] = check_images([image], client=self.client, running=running)
+        self.assertEqual(check.status, STALE)
+        self.assertEqual(check.detail, "1 older image(s) still running")
+        self.assertEqual(self.server.requests, [])
+
+    def test_containers_on_the_local_image_fall_through_to_the_registry(self):
+        image = self.image("foo/db:16")
+        local = {image: LocalImage("sha256:new", {"sha256:same"})}
+        with mock.patch.object(registry, "local_images", return_value=local):
+            [check] = check_images([image], client=self.client, running={image: {"sha256:new"}})
+        self.assertEqual(check.status, FRESH)
+
+    def test_no_docker_means_no_check(self):
+        with mock.patch.object(registry, "local_images", return_value=None):
+            self.assertIsNone(check_images(["nginx"], client=self.client))
+
+
+class TestLocalImages(unittest.TestCase):
+    def test_cli_fallback_maps_results_back_through_tags(self):
+        out = '["nginx:latest"]\t["nginx@sha256:aaa"]\tsha256:n1\n["foo/bar:1"]\t[]\tsha256:b1\n'
+        result = subprocess.CompletedProcess([], 1, stdout=out, stderr="Error: No such image: gone:1")
+        with mock.patch.object(registry, "get_client", return_value=None), \
+                mock.patch.object(registry.subprocess, "run", return_value=result) as run:
+            found = local_images(["docker.io/library/nginx", "foo/bar:1", "gone:1"])
+        self.assertEqual(found, {
+            "docker.io/library/nginx": LocalImage("sha256:n1", {"sha256:aaa"}),
+            "foo/bar:1": LocalImage("sha256:b1", set()),
+            "gone:1": None,
+        })
+        self.assertEqual(run.call_count, 1)
+
+
+class TestRunningImages(unittest.TestCase):
+    def test_moved_tags_are_resolved_through_the_container_config(self):
+        client = mock.MagicMock()
+        client.list_containers.return_value = [
+            {"Id": "c1", "Image": "nginx:latest", "ImageID": "sha256:new"},
+            {"Id": "c2", "Image": "sha256:0123456789ab", "ImageID": "sha256:old"},
+            {"Id": "c3", "Image": "0123456789abcdef", "ImageID": "sha256:orphan"},
+        ]
+        client.inspect_container.side_effect = lambda cid: {
+            "c2": {"Config": {"Image": "nginx"}},
+            "c3": {"Config": {"Image": "0123456789abcdef"}},
+        }[cid]
+        with mock.patch.object(registry, "get_client", return_value=client):
+            found = running_images()
+        self.assertEqual(found, {"nginx:latest": {"sha256:new", "sha256:old"}})
+
+    def test_cli_fallback(self):
+        ps = subprocess.CompletedProcess([], 0, stdout="c1\nc2\n")
+        inspect = subprocess.CompletedProcess([], 0, stdout="foo/bar:1\tsha256:b0\nfoo/bar:1\tsha256:b1\n")
+        with mock.patch.object(registry, "get_client", return_value=None), \
+                mock.patch.object(registry.subprocess, "run", side_effect=[ps, inspect]):
+            found = running_images()
+        self.assertEqual(found, {"foo/bar:1": {"sha256:b0", "sha256:b1"}})
+
+    def test_no_docker(self):
+        with mock.patch.object(registry, "get_client", return_value=None), \
+                mock.patch.object(registry.subprocess, "run", side_effect=OSError):
+            self.assertIsNone(running_images())
+
+
+if __name__ == "__main__":
+    unittest.main()
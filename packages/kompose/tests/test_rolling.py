@@ -0,0 +1,209 @@
+"""Tests for the rolling restart helpers (readiness, ordering, batching)."""
+
+import subprocess
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from kompose import rolling
+from kompose.compose_index import compose_index
+from kompose.rolling import (
+    FAILED,
+    READY,
+    WAITING,
+    ContainerState,
+    batches,
+    one_shot_services,
+    project_containers,
+    readiness,
+    rolling_order,
+    wait_ready,
+)
+
+
+class TestReadiness(unittest.TestCase):
+    def test_verdicts(self):
+        cases = [
+            ("running", "Up 3 seconds", READY),
+            ("running", "Up 3 seconds (healthy)", READY),
+            ("running", "Up 3 seconds (health: starting)", WAITING),
+            ("running", "Up 3 seconds (unhealthy)", FAILED),
+            ("restarting", "Restarting (1) 2 seconds ago", WAITING),
+            ("created", "Created", WAITING),
+            ("exited", "Exited (1) 1 second ago", FAILED),
+        ]
+        for state, status, expected in cases:
+            with self.subTest(status=status):
+                self.assertEqual(readiness(ContainerState("s", "c", state, status)), expected)
+
+    def test_one_shot_clean_exit_is_ready(self):
+        cases = [
+            ("exited", "Exited (0) 2 seconds ago", READY),
+            ("exited", "Exited (1) 2 seconds ago", FAILED),
+            ("dead", "Dead", FAILED),
+            ("running", "Up 1 second", READY),
+        ]
+        for state, status, expected in cases:
+            with self.subTest(status=status):
+                self.assertEqual(readiness(ContainerState("s", "c", state, status), one_shot=True), expected)
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class TestWaitReady(unittest.TestCase):
+    def _wait(self, frames, services=("web",), timeout=10, settle=0, restarts=(0,)):
+        clock = _Clock()
+        with mock.patch.object(rolling, "project_containers", side_effect=frames) as listing, \
+                mock.patch.object(rolling, "restart_count", side_effect=restarts):
+            result = wait_ready("p", list(services), timeout, clock=clock, sleep=clock.sleep, settle=settle)
+        return result, listing.call_count
+
+    def test_waits_for_healthcheck_then_succeeds(self):
+        frames = [
+            [ContainerState("web", "p-web-1", "running", "Up 1 second (health: starting)")],
+            [ContainerState("web", "p-web-1", "running", "Up 2 seconds (healthy)")],
+        ]
+        self.assertEqual(self._wait(frames), (None, 2))
+
+    def test_unhealthy_fails_immediately(self):
+        frames = [[ContainerState("web", "p-web-1", "running", "Up 9 seconds (unhealthy)")]]
+        result, _ = self._wait(frames)
+        self.assertIn("p-web-1", result)
+        self.assertIn("unhealthy", result)
+
+    def test_times_out_naming_pending_containers(self):
+        starting = [ContainerState("web", "p-web-1", "running", "Up (health: starting)")]
+        result, calls = self._wait(lambda project: starting, timeout=3)
+        self.assertIn("not ready after 3s: p-web-1", result)
+        self.assertEqual(calls, 4)
+
+    def test_one_shot_service_may_exit_cleanly(self):
+        frames = [[
+            ContainerState("web", "p-web-1", "running", "Up"),
+            ContainerState("migrate", "p-migrate-1", "exited", "Exited (0) 1 second ago"),
+        ]]
+        clock = _Clock()
+        with mock.patch.object(rolling, "project_containers", side_effect=frames * 2), \
+                mock.patch.object(rolling, "restart_count", return_value=0):
+            self.assertIsNone(wait_ready("p", ["web", "migrate"], 10, clock=clock, sleep=clock.sleep,
+                                         one_shot={"migrate"}, settle=0))
+            self.assertIn("p-migrate-1", wait_ready("p", ["web", "migrate"], 10, clock=clock, sleep=clock.sleep,
+                                                    settle=0))
+
+    def test_service_without_container_waits_then_fails(self):
+        frames = [[], [ContainerState("web", "p-web-1", "running", "Up 1 second")]]
+        self.assertEqual(self._wait(frames), (None, 2))
+
+        result, calls = self._wait(lambda project: [], timeout=3)
+        self.assertIn("not ready after 3s: web (no container)", result)
+        self.assertEqual(calls, 4)
+
+    def test_no_healthcheck_must_settle(self):
+        up = [ContainerState("web", "p-web-1", "running", "Up")]
+        result, calls = self._wait(lambda project: up, settle=3, restarts=[0] * 10)
+        self.assertIsNone(result)
+        self.assertEqual(calls, 4)  # seen at t=0, ready at t=3
+
+    def test_restart_during_settle_starts_over(self):
+        up = [ContainerState("web", "p-web-1", "running", "Up")]
+        result, calls = self._wait(lambda project: up, settle=3, restarts=[0, 0, 1, 1, 1, 1, 1])
+        self.assertIsNone(result)
+        self.assertEqual(calls, 6)  # count moved at t=2, ready at t=5
+
+        result, _ = self._wait(lambda project: up, timeout=4, settle=3, restarts=[0, 1, 2, 3, 4, 5])
+        self.assertIn("not ready after 4s: p-web-1", result)
+
+    def test_healthy_container_skips_settle(self):
+        frames = [[ContainerState("web", "p-web-1", "running", "Up 2 seconds (healthy)")]]
+        self.assertEqual(self._wait(frames, settle=30, restarts=[]), (None, 1))
+
+    def test_other_services_are_ignored(self):
+        frames = [[
+            ContainerState("web", "p-web-1", "running", "Up"),
+            ContainerState("db", "p-db-1", "exited", "Exited (1)"),
+        ]]
+        self.assertEqual(self._wait(frames), (None, 1))
+
+
+class TestProjectContainers(unittest.TestCase):
+    def test_cli_fallback_skips_oneoff(self):
+        out = "web\tFalse\tp-web-1\trunning\tUp 1 minute (healthy)\nweb\tTrue\tp-web-run-1\texited\tExited (0)\n"
+        result = subprocess.CompletedProcess([], 0, stdout=out)
+        with mock.patch.object(rolling, "get_client", return_value=None), \
+                mock.patch.object(rolling.subprocess, "run", return_value=result):
+            self.assertEqual(project_containers("p"), [
+                ContainerState("web", "p-web-1", "running", "Up 1 minute (healthy)"),
+            ])
+
+
+class TestRestartCount(unittest.TestCase):
+    def test_cli_fallback(self):
+        result = subprocess.CompletedProcess([], 0, stdout="3\n")
+        with mock.patch.object(rolling, "get_client", return_value=None), \
+                mock.patch.object(rolling.subprocess, "run", return_value=result) as run:
+            self.assertEqual(rolling.restart_count("p-web-1"), 3)
+        self.assertEqual(run.call_args.args[0][-1], "p-web-1")
+
+    def test_api(self):
+        client = mock.Mock()
+        client.inspect_container.return_value = {"RestartCount": 2}
+        with mock.patch.object(rolling, "get_client", return_value=client):
+            self.assertEqual(rolling.restart_count("p-web-1"), 2)
+
+
+class TestRollingOrder(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.host = Path(self.tmp.name)
+        compose_index().clear()
+        (self.host / "app").mkdir()
+        (self.host / "app" / "compose.yml").write_text(
+            "services:\n  web:\n    depends_on: [db]\n  db: {}\n  worker:\n    depends_on:\n      web:\n        condition: service_healthy\n"
+        )
+        self.root = self.host / "compose.yml"
+        self.root.write_text("include:\n  - app/compose.yml\nservices:\n  proxy: {}\n")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+        compose_index().clear()
+
+    def test_all_services_dependencies_first(self):
+        self.assertEqual(rolling_order(self.root, []), ["db", "proxy", "web", "worker"])
+
+    def test_targets_only(self):
+        self.assertEqual(rolling_order(self.root, ["worker", "web"]), ["web", "worker"])
+
+    def test_one_shot_services_follow_the_restart_policy(self):
+        (self.host / "jobs").mkdir()
+        (self.host / "jobs" / "compose.yml").write_text(
+            "services:\n"
+            "  migrate:\n    restart: \"no\"\n"
+            "  seed:\n    restart: no\n"
+            "  backup:\n    restart: on-failure:3\n"
+            "  api:\n    restart: unless-stopped\n"
+        )
+        self.root.write_text("include:\n  - app/compose.yml\n  - jobs/compose.yml\nservices:\n  proxy:\n    restart: always\n")
+        self.assertEqual(
+            one_shot_services(self.root, ["migrate", "seed", "backup", "api", "proxy", "db"]),
+            {"migrate", "seed", "backup", "db"},  # db sets no policy: compose defaults to "no"
+        )
+
+
+class TestBatches(unittest.TestCase):
+    def test_splits_in_order(self):
+        self.assertEqual(batches(["a", "b", "c"], 2), [["a", "b"], ["c"]])
+        self.assertEqual(batches(["a", "b"], 1), [["a"], ["b"]])
+
+
+if __name__ == "__main__":
+    unittest.main()
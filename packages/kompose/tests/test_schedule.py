@@ -0,0 +1,106 @@
+"""Tests for dependency waves across legacy-mode groups."""
+
+import tempfile
+import unittest
+from pathlib import Path
+
+from kompose.schedule import group_dependencies, group_info, legacy_waves, plan_waves
+
+
+class TestPlanWaves(unittest.TestCase):
+    def test_levels(self):
+        graph = {
+            "traefik": set(),
+            "postgres": set(),
+            "paperless": {"traefik", "postgres"},
+            "immich": {"traefik"},
+            "backup": {"paperless"},
+        }
+        self.assertEqual(plan_waves(graph), [
+            ["postgres", "traefik"],
+            ["immich", "paperless"],
+            ["backup"],
+        ])
+
+    def test_unknown_dependencies_are_ignored(self):
+        self.assertEqual(plan_waves({"a": {"ghost"}}), [["a"]])
+
+    def test_cycle_goes_in_a_final_wave(self):
+        graph = {"base": set(), "a": {"b", "base"}, "b": {"a"}}
+        self.assertEqual(plan_waves(graph), [["base"], ["a", "b"]])
+
+    def test_empty(self):
+        self.assertEqual(plan_waves({}), [])
+
+
+class TestGroupDependencies(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.host_dir = Path(self._tmp.name)
+
+    def _group(self, name: str, content: str) -> None:
+        (self.host_dir / name).mkdir()
+        (self.host_dir / name / "compose.yml").write_text(content)
+
+    def _files(self, name: str) -> list[Path]:
+        return [self.host_dir / name / "compose.yml"]
+
+    def test_edges_from_compose_files(self):
+        self._group("traefik", (
+            "services:\n  traefik:\n    image: traefik\n"
+            "networks:\n  reverse-proxy:\n    name: reverse-proxy\n"
+        ))
+        self._group("db", "services:\n  postgres:\n    image: postgres\n    container_name: pg\n")
+        self._group("vpn", "services:\n  gluetun:\n    image: gluetun\n")
+        self._group("paperless", (
+            "services:\n"
+            "  paperless:\n"
+            "    image: paperless\n"
+            "    depends_on: [redis, pg]\n"
+            "    networks: [reverse-proxy]\n"
+            "  redis:\n    image: redis\n"
+            "networks:\n  reverse-proxy:\n    external: true\n"
+        ))
+        self._group("qbit", (
+            "services:\n  qbittorrent:\n    image: qbit\n    network_mode: service:gluetun\n"
+            "    depends_on:\n      gluetun:\n        condition: service_healthy\n"
+        ))
+        groups = ["db", "paperless", "qbit", "traefik", "vpn"]
+        infos = {g: group_info(self._files(g)) for g in groups}
+        self.assertEqual(group_dependencies(infos), {
+            "db": set(),
+            "paperless": {"db", "traefik"},
+            "qbit": {"vpn"},
+            "traefik": set(),
+            "vpn": set(),
+        })
+        self.assertEqual(legacy_waves(groups, self._files), [
+            ["db", "traefik", "vpn"],
+            ["paperless", "qbit"],
+        ])
+
+    def test_layered_files_are_merged(self):
+        base = self.host_dir / "base.yml"
+        base.write_text("services:\n  app:\n    image: x\n")
+        override = self.host_dir / "host.yml"
+        override.write_text("services:\n  app:\n    depends_on: [db]\n")
+        info = group_info([base, override, self.host_dir / "missing.yml"])
+        self.assertEqual(info.services, {"app"})
+        self.assertEqual(info.service_refs, {"db"})
+
+    def test_unnamed_owned_network_is_project_prefixed(self):
+        self._group("Traefik", "services:\n  traefik: {}\nnetworks:\n  proxy: {}\n")
+        self._group("app", "services:\n  a: {}\nnetworks:\n  proxy:\n    external: true\n")
+        self._group("web", "services:\n  w: {}\nnetworks:\n  traefik_proxy:\n    external: true\n")
+        infos = {g: group_info(self._files(g)) for g in ("Traefik", "app", "web")}
+        self.assertEqual(infos["Traefik"].owned_networks, {"traefik_proxy"})
+        self.assertEqual(group_dependencies(infos), {"Traefik": set(), "app": set(), "web": {"Traefik"}})
+
+    def test_external_network_legacy_form(self):
+        self._group("app", "services:\n  a: {}\nnetworks:\n  proxy:\n    external:\n      name: reverse-proxy\n")
+        self.assertEqual(group_info(self._files("app")).external_networks, {"reverse-proxy"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -6,12 +6,29 @@ that have no docker dependency.
 """
 
 import re
+import tempfile
 import unittest
+from pathlib import Path
+from unittest import mock
 
+from kompose import config, status
 from kompose.status import (
+    CgroupStats,
+    ContainerModel,
+    _api_ports,
+    _compose_layout,
+    _container_from_api,
+    _container_from_inspect,
+    _docker_bytes,
+    _find_cgroup_dir,
     _format_cpu,
     _format_ports,
+    _group_status_containers,
+    _human_duration,
+    _parse_docker_time,
     _parse_exposed_ports,
+    _stats_from_api,
+    _status_text,
     parse_ip_for_sort,
 )
 
@@ -115,5 +132,337 @@ class TestFormatCpu(unittest.TestCase):
         self.assertIsInstance(_format_cpu(""), str)
 
 
+
+class TestApiPorts(unittest.TestCase):
+    """Engine API `Ports` → same strings `_parse_exposed_ports` gives for `docker ps`."""
+
+    def test_empty(self):
+        self.assertEqual(_api_ports([]), [])
+
+    def test_published_dual_stack_deduplicated(self):
+        ports = [
+            {"IP": "0.0.0.0", "PrivatePort": 80, "PublicPort": 8080, "Type": "tcp"},
+            {"IP": "::", "PrivatePort": 80, "PublicPort": 8080, "Type": "tcp"},
+        ]
+        self.assertEqual(_api_ports(ports), ["80/tcp"])
+
+    def test_consecutive_ports_collapse_to_range(self):
+        ports = [{"PrivatePort": p, "Type": "udp"} for p in (32414, 32412, 32413)]
+        ports.append({"PrivatePort": 32400, "Type": "tcp"})
+        self.assertEqual(_api_ports(ports), ["32412-32414/udp", "32400/tcp"])
+
+    def test_gap_splits_ranges(self):
+        ports = [{"PrivatePort": p, "Type": "tcp"} for p in (80, 81, 443)]
+        self.assertEqual(_api_ports(ports), ["80-81/tcp", "443/tcp"])
+
+
+class TestContainerFromApi(unittest.TestCase):
+    def test_normalises_name_and_labels(self):
+        row = _container_from_api({
+            "Id": "abc123",
+            "Names": ["/immich_server"],
+            "State": "running",
+            "Status": "Up 3 hours (healthy)",
+            "Ports": [{"PrivatePort": 2283, "Type": "tcp"}],
+            "Labels": {
+                "com.docker.compose.project": "immich",
+                "com.docker.compose.service": "immich-server",
+            },
+        })
+        self.assertEqual(row["ID"], "abc123")
+        self.assertEqual(row["Name"], "immich_server")
+        self.assertEqual(row["ExposedPorts"], ["2283/tcp"])
+        self.assertEqual(row["_project"], "immich")
+        self.assertEqual(row["_service"], "immich-server")
+
+
+class TestStatsFromApi(unittest.TestCase):
+    def _sample(self, **overrides):
+        sample = {
+            "name": "/jellyfin",
+            "cpu_stats": {"cpu_usage": {"total_usage": 2_000_000}, "system_cpu_usage": 20_000_000, "online_cpus": 4},
+            "precpu_stats": {"cpu_usage": {"total_usage": 1_000_000}, "system_cpu_usage": 10_000_000},
+            "memory_stats": {"usage": 600 * 1024**2, "limit": 16 * 1024**3, "stats": {"inactive_file": 100 * 1024**2}},
+        }
+        sample.update(overrides)
+        return sample
+
+    def test_cpu_matches_cli_formula(self):
+        # 1M / 10M × 4 CPUs × 100 = 40%
+        self.assertEqual(_stats_from_api(self._sample())["CPUPerc"], "40.00%")
+
+    def test_memory_subtracts_page_cache(self):
+        self.assertEqual(_stats_from_api(self._sample())["MemUsage"], "500MiB / 16GiB")
+
+    def test_no_previous_sample_reports_zero_cpu(self):
+        stats = _stats_from_api(self._sample(precpu_stats={}, cpu_stats={}))
+        self.assertEqual(stats["CPUPerc"], "0.00%")
+
+    def test_missing_limit_omits_memory(self):
+        self.assertNotIn("MemUsage", _stats_from_api(self._sample(memory_stats={})))
+
+
+class TestDockerBytes(unittest.TestCase):
+    def test_units(self):
+        self.assertEqual(_docker_bytes(512), "512B")
+        self.assertEqual(_docker_bytes(1536), "1.5KiB")
+        self.assertEqual(_docker_bytes(696.9 * 1024**2), "696.9MiB")
+        self.assertEqual(_docker_bytes(15.5 * 1024**3), "15.5GiB")
+
+
+
+class TestParseDockerTime(unittest.TestCase):
+    def test_nanosecond_utc(self):
+        self.assertAlmostEqual(_parse_docker_time("1970-01-01T00:01:40.123456789Z"), 100.123456789, places=6)
+
+    def test_zero_time_is_none(self):
+        self.assertIsNone(_parse_docker_time("0001-01-01T00:00:00Z"))
+
+    def test_offset(self):
+        self.assertEqual(_parse_docker_time("1970-01-01T01:00:00+01:00"), 0.0)
+
+
+class TestHumanDuration(unittest.TestCase):
+    def test_matches_docker_wording(self):
+        self.assertEqual(_human_duration(0.4), "Less than a second")
+        self.assertEqual(_human_duration(1), "1 second")
+        self.assertEqual(_human_duration(45), "45 seconds")
+        self.assertEqual(_human_duration(90), "About a minute")
+        self.assertEqual(_human_duration(5 * 60), "5 minutes")
+        self.assertEqual(_human_duration(3600), "About an hour")
+        self.assertEqual(_human_duration(5 * 3600), "5 hours")
+        self.assertEqual(_human_duration(3 * 86400), "3 days")
+        self.assertEqual(_human_duration(21 * 86400), "3 weeks")
+        self.assertEqual(_human_duration(90 * 86400), "3 months")
+        self.assertEqual(_human_duration(3 * 365 * 86400), "3 years")
+
+
+class TestStatusText(unittest.TestCase):
+    NOW = 10_000.0
+
+    def test_running_healthy(self):
+        state = {"Running": True, "StartedAt": "1970-01-01T00:01:40Z", "Health": {"Status": "healthy"}}
+        self.assertEqual(_status_text(state, self.NOW), "Up 3 hours (healthy)")
+
+    def test_health_starting(self):
+        state = {"Running": True, "StartedAt": "1970-01-01T02:46:30Z", "Health": {"Status": "starting"}}
+        self.assertEqual(_status_text(state, self.NOW), "Up 10 seconds (health: starting)")
+
+    def test_exited(self):
+        state = {"Running": False, "ExitCode": 137, "StartedAt": "1970-01-01T00:00:01Z",
+                 "FinishedAt": "1970-01-01T02:36:40Z"}
+        self.assertEqual(_status_text(state, self.NOW), "Exited (137) 10 minutes ago")
+
+    def test_never_started(self):
+        self.assertEqual(_status_text({"StartedAt": "0001-01-01T00:00:00Z"}, self.NOW), "Created")
+
+
+def _inspect_payload(cid="c1", name="immich_server", ip="10.10.10.5", running=True, project="immich"):
+    return {
+        "Id": cid,
+        "Name": f"/{name}",
+        "State": {"Status": "running" if running else "exited", "Running": running,
+                  "StartedAt": "1970-01-01T00:00:00Z", "FinishedAt": "1970-01-01T00:00:01Z"},
+        "Config": {"Labels": {"com.docker.compose.project": project,
+                              "com.docker.compose.service": "immich-server"}},
+        "NetworkSettings": {
+            "Ports": {"2283/tcp": None, "8080/tcp": [{"HostIp": "0.0.0.0", "HostPort": "8080"}]},
+            "Networks": {"reverse-proxy": {"IPAddress": ip if running else ""}},
+        },
+    }
+
+
+class TestContainerFromInspect(unittest.TestCase):
+    def test_row_shape(self):
+        row = _container_from_inspect(_inspect_payload())
+        self.assertEqual(row["Name"], "immich_server")
+        self.assertEqual(row["State"], "running")
+        self.assertEqual(row["_ip"], "10.10.10.5")
+        self.assertEqual(row["_service"], "immich-server")
+        self.assertEqual(row["ExposedPorts"], ["2283/tcp", "8080/tcp"])
+
+
+class TestContainerModel(unittest.TestCase):
+    """Event folding — inspect is stubbed, no docker needed."""
+
+    def setUp(self):
+        self.inspected: dict[str, dict] = {}
+        patcher = mock.patch.object(
+            status, "_inspect_containers",
+            side_effect=lambda ids, network: [_container_from_inspect(self.inspected[i]) for i in ids if i in self.inspected],
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.model = ContainerModel()
+
+    def _event(self, kind, action, actor_id="", **attrs):
+        return {"Type": kind, "Action": action, "Actor": {"ID": actor_id, "Attributes": attrs}}
+
+    def test_start_event_adds_row_and_signals(self):
+        self.inspected["c1"] = _inspect_payload()
+        self.model.apply(self._event("container", "start", "c1", **{"com.docker.compose.project": "immich"}))
+        self.assertTrue(self.model.changed.is_set())
+        self.assertEqual([r["Name"] for r in self.model.rows()], ["immich_server"])
+
+    def test_die_event_refreshes_state(self):
+        self.inspected["c1"] = _inspect_payload()
+        self.model.apply(self._event("container", "start", "c1", **{"com.docker.compose.project": "immich"}))
+        self.inspected["c1"] = _inspect_payload(running=False)
+        self.model.apply(self._event("container", "die", "c1", **{"com.docker.compose.project": "immich"}))
+        row = self.model.rows()[0]
+        self.assertEqual(row["State"], "exited")
+        self.assertTrue(row["Status"].startswith("Exited (0)"))
+
+    def test_health_status_action_suffix_is_ignored(self):
+        self.inspected["c1"] = _inspect_payload()
+        self.model.apply(self._event("container", "health_status: healthy", "c1",
+                                     **{"com.docker.compose.project": "immich"}))
+        self.assertEqual(len(self.model.rows()), 1)
+
+    def test_destroy_removes_row(self):
+        self.inspected["c1"] = _inspect_payload()
+        self.model.apply(self._event("container", "start", "c1", **{"com.docker.compose.project": "immich"}))
+        self.model.changed.clear()
+        self.model.apply(self._event("container", "destroy", "c1", **{"com.docker.compose.project": "immich"}))
+        self.assertEqual(self.model.rows(), [])
+        self.assertTrue(self.model.changed.is_set())
+
+    def test_non_compose_container_ignored(self):
+        self.model.apply(self._event("container", "start", "x"))
+        self.assertFalse(self.model.changed.is_set())
+
+    def test_network_connect_reinspects_container(self):
+        self.inspected["c1"] = _inspect_payload(ip="")
+        self.model.apply(self._event("container", "create", "c1", **{"com.docker.compose.project": "immich"}))
+        self.inspected["c1"] = _inspect_payload(ip="10.10.10.9")
+        self.model.apply(self._event("network", "connect", "net1", name="reverse-proxy", container="c1"))
+        self.assertEqual(self.model.rows()[0]["_ip"], "10.10.10.9")
+
+    def test_other_network_ignored(self):
+        self.model.apply(self._event("network", "connect", "net2", name="immich_default", container="c1"))
+        self.assertFalse(self.model.changed.is_set())
+
+
+class TestGroupStatusContainers(unittest.TestCase):
+    def test_groups_via_service_map_and_sorts_by_ip(self):
+        containers = [
+            {"Name": "b", "_service": "sonarr", "_ip": "10.10.10.20"},
+            {"Name": "a", "_service": "immich-server", "_ip": "10.10.10.5"},
+            {"Name": "z", "_service": "unknown", "_ip": ""},
+        ]
+        groups = _group_status_containers(
+            containers, {"sonarr": "servarr", "immich-server": "immich"}, {"servarr", "immich"}, None,
+        )
+        self.assertEqual([g for g, _ in groups], ["immich", "servarr"])
+
+    def test_filters_by_container_service(self):
+        containers = [
+            {"Name": "a", "_service": "sonarr", "_ip": ""},
+            {"Name": "b", "_service": "radarr", "_ip": ""},
+        ]
+        groups = _group_status_containers(
+            containers, {"sonarr": "servarr", "radarr": "servarr"}, {"servarr"}, "radarr",
+        )
+        self.assertEqual([[c["Name"] for c in cs] for _, cs in groups], [["b"]])
+
+
+class TestComposeLayout(unittest.TestCase):
+    def test_groups_and_includes_added_later_are_picked_up(self):
+        with tempfile.TemporaryDirectory() as tmp, \
+                mock.patch.object(config, "WORKSPACE_DIR", Path(tmp)):
+            host = Path(tmp) / "nas"
+            (host / "plex").mkdir(parents=True)
+            (host / "plex" / "compose.yml").write_text("services:\n  plex: {image: p}\n")
+            (host / "compose.yml").write_text("include:\n  - plex/compose.yml\n")
+            _, mapping, names = _compose_layout("nas")
+            self.assertEqual((mapping, names), ({"plex": "plex"}, {"plex"}))
+
+            (host / "arr").mkdir()
+            (host / "arr" / "compose.yml").write_text("services:\n  sonarr: {image: s}\n")
+            (host / "compose.yml").write_text("include:\n  - plex/compose.yml\n  - arr/compose.yml\n")
+            _, mapping, names = _compose_layout("nas")
+            self.assertEqual((mapping, names), ({"plex": "plex", "sonarr": "arr"}, {"plex", "arr"}))
+
+
+_CID = "a" * 64
+
+
+class TestCgroupStats(unittest.TestCase):
+    """Fake cgroup v2 tree in a temp dir (systemd driver layout)."""
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.root = Path(self._tmp.name)
+        (self.root / "cgroup.controllers").write_text("cpu memory\n")
+        self.dir = self.root / "system.slice" / f"docker-{_CID}.scope"
+        self.dir.mkdir(parents=True)
+        self._write(usage_usec=0, current=600 * 1024**2, inactive=100 * 1024**2, limit="max")
+
+    def _write(self, *, usage_usec, current, inactive, limit):
+        (self.dir / "cpu.stat").write_text(f"usage_usec {usage_usec}\nuser_usec 0\nsystem_usec 0\n")
+        (self.dir / "memory.current").write_text(f"{current}\n")
+        (self.dir / "memory.max").write_text(f"{limit}\n")
+        (self.dir / "memory.stat").write_text(f"anon 1\ninactive_file {inactive}\nactive_file 2\n")
+
+    def test_available_only_on_unified_hierarchy(self):
+        self.assertTrue(CgroupStats(self.root, system_mem=1).available())
+        (self.root / "cgroup.controllers").unlink()
+        self.assertFalse(CgroupStats(self.root, system_mem=1).available())
+
+    def test_find_dir_by_full_and_truncated_id(self):
+        self.assertEqual(_find_cgroup_dir(self.root, _CID), self.dir)
+        self.assertEqual(_find_cgroup_dir(self.root, _CID[:12]), self.dir)
+        self.assertIsNone(_find_cgroup_dir(self.root, "b" * 64))
+
+    def test_cgroupfs_layout(self):
+        other = self.root / "docker" / ("c" * 64)
+        other.mkdir(parents=True)
+        self.assertEqual(_find_cgroup_dir(self.root, "c" * 64), other)
+
+    def test_track_reports_missing_container(self):
+        stats = CgroupStats(self.root, system_mem=1)
+        self.assertTrue(stats.track({"web": _CID}))
+        self.assertFalse(stats.track({"web": _CID, "db": "b" * 64}))
+
+    def test_cpu_percent_from_usage_delta(self):
+        stats = CgroupStats(self.root, system_mem=16 * 1024**3)
+        stats.track({"web": _CID})
+        with mock.patch("kompose.status.time.monotonic", side_effect=[100.0, 101.0]):
+            stats.sample()
+            self.assertNotIn("CPUPerc", stats.get("web"))
+            # 1.5 s of CPU over 1 s of wall time = 150% (1.5 cores)
+            self._write(usage_usec=1_500_000, current=600 * 1024**2, inactive=100 * 1024**2, limit="max")
+            stats.sample()
+        self.assertEqual(stats.get("web")["CPUPerc"], "150.00%")
+
+    def test_short_window_keeps_previous_cpu(self):
+        stats = CgroupStats(self.root, system_mem=1)
+        stats.track({"web": _CID})
+        with mock.patch("kompose.status.time.monotonic", side_effect=[100.0, 101.0, 101.01]):
+            stats.sample()
+            self._write(usage_usec=500_000, current=1, inactive=0, limit="max")
+            stats.sample()
+            self._write(usage_usec=900_000, current=1, inactive=0, limit="max")
+            stats.sample()
+        self.assertEqual(stats.get("web")["CPUPerc"], "50.00%")
+
+    def test_memory_unlimited_uses_system_memory(self):
+        stats = CgroupStats(self.root, system_mem=16 * 1024**3)
+        stats.track({"web": _CID})
+        stats.sample()
+        self.assertEqual(stats.get("web")["MemUsage"], "500MiB / 16GiB")
+
+    def test_memory_with_limit(self):
+        self._write(usage_usec=0, current=300 * 1024**2, inactive=0, limit=str(512 * 1024**2))
+        stats = CgroupStats(self.root, system_mem=16 * 1024**3)
+        stats.track({"web": _CID})
+        stats.sample()
+        self.assertEqual(stats.get("web")["MemUsage"], "300MiB / 512MiB")
+
+    def test_unknown_container_is_empty(self):
+        self.assertEqual(CgroupStats(self.root, system_mem=1).get("nope"), {})
+
+
 if __name__ == "__main__":
     unittest.main()
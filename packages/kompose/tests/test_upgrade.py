@@ -1,27 +1,40 @@
 """Tests for the upgrade command — image extraction, discovery, log parsing."""
 
+import io
 import tempfile
+import threading
+import time
 import unittest
+from contextlib import redirect_stdout
+from datetime import datetime, timezone
 from pathlib import Path
 from unittest import mock
 
 from kompose import upgrade
+from kompose.history import ImageUpdate, Session, UpgradeHistory
+from kompose.registry import FRESH, STALE, DigestCheck
 from kompose.upgrade import (
     EXIT_OK,
     EXIT_PARTIAL,
     EXIT_TRIGGER_FAILED,
+    GroupRun,
     LogEvent,
     TriggerResult,
     _extract_summary,
     _strip_env_quotes,
+    attribute_events,
     discover_watchtower_url,
     extract_image_for_service,
     extract_images_from_compose,
+    latest_session,
     parse_watchtower_line,
     read_watchtower_token,
     render_event,
+    resolve_native_targets,
     resolve_target,
+    sessions_from_events,
     slice_latest_session,
+    trigger_many,
     trigger_update,
 )
 
@@ -159,6 +172,22 @@ class TestResolveTarget(unittest.TestCase):
         self.assertEqual(result.target, "app")
         self.assertEqual(result.images, [])
 
+    def test_native_targets_keep_each_service(self):
+        self._make_service(
+            "servarr",
+            "services:\n"
+            "  plex:\n    image: plexinc/pms-docker:latest\n"
+            "  sonarr:\n    image: linuxserver/sonarr:latest\n"
+            "  app:\n    build: .\n",
+        )
+        service_map = {"plex": "servarr", "sonarr": "servarr", "app": "servarr"}
+        with mock.patch.object(upgrade, "get_host_dir", return_value=self.host_dir), \
+             mock.patch.object(upgrade, "build_service_to_group_map", return_value=service_map):
+            every = resolve_native_targets("nas", [])
+            one = resolve_native_targets("nas", ["plex"])
+        self.assertEqual([(t.target, t.service) for t in every], [("servarr", "plex"), ("servarr", "sonarr")])
+        self.assertEqual([(t.target, t.group, t.image) for t in one], [("plex", "servarr", "plexinc/pms-docker:latest")])
+
 
 class TestExtractImageForService(unittest.TestCase):
     def _write(self, content: str) -> Path:
@@ -359,6 +388,97 @@ class TestSliceLatestSession(unittest.TestCase):
         self.assertEqual(len(events), 2)
 
 
+class TestLatestSessionReversed(unittest.TestCase):
+    LINES = [
+        "INFO[0100] Received HTTP API update request              method=POST path=/v1/update",
+        "INFO[0101] Update session completed                      failed=0 scanned=10 updated=0",
+        "INFO[0200] Received HTTP API update request              method=POST path=/v1/update",
+        "INFO[0201] Pulling new image                             image=foo/bar:latest",
+        "INFO[0203] Update session completed                      failed=0 scanned=10 updated=1",
+        "DEBU[0300] Checking containers for updated images",
+    ]
+
+    def test_stops_pulling_lines_once_the_session_is_complete(self):
+        pulled = []
+
+        def newest_first():
+            for line in reversed(self.LINES):
+                pulled.append(line)
+                yield line
+
+        events = latest_session(newest_first())
+        self.assertEqual([e.message for e in events], [
+            "Received HTTP API update request", "Pulling new image", "Update session completed",
+        ])
+        self.assertEqual(len(pulled), 4)
+
+    def test_reverse_file_reader_handles_chunk_boundaries(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "log"
+            lines = [f"line {i} " + "x" * (i % 7) for i in range(200)]
+            path.write_text("\n".join(lines) + "\n")
+            self.assertEqual(list(upgrade._reverse_file_lines(path, chunk=16)), lines[::-1])
+
+    def test_json_file_records_are_unwrapped(self):
+        records = ['{"log":"INFO[0001] hi\\n","stream":"stderr"}', "not json", '{"other":1}']
+        self.assertEqual(list(upgrade._json_file_messages(records)), ["INFO[0001] hi"])
+
+    def test_tail_windows_grow_until_the_start_of_the_log(self):
+        log = [f"l{i}" for i in range(10)]
+        requested = []
+
+        def fetch(n):
+            requested.append(n)
+            return log[-n:]
+
+        with mock.patch.object(upgrade, "_TAIL_GROWTH", 2):
+            out = list(upgrade._reverse_tail_lines(fetch(3), fetch, 3))
+        self.assertEqual(out, log[::-1])
+        self.assertEqual(requested, [3, 6, 12])
+
+
+class TestSessionsFromEvents(unittest.TestCase):
+    LINES = [
+        "2024-05-01T03:00:00.5Z INFO[0200] Received HTTP API update request  method=POST path=/v1/update",
+        "2024-05-01T03:00:01Z INFO[0201] Pulling new image                  image=foo/bar:latest",
+        '2024-05-01T03:00:04Z INFO[0204] Found new foo/bar:latest image (1a2b3c)  container=/bar image="foo/bar:latest"',
+        "2024-05-01T03:00:05Z INFO[0205] Stopping container                 container=/bar",
+        "2024-05-01T03:00:09Z INFO[0209] Started new container              container=/bar",
+        "2024-05-01T03:00:10Z INFO[0210] Update session completed           failed=0 scanned=12 updated=1",
+        "2024-05-01T04:00:00Z INFO[0300] Received HTTP API update request   method=POST path=/v1/update",
+    ]
+
+    def test_docker_timestamp_is_split_off(self):
+        event = parse_watchtower_line(self.LINES[1])
+        self.assertEqual(event.time, "2024-05-01T03:00:01Z")
+        self.assertEqual(event.message, "Pulling new image")
+
+    def test_completed_session_with_image_timeline(self):
+        events = [parse_watchtower_line(line) for line in self.LINES]
+        sessions = sessions_from_events(events, "nas")
+        self.assertEqual(len(sessions), 1)  # the trailing in-progress session is skipped
+        session = sessions[0]
+        self.assertEqual(session.id, "2024-05-01T03:00:10Z")
+        self.assertEqual((session.scanned, session.updated, session.failed), (12, 1, 0))
+        self.assertEqual(session.duration, 9.5)
+        [update] = session.updates
+        self.assertEqual((update.image, update.container), ("foo/bar:latest", "bar"))
+        self.assertEqual(update.time, "2024-05-01T03:00:01Z")
+        self.assertEqual(update.duration, 8.0)
+
+    def test_session_id_does_not_depend_on_timestamp_precision(self):
+        ids = set()
+        for stamp in ("2024-05-01T03:00:10.5Z", "2024-05-01T03:00:10.500000000Z", "2024-05-01T05:00:10.50+02:00"):
+            event = LogEvent(level="INFO", message="Update session completed", fields={}, time=stamp)
+            [session] = sessions_from_events([event], "nas")
+            ids.add(session.id)
+        self.assertEqual(ids, {"2024-05-01T03:00:10.5Z"})
+
+    def test_sessions_without_timestamps_are_not_recorded(self):
+        events = [parse_watchtower_line("INFO[0001] Update session completed  failed=0 scanned=1 updated=0")]
+        self.assertEqual(sessions_from_events(events, "nas"), [])
+
+
 # ---------------------------------------------------------------------------
 # Event rendering
 # ---------------------------------------------------------------------------
@@ -467,6 +587,127 @@ class TestTriggerUpdate(unittest.TestCase):
         self.assertIn("dns", result.error)
 
 
+# ---------------------------------------------------------------------------
+# Live tail
+# ---------------------------------------------------------------------------
+
+
+class _FakeStream:
+    def __init__(self, lines, block: bool = False):
+        self.lines = lines
+        self.block = block
+        self.closed = threading.Event()
+
+    def __iter__(self):
+        yield from self.lines
+        if self.block:
+            self.closed.wait(5)
+
+    def close(self):
+        self.closed.set()
+
+
+class TestWatchtowerLogTail(unittest.TestCase):
+    T0 = datetime(2024, 5, 1, 3, 0, 0, tzinfo=timezone.utc)
+
+    def _tail(self, stream):
+        client = mock.MagicMock()
+        client.logs.return_value = stream
+        tail = upgrade.WatchtowerLogTail(since=self.T0)
+        with mock.patch.object(upgrade, "get_client", return_value=client), redirect_stdout(io.StringIO()):
+            tail.start()
+            finished = tail.wait_finished(timeout=0.5 if stream.block else 5)
+            tail.stop()
+        return tail, finished, client
+
+    def test_replays_from_before_t0_and_drops_older_lines(self):
+        stream = _FakeStream([
+            "2024-05-01T02:59:59Z INFO[0100] Update session completed  failed=0 scanned=1 updated=0",
+            "2024-05-01T03:00:00.2Z INFO[0200] Received HTTP API update request",
+            "2024-05-01T03:00:03Z INFO[0203] Update session completed  failed=0 scanned=3 updated=0",
+        ], block=False)
+        tail, finished, client = self._tail(stream)
+        self.assertTrue(finished)
+        self.assertLess(client.logs.call_args.kwargs["since"], self.T0)
+        self.assertEqual([e.time for e in tail.events], ["2024-05-01T03:00:00.2Z", "2024-05-01T03:00:03Z"])
+
+    def test_session_end_line_releases_the_wait(self):
+        stream = _FakeStream(["2024-05-01T03:00:03Z INFO[0203] Update session completed  updated=0"], block=True)
+        _, finished, _ = self._tail(stream)
+        self.assertTrue(finished)
+
+    def test_wait_times_out_without_session_end(self):
+        stream = _FakeStream(["2024-05-01T03:00:01Z INFO[0201] Pulling new image  image=foo/bar"], block=True)
+        _, finished, _ = self._tail(stream)
+        self.assertFalse(finished)
+
+
+class TestEventAttribution(unittest.TestCase):
+    def test_container_lines_follow_the_image_that_named_them(self):
+        lines = [
+            '2024-05-01T03:00:01Z INFO[0201] Found new foo/app:latest image (1a2b)  container=/app image="foo/app:latest"',
+            "2024-05-01T03:00:02Z INFO[0202] Stopping /app (1a2b) with SIGTERM  container=/app",
+            '2024-05-01T03:00:03Z INFO[0203] Found new bar/db:16 image (3c4d)  container=/db image="bar/db:16"',
+            "2024-05-01T03:00:04Z INFO[0204] Started new container  container=/app",
+            "2024-05-01T03:00:05Z INFO[0205] Started new container  container=/db",
+            "2024-05-01T03:00:06Z INFO[0206] Update session completed  updated=2",
+        ]
+        events = [parse_watchtower_line(line) for line in lines]
+        by_group = attribute_events(events, {"foo/app": "apps", "docker.io/bar/db:16": "data"})
+        self.assertEqual([e.time[-3:] for e in by_group["apps"]], ["01Z", "02Z", "04Z"])
+        self.assertEqual([e.time[-3:] for e in by_group["data"]], ["03Z", "05Z"])
+
+
+class TestTriggerMany(unittest.TestCase):
+    def test_bounded_concurrency_and_one_request_per_group(self):
+        runs = [GroupRun(name, [f"{name}/img"]) for name in "abcd"] + [GroupRun("e", [])]
+        lock = threading.Lock()
+        live, peak = [0], [0]
+
+        def fake_trigger(url, token, images, timeout):
+            with lock:
+                live[0] += 1
+                peak[0] = max(peak[0], live[0])
+            time.sleep(0.05)
+            with lock:
+                live[0] -= 1
+            return TriggerResult(200, {"metric": {"scanned": 1, "updated": 1, "failed": 0}})
+
+        with mock.patch.object(upgrade, "trigger_update", side_effect=fake_trigger) as t:
+            trigger_many("http://wt", "tok", runs, parallel=2)
+        self.assertEqual(t.call_count, 4)
+        self.assertEqual(peak[0], 2)
+        self.assertTrue(all(run.result for run in runs[:4]))
+        self.assertIsNone(runs[4].result)
+
+    def test_timeout_scales_with_queue_position_and_flags_queued(self):
+        runs = [GroupRun("a", ["a/img"]), GroupRun("b", ["b/img"])]
+        a_sent, b_done = threading.Event(), threading.Event()
+        timeouts = {}
+
+        def fake_trigger(url, token, images, timeout):
+            timeouts[images[0]] = timeout
+            if images == ["a/img"]:
+                a_sent.set()
+                b_done.wait(5)
+                return TriggerResult(200, {"metric": {"scanned": 1, "updated": 1, "failed": 0}})
+            a_sent.wait(5)
+            b_done.set()
+            return TriggerResult(0, None, "timed out", timed_out=True)
+
+        with mock.patch.object(upgrade, "trigger_update", side_effect=fake_trigger):
+            trigger_many("http://wt", "tok", runs, parallel=2)
+        self.assertEqual(timeouts, {"a/img": upgrade.TRIGGER_TIMEOUT, "b/img": 2 * upgrade.TRIGGER_TIMEOUT})
+        self.assertEqual([run.queued for run in runs], [False, True])
+
+    def test_timeout_of_the_running_request_is_not_queued(self):
+        runs = [GroupRun("a", ["a/img"])]
+        timed_out = TriggerResult(0, None, "timed out", timed_out=True)
+        with mock.patch.object(upgrade, "trigger_update", return_value=timed_out):
+            trigger_many("http://wt", "tok", runs, parallel=2)
+        self.assertFalse(runs[0].queued)
+
+
 # ---------------------------------------------------------------------------
 # cmd_upgrade exit codes (HTTP mocked, tail no-op)
 # ---------------------------------------------------------------------------
@@ -492,6 +733,10 @@ class TestCmdUpgradeExitCodes(unittest.TestCase):
         ns.service = kwargs.get("service")
         ns.force = kwargs.get("force", True)
         ns.logs = kwargs.get("logs", False)
+        ns.history = kwargs.get("history", False)
+        ns.check = kwargs.get("check", False)
+        ns.parallel = kwargs.get("parallel")
+        ns.engine = kwargs.get("engine", "watchtower")
         return ns
 
     def _patch_env(self):
@@ -539,6 +784,125 @@ class TestCmdUpgradeExitCodes(unittest.TestCase):
         self.assertEqual(code, EXIT_OK)
         t.assert_not_called()
 
+    def _app_group(self, *images: str) -> None:
+        (self.host_dir / "app").mkdir()
+        (self.host_dir / "app" / "compose.yml").write_text(
+            "services:\n" + "".join(f"  s{i}:\n    image: {image}\n" for i, image in enumerate(images))
+        )
+
+    def test_precheck_sends_only_stale_images(self):
+        self._app_group("foo/a", "foo/b")
+        checks = [DigestCheck("foo/a", FRESH), DigestCheck("foo/b", STALE)]
+        with self._patch_env(), self._patch_tail(), \
+             mock.patch.object(upgrade, "check_images", return_value=checks), \
+             mock.patch.object(upgrade, "trigger_update",
+                               return_value=TriggerResult(200, {"metric": {"scanned": 1, "updated": 1, "failed": 0}})) as t, \
+             redirect_stdout(io.StringIO()):
+            code = upgrade.cmd_upgrade(self._args(service="app", check=True))
+        self.assertEqual(code, EXIT_OK)
+        self.assertEqual(t.call_args[0][2], ["foo/b"])
+
+    def test_precheck_all_fresh_skips_the_trigger(self):
+        self._app_group("foo/a")
+        with self._patch_env(), self._patch_tail(), \
+             mock.patch.object(upgrade, "check_images", return_value=[DigestCheck("foo/a", FRESH)]), \
+             mock.patch.object(upgrade, "trigger_update") as t, redirect_stdout(io.StringIO()):
+            code = upgrade.cmd_upgrade(self._args(service="app", check=True))
+        self.assertEqual(code, EXIT_OK)
+        t.assert_not_called()
+
+    def test_global_precheck_narrows_to_the_managed_images(self):
+        checks = [DigestCheck("foo/a", FRESH), DigestCheck("foo/b", STALE, "1 older image(s) still running")]
+        with self._patch_env(), self._patch_tail(), \
+             mock.patch.object(upgrade, "host_images", return_value=["foo/a", "foo/b"]), \
+             mock.patch.object(upgrade, "running_images", return_value={"foo/a:latest": {"sha256:1"}}), \
+             mock.patch.object(upgrade, "check_images", return_value=checks) as c, \
+             mock.patch.object(upgrade, "trigger_update",
+                               return_value=TriggerResult(200, {"metric": {"scanned": 1, "updated": 1, "failed": 0}})) as t, \
+             redirect_stdout(io.StringIO()):
+            code = upgrade.cmd_upgrade(self._args(check=True))
+        self.assertEqual(code, EXIT_OK)
+        self.assertEqual(c.call_args.kwargs["running"], {"foo/a:latest": {"sha256:1"}})
+        self.assertEqual(t.call_args[0][2], ["foo/b"])
+
+    def test_global_precheck_keeps_the_full_scan_for_unmanaged_containers(self):
+        out = io.StringIO()
+        with self._patch_env(), self._patch_tail(), \
+             mock.patch.object(upgrade, "host_images", return_value=["foo/a"]), \
+             mock.patch.object(upgrade, "running_images",
+                               return_value={"foo/a:latest": {"sha256:1"}, "adhoc/tool:2": {"sha256:2"}}), \
+             mock.patch.object(upgrade, "check_images") as c, \
+             mock.patch.object(upgrade, "trigger_update",
+                               return_value=TriggerResult(200, {"metric": {"scanned": 5, "updated": 0, "failed": 0}})) as t, \
+             redirect_stdout(out):
+            code = upgrade.cmd_upgrade(self._args(check=True))
+        self.assertEqual(code, EXIT_OK)
+        c.assert_not_called()
+        self.assertEqual(t.call_args[0][2], [])
+        self.assertIn("adhoc/tool:2", out.getvalue())
+        self.assertIn("keeping the full watchtower scan", out.getvalue())
+
+    def test_several_targets_get_one_trigger_and_one_row_each(self):
+        for group, image in (("app", "foo/a"), ("db", "foo/b")):
+            (self.host_dir / group).mkdir()
+            (self.host_dir / group / "compose.yml").write_text(f"services:\n  {group}:\n    image: {image}\n")
+        results = {
+            ("foo/a",): TriggerResult(200, {"metric": {"scanned": 1, "updated": 1, "failed": 0}}),
+            ("foo/b",): TriggerResult(200, {"metric": {"scanned": 1, "updated": 0, "failed": 1}}),
+        }
+        out = io.StringIO()
+        with self._patch_env(), self._patch_tail(), \
+             mock.patch.object(upgrade, "trigger_update", side_effect=lambda u, t, images, timeout: results[tuple(images)]) as t, \
+             redirect_stdout(out):
+            code = upgrade.cmd_upgrade(self._args(service=["app", "db", "app"], parallel=2))
+        self.assertEqual(code, EXIT_PARTIAL)
+        self.assertEqual(t.call_count, 2)
+        text = out.getvalue()
+        self.assertIn("Group", text)
+        self.assertIn("app", text)
+        self.assertIn("db", text)
+
+    def test_native_engine_skips_watchtower(self):
+        self._app_group("foo/a", "foo/b@sha256:abc")
+
+        def fake_run(host, targets, emit, **kwargs):
+            self.assertEqual([(t.group, t.service, t.image) for t in targets], [("app", "s0", "foo/a")])
+            emit("INFO", "Found new foo/a image (123)", {"container": "app-s0-1", "image": "foo/a"})
+            emit("INFO", "Update session completed", {"scanned": "1", "updated": "0", "failed": "1"})
+            return mock.MagicMock(body=lambda target=None: {"metric": {"scanned": 1, "updated": 0, "failed": 1}})
+
+        out = io.StringIO()
+        with self._patch_env(), mock.patch.object(upgrade, "run_native", side_effect=fake_run), \
+             mock.patch.object(upgrade, "trigger_update") as t, \
+             mock.patch.object(upgrade, "_record_history") as record, redirect_stdout(out):
+            code = upgrade.cmd_upgrade(self._args(service="app", engine="native"))
+        self.assertEqual(code, EXIT_PARTIAL)
+        t.assert_not_called()
+        self.assertEqual(len(record.call_args[0][0]), 2)
+        self.assertIn("new image", out.getvalue())
+
+    def test_history_reads_the_local_store_only(self):
+        (self.host_dir / "app").mkdir()
+        (self.host_dir / "app" / "compose.yml").write_text(
+            "services:\n  app:\n    image: foo/app\n"
+        )
+        store = UpgradeHistory(Path(self._tmp.name) / "state")
+        store.record([
+            Session(id="2024-05-01T03:00:10Z", host="nas", started=None, finished="2024-05-01T03:00:10Z",
+                    duration=9.5, scanned=12, updated=2, failed=0,
+                    updates=[ImageUpdate("foo/app:latest", "app", "2024-05-01T03:00:01Z", 8.0),
+                             ImageUpdate("foo/other:latest", "other", "2024-05-01T03:00:02Z", 3.0)]),
+        ])
+        out = io.StringIO()
+        with self._patch_env(), mock.patch.object(upgrade, "UpgradeHistory", return_value=store), \
+             mock.patch.object(upgrade, "trigger_update") as t, redirect_stdout(out):
+            code = upgrade.cmd_upgrade(self._args(history=True, service="app"))
+        self.assertEqual(code, EXIT_OK)
+        t.assert_not_called()
+        self.assertIn("foo/app:latest", out.getvalue())
+        self.assertNotIn("foo/other", out.getvalue())
+        self.assertIn("8.0s", out.getvalue())
+
 
 if __name__ == "__main__":
     unittest.main()
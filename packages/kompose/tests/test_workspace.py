@@ -0,0 +1,151 @@
+"""Tests for the fix workspace and the buffered `kompose fix` pipeline."""
+
+import argparse
+import io
+import os
+import stat
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from pathlib import Path
+from unittest import mock
+
+from kompose import fix as fix_module
+from kompose import workspace as workspace_module
+from kompose._engine import FixApplied, RulePlan, RuleSpec
+from kompose.rules import _builtin
+from kompose.workspace import FixWorkspace
+
+
+class TestFixWorkspace(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.path = Path(self._tmp.name) / "compose.yml"
+        self.path.write_text("a\n")
+
+    def test_staged_writes_are_visible_but_not_on_disk(self):
+        ws = FixWorkspace()
+        ws.write(self.path, "b\n")
+        self.assertEqual(ws.read(self.path), "b\n")
+        self.assertEqual(self.path.read_text(), "a\n")
+
+    def test_commit_writes_changed_files_only(self):
+        other = self.path.with_name("other.yml")
+        other.write_text("same\n")
+        ws = FixWorkspace()
+        ws.write(self.path, "b\n")
+        ws.write(other, "same\n")
+        self.assertEqual(ws.commit(), [self.path])
+        self.assertEqual(self.path.read_text(), "b\n")
+        self.assertEqual(ws.commit(), [])
+
+    def test_commit_keeps_permissions_and_leaves_no_temp_file(self):
+        os.chmod(self.path, 0o640)
+        ws = FixWorkspace()
+        ws.write(self.path, "b\n")
+        ws.commit()
+        self.assertEqual(stat.S_IMODE(self.path.stat().st_mode), 0o640)
+        self.assertEqual(sorted(p.name for p in self.path.parent.iterdir()), ["compose.yml"])
+
+    def test_missing_file(self):
+        ws = FixWorkspace()
+        missing = self.path.with_name("nope.yml")
+        self.assertFalse(ws.exists(missing))
+        self.assertIsNone(ws.doc(missing))
+        with self.assertRaises(FileNotFoundError):
+            ws.read(missing)
+
+    def test_rollback_drops_writes_staged_since_checkpoint(self):
+        other = self.path.with_name("other.yml")
+        ws = FixWorkspace()
+        ws.write(self.path, "b\n")
+        checkpoint = ws.checkpoint()
+        ws.write(self.path, "c\n")
+        ws.write(other, "new\n")
+        self.assertEqual(sorted(ws.rollback(checkpoint)), sorted([self.path, other]))
+        self.assertEqual(ws.read(self.path), "b\n")
+        self.assertFalse(ws.exists(other))
+
+    def test_doc_follows_staged_content(self):
+        ws = FixWorkspace()
+        ws.write(self.path, "services:\n  x: {}\n")
+        self.assertEqual(list(ws.doc(self.path).services), ["x"])
+
+
+class TestFixPipeline(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.host_dir = Path(self._tmp.name)
+        self.root = self.host_dir / "compose.yml"
+        self.root.write_text("include:\n  - path: paperless/compose.yml\n")
+        for name in ("paperless", "immich", "jellyfin"):
+            (self.host_dir / name).mkdir()
+            (self.host_dir / name / "compose.yml").write_text(
+                f"services:\n  {name}:\n    image: {name}\n    container_name: {name}\n"
+            )
+        self.plan = RulePlan([
+            RuleSpec(name="order", category="structure", type="property_order",
+                     params={"order": ["container_name", "image"]}),
+            RuleSpec(name="sync", category="structure", handler="compose_includes_sync"),
+        ])
+
+    def _run(self, **flags):
+        args = argparse.Namespace(service=None, host=None, force=True, dry_run=False, auto=True, env=False)
+        vars(args).update(flags)
+        services = sorted(p for p in self.host_dir.iterdir() if p.is_dir())
+        out = io.StringIO()
+        with mock.patch.object(fix_module, "get_host_dir", return_value=self.host_dir), \
+                mock.patch.object(fix_module, "get_services", return_value=services), \
+                mock.patch.object(fix_module, "load_rules", return_value=({}, self.plan)), \
+                mock.patch.object(workspace_module, "_atomic_write",
+                                  wraps=workspace_module._atomic_write) as writes, \
+                redirect_stdout(out):
+            code = fix_module.cmd_fix(args)
+        self.output = out.getvalue()
+        return code, [call.args[0] for call in writes.call_args_list]
+
+    def test_each_touched_file_written_once(self):
+        code, written = self._run()
+        self.assertEqual(code, 0)
+        self.assertEqual(written.count(self.root), 1)
+        self.assertEqual(len(written), len(set(written)))
+        root = self.root.read_text()
+        self.assertIn("- path: immich/compose.yml", root)
+        self.assertIn("- path: jellyfin/compose.yml", root)
+        content = (self.host_dir / "immich" / "compose.yml").read_text()
+        self.assertLess(content.index("container_name"), content.index("image"))
+
+    def test_fix_that_does_not_clear_its_issue_is_rolled_back(self):
+        def useless_fix(ctx, params, exclude, *, force=False):
+            ctx.workspace.write(ctx.compose_path, ctx.content + "# touched\n")
+            return [FixApplied(target=f"{ctx.service_name}/compose.yml", message="touched")]
+
+        before = (self.host_dir / "immich" / "compose.yml").read_text()
+        with mock.patch.object(_builtin, "property_order_fix", useless_fix):
+            code, written = self._run()
+        self.assertEqual(code, 1)
+        self.assertEqual(written, [self.root])  # the include fixes still go through
+        self.assertEqual((self.host_dir / "immich" / "compose.yml").read_text(), before)
+        self.assertIn("not applied, it did not clear the rule's issues (touched)", self.output)
+
+    def test_fix_with_issues_left_is_kept_and_reported(self):
+        compose = self.host_dir / "immich" / "compose.yml"
+        compose.write_text("services:\n  immich:\n    image: immich\n    restart: always\n    container_name: immich\n")
+        code, _ = self._run()
+        self.assertEqual(code, 0)
+        self.assertLess(compose.read_text().index("container_name"), compose.read_text().index("image"))
+        self.assertIn("Still reported after fixing", self.output)
+        self.assertIn("unknown property `restart`", self.output)
+
+    def test_dry_run_writes_nothing(self):
+        before = self.root.read_text()
+        code, written = self._run(dry_run=True)
+        self.assertEqual(code, 0)
+        self.assertEqual(written, [])
+        self.assertEqual(self.root.read_text(), before)
+
+
+if __name__ == "__main__":
+    unittest.main()